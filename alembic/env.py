@@ -19,7 +19,10 @@ load_dotenv()
 
 # Importar Base y modelos para que Alembic los detecte
 from app.infrastructure.database.connection import Base
-from app.infrastructure.database.models import UserModel, DetectionModel, WeatherModel
+from app.infrastructure.database.models import (
+    UserModel, DetectionModel, WeatherModel,
+    WeatherRollupMinuteModel, WeatherRollupHourModel, WeatherRollupDayModel
+)
 
 # Configuración de Alembic
 config = context.config
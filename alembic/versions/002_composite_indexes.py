@@ -0,0 +1,43 @@
+"""
+Índices compuestos para paginación keyset y consultas por rango de tiempo
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18 09:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# Información de revisión
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """
+    Aplicar migración - Crear índices compuestos
+    InnoDB agrega la llave primaria a cada índice secundario, por lo que
+    (cameraId, createdAt) sirve también para ordenar por (createdAt, id)
+    """
+    # Índices para detections
+    op.create_index('ix_detections_cameraId_createdAt', 'detections', ['cameraId', 'createdAt'], unique=False)
+    op.create_index('ix_detections_detectionType_createdAt', 'detections', ['detectionType', 'createdAt'], unique=False)
+    op.create_index('ix_detections_processed_createdAt', 'detections', ['processed', 'createdAt'], unique=False)
+    
+    # Índices para weather_data
+    op.create_index('ix_weather_data_sensorId_createdAt', 'weather_data', ['sensorId', 'createdAt'], unique=False)
+    op.create_index('ix_weather_data_sensorId_timestamp', 'weather_data', ['sensorId', 'timestamp'], unique=False)
+    op.create_index('ix_weather_data_timestamp', 'weather_data', ['timestamp'], unique=False)
+
+def downgrade() -> None:
+    """
+    Revertir migración - Eliminar índices compuestos
+    """
+    op.drop_index('ix_weather_data_timestamp', table_name='weather_data')
+    op.drop_index('ix_weather_data_sensorId_timestamp', table_name='weather_data')
+    op.drop_index('ix_weather_data_sensorId_createdAt', table_name='weather_data')
+    op.drop_index('ix_detections_processed_createdAt', table_name='detections')
+    op.drop_index('ix_detections_detectionType_createdAt', table_name='detections')
+    op.drop_index('ix_detections_cameraId_createdAt', table_name='detections')
@@ -0,0 +1,73 @@
+"""
+Tablas de rollups meteorológicos 1m/1h/1d con carga inicial desde weather_data
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18 10:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# Información de revisión
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tabla de rollup y expresión MySQL que trunca timestamp al inicio del bucket
+ROLLUP_TABLES = [
+    ('weather_rollup_1m', "DATE_FORMAT(`timestamp`, '%Y-%m-%d %H:%i:00')"),
+    ('weather_rollup_1h', "DATE_FORMAT(`timestamp`, '%Y-%m-%d %H:00:00')"),
+    ('weather_rollup_1d', "DATE(`timestamp`)"),
+]
+
+def upgrade() -> None:
+    """
+    Aplicar migración - Crear tablas de rollups y poblarlas con el histórico
+    """
+    for tableName, bucketExpression in ROLLUP_TABLES:
+        op.create_table(
+            tableName,
+            sa.Column('sensorId', sa.String(length=50), nullable=False),
+            sa.Column('bucketStart', sa.DateTime(), nullable=False),
+            sa.Column('recordCount', sa.Integer(), nullable=False, default=0),
+            sa.Column('temperatureSum', sa.Float(), nullable=False, default=0.0),
+            sa.Column('temperatureCount', sa.Integer(), nullable=False, default=0),
+            sa.Column('temperatureMin', sa.Float(), nullable=True),
+            sa.Column('temperatureMax', sa.Float(), nullable=True),
+            sa.Column('humiditySum', sa.Float(), nullable=False, default=0.0),
+            sa.Column('humidityCount', sa.Integer(), nullable=False, default=0),
+            sa.Column('windSpeedSum', sa.Float(), nullable=False, default=0.0),
+            sa.Column('windSpeedCount', sa.Integer(), nullable=False, default=0),
+            sa.Column('rainfallSum', sa.Float(), nullable=False, default=0.0),
+            sa.Column('rainfallCount', sa.Integer(), nullable=False, default=0),
+            sa.Column('updatedAt', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+            sa.PrimaryKeyConstraint('sensorId', 'bucketStart')
+        )
+        op.create_index(f'ix_{tableName}_bucketStart', tableName, ['bucketStart'], unique=False)
+        
+        # Carga inicial desde las lecturas existentes
+        op.execute(f"""
+            INSERT INTO {tableName} (
+                sensorId, bucketStart, recordCount,
+                temperatureSum, temperatureCount, temperatureMin, temperatureMax,
+                humiditySum, humidityCount, windSpeedSum, windSpeedCount,
+                rainfallSum, rainfallCount
+            )
+            SELECT
+                COALESCE(sensorId, ''), {bucketExpression}, COUNT(*),
+                COALESCE(SUM(temperature), 0), COUNT(temperature), MIN(temperature), MAX(temperature),
+                COALESCE(SUM(humidity), 0), COUNT(humidity), COALESCE(SUM(windSpeed), 0), COUNT(windSpeed),
+                COALESCE(SUM(rainfall), 0), COUNT(rainfall)
+            FROM weather_data
+            WHERE `timestamp` IS NOT NULL
+            GROUP BY COALESCE(sensorId, ''), {bucketExpression}
+        """)
+
+def downgrade() -> None:
+    """
+    Revertir migración - Eliminar tablas de rollups
+    """
+    for tableName, _ in reversed(ROLLUP_TABLES):
+        op.drop_table(tableName)
@@ -0,0 +1,54 @@
+"""
+Particionado mensual de detections y weather_data por RANGE COLUMNS(createdAt) (solo MySQL)
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 11:00:00.000000
+"""
+from datetime import datetime
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from app.infrastructure.database.partitioning import (
+    PARTITIONED_TABLES, PARTITION_COLUMN, addMonths, monthStart, monthlyWindows,
+    primaryKeyDdl, restorePrimaryKeyDdl, partitionTableDdl, removePartitioningDdl
+)
+
+# Información de revisión
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Meses futuros creados por la migración; luego los mantiene app/jobs/partition_maintenance.py
+MONTHS_AHEAD = 3
+
+def upgrade() -> None:
+    """
+    Aplicar migración - Reconstruir las tablas particionadas desde el mes de la fila más antigua
+    La llave primaria pasa a (id, createdAt) porque debe incluir la columna de partición
+    """
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql':
+        print("Particionado omitido: solo aplica a MySQL")
+        return
+    
+    currentMonth = monthStart(datetime.now())
+    for tableName in PARTITIONED_TABLES:
+        oldest = bind.execute(sa.text(f"SELECT MIN(`{PARTITION_COLUMN}`) FROM `{tableName}`")).scalar()
+        firstMonth = min(monthStart(oldest), currentMonth) if oldest else currentMonth
+        windows = monthlyWindows(firstMonth, addMonths(currentMonth, MONTHS_AHEAD + 1))
+        op.execute(primaryKeyDdl(tableName))
+        op.execute(partitionTableDdl(tableName, windows))
+
+def downgrade() -> None:
+    """
+    Revertir migración - Volver a tablas sin particionar con llave primaria (id)
+    """
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql':
+        return
+    
+    for tableName in reversed(PARTITIONED_TABLES):
+        op.execute(removePartitioningDdl(tableName))
+        op.execute(restorePrimaryKeyDdl(tableName))
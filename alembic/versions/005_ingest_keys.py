@@ -0,0 +1,37 @@
+"""
+Tabla ingest_keys para ingesta idempotente
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 14:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# Información de revisión
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """
+    Aplicar migración - Crear tabla de llaves de idempotencia
+    """
+    op.create_table(
+        'ingest_keys',
+        sa.Column('dataset', sa.String(length=20), nullable=False),
+        sa.Column('keyHash', sa.String(length=32), nullable=False),
+        sa.Column('recordId', sa.Integer(), nullable=False),
+        sa.Column('createdAt', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('dataset', 'keyHash')
+    )
+    op.create_index('ix_ingest_keys_createdAt', 'ingest_keys', ['createdAt'], unique=False)
+
+def downgrade() -> None:
+    """
+    Revertir migración - Eliminar tabla de llaves de idempotencia
+    """
+    op.drop_index('ix_ingest_keys_createdAt', table_name='ingest_keys')
+    op.drop_table('ingest_keys')
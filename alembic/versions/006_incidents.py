@@ -0,0 +1,61 @@
+"""
+Tabla incidents y columna detections.incidentId
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 15:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# Información de revisión
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """
+    Aplicar migración - Crear incidents y enlazar detecciones
+    Las detecciones existentes quedan sin incidente; el tracker solo agrupa las nuevas
+    """
+    op.create_table(
+        'incidents',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cameraId', sa.String(length=50), nullable=False),
+        sa.Column('detectionType', sa.String(length=50), nullable=False),
+        sa.Column('firstSeen', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('lastSeen', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('detectionCount', sa.Integer(), nullable=False, default=1),
+        sa.Column('peakConfidence', sa.Float(), nullable=False),
+        sa.Column('bboxMinX', sa.Integer(), nullable=True),
+        sa.Column('bboxMinY', sa.Integer(), nullable=True),
+        sa.Column('bboxMaxX', sa.Integer(), nullable=True),
+        sa.Column('bboxMaxY', sa.Integer(), nullable=True),
+        sa.Column('createdAt', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updatedAt', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_incidents_id', 'incidents', ['id'], unique=False)
+    op.create_index('ix_incidents_createdAt', 'incidents', ['createdAt'], unique=False)
+    op.create_index('ix_incidents_cameraId_lastSeen', 'incidents', ['cameraId', 'lastSeen'], unique=False)
+    op.create_index('ix_incidents_detectionType_lastSeen', 'incidents', ['detectionType', 'lastSeen'], unique=False)
+    op.create_index('ix_incidents_lastSeen', 'incidents', ['lastSeen'], unique=False)
+    
+    # Columna nullable: en MySQL 8 se agrega sin reescribir la tabla
+    op.add_column('detections', sa.Column('incidentId', sa.Integer(), nullable=True))
+    op.create_index('ix_detections_incidentId', 'detections', ['incidentId'], unique=False)
+
+def downgrade() -> None:
+    """
+    Revertir migración - Eliminar incidents y la columna de enlace
+    """
+    op.drop_index('ix_detections_incidentId', table_name='detections')
+    op.drop_column('detections', 'incidentId')
+    op.drop_index('ix_incidents_lastSeen', table_name='incidents')
+    op.drop_index('ix_incidents_detectionType_lastSeen', table_name='incidents')
+    op.drop_index('ix_incidents_cameraId_lastSeen', table_name='incidents')
+    op.drop_index('ix_incidents_createdAt', table_name='incidents')
+    op.drop_index('ix_incidents_id', table_name='incidents')
+    op.drop_table('incidents')
@@ -0,0 +1,30 @@
+"""
+Columna detections.riskScore calculada por el worker de detecciones
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 17:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# Información de revisión
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """
+    Aplicar migración - Agregar riskScore
+    Las detecciones ya marcadas como procesadas quedan con riskScore nulo
+    """
+    # Columna nullable: en MySQL 8 se agrega sin reescribir la tabla
+    op.add_column('detections', sa.Column('riskScore', sa.Float(), nullable=True))
+
+def downgrade() -> None:
+    """
+    Revertir migración - Eliminar riskScore
+    """
+    op.drop_column('detections', 'riskScore')
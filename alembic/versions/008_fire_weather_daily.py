@@ -0,0 +1,50 @@
+"""
+Tabla fire_weather_daily con los índices de peligro de incendio por sensor y día
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18 19:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# Información de revisión
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """
+    Aplicar migración - Crear fire_weather_daily
+    Se llena sola desde los rollups la primera vez que se consultan los índices
+    """
+    op.create_table(
+        'fire_weather_daily',
+        sa.Column('sensorId', sa.String(length=50), nullable=False),
+        sa.Column('dayStart', sa.DateTime(), nullable=False),
+        sa.Column('temperature', sa.Float(), nullable=True),
+        sa.Column('humidity', sa.Float(), nullable=True),
+        sa.Column('windSpeed', sa.Float(), nullable=True),
+        sa.Column('rainfall', sa.Float(), nullable=True),
+        sa.Column('ffmc', sa.Float(), nullable=True),
+        sa.Column('dmc', sa.Float(), nullable=True),
+        sa.Column('dc', sa.Float(), nullable=True),
+        sa.Column('isi', sa.Float(), nullable=True),
+        sa.Column('bui', sa.Float(), nullable=True),
+        sa.Column('fwi', sa.Float(), nullable=True),
+        sa.Column('ffwi', sa.Float(), nullable=True),
+        sa.Column('ffwiMax', sa.Float(), nullable=True),
+        sa.Column('sourceRecordCount', sa.Integer(), nullable=False),
+        sa.Column('updatedAt', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('sensorId', 'dayStart')
+    )
+    op.create_index('ix_fire_weather_daily_dayStart', 'fire_weather_daily', ['dayStart'], unique=False)
+
+def downgrade() -> None:
+    """
+    Revertir migración - Eliminar fire_weather_daily
+    """
+    op.drop_index('ix_fire_weather_daily_dayStart', table_name='fire_weather_daily')
+    op.drop_table('fire_weather_daily')
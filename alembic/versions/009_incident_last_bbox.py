@@ -0,0 +1,35 @@
+"""
+Columnas incidents.lastBbox* con el último bbox de cada incidente
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18 21:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# Información de revisión
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LAST_BBOX_COLUMNS = ('lastBboxMinX', 'lastBboxMinY', 'lastBboxMaxX', 'lastBboxMaxY')
+
+def upgrade() -> None:
+    """
+    Aplicar migración - Agregar lastBbox*
+    Cada ingesta reconstruye los incidentes abiertos desde la base y compara contra el último bbox;
+    los incidentes existentes quedan nulos y usan su envolvente
+    """
+    # Columnas nullable: en MySQL 8 se agregan sin reescribir la tabla
+    for name in LAST_BBOX_COLUMNS:
+        op.add_column('incidents', sa.Column(name, sa.Integer(), nullable=True))
+
+def downgrade() -> None:
+    """
+    Revertir migración - Eliminar lastBbox*
+    """
+    for name in reversed(LAST_BBOX_COLUMNS):
+        op.drop_column('incidents', name)
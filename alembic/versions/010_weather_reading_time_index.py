@@ -0,0 +1,34 @@
+"""
+Índice sobre COALESCE(timestamp, createdAt) de weather_data
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18 22:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# Información de revisión
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """
+    Aplicar migración - Crear ix_weather_data_readingTime
+    Las ventanas de correlación y series filtran por el instante de lectura, que cae en
+    createdAt cuando la lectura no trae timestamp; en MySQL 8 es un índice funcional
+    """
+    quote = op.get_bind().dialect.identifier_preparer.quote
+    op.create_index(
+        'ix_weather_data_readingTime', 'weather_data',
+        [sa.text(f"(coalesce({quote('timestamp')}, {quote('createdAt')}))")], unique=False
+    )
+
+def downgrade() -> None:
+    """
+    Revertir migración - Eliminar ix_weather_data_readingTime
+    """
+    op.drop_index('ix_weather_data_readingTime', table_name='weather_data')
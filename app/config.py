@@ -0,0 +1,198 @@
+"""
+Configuración de la API leída de variables de entorno una sola vez por proceso
+"""
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+
+def envBool(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() == "true"
+
+def envOptionalFloat(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+def parseCameraSensorMap(value: str) -> Dict[str, str]:
+    """Sensor meteorológico de cada cámara desde CAM_1:SENSOR_1,CAM_2:SENSOR_2"""
+    return dict(pair.strip().split(":", 1) for pair in value.split(",") if ":" in pair)
+
+@dataclass(frozen=True)
+class Settings:
+    """Valores de configuración de la API; los jobs leen además sus propias variables"""
+    environment: str = "development"
+    debug: bool = False
+    projectName: str = "Thermal Monitoring API"
+    version: str = "1.0.0"
+    apiHost: str = "0.0.0.0"
+    apiPort: int = 8000
+    logLevel: str = "info"
+    corsOrigins: List[str] = field(default_factory=lambda: ["*"])  # En iteraciones futuras lo leeremos de .env
+    # Base de datos: pool por proceso (app.launcher lo calcula) y conexiones abiertas al arrancar
+    databaseUrl: Optional[str] = None
+    poolSize: int = 10
+    maxOverflow: int = 20
+    poolMinConnections: int = 10
+    # Arranque con app.launcher: workers (0 = uno por núcleo), conexiones a la base entre todos
+    # los workers (max_connections de MySQL es 151 por defecto) y espera a las peticiones en curso
+    webConcurrency: int = 0
+    dbConnectionBudget: int = 100
+    launcherGracefulTimeout: int = 30
+    # Réplica de lectura opcional: atraso máximo tolerado y ventana read-your-writes
+    replicaDatabaseUrl: Optional[str] = None
+    replicaMaxLagSeconds: float = 5
+    replicaStickySeconds: float = 5
+    replicaCheckIntervalSeconds: float = 2
+    batchMaxItems: int = 5000
+    # Modo de ingesta: "sync" confirma cada petición, "queue" usa group-commit en segundo plano
+    ingestMode: str = "sync"
+    ingestQueueMaxSize: int = 10000
+    ingestFlushIntervalMs: int = 50
+    ingestFlushMaxRows: int = 500
+    cameraSensorMap: Dict[str, str] = field(default_factory=dict)
+    # Caché de últimas lecturas por dispositivo
+    latestCacheMaxEntries: int = 5000
+    latestWeatherStaleSeconds: float = 900
+    latestDetectionStaleSeconds: float = 300
+    latestCachePrimeHours: int = 168
+    latestCacheRefreshSeconds: float = 30
+    # Intervalo del sondeo de salud de base de datos
+    healthCheckIntervalSeconds: float = 5
+    # Mantenimiento de particiones mensuales (solo MySQL); 0 lo desactiva en la API
+    partitionMaintenanceIntervalHours: float = 24
+    # Almacenamiento frío: directorio, días que permanecen en la base (0 desactiva), cada cuánto corre
+    # el archivador dentro de la API, filas por DELETE y confianza máxima de las detecciones archivadas
+    archiveDir: str = "archive"
+    archiveAfterDays: int = 0
+    archiveIntervalHours: float = 24
+    archiveDeleteChunk: int = 1000
+    archiveDetectionMaxConfidence: Optional[float] = None
+    # Worker de detecciones: correrlo dentro de la API, lote adaptativo (inicial, límites y duración
+    # objetivo), espera sin pendientes y distancia máxima a la lectura meteorológica
+    detectionWorkerEnabled: bool = False
+    detectionWorkerInitialBatch: int = 500
+    detectionWorkerMinBatch: int = 50
+    detectionWorkerMaxBatch: int = 5000
+    detectionWorkerTargetSeconds: float = 0.5
+    detectionWorkerIdleSeconds: float = 1
+    detectionWorkerMaxGapMinutes: int = 30
+    # Ingesta idempotente: ventana en la que se reconocen reintentos y tamaño del filtro de Bloom
+    idempotencyWindowSeconds: float = 86400
+    idempotencyExpectedKeys: int = 1000000
+    idempotencyFalsePositiveRate: float = 0.01
+    # Agrupación de detecciones en incidentes: IoU mínimo y salto máximo de tiempo entre cuadros
+    incidentIouThreshold: float = 0.3
+    incidentMaxGapSeconds: float = 120
+    incidentMaxOpenPerCamera: int = 64
+    # Eventos en vivo (WebSocket/SSE): backend "memory" o "redis" para compartirlos entre workers
+    eventsBackend: str = "memory"
+    eventsRedisUrl: str = "redis://localhost:6379/0"
+    eventsRedisChannel: str = "thermal-monitoring-events"
+    eventsClientQueueSize: int = 256
+    eventsMaxSubscribers: int = 1000
+    eventsHeartbeatSeconds: float = 15
+    # GET condicionales: marcas de agua por tabla "off", "memory" (solo si todas las escrituras pasan por
+    # un único proceso de la API) o "redis" (compartidas con workers y jobs aparte)
+    conditionalGetBackend: str = "off"
+    conditionalGetRedisUrl: str = "redis://localhost:6379/0"
+    # Nivel de riesgo mínimo de una detección para publicar una alerta
+    alertMinRiskLevel: str = "high"
+    # Imágenes de detecciones: almacén por contenido, tamaño máximo y procesos para miniaturas
+    imageStoreDir: str = "images"
+    imageMaxBytes: int = 20 * 1024 * 1024
+    imageChunkBytes: int = 64 * 1024
+    imageThumbnailWorkers: int = 1
+    # Puntos calientes en cuadros radiométricos: procesos (0 = núcleos disponibles), umbral y límites
+    hotspotWorkers: int = 0
+    hotspotThresholdCelsius: float = 60
+    hotspotMinPixels: int = 4
+    hotspotMaxPerFrame: int = 20
+    hotspotMaxFramePixels: int = 2048 * 2048
+    # Índices de peligro de incendio: latitud para la duración del día y hora de las entradas del FWI
+    fireWeatherLatitude: float = 46.0
+    fireWeatherNoonHour: int = 12
+    # Series remuestreadas: máximo de valores (sensores x buckets x campos) por respuesta
+    weatherSeriesMaxPoints: int = 500000
+    
+    @classmethod
+    def fromEnv(cls) -> "Settings":
+        poolSize = int(os.getenv("DB_POOL_SIZE", "10"))
+        return cls(
+            environment=os.getenv("ENVIRONMENT", "development"),
+            debug=envBool("DEBUG", "false"),
+            projectName=os.getenv("PROJECT_NAME", "Thermal Monitoring API"),
+            version=os.getenv("VERSION", "1.0.0"),
+            apiHost=os.getenv("API_HOST", "0.0.0.0"),
+            apiPort=int(os.getenv("API_PORT", "8000")),
+            logLevel=os.getenv("LOG_LEVEL", "info"),
+            databaseUrl=os.getenv("DATABASE_URL"),
+            poolSize=poolSize,
+            maxOverflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+            poolMinConnections=int(os.getenv("DB_POOL_MIN_CONNECTIONS", str(poolSize))),
+            webConcurrency=int(os.getenv("WEB_CONCURRENCY", "0")),
+            dbConnectionBudget=int(os.getenv("DB_CONNECTION_BUDGET", "100")),
+            launcherGracefulTimeout=int(os.getenv("LAUNCHER_GRACEFUL_TIMEOUT", "30")),
+            replicaDatabaseUrl=os.getenv("DATABASE_REPLICA_URL") or None,
+            replicaMaxLagSeconds=float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5")),
+            replicaStickySeconds=float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5")),
+            replicaCheckIntervalSeconds=float(os.getenv("DB_REPLICA_CHECK_INTERVAL_SECONDS", "2")),
+            batchMaxItems=int(os.getenv("BATCH_MAX_ITEMS", "5000")),
+            ingestMode=os.getenv("INGEST_MODE", "sync").lower(),
+            ingestQueueMaxSize=int(os.getenv("INGEST_QUEUE_MAX_SIZE", "10000")),
+            ingestFlushIntervalMs=int(os.getenv("INGEST_FLUSH_INTERVAL_MS", "50")),
+            ingestFlushMaxRows=int(os.getenv("INGEST_FLUSH_MAX_ROWS", "500")),
+            cameraSensorMap=parseCameraSensorMap(os.getenv("CAMERA_SENSOR_MAP", "")),
+            latestCacheMaxEntries=int(os.getenv("LATEST_CACHE_MAX_ENTRIES", "5000")),
+            latestWeatherStaleSeconds=float(os.getenv("LATEST_WEATHER_STALE_SECONDS", "900")),
+            latestDetectionStaleSeconds=float(os.getenv("LATEST_DETECTION_STALE_SECONDS", "300")),
+            latestCachePrimeHours=int(os.getenv("LATEST_CACHE_PRIME_HOURS", "168")),
+            latestCacheRefreshSeconds=float(os.getenv("LATEST_CACHE_REFRESH_SECONDS", "30")),
+            healthCheckIntervalSeconds=float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "5")),
+            partitionMaintenanceIntervalHours=float(os.getenv("PARTITION_MAINTENANCE_INTERVAL_HOURS", "24")),
+            archiveDir=os.getenv("ARCHIVE_DIR", "archive"),
+            archiveAfterDays=int(os.getenv("ARCHIVE_AFTER_DAYS", "0")),
+            archiveIntervalHours=float(os.getenv("ARCHIVE_INTERVAL_HOURS", "24")),
+            archiveDeleteChunk=int(os.getenv("ARCHIVE_DELETE_CHUNK", "1000")),
+            archiveDetectionMaxConfidence=envOptionalFloat("ARCHIVE_DETECTION_MAX_CONFIDENCE"),
+            detectionWorkerEnabled=envBool("DETECTION_WORKER_ENABLED", "false"),
+            detectionWorkerInitialBatch=int(os.getenv("DETECTION_WORKER_INITIAL_BATCH", "500")),
+            detectionWorkerMinBatch=int(os.getenv("DETECTION_WORKER_MIN_BATCH", "50")),
+            detectionWorkerMaxBatch=int(os.getenv("DETECTION_WORKER_MAX_BATCH", "5000")),
+            detectionWorkerTargetSeconds=float(os.getenv("DETECTION_WORKER_TARGET_SECONDS", "0.5")),
+            detectionWorkerIdleSeconds=float(os.getenv("DETECTION_WORKER_IDLE_SECONDS", "1")),
+            detectionWorkerMaxGapMinutes=int(os.getenv("DETECTION_WORKER_MAX_GAP_MINUTES", "30")),
+            idempotencyWindowSeconds=float(os.getenv("IDEMPOTENCY_WINDOW_SECONDS", "86400")),
+            idempotencyExpectedKeys=int(os.getenv("IDEMPOTENCY_EXPECTED_KEYS", "1000000")),
+            idempotencyFalsePositiveRate=float(os.getenv("IDEMPOTENCY_FALSE_POSITIVE_RATE", "0.01")),
+            incidentIouThreshold=float(os.getenv("INCIDENT_IOU_THRESHOLD", "0.3")),
+            incidentMaxGapSeconds=float(os.getenv("INCIDENT_MAX_GAP_SECONDS", "120")),
+            incidentMaxOpenPerCamera=int(os.getenv("INCIDENT_MAX_OPEN_PER_CAMERA", "64")),
+            eventsBackend=os.getenv("EVENTS_BACKEND", "memory").lower(),
+            eventsRedisUrl=os.getenv("EVENTS_REDIS_URL", "redis://localhost:6379/0"),
+            eventsRedisChannel=os.getenv("EVENTS_REDIS_CHANNEL", "thermal-monitoring-events"),
+            eventsClientQueueSize=int(os.getenv("EVENTS_CLIENT_QUEUE_SIZE", "256")),
+            eventsMaxSubscribers=int(os.getenv("EVENTS_MAX_SUBSCRIBERS", "1000")),
+            eventsHeartbeatSeconds=float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15")),
+            conditionalGetBackend=os.getenv("CONDITIONAL_GET_BACKEND", "off").lower(),
+            conditionalGetRedisUrl=os.getenv("CONDITIONAL_GET_REDIS_URL", os.getenv("EVENTS_REDIS_URL", "redis://localhost:6379/0")),
+            alertMinRiskLevel=os.getenv("ALERT_MIN_RISK_LEVEL", "high").lower(),
+            imageStoreDir=os.getenv("IMAGE_STORE_DIR", "images"),
+            imageMaxBytes=int(os.getenv("IMAGE_MAX_BYTES", str(20 * 1024 * 1024))),
+            imageChunkBytes=int(os.getenv("IMAGE_CHUNK_BYTES", str(64 * 1024))),
+            imageThumbnailWorkers=int(os.getenv("IMAGE_THUMBNAIL_WORKERS", "1")),
+            hotspotWorkers=int(os.getenv("HOTSPOT_WORKERS", "0")),
+            hotspotThresholdCelsius=float(os.getenv("HOTSPOT_THRESHOLD_CELSIUS", "60")),
+            hotspotMinPixels=int(os.getenv("HOTSPOT_MIN_PIXELS", "4")),
+            hotspotMaxPerFrame=int(os.getenv("HOTSPOT_MAX_PER_FRAME", "20")),
+            hotspotMaxFramePixels=int(os.getenv("HOTSPOT_MAX_FRAME_PIXELS", str(2048 * 2048))),
+            fireWeatherLatitude=float(os.getenv("FIRE_WEATHER_LATITUDE", "46.0")),
+            fireWeatherNoonHour=int(os.getenv("FIRE_WEATHER_NOON_HOUR", "12")),
+            weatherSeriesMaxPoints=int(os.getenv("WEATHER_SERIES_MAX_POINTS", "500000"))
+        )
+
+@lru_cache(maxsize=None)
+def getSettings() -> Settings:
+    """Cargar .env y leer la configuración la primera vez que se pide"""
+    load_dotenv()
+    return Settings.fromEnv()
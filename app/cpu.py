@@ -0,0 +1,37 @@
+"""
+Núcleos de CPU disponibles para el proceso: afinidad y cuota de CPU del contenedor
+
+Sin efectos al importar (no lee .env ni configuración); lo usan el launcher, la API
+y los benchmarks.
+"""
+import math
+import os
+from typing import Optional
+
+def cgroupCpuLimit() -> Optional[float]:
+    """Cuota de CPU del contenedor en núcleos (cgroup v2 o v1), None si no hay límite"""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as quotaFile:
+            quota, period = quotaFile.read().split()[:2]
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as quotaFile:
+            quota = int(quotaFile.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as periodFile:
+            period = int(periodFile.read())
+        return None if quota <= 0 else quota / period
+    except (OSError, ValueError):
+        return None
+
+def availableCores() -> int:
+    """Núcleos que este proceso puede usar realmente"""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    limit = cgroupCpuLimit()
+    if limit is not None:
+        cores = min(cores, max(1, math.ceil(limit)))
+    return max(1, cores)
@@ -7,13 +7,19 @@ from .user import (
 )
 from .detection import (
     DetectionBase, DetectionCreate, DetectionUpdate, 
-    DetectionResponse, DetectionList, DetectionFilter
+    DetectionResponse, DetectionList, DetectionFilter,
+    DetectionLatest, DetectionLatestList
 )
 from .weather_data import (
     WeatherDataBase, WeatherDataCreate, WeatherDataUpdate,
     WeatherDataResponse, WeatherDataList, WeatherDataFilter,
-    WeatherSummary
+    WeatherSummary, WeatherCurrentReading, WeatherCurrentList, FireWeatherDay, FireWeatherList,
+    WeatherSeries, WeatherSeriesList
 )
+from .incident import IncidentResponse, IncidentList, IncidentFilter
+from .event import EventFilter, EVENT_TYPES
+from .batch import BatchItemError, BatchDuplicate, BatchResult, validateBatch
+from .hotspot import Hotspot, FrameDetectionResult
 
 # Exportar todas las entidades
 __all__ = [
@@ -24,9 +30,23 @@ __all__ = [
     # Detection entities  
     "DetectionBase", "DetectionCreate", "DetectionUpdate",
     "DetectionResponse", "DetectionList", "DetectionFilter",
+    "DetectionLatest", "DetectionLatestList",
     
     # WeatherData entities
     "WeatherDataBase", "WeatherDataCreate", "WeatherDataUpdate", 
     "WeatherDataResponse", "WeatherDataList", "WeatherDataFilter",
-    "WeatherSummary"
+    "WeatherSummary", "WeatherCurrentReading", "WeatherCurrentList", "FireWeatherDay", "FireWeatherList",
+    "WeatherSeries", "WeatherSeriesList",
+    
+    # Incident entities
+    "IncidentResponse", "IncidentList", "IncidentFilter",
+    
+    # Event entities
+    "EventFilter", "EVENT_TYPES",
+    
+    # Batch entities
+    "BatchItemError", "BatchDuplicate", "BatchResult", "validateBatch",
+    
+    # Hotspot entities
+    "Hotspot", "FrameDetectionResult"
 ]
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""
+Entidades Pydantic para ingesta por lotes - Validación de API
+"""
+from pydantic import BaseModel, Field, ValidationError
+from typing import Any, List, Tuple, Type
+
+class BatchItemError(BaseModel):
+    """Error de validación de un elemento dentro de un lote"""
+    index: int = Field(..., ge=0, description="Posición del elemento dentro del lote")
+    errors: List[dict] = Field(..., description="Errores de validación del elemento")
+
+class BatchDuplicate(BaseModel):
+    """Elemento de un lote que repite una lectura ya registrada"""
+    index: int = Field(..., ge=0, description="Posición del elemento dentro del lote")
+    id: int = Field(..., description="ID del registro original")
+
+class BatchResult(BaseModel):
+    """Resultado de una ingesta por lotes"""
+    insertedIds: List[int] = Field(default_factory=list, description="IDs asignados a los elementos insertados, en orden")
+    insertedCount: int = Field(..., description="Número de elementos insertados")
+    rejectedCount: int = Field(..., description="Número de elementos rechazados por validación")
+    errors: List[BatchItemError] = Field(default_factory=list, description="Errores por elemento rechazado")
+    duplicateCount: int = Field(0, description="Elementos no insertados por repetir una lectura registrada")
+    duplicates: List[BatchDuplicate] = Field(default_factory=list, description="Posición e ID original de cada duplicado")
+
+def validateBatch(items: List[Any], entityClass: Type[BaseModel]) -> Tuple[List[Tuple[int, BaseModel]], List[BatchItemError]]:
+    """
+    Validar todos los elementos de un lote sin detenerse en el primer error
+    Retorna los elementos válidos con su posición original y los errores por elemento
+    """
+    validItems: List[Tuple[int, BaseModel]] = []
+    errors: List[BatchItemError] = []
+    
+    for index, item in enumerate(items):
+        try:
+            validItems.append((index, entityClass.parse_obj(item)))
+        except ValidationError as e:
+            errors.append(BatchItemError(index=index, errors=e.errors()))
+    
+    return validItems, errors
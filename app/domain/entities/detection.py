@@ -47,6 +47,8 @@ class DetectionResponse(DetectionBase):
     bboxHeight: Optional[int] = Field(None, description="Alto del bounding box")
     imagePath: Optional[str] = Field(None, description="Ruta de la imagen")
     processed: bool = Field(..., description="Si fue procesada por motor de correlación")
+    riskScore: Optional[float] = Field(None, description="Puntaje de riesgo asignado al procesarla")
+    incidentId: Optional[int] = Field(None, description="Incidente al que se enlazó la detección")
     timestamp: Optional[datetime] = Field(None, description="Timestamp original")
     createdAt: datetime = Field(..., description="Fecha de registro en sistema")
     
@@ -54,18 +56,30 @@ class DetectionResponse(DetectionBase):
         from_attributes = True
         orm_mode = True
 
+class DetectionLatest(DetectionResponse):
+    """Última detección de una cámara y tipo, servida desde caché en memoria"""
+    createdAt: Optional[datetime] = Field(None, description="Fecha de registro en sistema")
+    ageSeconds: Optional[float] = Field(None, description="Segundos transcurridos desde el timestamp")
+    stale: bool = Field(..., description="Si supera la antigüedad máxima configurada")
+
+class DetectionLatestList(BaseModel):
+    """Últimas detecciones por cámara y tipo"""
+    detections: List[DetectionLatest] = Field(..., description="Última detección por (cameraId, detectionType)")
+    staleAfterSeconds: float = Field(..., description="Antigüedad a partir de la cual una entrada es stale")
+
 class DetectionList(BaseModel):
-    """Modelo para lista de detecciones con paginación"""
+    """Modelo para lista de detecciones con paginación keyset"""
     detections: List[DetectionResponse] = Field(..., description="Lista de detecciones")
-    totalCount: int = Field(..., description="Total de detecciones")
-    page: int = Field(default=1, description="Página actual")
+    totalCount: Optional[int] = Field(None, description="Total de detecciones con los filtros, solo si se solicita")
     pageSize: int = Field(default=10, description="Elementos por página")
+    nextCursor: Optional[str] = Field(None, description="Cursor para la página siguiente, nulo en la última")
     
 class DetectionFilter(BaseModel):
     """Modelo para filtros de búsqueda de detecciones"""
     detectionType: Optional[str] = Field(None, description="Filtrar por tipo")
     cameraId: Optional[str] = Field(None, description="Filtrar por cámara")
     processed: Optional[bool] = Field(None, description="Filtrar por estado procesado")
+    incidentId: Optional[int] = Field(None, description="Solo las detecciones de este incidente")
     minConfidence: Optional[float] = Field(None, ge=0.0, le=1.0, description="Confianza mínima")
     startDate: Optional[datetime] = Field(None, description="Fecha inicio")
     endDate: Optional[datetime] = Field(None, description="Fecha fin")
\ No newline at end of file
@@ -0,0 +1,16 @@
+"""
+Entidades Pydantic para eventos en vivo - Suscripciones WebSocket/SSE
+"""
+from pydantic import BaseModel, Field
+from typing import Optional
+
+# Tipos de evento publicados por la ingesta
+EVENT_TYPES = ("detection", "weather", "alert")
+
+class EventFilter(BaseModel):
+    """Filtros de una suscripción; los campos con varios valores se separan por coma"""
+    types: Optional[str] = Field(None, description="Tipos de evento: detection, weather, alert")
+    cameraId: Optional[str] = Field(None, description="Solo estas cámaras (detecciones y alertas)")
+    detectionType: Optional[str] = Field(None, description="Solo estos tipos de detección")
+    sensorId: Optional[str] = Field(None, description="Solo estos sensores (lecturas meteorológicas)")
+    minConfidence: Optional[float] = Field(None, ge=0.0, le=1.0, description="Confianza mínima de detecciones y alertas")
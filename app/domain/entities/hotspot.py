@@ -0,0 +1,27 @@
+"""
+Entidades Pydantic para detección de puntos calientes en cuadros radiométricos
+"""
+from pydantic import BaseModel, Field
+from typing import List
+
+class Hotspot(BaseModel):
+    """Punto caliente encontrado en un cuadro y la detección que generó"""
+    id: int = Field(..., description="ID de la detección insertada")
+    bboxX: int = Field(..., ge=0)
+    bboxY: int = Field(..., ge=0)
+    bboxWidth: int = Field(..., ge=1)
+    bboxHeight: int = Field(..., ge=1)
+    pixels: int = Field(..., ge=1, description="Píxeles sobre el umbral")
+    peakTemperature: float = Field(..., description="Temperatura máxima en °C")
+    meanTemperature: float = Field(..., description="Temperatura media de sus píxeles en °C")
+    confidence: float = Field(..., ge=0.0, le=1.0)
+
+class FrameDetectionResult(BaseModel):
+    """Resultado de procesar un cuadro radiométrico"""
+    cameraId: str
+    width: int
+    height: int
+    thresholdCelsius: float
+    hotspots: List[Hotspot] = Field(default_factory=list, description="Ordenados por temperatura máxima descendente")
+    insertedCount: int = Field(..., description="Detecciones insertadas")
+    computeMs: float = Field(..., description="Tiempo de detección en el pool de procesos")
@@ -0,0 +1,41 @@
+"""
+Entidades Pydantic para Incident - Validación de API
+"""
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+class IncidentResponse(BaseModel):
+    """Incidente: detecciones consecutivas de una cámara y tipo agrupadas por IoU y tiempo"""
+    id: int = Field(..., description="ID único del incidente")
+    cameraId: str = Field(..., description="Cámara que lo observó")
+    detectionType: str = Field(..., description="Tipo de detección")
+    firstSeen: datetime = Field(..., description="Timestamp de la primera detección")
+    lastSeen: datetime = Field(..., description="Timestamp de la última detección")
+    detectionCount: int = Field(..., description="Detecciones enlazadas")
+    peakConfidence: float = Field(..., description="Confianza máxima observada")
+    bboxMinX: Optional[int] = Field(None, description="Envolvente de los bounding box: X mínima")
+    bboxMinY: Optional[int] = Field(None, description="Envolvente de los bounding box: Y mínima")
+    bboxMaxX: Optional[int] = Field(None, description="Envolvente de los bounding box: X máxima")
+    bboxMaxY: Optional[int] = Field(None, description="Envolvente de los bounding box: Y máxima")
+    createdAt: datetime = Field(..., description="Fecha de registro en sistema")
+    
+    class Config:
+        from_attributes = True
+        orm_mode = True
+
+class IncidentList(BaseModel):
+    """Modelo para lista de incidentes con paginación keyset"""
+    incidents: List[IncidentResponse] = Field(..., description="Lista de incidentes")
+    totalCount: Optional[int] = Field(None, description="Total de incidentes con los filtros, solo si se solicita")
+    pageSize: int = Field(default=10, description="Elementos por página")
+    nextCursor: Optional[str] = Field(None, description="Cursor para la página siguiente, nulo en la última")
+
+class IncidentFilter(BaseModel):
+    """Modelo para filtros de búsqueda de incidentes"""
+    cameraId: Optional[str] = Field(None, description="Filtrar por cámara")
+    detectionType: Optional[str] = Field(None, description="Filtrar por tipo")
+    minPeakConfidence: Optional[float] = Field(None, ge=0.0, le=1.0, description="Confianza máxima mínima")
+    startDate: Optional[datetime] = Field(None, description="Activos desde (lastSeen >= startDate)")
+    endDate: Optional[datetime] = Field(None, description="Activos antes de (firstSeen < endDate)")
+    activeOnly: bool = Field(False, description="Solo incidentes que aún pueden recibir detecciones")
@@ -2,7 +2,7 @@
 Entidades Pydantic para WeatherData - Validación de API
 """
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 
 class WeatherDataBase(BaseModel):
@@ -62,12 +62,23 @@ class WeatherDataResponse(WeatherDataBase):
         from_attributes = True
         orm_mode = True
 
+class WeatherCurrentReading(WeatherDataResponse):
+    """Última lectura de un sensor, servida desde caché en memoria"""
+    createdAt: Optional[datetime] = Field(None, description="Fecha de registro en sistema")
+    ageSeconds: Optional[float] = Field(None, description="Segundos transcurridos desde el timestamp")
+    stale: bool = Field(..., description="Si supera la antigüedad máxima configurada")
+
+class WeatherCurrentList(BaseModel):
+    """Condiciones actuales de todos los sensores"""
+    readings: List[WeatherCurrentReading] = Field(..., description="Última lectura por sensorId")
+    staleAfterSeconds: float = Field(..., description="Antigüedad a partir de la cual una entrada es stale")
+
 class WeatherDataList(BaseModel):
-    """Modelo para lista de datos meteorológicos con paginación"""
+    """Modelo para lista de datos meteorológicos con paginación keyset"""
     weatherData: List[WeatherDataResponse] = Field(..., description="Lista de registros meteorológicos")
-    totalCount: int = Field(..., description="Total de registros")
-    page: int = Field(default=1, description="Página actual")
+    totalCount: Optional[int] = Field(None, description="Total de registros con los filtros, solo si se solicita")
     pageSize: int = Field(default=10, description="Elementos por página")
+    nextCursor: Optional[str] = Field(None, description="Cursor para la página siguiente, nulo en la última")
 
 class WeatherDataFilter(BaseModel):
     """Modelo para filtros de búsqueda de datos meteorológicos"""
@@ -81,6 +92,7 @@ class WeatherDataFilter(BaseModel):
 
 class WeatherSummary(BaseModel):
     """Resumen estadístico de datos meteorológicos"""
+    sensorId: Optional[str] = Field(None, description="Sensor resumido, nulo si abarca todos")
     avgTemperature: Optional[float] = Field(None, description="Temperatura promedio")
     maxTemperature: Optional[float] = Field(None, description="Temperatura máxima")
     minTemperature: Optional[float] = Field(None, description="Temperatura mínima")
@@ -89,4 +101,45 @@ class WeatherSummary(BaseModel):
     totalRainfall: Optional[float] = Field(None, description="Precipitación total")
     recordCount: int = Field(..., description="Número de registros analizados")
     periodStart: datetime = Field(..., description="Inicio del período")
-    periodEnd: datetime = Field(..., description="Fin del período")
\ No newline at end of file
+    periodEnd: datetime = Field(..., description="Fin del período")
+
+class FireWeatherDay(BaseModel):
+    """Índices de peligro de incendio de un sensor en un día"""
+    sensorId: str
+    day: datetime = Field(..., description="Inicio del día")
+    temperature: Optional[float] = Field(None, description="Temperatura al mediodía (°C)")
+    humidity: Optional[float] = Field(None, description="Humedad relativa al mediodía (%)")
+    windSpeed: Optional[float] = Field(None, description="Viento al mediodía (km/h)")
+    rainfall: Optional[float] = Field(None, description="Lluvia del día (mm)")
+    ffmc: Optional[float] = Field(None, description="Fine Fuel Moisture Code")
+    dmc: Optional[float] = Field(None, description="Duff Moisture Code")
+    dc: Optional[float] = Field(None, description="Drought Code")
+    isi: Optional[float] = Field(None, description="Initial Spread Index")
+    bui: Optional[float] = Field(None, description="Buildup Index")
+    fwi: Optional[float] = Field(None, description="Fire Weather Index")
+    ffwi: Optional[float] = Field(None, description="Fosberg FFWI al mediodía (0-100)")
+    ffwiMax: Optional[float] = Field(None, description="Fosberg FFWI máximo horario del día")
+    dangerClass: Optional[str] = Field(None, description="Clase de peligro según FWI: low, moderate, high, very_high, extreme")
+
+class FireWeatherList(BaseModel):
+    """Índices diarios por sensor"""
+    days: List[FireWeatherDay] = Field(..., description="Ordenados por sensor y día")
+    count: int = Field(..., description="Número de días retornados")
+    recomputedDays: int = Field(..., description="Días (sensor, día) recalculados en esta consulta")
+
+class WeatherSeries(BaseModel):
+    """Serie remuestreada de un sensor, alineada con WeatherSeriesList.timestamps"""
+    sensorId: str
+    count: List[int] = Field(..., description="Lecturas que cayeron en cada bucket")
+    values: Dict[str, List[Optional[float]]] = Field(..., description="Un arreglo por campo; null donde no hay dato ni relleno")
+
+class WeatherSeriesList(BaseModel):
+    """Series meteorológicas en una grilla de intervalo fijo, en formato columnar"""
+    interval: str = Field(..., description="1m, 5m o 1h")
+    intervalSeconds: int
+    aggregation: str = Field(..., description="mean, min, max o last")
+    fill: str = Field(..., description="none, ffill o linear")
+    start: datetime = Field(..., description="Inicio del primer bucket, alineado al intervalo")
+    fields: List[str]
+    timestamps: List[int] = Field(..., description="Inicio de cada bucket en segundos epoch")
+    series: List[WeatherSeries] = Field(..., description="Una serie por sensor, ordenadas por sensorId")
@@ -0,0 +1,33 @@
+"""
+Exportar servicios de dominio
+"""
+from .correlation_engine import (
+    DetectionColumns, WeatherColumns, CorrelationOutput,
+    asofJoinNearest, asofJoinBySensor, computeRiskScores, correlate,
+    datetimesToEpoch, toFloatArray, factorize, riskLevelFor, scoreDetections,
+    RISK_LEVEL_THRESHOLDS, RECOMMENDATIONS
+)
+from .incident_tracker import IncidentTracker, IncidentMatch, bboxCorners, iouAgainst
+from .hotspot_detector import (
+    HotspotColumns, detectHotspots, detectFrameHotspots, frameFromBuffer, rawThreshold, FRAME_DTYPES
+)
+from .fire_weather import (
+    FireWeatherState, FireWeatherColumns, computeFireWeather, fosbergIndex, dangerClassFor,
+    ffmcStep, dmcStep, dcStep, initialSpreadIndex, buildupIndex, fireWeatherIndex, FWI_DANGER_CLASSES
+)
+from .time_series import (
+    resampleColumns, aggregateBuckets, fillGaps, alignGrid, rowsToLists,
+    SERIES_INTERVALS, SERIES_AGGREGATIONS, SERIES_FILLS
+)
+
+__all__ = [
+    "DetectionColumns", "WeatherColumns", "CorrelationOutput",
+    "asofJoinNearest", "asofJoinBySensor", "computeRiskScores", "correlate",
+    "datetimesToEpoch", "toFloatArray", "factorize", "riskLevelFor", "scoreDetections",
+    "RISK_LEVEL_THRESHOLDS", "RECOMMENDATIONS",
+    "IncidentTracker", "IncidentMatch", "bboxCorners", "iouAgainst",
+    "HotspotColumns", "detectHotspots", "detectFrameHotspots", "frameFromBuffer", "rawThreshold", "FRAME_DTYPES",
+    "FireWeatherState", "FireWeatherColumns", "computeFireWeather", "fosbergIndex", "dangerClassFor",
+    "ffmcStep", "dmcStep", "dcStep", "initialSpreadIndex", "buildupIndex", "fireWeatherIndex", "FWI_DANGER_CLASSES",
+    "resampleColumns", "aggregateBuckets", "fillGaps", "alignGrid", "rowsToLists", "SERIES_INTERVALS", "SERIES_AGGREGATIONS", "SERIES_FILLS"
+]
@@ -0,0 +1,324 @@
+"""
+Motor de correlación detección-clima vectorizado con NumPy
+
+Cada detección se une con la lectura meteorológica más cercana en el tiempo
+(as-of join por sensor) y se calcula un puntaje de riesgo a partir de la
+confianza de la detección, humedad, viento y temperatura. Todas las
+operaciones son columnares: no hay ciclos de Python por fila.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+
+# Peso de cada tipo de detección en el riesgo de incendio
+DETECTION_TYPE_WEIGHTS = {
+    "fire": 1.0,
+    "smoke": 0.8,
+    "person": 0.3,
+    "vehicle": 0.3,
+    "animal": 0.2
+}
+DEFAULT_TYPE_WEIGHT = 0.2
+
+# Factor meteorológico neutro cuando no hay lectura cercana
+NEUTRAL_WEATHER_FACTOR = 0.5
+
+# Umbrales de puntaje para cada nivel de riesgo (límite inferior)
+RISK_LEVEL_THRESHOLDS = [
+    (0.8, "critical"),
+    (0.6, "high"),
+    (0.3, "medium"),
+    (0.0, "low")
+]
+
+RECOMMENDATIONS = {
+    "critical": "Activar protocolo de emergencia y despachar brigada al sector detectado",
+    "high": "Verificar visualmente el sector detectado y alertar a la brigada",
+    "medium": "Aumentar vigilancia en sector detectado",
+    "low": "Mantener monitoreo normal"
+}
+
+def datetimesToEpoch(values: Sequence[datetime]) -> np.ndarray:
+    """
+    Convertir una secuencia de datetime en segundos epoch como float64
+    """
+    if len(values) == 0:
+        return np.empty(0, dtype=np.float64)
+    return np.array(values, dtype="datetime64[us]").astype(np.int64) / 1e6
+
+def toFloatArray(values: Sequence[Optional[float]]) -> np.ndarray:
+    """
+    Convertir valores opcionales en float64, None se convierte en NaN
+    """
+    return np.array(values, dtype=np.float64) if len(values) else np.empty(0, dtype=np.float64)
+
+def factorize(values: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Codificar una columna de texto como (códigos int32, categorías)
+    Ordenar y comparar enteros es mucho más rápido que hacerlo sobre objetos str
+    """
+    lookup: Dict[str, int] = {}
+    codes = np.fromiter((lookup.setdefault(value, len(lookup)) for value in values), dtype=np.int32, count=len(values))
+    return codes, np.array(list(lookup), dtype=object)
+
+@dataclass
+class DetectionColumns:
+    """Ventana de detecciones en formato columnar, texto codificado con factorize"""
+    ids: np.ndarray
+    times: np.ndarray           # segundos epoch
+    cameraCodes: np.ndarray     # índices sobre cameras
+    cameras: np.ndarray
+    typeCodes: np.ndarray       # índices sobre detectionTypes
+    detectionTypes: np.ndarray
+    confidence: np.ndarray
+    
+    def __len__(self):
+        return len(self.ids)
+
+@dataclass
+class WeatherColumns:
+    """Ventana de lecturas meteorológicas en formato columnar"""
+    times: np.ndarray           # segundos epoch
+    sensorCodes: np.ndarray     # índices sobre sensors
+    sensors: np.ndarray
+    temperature: np.ndarray
+    humidity: np.ndarray
+    windSpeed: np.ndarray
+    
+    def __len__(self):
+        return len(self.times)
+
+@dataclass
+class CorrelationOutput:
+    """Resultado por detección y agregado de la ventana"""
+    riskScores: np.ndarray
+    weatherIndex: np.ndarray   # posición de la lectura unida, -1 si no hubo
+    riskLevel: str
+    confidence: float
+    factors: Dict = field(default_factory=dict)
+    recommendation: str = RECOMMENDATIONS["low"]
+
+def asofJoinNearest(leftTimes: np.ndarray, rightTimes: np.ndarray, maxGapSeconds: float) -> np.ndarray:
+    """
+    Para cada tiempo de la izquierda, índice del tiempo más cercano de la derecha
+    rightTimes debe estar ordenado; retorna -1 cuando la distancia supera maxGapSeconds
+    """
+    size = len(rightTimes)
+    if size == 0:
+        return np.full(len(leftTimes), -1, dtype=np.int64)
+    
+    position = np.searchsorted(rightTimes, leftTimes)
+    previous = np.clip(position - 1, 0, size - 1)
+    following = np.clip(position, 0, size - 1)
+    previousGap = np.abs(leftTimes - rightTimes[previous])
+    followingGap = np.abs(rightTimes[following] - leftTimes)
+    
+    nearest = np.where(followingGap < previousGap, following, previous).astype(np.int64)
+    nearest[np.minimum(previousGap, followingGap) > maxGapSeconds] = -1
+    return nearest
+
+def asofJoinBySensor(
+    detections: DetectionColumns,
+    weather: WeatherColumns,
+    cameraSensorMap: Optional[Dict[str, str]] = None,
+    sensorId: Optional[str] = None,
+    maxGapSeconds: float = 1800.0
+) -> np.ndarray:
+    """
+    As-of join por sensor: cada detección se une con la lectura más cercana del sensor
+    asignado a su cámara; sin sensor asignado se usa la lectura más cercana de cualquiera
+    Retorna índices sobre las columnas originales de weather, -1 si no hubo lectura
+    """
+    result = np.full(len(detections), -1, dtype=np.int64)
+    if len(detections) == 0 or len(weather) == 0:
+        return result
+    
+    # Código de sensor objetivo por detección, -1 significa cualquier sensor
+    sensorCodeOf = {str(sensor): code for code, sensor in enumerate(weather.sensors)}
+    if sensorId is not None:
+        targetCodes = np.full(len(detections), sensorCodeOf.get(sensorId, -2), dtype=np.int64)
+    elif cameraSensorMap:
+        cameraTargets = np.array([
+            sensorCodeOf.get(cameraSensorMap[str(camera)], -2) if str(camera) in cameraSensorMap else -1
+            for camera in detections.cameras
+        ], dtype=np.int64)
+        targetCodes = cameraTargets[detections.cameraCodes]
+    else:
+        targetCodes = np.full(len(detections), -1, dtype=np.int64)
+    
+    # Ordenar lecturas por (sensor, tiempo) para tener cada sensor en un bloque contiguo
+    order = np.lexsort((weather.times, weather.sensorCodes))
+    sortedCodes = weather.sensorCodes[order]
+    sortedTimes = weather.times[order]
+    
+    # Un ciclo por sensor distinto (decenas), nunca por fila; -2 es un sensor sin lecturas
+    for target in np.unique(targetCodes):
+        if target == -2:
+            continue
+        mask = targetCodes == target
+        if target == -1:
+            timeOrder = np.argsort(weather.times, kind="stable")
+            nearest = asofJoinNearest(detections.times[mask], weather.times[timeOrder], maxGapSeconds)
+            result[mask] = np.where(nearest >= 0, timeOrder[np.maximum(nearest, 0)], -1)
+            continue
+        
+        start = np.searchsorted(sortedCodes, target, side="left")
+        end = np.searchsorted(sortedCodes, target, side="right")
+        nearest = asofJoinNearest(detections.times[mask], sortedTimes[start:end], maxGapSeconds)
+        result[mask] = np.where(nearest >= 0, order[start + np.maximum(nearest, 0)], -1)
+    
+    return result
+
+def computeWeatherFactor(temperature: np.ndarray, humidity: np.ndarray, windSpeed: np.ndarray) -> np.ndarray:
+    """
+    Factor meteorológico entre 0 y 1: aire seco, viento fuerte y calor lo elevan
+    Las variables faltantes (NaN) aportan un valor neutro
+    """
+    humidityFactor = np.clip((70.0 - humidity) / 60.0, 0.0, 1.0)
+    windFactor = np.clip(windSpeed / 40.0, 0.0, 1.0)
+    temperatureFactor = np.clip((temperature - 10.0) / 30.0, 0.0, 1.0)
+    
+    humidityFactor = np.where(np.isnan(humidityFactor), NEUTRAL_WEATHER_FACTOR, humidityFactor)
+    windFactor = np.where(np.isnan(windFactor), NEUTRAL_WEATHER_FACTOR, windFactor)
+    temperatureFactor = np.where(np.isnan(temperatureFactor), NEUTRAL_WEATHER_FACTOR, temperatureFactor)
+    
+    return 0.45 * humidityFactor + 0.30 * windFactor + 0.25 * temperatureFactor
+
+def computeRiskScores(
+    confidence: np.ndarray,
+    typeCodes: np.ndarray,
+    detectionTypes: np.ndarray,
+    temperature: np.ndarray,
+    humidity: np.ndarray,
+    windSpeed: np.ndarray
+) -> np.ndarray:
+    """
+    Puntaje de riesgo por detección entre 0 y 1
+    """
+    weightByCode = np.array([DETECTION_TYPE_WEIGHTS.get(str(t), DEFAULT_TYPE_WEIGHT) for t in detectionTypes])
+    typeWeights = weightByCode[typeCodes] if len(weightByCode) else np.empty(0)
+    weatherFactor = computeWeatherFactor(temperature, humidity, windSpeed)
+    return confidence * typeWeights * (0.5 + 0.5 * weatherFactor)
+
+def scoreDetections(
+    confidence: Sequence[float],
+    detectionTypes: Sequence[str],
+    temperature: Sequence[Optional[float]],
+    humidity: Sequence[Optional[float]],
+    windSpeed: Sequence[Optional[float]]
+) -> np.ndarray:
+    """
+    Puntaje de riesgo de detecciones recién ingeridas con su lectura meteorológica ya resuelta
+    Sin lectura (None) se usa el factor neutro, igual que en correlate
+    """
+    typeCodes, types = factorize(detectionTypes)
+    return computeRiskScores(
+        toFloatArray(confidence), typeCodes, types,
+        toFloatArray(temperature), toFloatArray(humidity), toFloatArray(windSpeed)
+    )
+
+def riskLevelFor(score: float) -> str:
+    """
+    Nivel de riesgo correspondiente a un puntaje
+    """
+    for threshold, level in RISK_LEVEL_THRESHOLDS:
+        if score >= threshold:
+            return level
+    return "low"
+
+def describeWeather(weatherFactor: float) -> str:
+    """
+    Descripción cualitativa del factor meteorológico
+    """
+    if np.isnan(weatherFactor):
+        return "unknown"
+    if weatherFactor >= 0.6:
+        return "favorable_for_fire"
+    if weatherFactor >= 0.35:
+        return "moderate"
+    return "unfavorable_for_fire"
+
+def roundOrNone(value: float, digits: int = 2) -> Optional[float]:
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+def correlate(
+    detections: DetectionColumns,
+    weather: WeatherColumns,
+    cameraSensorMap: Optional[Dict[str, str]] = None,
+    sensorId: Optional[str] = None,
+    maxGapSeconds: float = 1800.0
+) -> CorrelationOutput:
+    """
+    Ejecutar la correlación completa sobre una ventana de datos
+    """
+    count = len(detections)
+    if count == 0:
+        return CorrelationOutput(
+            riskScores=np.empty(0),
+            weatherIndex=np.empty(0, dtype=np.int64),
+            riskLevel="low",
+            confidence=0.0,
+            factors={
+                "thermalDetection": False,
+                "detectionCount": 0,
+                "matchedWeatherCount": 0,
+                "weatherReadingCount": len(weather)
+            },
+            recommendation="Sin detecciones en la ventana; " + RECOMMENDATIONS["low"].lower()
+        )
+    
+    weatherIndex = asofJoinBySensor(detections, weather, cameraSensorMap, sensorId, maxGapSeconds)
+    matched = weatherIndex >= 0
+    safeIndex = np.maximum(weatherIndex, 0)
+    
+    def joined(column: np.ndarray) -> np.ndarray:
+        if len(column) == 0:
+            return np.full(count, np.nan)
+        return np.where(matched, column[safeIndex], np.nan)
+    
+    temperature = joined(weather.temperature)
+    humidity = joined(weather.humidity)
+    windSpeed = joined(weather.windSpeed)
+    
+    riskScores = computeRiskScores(
+        detections.confidence, detections.typeCodes, detections.detectionTypes,
+        temperature, humidity, windSpeed
+    )
+    top = int(np.argmax(riskScores))
+    maxScore = float(riskScores[top])
+    riskLevel = riskLevelFor(maxScore)
+    
+    # La confianza del análisis baja a la mitad si la detección principal no tiene clima asociado
+    confidence = float(detections.confidence[top]) * (1.0 if matched[top] else 0.5)
+    
+    typeCounts = np.bincount(detections.typeCodes, minlength=len(detections.detectionTypes))
+    thermalCodes = [code for code, t in enumerate(detections.detectionTypes) if t in ("fire", "smoke")]
+    weatherFactor = computeWeatherFactor(temperature[matched], humidity[matched], windSpeed[matched])
+    
+    factors = {
+        "thermalDetection": bool(typeCounts[thermalCodes].sum() > 0),
+        "detectionCount": count,
+        "detectionsByType": {str(t): int(n) for t, n in zip(detections.detectionTypes, typeCounts)},
+        "matchedWeatherCount": int(matched.sum()),
+        "weatherReadingCount": len(weather),
+        "maxRiskScore": round(maxScore, 4),
+        "meanRiskScore": round(float(riskScores.mean()), 4),
+        "highRiskCount": int((riskScores >= 0.6).sum()),
+        "weatherConditions": describeWeather(float(weatherFactor.mean()) if len(weatherFactor) else np.nan),
+        "topDetectionId": int(detections.ids[top]),
+        "topCameraId": str(detections.cameras[detections.cameraCodes[top]]),
+        "topDetectionType": str(detections.detectionTypes[detections.typeCodes[top]]),
+        "temperature": roundOrNone(temperature[top]),
+        "humidity": roundOrNone(humidity[top]),
+        "windSpeed": roundOrNone(windSpeed[top])
+    }
+    
+    return CorrelationOutput(
+        riskScores=riskScores,
+        weatherIndex=weatherIndex,
+        riskLevel=riskLevel,
+        confidence=round(confidence, 4),
+        factors=factors,
+        recommendation=RECOMMENDATIONS[riskLevel]
+    )
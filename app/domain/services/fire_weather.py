@@ -0,0 +1,219 @@
+"""
+Índices de peligro de incendio a partir de series meteorológicas
+
+- Fosberg FFWI: humedad de equilibrio del combustible y viento, instantáneo (0-100)
+- Sistema canadiense FWI (Van Wagner 1987): códigos de humedad FFMC, DMC y DC que se
+  arrastran de un día al siguiente, y los índices ISI, BUI y FWI que dependen solo del día
+
+Las series van en matrices (días, sensores). Los códigos son recursivos en el tiempo:
+se avanza día por día con cada paso vectorizado sobre todos los sensores y el estado
+del último día calculado sirve de punto de partida para los días nuevos. ISI, BUI, FWI
+y FFWI se calculan sobre la matriz completa de una vez.
+
+Entradas del FWI por día: temperatura (°C), humedad relativa (%) y viento (km/h) al
+mediodía y lluvia acumulada del día (mm).
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import numpy as np
+
+# Valores iniciales estándar de los códigos al no haber días previos
+FFMC_START = 85.0
+DMC_START = 6.0
+DC_START = 15.0
+
+# Factor de duración del día por mes para DMC, según banda de latitud (cffdrs)
+DMC_DAY_LENGTH = (
+    (33.0, np.array([6.5, 7.5, 9.0, 12.8, 13.9, 13.9, 12.4, 10.9, 9.4, 8.0, 7.0, 6.0])),
+    (15.0, np.array([7.9, 8.4, 8.9, 9.5, 9.9, 10.2, 10.1, 9.7, 9.1, 8.6, 8.1, 7.8])),
+    (-15.0, np.full(12, 9.0)),
+    (-30.0, np.array([10.1, 9.6, 9.1, 8.5, 8.1, 7.8, 7.9, 8.3, 8.9, 9.4, 9.9, 10.2])),
+    (-90.0, np.array([11.5, 10.5, 9.2, 7.9, 6.8, 6.2, 6.5, 7.4, 8.7, 10.0, 11.2, 11.8]))
+)
+
+# Factor de duración del día por mes para DC, según banda de latitud (cffdrs)
+DC_DAY_LENGTH = (
+    (20.0, np.array([-1.6, -1.6, -1.6, 0.9, 3.8, 5.8, 6.4, 5.0, 2.4, 0.4, -1.6, -1.6])),
+    (-20.0, np.full(12, 1.4)),
+    (-90.0, np.array([6.4, 5.0, 2.4, 0.4, -1.6, -1.6, -1.6, -1.6, -1.6, 0.9, 3.8, 5.8]))
+)
+
+# Clases de peligro por FWI: (límite inferior, clase)
+FWI_DANGER_CLASSES = ((30.0, "extreme"), (20.0, "very_high"), (10.0, "high"), (5.0, "moderate"), (0.0, "low"))
+
+def dayLengthFactors(latitude: float, months: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Factores (DMC, DC) de cada mes (1-12) para la latitud"""
+    dmcTable = next(table for bound, table in DMC_DAY_LENGTH if latitude > bound or bound == -90.0)
+    dcTable = next(table for bound, table in DC_DAY_LENGTH if latitude > bound or bound == -90.0)
+    return dmcTable[months - 1], dcTable[months - 1]
+
+def ffmcStep(ffmc: np.ndarray, temperature: np.ndarray, humidity: np.ndarray, windSpeed: np.ndarray, rainfall: np.ndarray) -> np.ndarray:
+    """Fine Fuel Moisture Code del día a partir del día anterior"""
+    moisture = 147.2 * (101.0 - ffmc) / (59.5 + ffmc)
+    
+    # Humedecimiento por lluvia (más de 0.5 mm)
+    effectiveRain = np.maximum(rainfall - 0.5, 1e-9)
+    wetting = 42.5 * effectiveRain * np.exp(-100.0 / (251.0 - moisture)) * (1.0 - np.exp(-6.93 / effectiveRain))
+    saturated = 0.0015 * np.maximum(moisture - 150.0, 0.0) ** 2 * np.sqrt(effectiveRain)
+    moisture = np.where(rainfall > 0.5, np.minimum(moisture + wetting + saturated, 250.0), moisture)
+    
+    # Secado hacia la humedad de equilibrio o absorción desde el aire
+    relative = humidity / 100.0
+    drying = 0.942 * humidity ** 0.679 + 11.0 * np.exp((humidity - 100.0) / 10.0) + 0.18 * (21.1 - temperature) * (1.0 - np.exp(-0.115 * humidity))
+    wettingEquilibrium = 0.618 * humidity ** 0.753 + 10.0 * np.exp((humidity - 100.0) / 10.0) + 0.18 * (21.1 - temperature) * (1.0 - np.exp(-0.115 * humidity))
+    dryingRate = (0.424 * (1.0 - relative ** 1.7) + 0.0694 * np.sqrt(windSpeed) * (1.0 - relative ** 8)) * 0.581 * np.exp(0.0365 * temperature)
+    wettingRate = (0.424 * (1.0 - (1.0 - relative) ** 1.7) + 0.0694 * np.sqrt(windSpeed) * (1.0 - (1.0 - relative) ** 8)) * 0.581 * np.exp(0.0365 * temperature)
+    moisture = np.select(
+        [moisture > drying, moisture < wettingEquilibrium],
+        [drying + (moisture - drying) * 10.0 ** -dryingRate, wettingEquilibrium - (wettingEquilibrium - moisture) * 10.0 ** -wettingRate],
+        moisture
+    )
+    return np.clip(59.5 * (250.0 - moisture) / (147.2 + moisture), 0.0, 101.0)
+
+def dmcStep(dmc: np.ndarray, temperature: np.ndarray, humidity: np.ndarray, rainfall: np.ndarray, dayLength: np.ndarray) -> np.ndarray:
+    """Duff Moisture Code del día a partir del día anterior"""
+    drying = 1.894 * (np.maximum(temperature, -1.1) + 1.1) * (100.0 - humidity) * dayLength * 1e-4
+    
+    # Lluvia efectiva sobre 1.5 mm
+    effectiveRain = 0.92 * rainfall - 1.27
+    previousMoisture = 20.0 + 280.0 / np.exp(0.023 * dmc)
+    safeDmc = np.maximum(dmc, 1e-9)
+    slope = np.select(
+        [dmc <= 33.0, dmc <= 65.0],
+        [100.0 / (0.5 + 0.3 * dmc), 14.0 - 1.3 * np.log(safeDmc)],
+        6.2 * np.log(safeDmc) - 17.2
+    )
+    moisture = previousMoisture + 1000.0 * effectiveRain / (48.77 + slope * effectiveRain)
+    afterRain = np.maximum(43.43 * (5.6348 - np.log(np.maximum(moisture - 20.0, 1e-9))), 0.0)
+    return np.maximum(np.where(rainfall > 1.5, afterRain, dmc) + drying, 0.0)
+
+def dcStep(dc: np.ndarray, temperature: np.ndarray, rainfall: np.ndarray, dayLength: np.ndarray) -> np.ndarray:
+    """Drought Code del día a partir del día anterior"""
+    evaporation = np.maximum((0.36 * (np.maximum(temperature, -2.8) + 2.8) + dayLength) / 2.0, 0.0)
+    
+    # Lluvia efectiva sobre 2.8 mm
+    effectiveRain = 0.83 * rainfall - 1.27
+    moisture = 800.0 * np.exp(-dc / 400.0)
+    afterRain = np.maximum(dc - 400.0 * np.log(1.0 + 3.937 * np.maximum(effectiveRain, 0.0) / moisture), 0.0)
+    return np.where(rainfall > 2.8, afterRain, dc) + evaporation
+
+def initialSpreadIndex(ffmc: np.ndarray, windSpeed: np.ndarray) -> np.ndarray:
+    moisture = 147.2 * (101.0 - ffmc) / (59.5 + ffmc)
+    fuelFactor = 19.115 * np.exp(-0.1386 * moisture) * (1.0 + moisture ** 5.31 / 4.93e7)
+    return fuelFactor * np.exp(0.05039 * windSpeed)
+
+def buildupIndex(dmc: np.ndarray, dc: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        low = np.where(dmc + dc > 0, 0.8 * dc * dmc / (dmc + 0.4 * dc), 0.0)
+        high = dmc - (1.0 - 0.8 * dc / (dmc + 0.4 * dc)) * (0.92 + (0.0114 * dmc) ** 1.7)
+    return np.maximum(np.where(dmc <= 0.4 * dc, low, high), 0.0)
+
+def fireWeatherIndex(isi: np.ndarray, bui: np.ndarray) -> np.ndarray:
+    duffFactor = np.where(bui <= 80.0, 0.626 * bui ** 0.809 + 2.0, 1000.0 / (25.0 + 108.64 * np.exp(-0.023 * bui)))
+    intermediate = 0.1 * isi * duffFactor
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scaled = np.exp(2.72 * (0.434 * np.log(np.maximum(intermediate, 1.0))) ** 0.647)
+    return np.where(intermediate > 1.0, scaled, intermediate)
+
+def fosbergIndex(temperature: np.ndarray, humidity: np.ndarray, windSpeed: np.ndarray) -> np.ndarray:
+    """
+    Fosberg Fire Weather Index (0-100) con temperatura en °C y viento en km/h
+    La fórmula original usa °F y mph
+    """
+    fahrenheit = temperature * 9.0 / 5.0 + 32.0
+    mph = windSpeed / 1.609344
+    equilibrium = np.select(
+        [humidity < 10.0, humidity <= 50.0],
+        [0.03229 + 0.281073 * humidity - 0.000578 * humidity * fahrenheit, 2.22749 + 0.160107 * humidity - 0.01478 * fahrenheit],
+        21.0606 + 0.005565 * humidity ** 2 - 0.00035 * humidity * fahrenheit - 0.483199 * humidity
+    )
+    ratio = equilibrium / 30.0
+    damping = 1.0 - 2.0 * ratio + 1.5 * ratio ** 2 - 0.5 * ratio ** 3
+    return np.clip(damping * np.sqrt(1.0 + mph ** 2) / 0.3002, 0.0, 100.0)
+
+def dangerClassFor(fwi: Optional[float]) -> Optional[str]:
+    if fwi is None:
+        return None
+    return next(name for bound, name in FWI_DANGER_CLASSES if fwi >= bound)
+
+@dataclass
+class FireWeatherState:
+    """Códigos del último día calculado de cada sensor"""
+    ffmc: np.ndarray
+    dmc: np.ndarray
+    dc: np.ndarray
+    
+    @classmethod
+    def start(cls, sensors: int) -> "FireWeatherState":
+        return cls(np.full(sensors, FFMC_START), np.full(sensors, DMC_START), np.full(sensors, DC_START))
+
+@dataclass
+class FireWeatherColumns:
+    """Índices por (día, sensor); active marca las celdas calculadas"""
+    active: np.ndarray
+    ffmc: np.ndarray
+    dmc: np.ndarray
+    dc: np.ndarray
+    isi: np.ndarray
+    bui: np.ndarray
+    fwi: np.ndarray
+    ffwi: np.ndarray
+
+def computeFireWeather(
+    months: np.ndarray,
+    temperature: np.ndarray,
+    humidity: np.ndarray,
+    windSpeed: np.ndarray,
+    rainfall: np.ndarray,
+    startIndex: np.ndarray,
+    state: FireWeatherState,
+    latitude: float
+) -> Tuple[FireWeatherColumns, FireWeatherState]:
+    """
+    Avanzar los códigos de cada sensor desde su día startIndex con entradas (días, sensores)
+    Los días sin temperatura, humedad o viento no se calculan y el estado pasa intacto;
+    la lluvia faltante cuenta como 0. Retorna los índices y el estado al último día
+    """
+    days, sensors = temperature.shape
+    rainfall = np.nan_to_num(rainfall, nan=0.0)
+    active = (
+        (np.arange(days)[:, None] >= startIndex[None, :])
+        & np.isfinite(temperature) & np.isfinite(humidity) & np.isfinite(windSpeed)
+    )
+    dmcLength, dcLength = dayLengthFactors(latitude, months)
+    
+    # Los valores de celdas inactivas no importan: se sustituyen para no propagar NaN
+    safeTemperature = np.where(active, temperature, 0.0)
+    safeHumidity = np.clip(np.where(active, humidity, 50.0), 0.0, 100.0)
+    safeWind = np.maximum(np.where(active, windSpeed, 0.0), 0.0)
+    
+    ffmc = np.full((days, sensors), np.nan)
+    dmc = np.full((days, sensors), np.nan)
+    dc = np.full((days, sensors), np.nan)
+    current = FireWeatherState(state.ffmc.copy(), state.dmc.copy(), state.dc.copy())
+    for day in range(days):
+        mask = active[day]
+        if not mask.any():
+            continue
+        current.ffmc = np.where(mask, ffmcStep(current.ffmc, safeTemperature[day], safeHumidity[day], safeWind[day], rainfall[day]), current.ffmc)
+        current.dmc = np.where(mask, dmcStep(current.dmc, safeTemperature[day], safeHumidity[day], rainfall[day], dmcLength[day]), current.dmc)
+        current.dc = np.where(mask, dcStep(current.dc, safeTemperature[day], rainfall[day], dcLength[day]), current.dc)
+        ffmc[day], dmc[day], dc[day] = current.ffmc, current.dmc, current.dc
+    
+    # Índices sin memoria: una sola pasada sobre toda la matriz
+    isi = initialSpreadIndex(np.nan_to_num(ffmc), safeWind)
+    bui = buildupIndex(np.nan_to_num(dmc), np.nan_to_num(dc))
+    fwi = fireWeatherIndex(isi, bui)
+    ffwi = fosbergIndex(safeTemperature, safeHumidity, safeWind)
+    inactive = ~active
+    for values in (isi, bui, fwi, ffwi):
+        values[inactive] = np.nan
+    return FireWeatherColumns(active, ffmc, dmc, dc, isi, bui, fwi, ffwi), current
+
+def dailyMaxByIndex(values: np.ndarray, dayIndex: np.ndarray, sensorIndex: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+    """Máximo por (día, sensor) de valores sueltos, NaN donde no hay ninguno"""
+    result = np.full(shape, -np.inf)
+    valid = np.isfinite(values)
+    np.maximum.at(result, (dayIndex[valid], sensorIndex[valid]), values[valid])
+    result[np.isneginf(result)] = np.nan
+    return result
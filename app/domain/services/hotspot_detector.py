@@ -0,0 +1,192 @@
+"""
+Detección de puntos calientes en cuadros radiométricos crudos
+
+Un cuadro radiométrico es una matriz de temperaturas codificadas (por ejemplo uint16
+en centésimas de Kelvin: °C = valor * 0.01 - 273.15). Un punto caliente es un grupo
+de píxeles conectados (8-vecindad) que superan el umbral.
+
+Todo es vectorizado: el umbral se compara en unidades crudas (no se convierte el
+cuadro completo a °C), los píxeles calientes se agrupan en tramos horizontales por
+fila y los tramos que se tocan entre filas consecutivas se unen con propagación de
+etiquetas sobre arreglos. El costo depende de los píxeles calientes, no de un
+recorrido píxel a píxel en Python.
+"""
+from dataclasses import dataclass
+from typing import List, Tuple
+import math
+import numpy as np
+
+# Codificaciones aceptadas para el cuadro (little-endian)
+FRAME_DTYPES = {"uint16": np.dtype("<u2"), "float32": np.dtype("<f4")}
+
+# Grados sobre el umbral con los que la confianza llega a 1.0 (en el umbral es 0.5)
+CONFIDENCE_SPAN_CELSIUS = 100.0
+
+@dataclass
+class HotspotColumns:
+    """Puntos calientes de un cuadro en columnas NumPy, temperaturas en unidades crudas"""
+    x: np.ndarray
+    y: np.ndarray
+    width: np.ndarray
+    height: np.ndarray
+    pixels: np.ndarray
+    peak: np.ndarray
+    mean: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.x)
+
+def frameFromBuffer(buffer, width: int, height: int, dtype: str = "uint16") -> np.ndarray:
+    """
+    Vista (height, width) sobre el buffer sin copiarlo
+    Lanza ValueError si el tamaño no corresponde a las dimensiones
+    """
+    frameDtype = FRAME_DTYPES[dtype]
+    expected = width * height * frameDtype.itemsize
+    if memoryview(buffer).nbytes < expected:
+        raise ValueError(f"El cuadro debe tener {expected} bytes ({width}x{height} {dtype})")
+    return np.frombuffer(buffer, dtype=frameDtype, count=width * height).reshape(height, width)
+
+def rawThreshold(frameDtype: np.dtype, thresholdCelsius: float, scale: float, offset: float):
+    """
+    Umbral en unidades crudas: valor * scale + offset >= umbral  ⇔  valor >= (umbral - offset) / scale
+    En enteros se redondea hacia arriba y se acota al rango del tipo para comparar sin convertir el cuadro
+    """
+    threshold = (thresholdCelsius - offset) / scale
+    if frameDtype.kind != "u":
+        return frameDtype.type(threshold)
+    limits = np.iinfo(frameDtype)
+    return frameDtype.type(min(max(math.ceil(threshold), limits.min), limits.max))
+
+def findRuns(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Tramos horizontales de True: (fila, inicio, fin exclusivo) en orden de filas"""
+    height, width = mask.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return rows, starts, ends
+
+def labelRuns(rows: np.ndarray, starts: np.ndarray, ends: np.ndarray, width: int) -> np.ndarray:
+    """
+    Etiqueta de componente de cada tramo (8-vecindad)
+    Los tramos de la fila anterior que tocan a cada tramo forman un intervalo contiguo,
+    que se ubica con searchsorted sobre posiciones globales fila * (width + 2) + columna
+    """
+    count = len(rows)
+    labels = np.arange(count)
+    if count < 2:
+        return labels
+    stride = width + 2
+    globalStarts = rows * stride + starts
+    globalEnds = rows * stride + ends
+    previousRow = (rows - 1) * stride
+    first = np.searchsorted(globalEnds, previousRow + starts - 1, side="right")
+    last = np.searchsorted(globalStarts, previousRow + ends + 1, side="left")
+    counts = np.clip(last - first, 0, None)
+    total = int(counts.sum())
+    if total == 0:
+        return labels
+    
+    # Pares (tramo, tramo de arriba que lo toca)
+    below = np.repeat(np.arange(count), counts)
+    above = np.repeat(first, counts) + (np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts))
+    
+    # Unir raíces hacia la etiqueta menor y comprimir caminos hasta que no cambie nada
+    while True:
+        labelBelow, labelAbove = labels[below], labels[above]
+        low = np.minimum(labelBelow, labelAbove)
+        high = np.maximum(labelBelow, labelAbove)
+        pending = low != high
+        if not pending.any():
+            return labels
+        np.minimum.at(labels, high[pending], low[pending])
+        while True:
+            compressed = labels[labels]
+            if np.array_equal(compressed, labels):
+                break
+            labels = compressed
+
+def detectHotspots(frame: np.ndarray, threshold, minPixels: int = 4, maxHotspots: int = 20) -> HotspotColumns:
+    """
+    Componentes conectadas de frame >= threshold (unidades crudas) con al menos minPixels,
+    ordenadas por temperatura máxima descendente y limitadas a maxHotspots
+    """
+    height, width = frame.shape
+    mask = frame >= threshold
+    rows, starts, ends = findRuns(mask)
+    if len(rows) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return HotspotColumns(empty, empty, empty, empty, empty, np.zeros(0), np.zeros(0))
+    
+    # Temperaturas de los píxeles calientes en el mismo orden que los tramos
+    lengths = ends - starts
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    values = frame[mask]
+    runPeaks = np.maximum.reduceat(values, offsets).astype(np.float64)
+    runSums = np.add.reduceat(values.astype(np.float64), offsets)
+    
+    _, component = np.unique(labelRuns(rows, starts, ends, width), return_inverse=True)
+    componentCount = int(component.max()) + 1
+    pixels = np.bincount(component, weights=lengths, minlength=componentCount).astype(np.int64)
+    sums = np.bincount(component, weights=runSums, minlength=componentCount)
+    peaks = np.full(componentCount, -np.inf)
+    np.maximum.at(peaks, component, runPeaks)
+    left = np.full(componentCount, width, dtype=np.int64)
+    np.minimum.at(left, component, starts)
+    right = np.zeros(componentCount, dtype=np.int64)
+    np.maximum.at(right, component, ends)
+    top = np.full(componentCount, height, dtype=np.int64)
+    np.minimum.at(top, component, rows)
+    bottom = np.zeros(componentCount, dtype=np.int64)
+    np.maximum.at(bottom, component, rows)
+    
+    keep = np.nonzero(pixels >= minPixels)[0]
+    keep = keep[np.argsort(-peaks[keep], kind="stable")][:maxHotspots]
+    return HotspotColumns(
+        x=left[keep],
+        y=top[keep],
+        width=right[keep] - left[keep],
+        height=bottom[keep] - top[keep] + 1,
+        pixels=pixels[keep],
+        peak=peaks[keep],
+        mean=sums[keep] / pixels[keep]
+    )
+
+def hotspotConfidence(peakCelsius: float, thresholdCelsius: float) -> float:
+    """0.5 en el umbral, crece linealmente hasta 1.0 a CONFIDENCE_SPAN_CELSIUS grados por encima"""
+    return min(1.0, 0.5 + 0.5 * max(0.0, peakCelsius - thresholdCelsius) / CONFIDENCE_SPAN_CELSIUS)
+
+def detectFrameHotspots(
+    buffer,
+    width: int,
+    height: int,
+    dtype: str = "uint16",
+    scale: float = 0.01,
+    offset: float = -273.15,
+    thresholdCelsius: float = 60.0,
+    minPixels: int = 4,
+    maxHotspots: int = 20
+) -> List[dict]:
+    """
+    Puntos calientes de un cuadro crudo con bbox, píxeles y temperaturas en °C
+    Se ejecuta en los procesos del pool: recibe y retorna solo tipos simples
+    """
+    frame = frameFromBuffer(buffer, width, height, dtype)
+    hotspots = detectHotspots(frame, rawThreshold(frame.dtype, thresholdCelsius, scale, offset), minPixels, maxHotspots)
+    peaks = hotspots.peak * scale + offset
+    means = hotspots.mean * scale + offset
+    return [
+        {
+            "bboxX": int(hotspots.x[index]),
+            "bboxY": int(hotspots.y[index]),
+            "bboxWidth": int(hotspots.width[index]),
+            "bboxHeight": int(hotspots.height[index]),
+            "pixels": int(hotspots.pixels[index]),
+            "peakTemperature": round(float(peaks[index]), 2),
+            "meanTemperature": round(float(means[index]), 2),
+            "confidence": round(hotspotConfidence(float(peaks[index]), thresholdCelsius), 4)
+        }
+        for index in range(len(hotspots))
+    ]
@@ -0,0 +1,170 @@
+"""
+Seguimiento incremental de incidentes: agrupa detecciones consecutivas de una cámara
+
+Un incendio visto por una cámara genera una detección por cuadro. Cada detección
+nueva se enlaza con un incidente abierto de la misma (cameraId, detectionType) si
+su bbox se superpone (IoU) con el último bbox del incidente y el salto de tiempo no
+supera el umbral; si no, abre un incidente nuevo.
+
+El estado por (cameraId, detectionType) son arreglos NumPy compactos de los
+incidentes abiertos; comparar contra todos es una operación vectorizada. Los IDs
+los asigna la base: el tracker no persiste nada por sí mismo. Cada ingesta arma
+uno propio con los incidentes abiertos que lee de la base dentro de su transacción,
+así ningún estado de un worker queda desfasado de la base ni de otros workers.
+"""
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional, Tuple
+import numpy as np
+
+# Capacidad inicial de los arreglos por llave, se duplica al llenarse
+INITIAL_CAPACITY = 4
+
+@dataclass(frozen=True)
+class IncidentMatch:
+    """Resultado de match(): incidente abierto o None si hay que crear uno"""
+    incidentId: Optional[int]
+    iou: float = 0.0
+
+def bboxCorners(x: Optional[int], y: Optional[int], width: Optional[int], height: Optional[int]) -> Optional[Tuple[float, float, float, float]]:
+    """(x1, y1, x2, y2) o None si la detección no trae bbox completo"""
+    if x is None or y is None or width is None or height is None:
+        return None
+    return (float(x), float(y), float(x + width), float(y + height))
+
+def iouAgainst(boxes: np.ndarray, box: Tuple[float, float, float, float]) -> np.ndarray:
+    """IoU de un bbox contra una matriz (n, 4) de bboxes"""
+    x1 = np.maximum(boxes[:, 0], box[0])
+    y1 = np.maximum(boxes[:, 1], box[1])
+    x2 = np.minimum(boxes[:, 2], box[2])
+    y2 = np.minimum(boxes[:, 3], box[3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    union = areas + (box[2] - box[0]) * (box[3] - box[1]) - intersection
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(union > 0, intersection / union, 0.0)
+
+class OpenIncidents:
+    """
+    Incidentes abiertos de una (cameraId, detectionType): IDs, último instante y último bbox
+    Un bbox NaN indica que la última detección no traía bbox
+    """
+    __slots__ = ("ids", "lastSeen", "boxes", "size")
+    
+    def __init__(self):
+        self.ids = np.zeros(INITIAL_CAPACITY, dtype=np.int64)
+        self.lastSeen = np.zeros(INITIAL_CAPACITY, dtype=np.float64)
+        self.boxes = np.full((INITIAL_CAPACITY, 4), np.nan, dtype=np.float32)
+        self.size = 0
+    
+    def append(self, incidentId: int, epoch: float, box: Optional[Tuple[float, float, float, float]]):
+        if self.size == len(self.ids):
+            capacity = len(self.ids) * 2
+            self.ids = np.resize(self.ids, capacity)
+            self.lastSeen = np.resize(self.lastSeen, capacity)
+            self.boxes = np.resize(self.boxes, (capacity, 4))
+        self.ids[self.size] = incidentId
+        self.lastSeen[self.size] = epoch
+        self.boxes[self.size] = box if box is not None else np.nan
+        self.size += 1
+    
+    def keep(self, mask: np.ndarray):
+        """Conservar solo las posiciones indicadas (compacta al inicio de los arreglos)"""
+        count = int(mask.sum())
+        self.ids[:count] = self.ids[:self.size][mask]
+        self.lastSeen[:count] = self.lastSeen[:self.size][mask]
+        self.boxes[:count] = self.boxes[:self.size][mask]
+        self.size = count
+
+class IncidentTracker:
+    """
+    Estado de incidentes abiertos por (cameraId, detectionType) durante una ingesta
+    """
+    
+    def __init__(self, iouThreshold: float = 0.3, maxGapSeconds: float = 120.0, maxOpenPerKey: int = 64):
+        self.iouThreshold = iouThreshold
+        self.maxGapSeconds = maxGapSeconds
+        self.maxOpenPerKey = maxOpenPerKey
+        self._open: Dict[Hashable, OpenIncidents] = {}
+        self._positions: Dict[int, Hashable] = {}
+    
+    @property
+    def openCount(self) -> int:
+        return sum(state.size for state in self._open.values())
+    
+    def _expire(self, state: OpenIncidents, epoch: float):
+        """Cerrar los incidentes cuyo último instante quedó fuera de la ventana"""
+        if state.size == 0:
+            return
+        alive = epoch - state.lastSeen[:state.size] <= self.maxGapSeconds
+        if not alive.all():
+            for incidentId in state.ids[:state.size][~alive]:
+                self._positions.pop(int(incidentId), None)
+            state.keep(alive)
+    
+    def match(self, key: Hashable, epoch: float, box: Optional[Tuple[float, float, float, float]]) -> IncidentMatch:
+        """
+        Incidente abierto al que pertenece una detección, o IncidentMatch(None) si es nueva
+        Sin bbox se enlaza con el incidente visto más recientemente dentro de la ventana
+        """
+        state = self._open.get(key)
+        if state is None or state.size == 0:
+            return IncidentMatch(None)
+        self._expire(state, epoch)
+        if state.size == 0:
+            return IncidentMatch(None)
+        
+        gaps = np.abs(epoch - state.lastSeen[:state.size])
+        candidates = gaps <= self.maxGapSeconds
+        if box is None:
+            if not candidates.any():
+                return IncidentMatch(None)
+            index = int(np.argmin(np.where(candidates, gaps, np.inf)))
+            return IncidentMatch(int(state.ids[index]))
+        
+        boxes = state.boxes[:state.size]
+        withBox = ~np.isnan(boxes[:, 0])
+        ious = np.where(withBox, iouAgainst(np.nan_to_num(boxes), box), 0.0)
+        # Un incidente cuya última detección no traía bbox acepta cualquier bbox
+        ious = np.where(withBox, ious, self.iouThreshold)
+        ious = np.where(candidates, ious, -1.0)
+        index = int(np.argmax(ious))
+        if ious[index] < self.iouThreshold:
+            return IncidentMatch(None)
+        return IncidentMatch(int(state.ids[index]), float(ious[index]))
+    
+    def open(self, key: Hashable, incidentId: int, epoch: float, box: Optional[Tuple[float, float, float, float]]):
+        """Registrar un incidente recién creado en la base"""
+        state = self._open.get(key)
+        if state is None:
+            state = self._open[key] = OpenIncidents()
+        if state.size >= self.maxOpenPerKey:
+            # Descartar el incidente visto hace más tiempo
+            oldest = int(np.argmin(state.lastSeen[:state.size]))
+            self._positions.pop(int(state.ids[oldest]), None)
+            mask = np.ones(state.size, dtype=bool)
+            mask[oldest] = False
+            state.keep(mask)
+        state.append(incidentId, epoch, box)
+        self._positions[incidentId] = key
+    
+    def extend(self, incidentId: int, epoch: float, box: Optional[Tuple[float, float, float, float]]):
+        """Actualizar último instante y bbox de un incidente abierto"""
+        key = self._positions.get(incidentId)
+        if key is None:
+            return
+        state = self._open[key]
+        index = int(np.flatnonzero(state.ids[:state.size] == incidentId)[0])
+        if box is not None and epoch >= state.lastSeen[index]:
+            state.boxes[index] = box
+        state.lastSeen[index] = max(state.lastSeen[index], epoch)
+    
+    def lastBox(self, incidentId: int) -> Optional[Tuple[float, float, float, float]]:
+        """Último bbox de un incidente abierto, None si no lo tiene o ya no está abierto"""
+        key = self._positions.get(incidentId)
+        if key is None:
+            return None
+        state = self._open[key]
+        box = state.boxes[int(np.flatnonzero(state.ids[:state.size] == incidentId)[0])]
+        if np.isnan(box[0]):
+            return None
+        return tuple(float(value) for value in box)
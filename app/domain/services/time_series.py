@@ -0,0 +1,141 @@
+"""
+Remuestreo de series meteorológicas a una grilla de intervalo fijo
+
+Las lecturas llegan con jitter, duplicadas y con huecos. Cada lectura cae en el bucket
+[inicio + k * intervalo, inicio + (k + 1) * intervalo) de su sensor; los buckets se agregan
+con operaciones reduceat sobre las lecturas ordenadas por (sensor, bucket) y los vacíos se
+rellenan según el modo elegido. Todo trabaja sobre columnas NumPy de la forma
+(sensores, buckets), sin recorrer lecturas en Python.
+"""
+from typing import Dict, List, Optional, Tuple
+import math
+import numpy as np
+
+# Intervalos de la grilla en segundos
+SERIES_INTERVALS = {"1m": 60, "5m": 300, "1h": 3600}
+
+# Agregación de las lecturas de un bucket
+SERIES_AGGREGATIONS = ("mean", "min", "max", "last")
+
+# Relleno de buckets sin lecturas: ninguno, último valor o interpolación lineal
+SERIES_FILLS = ("none", "ffill", "linear")
+
+def alignGrid(startEpoch: float, endEpoch: float, intervalSeconds: int) -> Tuple[int, int]:
+    """
+    Inicio de la grilla alineado al intervalo y número de buckets que cubren [startEpoch, endEpoch)
+    """
+    alignedStart = math.floor(startEpoch / intervalSeconds) * intervalSeconds
+    return alignedStart, max(0, math.ceil((endEpoch - alignedStart) / intervalSeconds))
+
+def bucketIndex(times: np.ndarray, sensorCodes: np.ndarray, startEpoch: float, intervalSeconds: int, buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Posición plana sensor * buckets + bucket de cada lectura dentro de la grilla
+    Retorna (posiciones, máscara de lecturas dentro de la grilla)
+    """
+    offsets = np.floor((times - startEpoch) / intervalSeconds).astype(np.int64)
+    inside = (offsets >= 0) & (offsets < buckets)
+    return sensorCodes.astype(np.int64) * buckets + offsets, inside
+
+def aggregateBuckets(positions: np.ndarray, values: np.ndarray, cells: int, aggregation: str) -> np.ndarray:
+    """
+    Agregar values (ordenados por posición, NaN = nulo) en cells celdas; NaN donde no hay datos
+    """
+    result = np.full(cells, np.nan)
+    present = ~np.isnan(values)
+    positions, values = positions[present], values[present]
+    if len(values) == 0:
+        return result
+    
+    # Inicio de cada grupo de lecturas con la misma posición
+    starts = np.flatnonzero(np.diff(positions, prepend=-1))
+    groups = positions[starts]
+    if aggregation == "mean":
+        result[groups] = np.add.reduceat(values, starts) / np.diff(np.append(starts, len(values)))
+    elif aggregation == "min":
+        result[groups] = np.minimum.reduceat(values, starts)
+    elif aggregation == "max":
+        result[groups] = np.maximum.reduceat(values, starts)
+    elif aggregation == "last":
+        result[groups] = values[np.append(starts[1:], len(values)) - 1]
+    else:
+        raise ValueError(f"Agregación desconocida: {aggregation}")
+    return result
+
+def neighborIndexes(present: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Para cada celda de cada fila, índice del último bucket con dato a su izquierda (o él mismo)
+    y del primero a su derecha; -1 y el ancho de la fila donde no existe
+    """
+    width = present.shape[1]
+    columns = np.arange(width)
+    previous = np.maximum.accumulate(np.where(present, columns, -1), axis=1)
+    following = np.minimum.accumulate(np.where(present, columns, width)[:, ::-1], axis=1)[:, ::-1]
+    return previous, following
+
+def fillGaps(matrix: np.ndarray, fill: str, limit: Optional[int] = None) -> np.ndarray:
+    """
+    Rellenar NaN de cada fila (sensor) de la matriz (sensores, buckets)
+    limit: máximo de buckets consecutivos que se rellenan; huecos más largos quedan vacíos
+    ffill no rellena antes del primer dato y linear no extrapola en los extremos
+    """
+    if fill == "none" or matrix.size == 0:
+        return matrix
+    present = ~np.isnan(matrix)
+    previous, following = neighborIndexes(present)
+    rows = np.arange(matrix.shape[0])[:, None]
+    columns = np.arange(matrix.shape[1])[None, :]
+    hasPrevious = previous >= 0
+    previousValues = matrix[rows, np.maximum(previous, 0)]
+    
+    if fill == "ffill":
+        filled = np.where(hasPrevious, previousValues, np.nan)
+        if limit is not None:
+            filled = np.where(columns - previous <= limit, filled, np.nan)
+    elif fill == "linear":
+        hasFollowing = following < matrix.shape[1]
+        followingValues = matrix[rows, np.minimum(following, matrix.shape[1] - 1)]
+        span = np.maximum(following - previous, 1)
+        filled = previousValues + (followingValues - previousValues) * (columns - previous) / span
+        valid = hasPrevious & hasFollowing
+        if limit is not None:
+            valid &= following - previous - 1 <= limit
+        filled = np.where(valid, filled, np.nan)
+    else:
+        raise ValueError(f"Relleno desconocido: {fill}")
+    return np.where(present, matrix, filled)
+
+def resampleColumns(
+    times: np.ndarray,
+    sensorCodes: np.ndarray,
+    sensorCount: int,
+    columns: Dict[str, np.ndarray],
+    startEpoch: float,
+    intervalSeconds: int,
+    buckets: int,
+    aggregation: str = "mean",
+    fill: str = "none",
+    fillLimit: Optional[int] = None
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Grilla (sensores, buckets) de cada columna y lecturas por bucket
+    times en segundos epoch; las lecturas fuera de la grilla se ignoran
+    """
+    positions, inside = bucketIndex(times, sensorCodes, startEpoch, intervalSeconds, buckets)
+    # Orden estable: dentro de un bucket se conserva el orden de llegada para "last"
+    order = np.argsort(np.where(inside, positions, -1), kind="stable")
+    order = order[inside[order]]
+    positions = positions[order]
+    cells = sensorCount * buckets
+    
+    counts = np.bincount(positions, minlength=cells).reshape(sensorCount, buckets)
+    grids = {}
+    for name, values in columns.items():
+        aggregated = aggregateBuckets(positions, values[order], cells, aggregation).reshape(sensorCount, buckets)
+        grids[name] = fillGaps(aggregated, fill, fillLimit)
+    return counts, grids
+
+def rowsToLists(matrix: np.ndarray, decimals: int = 2) -> List[List[Optional[float]]]:
+    """Filas de la matriz como listas redondeadas, NaN como None"""
+    rounded = np.round(matrix, decimals).astype(object)
+    rounded[np.isnan(matrix)] = None
+    return rounded.tolist()
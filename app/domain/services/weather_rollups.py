@@ -0,0 +1,146 @@
+"""
+Lógica de rollups meteorológicos: buckets de tiempo, acumulación y planificación
+
+Los rollups guardan suma/conteo/mínimo/máximo por sensor y bucket, así se pueden
+combinar entre sí y con los bordes crudos sin perder exactitud.
+"""
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+# Resoluciones disponibles, de la más gruesa a la más fina
+RESOLUTIONS: List[Tuple[str, timedelta]] = [
+    ("1d", timedelta(days=1)),
+    ("1h", timedelta(hours=1)),
+    ("1m", timedelta(minutes=1)),
+]
+RAW_RESOLUTION = "raw"
+
+def floorTime(value: datetime, resolution: str) -> datetime:
+    """
+    Inicio del bucket que contiene value
+    """
+    if resolution == "1m":
+        return value.replace(second=0, microsecond=0)
+    if resolution == "1h":
+        return value.replace(minute=0, second=0, microsecond=0)
+    if resolution == "1d":
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Resolución desconocida: {resolution}")
+
+def ceilTime(value: datetime, resolution: str, step: timedelta) -> datetime:
+    """
+    Primer inicio de bucket mayor o igual a value
+    """
+    floored = floorTime(value, resolution)
+    return floored if floored == value else floored + step
+
+def planRollupSegments(startDate: datetime, endDate: datetime) -> List[Tuple[str, datetime, datetime]]:
+    """
+    Dividir [startDate, endDate) en tramos cubiertos por el rollup más grueso posible
+    Los bordes que no alinean con ningún bucket quedan como tramos "raw"
+    """
+    def plan(start: datetime, end: datetime, levels: List[Tuple[str, timedelta]]) -> List[Tuple[str, datetime, datetime]]:
+        if start >= end:
+            return []
+        if not levels:
+            return [(RAW_RESOLUTION, start, end)]
+        
+        resolution, step = levels[0]
+        alignedStart = ceilTime(start, resolution, step)
+        alignedEnd = floorTime(end, resolution)
+        if alignedStart >= alignedEnd:
+            return plan(start, end, levels[1:])
+        
+        return (
+            plan(start, alignedStart, levels[1:])
+            + [(resolution, alignedStart, alignedEnd)]
+            + plan(alignedEnd, end, levels[1:])
+        )
+    
+    return plan(startDate, endDate, RESOLUTIONS)
+
+@dataclass
+class WeatherAggregate:
+    """Agregado combinable de lecturas meteorológicas"""
+    recordCount: int = 0
+    temperatureSum: float = 0.0
+    temperatureCount: int = 0
+    temperatureMin: Optional[float] = None
+    temperatureMax: Optional[float] = None
+    humiditySum: float = 0.0
+    humidityCount: int = 0
+    windSpeedSum: float = 0.0
+    windSpeedCount: int = 0
+    rainfallSum: float = 0.0
+    rainfallCount: int = 0
+    
+    def addReading(self, temperature: Optional[float], humidity: Optional[float],
+                   windSpeed: Optional[float], rainfall: Optional[float]):
+        """Acumular una lectura cruda"""
+        self.recordCount += 1
+        if temperature is not None:
+            self.temperatureSum += temperature
+            self.temperatureCount += 1
+            self.temperatureMin = temperature if self.temperatureMin is None else min(self.temperatureMin, temperature)
+            self.temperatureMax = temperature if self.temperatureMax is None else max(self.temperatureMax, temperature)
+        if humidity is not None:
+            self.humiditySum += humidity
+            self.humidityCount += 1
+        if windSpeed is not None:
+            self.windSpeedSum += windSpeed
+            self.windSpeedCount += 1
+        if rainfall is not None:
+            self.rainfallSum += rainfall
+            self.rainfallCount += 1
+    
+    def merge(self, other: "WeatherAggregate"):
+        """Combinar otro agregado en este"""
+        self.recordCount += other.recordCount
+        self.temperatureSum += other.temperatureSum
+        self.temperatureCount += other.temperatureCount
+        if other.temperatureMin is not None:
+            self.temperatureMin = other.temperatureMin if self.temperatureMin is None else min(self.temperatureMin, other.temperatureMin)
+        if other.temperatureMax is not None:
+            self.temperatureMax = other.temperatureMax if self.temperatureMax is None else max(self.temperatureMax, other.temperatureMax)
+        self.humiditySum += other.humiditySum
+        self.humidityCount += other.humidityCount
+        self.windSpeedSum += other.windSpeedSum
+        self.windSpeedCount += other.windSpeedCount
+        self.rainfallSum += other.rainfallSum
+        self.rainfallCount += other.rainfallCount
+    
+    def toDict(self) -> dict:
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+def aggregateByBucket(rows: Iterable[dict], resolution: str) -> Dict[Tuple[str, datetime], WeatherAggregate]:
+    """
+    Agrupar filas de weather_data por (sensorId, inicio de bucket)
+    """
+    buckets: Dict[Tuple[str, datetime], WeatherAggregate] = {}
+    for row in rows:
+        key = (row["sensorId"], floorTime(row["timestamp"], resolution))
+        aggregate = buckets.get(key)
+        if aggregate is None:
+            aggregate = buckets[key] = WeatherAggregate()
+        aggregate.addReading(row.get("temperature"), row.get("humidity"), row.get("windSpeed"), row.get("rainfall"))
+    return buckets
+
+def aggregateColumns(temperature: np.ndarray, humidity: np.ndarray, windSpeed: np.ndarray, rainfall: np.ndarray) -> WeatherAggregate:
+    """
+    Agregar arreglos NumPy de lecturas (NaN = nulo), usado para los rangos archivados
+    """
+    aggregate = WeatherAggregate(recordCount=int(len(temperature)))
+    present = ~np.isnan(temperature)
+    if present.any():
+        values = temperature[present]
+        aggregate.temperatureSum = float(values.sum())
+        aggregate.temperatureCount = int(values.size)
+        aggregate.temperatureMin = float(values.min())
+        aggregate.temperatureMax = float(values.max())
+    for name, values in (("humidity", humidity), ("windSpeed", windSpeed), ("rainfall", rainfall)):
+        present = values[~np.isnan(values)]
+        setattr(aggregate, f"{name}Sum", float(present.sum()))
+        setattr(aggregate, f"{name}Count", int(present.size))
+    return aggregate
@@ -0,0 +1,8 @@
+"""
+Exportar componentes del almacenamiento frío
+"""
+from .cold_archive import ColdArchive, columnToPython
+
+__all__ = [
+    "ColdArchive", "columnToPython"
+]
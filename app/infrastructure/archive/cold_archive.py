@@ -0,0 +1,298 @@
+"""
+Almacenamiento frío columnar: un archivo .npz comprimido por tabla y día de createdAt
+
+Cada columna es un miembro independiente del .npz: las lecturas descomprimen solo los
+miembros pedidos y en streaming, por tramos de filas, sin cargar el día completo.
+manifest.json guarda por archivo el número de filas, el rango de IDs y el rango
+de cada columna de fecha para descartar archivos sin abrirlos.
+
+Un archivo queda con pendingDelete hasta que el archivador termina de borrar sus filas
+de la base; mientras tanto los lectores descartan las filas archivadas que siguen en la
+base (excludeIds) para no contarlas dos veces.
+"""
+import json
+import os
+import zipfile
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Sequence
+import numpy as np
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+# Sufijo del miembro con la máscara de nulos de una columna entera o de texto
+NULL_SUFFIX = "__null"
+# Filas por tramo al leer un archivo; acota la memoria de lecturas y exportaciones
+ARCHIVE_SLICE_ROWS = 16384
+
+def encodeColumn(values: Sequence, kind: str) -> Dict[str, np.ndarray]:
+    """
+    Convertir una columna de valores Python al arreglo del archivo
+    kind: int, float, bool, str o datetime; los nulos van como NaN/NaT o en una máscara
+    """
+    if kind == "float":
+        return {"": np.array([np.nan if value is None else value for value in values], dtype=np.float64)}
+    if kind == "datetime":
+        return {"": np.array(
+            [None if value is None else value.replace(tzinfo=None) for value in values],
+            dtype="datetime64[us]"
+        )}
+    if kind == "bool":
+        return {"": np.array([bool(value) for value in values], dtype=bool)}
+    
+    nulls = np.array([value is None for value in values], dtype=bool)
+    if kind == "int":
+        encoded = {"": np.array([0 if value is None else value for value in values], dtype=np.int64)}
+    else:
+        encoded = {"": np.array(["" if value is None else value for value in values], dtype=np.str_)}
+    if nulls.any():
+        encoded[NULL_SUFFIX] = nulls
+    return encoded
+
+def columnToPython(values: np.ndarray, nulls: Optional[np.ndarray]) -> list:
+    """
+    Arreglo del archivo a valores Python (datetime, None, bool...) para exportar
+    """
+    converted = values.astype(object)
+    if values.dtype.kind == "f":
+        converted[np.isnan(values)] = None
+    if nulls is not None:
+        converted[nulls] = None
+    return converted.tolist()
+
+def datetimeRange(values: np.ndarray) -> Optional[List[str]]:
+    present = values[~np.isnat(values)]
+    if present.size == 0:
+        return None
+    return [str(present.min()), str(present.max())]
+
+class ArrayMemberReader:
+    """
+    Lectura secuencial de una columna (.npy dentro del .npz) que descomprime solo lo que se lee
+    """
+    
+    def __init__(self, handle):
+        self.handle = handle
+        version = np.lib.format.read_magic(handle)
+        readHeader = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        _, _, self.dtype = readHeader(handle)
+    
+    def read(self, count: int) -> np.ndarray:
+        return np.frombuffer(self.handle.read(count * self.dtype.itemsize), dtype=self.dtype, count=count)
+    
+    def close(self):
+        self.handle.close()
+
+class ColdArchive:
+    """
+    Archivos por día con manifiesto; solo el archivador escribe, las lecturas son concurrentes
+    """
+    
+    def __init__(self, rootDir: str):
+        self.rootDir = rootDir
+        self.manifestPath = os.path.join(rootDir, MANIFEST_NAME)
+        self._manifest: Optional[dict] = None
+        self._manifestMtime: Optional[float] = None
+    
+    def loadManifest(self) -> dict:
+        """Manifiesto actual, releído solo si el archivo cambió"""
+        try:
+            mtime = os.stat(self.manifestPath).st_mtime
+        except FileNotFoundError:
+            return {"version": MANIFEST_VERSION, "files": []}
+        if self._manifest is None or mtime != self._manifestMtime:
+            with open(self.manifestPath) as handle:
+                self._manifest = json.load(handle)
+            self._manifestMtime = mtime
+        return self._manifest
+    
+    def _saveManifest(self, manifest: dict):
+        temporaryPath = self.manifestPath + ".tmp"
+        with open(temporaryPath, "w") as handle:
+            json.dump(manifest, handle, indent=2)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporaryPath, self.manifestPath)
+        self._manifest = manifest
+        self._manifestMtime = os.stat(self.manifestPath).st_mtime
+    
+    def findEntry(self, table: str, day: date) -> Optional[dict]:
+        return next(
+            (entry for entry in self.loadManifest()["files"] if entry["table"] == table and entry["day"] == day.isoformat()),
+            None
+        )
+    
+    def pendingEntries(self, table: str, **filters) -> List[dict]:
+        """Archivos cuyas filas pueden seguir en la base (borrado interrumpido o en curso)"""
+        return [entry for entry in self.entries(table, **filters) if entry.get("pendingDelete")]
+    
+    def entries(
+        self,
+        table: str,
+        startDate: Optional[datetime] = None,
+        endDate: Optional[datetime] = None,
+        timeColumn: str = "createdAt"
+    ) -> List[dict]:
+        """
+        Archivos de una tabla cuyo rango de timeColumn se cruza con [startDate, endDate)
+        """
+        selected = []
+        for entry in self.loadManifest()["files"]:
+            if entry["table"] != table:
+                continue
+            bounds = entry["ranges"].get(timeColumn)
+            if bounds is None:
+                continue
+            low, high = datetime.fromisoformat(bounds[0]), datetime.fromisoformat(bounds[1])
+            if startDate is not None and high < startDate:
+                continue
+            if endDate is not None and low >= endDate:
+                continue
+            selected.append(entry)
+        return sorted(selected, key=lambda entry: entry["minId"])
+    
+    def writeDay(self, table: str, day: date, columnKinds: Dict[str, str], rows: List[tuple]) -> dict:
+        """
+        Escribir (o reemplazar) el archivo de un día y registrarlo en el manifiesto
+        rows son tuplas en el orden de columnKinds; el archivo queda completo antes de publicarse
+        """
+        arrays: Dict[str, np.ndarray] = {}
+        columns = list(zip(*rows)) if rows else [()] * len(columnKinds)
+        for (name, kind), values in zip(columnKinds.items(), columns):
+            for suffix, array in encodeColumn(values, kind).items():
+                arrays[name + suffix] = array
+        
+        relativePath = os.path.join(table, f"{day.isoformat()}.npz")
+        path = os.path.join(self.rootDir, relativePath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporaryPath = path + ".tmp"
+        with open(temporaryPath, "wb") as handle:
+            np.savez_compressed(handle, **arrays)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporaryPath, path)
+        
+        ids = arrays["id"]
+        entry = {
+            "table": table,
+            "day": day.isoformat(),
+            "path": relativePath,
+            "rowCount": len(rows),
+            "minId": int(ids.min()) if len(rows) else None,
+            "maxId": int(ids.max()) if len(rows) else None,
+            "columns": columnKinds,
+            "ranges": {
+                name: datetimeRange(arrays[name]) for name, kind in columnKinds.items() if kind == "datetime"
+            },
+            "bytes": os.path.getsize(path),
+            "archivedAt": datetime.now().isoformat(timespec="seconds"),
+            "pendingDelete": True
+        }
+        manifest = dict(self.loadManifest())
+        manifest["files"] = [
+            existing for existing in manifest["files"]
+            if not (existing["table"] == table and existing["day"] == entry["day"])
+        ] + [entry]
+        self._saveManifest(manifest)
+        return entry
+    
+    def markDeleted(self, table: str, day: date):
+        """Registrar que las filas archivadas de un día ya no están en la base"""
+        manifest = dict(self.loadManifest())
+        manifest["files"] = [
+            {**entry, "pendingDelete": False} if entry["table"] == table and entry["day"] == day.isoformat() else entry
+            for entry in manifest["files"]
+        ]
+        self._saveManifest(manifest)
+    
+    def readEntry(self, entry: dict, columns: Sequence[str]) -> Dict[str, tuple]:
+        """
+        Leer solo las columnas indicadas de un archivo: {columna: (valores, máscara de nulos o None)}
+        """
+        with np.load(os.path.join(self.rootDir, entry["path"])) as archive:
+            members = set(archive.files)
+            data = {}
+            for name in columns:
+                if name not in members:
+                    # Columna agregada después de archivar: todo nulo
+                    data[name] = (np.zeros(entry["rowCount"], dtype=np.int64), np.ones(entry["rowCount"], dtype=bool))
+                    continue
+                data[name] = (archive[name], archive[name + NULL_SUFFIX] if name + NULL_SUFFIX in members else None)
+            return data
+    
+    def readEntrySlices(self, entry: dict, columns: Sequence[str], sliceRows: int = ARCHIVE_SLICE_ROWS) -> Iterator[Dict[str, tuple]]:
+        """
+        Leer las columnas indicadas de un archivo por tramos de sliceRows filas
+        Mismo formato que readEntry; la memoria depende del tramo y no del tamaño del día
+        """
+        rowCount = entry["rowCount"]
+        readers: Dict[str, ArrayMemberReader] = {}
+        with zipfile.ZipFile(os.path.join(self.rootDir, entry["path"])) as bundle:
+            members = set(bundle.namelist())
+            try:
+                for name in columns:
+                    for member in (name, name + NULL_SUFFIX):
+                        if member + ".npy" in members:
+                            readers[member] = ArrayMemberReader(bundle.open(member + ".npy"))
+                
+                for start in range(0, rowCount, sliceRows):
+                    count = min(sliceRows, rowCount - start)
+                    data = {}
+                    for name in columns:
+                        if name not in readers:
+                            # Columna agregada después de archivar: todo nulo
+                            data[name] = (np.zeros(count, dtype=np.int64), np.ones(count, dtype=bool))
+                            continue
+                        nullReader = readers.get(name + NULL_SUFFIX)
+                        data[name] = (readers[name].read(count), nullReader.read(count) if nullReader else None)
+                    yield data
+            finally:
+                for reader in readers.values():
+                    reader.close()
+    
+    def readColumns(
+        self,
+        table: str,
+        columns: Sequence[str],
+        startDate: Optional[datetime] = None,
+        endDate: Optional[datetime] = None,
+        timeColumn: str = "createdAt",
+        equals: Optional[Dict[str, str]] = None,
+        excludeIds: Optional[np.ndarray] = None,
+        sliceRows: int = ARCHIVE_SLICE_ROWS
+    ) -> Iterator[Dict[str, tuple]]:
+        """
+        Columnas filtradas por rango de timeColumn e igualdades, un bloque por tramo de archivo
+        excludeIds son filas de archivos pendientes de borrado que siguen en la base
+        """
+        equals = {name: value for name, value in (equals or {}).items() if value is not None}
+        needed = list(dict.fromkeys([*columns, timeColumn, *equals, *(["id"] if excludeIds is not None else [])]))
+        
+        for entry in self.entries(table, startDate, endDate, timeColumn):
+            for data in self.readEntrySlices(entry, needed, sliceRows):
+                times = data[timeColumn][0]
+                mask = ~np.isnat(times)
+                if startDate is not None:
+                    mask &= times >= np.datetime64(startDate.replace(tzinfo=None), "us")
+                if endDate is not None:
+                    mask &= times < np.datetime64(endDate.replace(tzinfo=None), "us")
+                for name, value in equals.items():
+                    values, nulls = data[name]
+                    mask &= values == value
+                    if nulls is not None:
+                        mask &= ~nulls
+                if excludeIds is not None and entry.get("pendingDelete"):
+                    mask &= ~np.isin(data["id"][0], excludeIds)
+                if not mask.any():
+                    continue
+                yield {
+                    name: (values[mask], None if nulls is None else nulls[mask])
+                    for name, (values, nulls) in ((name, data[name]) for name in columns)
+                }
+    
+    def readRows(self, table: str, columns: Sequence[str], **filters) -> Iterator[List[tuple]]:
+        """
+        Filas como tuplas Python en orden de columnas, un bloque por tramo de archivo (exportación)
+        """
+        for block in self.readColumns(table, columns, **filters):
+            converted = [columnToPython(*block[name]) for name in columns]
+            yield list(zip(*converted))
@@ -0,0 +1,14 @@
+"""
+Exportar cachés en memoria
+"""
+from .latest_reading_cache import LatestReadingCache
+from .watermarks import (
+    TableWatermarks, InMemoryWatermarkBackend, RedisWatermarkBackend, createWatermarkBackend,
+    standaloneWatermarks, validatorHeaders, isNotModified
+)
+
+__all__ = [
+    "LatestReadingCache",
+    "TableWatermarks", "InMemoryWatermarkBackend", "RedisWatermarkBackend", "createWatermarkBackend",
+    "standaloneWatermarks", "validatorHeaders", "isNotModified"
+]
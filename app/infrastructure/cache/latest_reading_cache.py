@@ -0,0 +1,75 @@
+"""
+Caché en memoria de la lectura más reciente por dispositivo
+
+Los dashboards consultan las condiciones actuales cada pocos segundos; esta caché
+se llena al arrancar, se actualiza write-through desde la ingesta y desaloja por
+LRU los dispositivos que dejan de reportar.
+"""
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Hashable, List, Optional
+import time
+
+def readingEpoch(value: Optional[datetime]) -> float:
+    """
+    Segundos epoch de un timestamp con o sin zona horaria (sin zona se asume local)
+    """
+    return value.timestamp() if value is not None else 0.0
+
+class LatestReadingCache:
+    """
+    Mapa acotado llave → última lectura, ordenado por actualización más reciente
+    """
+    
+    def __init__(self, maxEntries: int = 5000, staleAfterSeconds: float = 900.0):
+        self.maxEntries = maxEntries
+        self.staleAfterSeconds = staleAfterSeconds
+        self._entries: "OrderedDict[Hashable, dict]" = OrderedDict()
+        self._order: dict = {}
+        self.evictedTotal = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def update(self, key: Hashable, reading: dict) -> bool:
+        """
+        Guardar la lectura si es más reciente que la existente (por timestamp y luego id)
+        Retorna False si la lectura llegó tarde y se descartó
+        """
+        order = (readingEpoch(reading.get("timestamp")), reading.get("id") or 0)
+        current = self._order.get(key)
+        if current is not None and order < current:
+            return False
+        
+        self._entries[key] = reading
+        self._order[key] = order
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.maxEntries:
+            evictedKey, _ = self._entries.popitem(last=False)
+            self._order.pop(evictedKey, None)
+            self.evictedTotal += 1
+        return True
+    
+    def get(self, key: Hashable) -> Optional[dict]:
+        """
+        Lectura cacheada con indicador de antigüedad, o None si no existe
+        """
+        reading = self._entries.get(key)
+        return self._withStaleness(reading, time.time()) if reading is not None else None
+    
+    def snapshot(self) -> List[dict]:
+        """
+        Todas las lecturas cacheadas con su indicador de antigüedad
+        """
+        now = time.time()
+        return [self._withStaleness(reading, now) for reading in self._entries.values()]
+    
+    def _withStaleness(self, reading: dict, now: float) -> dict:
+        timestamp = reading.get("timestamp")
+        ageSeconds = round(now - readingEpoch(timestamp), 3) if timestamp is not None else None
+        return {
+            **reading,
+            "ageSeconds": ageSeconds,
+            "stale": ageSeconds is None or ageSeconds > self.staleAfterSeconds
+        }
@@ -0,0 +1,220 @@
+"""
+Marcas de agua por tabla para GET condicionales (ETag débil y Last-Modified)
+
+Cada escritura confirmada sobre una tabla (ingesta, worker de detecciones, imágenes,
+archivador) sube su versión. El ETag de una respuesta es un hash de la ruta, los
+parámetros y las versiones de las tablas que lee, así que un If-None-Match se resuelve
+sin consultar la base ni serializar nada. Las versiones viven en memoria (un solo
+proceso) o en un hash de Redis compartido por todos los workers y los procesos aparte.
+"""
+import hashlib
+import secrets
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional, Sequence, Tuple
+
+try:
+    import redis.asyncio as redisAsyncio
+except ImportError:
+    redisAsyncio = None
+
+# (versión, epoch del último cambio) de una tabla; el instante es None si no se conoce
+Watermark = Tuple[str, Optional[float]]
+
+class InMemoryWatermarkBackend:
+    """
+    Versiones del proceso; válidas solo si todas las escrituras pasan por él
+    """
+    shared = False
+    
+    def __init__(self):
+        # Un ETag emitido por otro proceso o antes de un reinicio nunca coincide
+        self.bootId = secrets.token_hex(4)
+        self.startedAt = time.time()
+        self._versions: Dict[str, int] = {}
+        self._modifiedAt: Dict[str, float] = {}
+    
+    async def start(self):
+        pass
+    
+    async def bump(self, tables: Sequence[str]):
+        now = time.time()
+        for table in tables:
+            self._versions[table] = self._versions.get(table, 0) + 1
+            self._modifiedAt[table] = now
+    
+    async def read(self, tables: Sequence[str]) -> Dict[str, Watermark]:
+        # Lo escrito antes de arrancar es anterior a startedAt
+        return {
+            table: (f"{self.bootId}.{self._versions.get(table, 0)}", self._modifiedAt.get(table, self.startedAt))
+            for table in tables
+        }
+    
+    async def stop(self):
+        pass
+    
+    def getStats(self) -> dict:
+        return {"backend": "memory", "versions": dict(self._versions)}
+
+class RedisWatermarkBackend:
+    """
+    Versiones en un hash de Redis: HINCRBY por tabla y el instante del último cambio
+    """
+    shared = True
+    
+    def __init__(self, url: Optional[str] = None, key: str = "thermal-monitoring-watermarks", client=None):
+        self.url = url
+        self.key = key
+        self._client = client
+        self._ownsClient = client is None
+    
+    async def start(self):
+        if self._client is None:
+            if redisAsyncio is None:
+                raise RuntimeError("CONDITIONAL_GET_BACKEND=redis requiere el paquete redis (pip install redis)")
+            self._client = redisAsyncio.from_url(self.url)
+        await self._client.ping()
+    
+    async def bump(self, tables: Sequence[str]):
+        now = time.time()
+        pipeline = self._client.pipeline(transaction=True)
+        # epoch distingue las versiones de antes y después de que Redis pierda sus datos
+        pipeline.hsetnx(self.key, "epoch", secrets.token_hex(4))
+        for table in tables:
+            pipeline.hincrby(self.key, table, 1)
+            pipeline.hset(self.key, f"{table}:modifiedAt", repr(now))
+        await pipeline.execute()
+    
+    async def read(self, tables: Sequence[str]) -> Dict[str, Watermark]:
+        fields = ["epoch"]
+        for table in tables:
+            fields.extend((table, f"{table}:modifiedAt"))
+        values = [value.decode() if isinstance(value, bytes) else value for value in await self._client.hmget(self.key, fields)]
+        epoch = values[0] or "-"
+        return {
+            table: (f"{epoch}.{values[1 + 2 * index] or 0}", float(values[2 + 2 * index]) if values[2 + 2 * index] else None)
+            for index, table in enumerate(tables)
+        }
+    
+    async def stop(self):
+        if self._ownsClient and self._client is not None:
+            await self._client.close()
+            self._client = None
+    
+    def getStats(self) -> dict:
+        return {"backend": "redis", "key": self.key}
+
+def createWatermarkBackend(name: str, redisUrl: Optional[str] = None):
+    """Backend según CONDITIONAL_GET_BACKEND: memory, redis u off (None)"""
+    if name == "off":
+        return None
+    if name == "memory":
+        return InMemoryWatermarkBackend()
+    if name == "redis":
+        return RedisWatermarkBackend(redisUrl)
+    raise ValueError(f"CONDITIONAL_GET_BACKEND no soportado: {name} (memory, redis u off)")
+
+class TableWatermarks:
+    """
+    Versiones por tabla y validadores (ETag, Last-Modified) de las respuestas que las leen
+    Sin backend todo queda desactivado: bump no hace nada y no se emiten validadores
+    """
+    
+    def __init__(self, backend=None):
+        self.backend = backend
+        
+        # Contadores expuestos en estadísticas
+        self.bumpTotal = 0
+        self.notModifiedTotal = 0
+        self.errorCount = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+    
+    async def start(self):
+        if self.backend is not None:
+            await self.backend.start()
+    
+    async def stop(self):
+        if self.backend is not None:
+            await self.backend.stop()
+    
+    async def bump(self, *tables: str):
+        """Después del commit de una escritura sobre tables"""
+        if self.backend is None:
+            return
+        try:
+            await self.backend.bump(tables)
+            self.bumpTotal += 1
+        except Exception as e:
+            self.errorCount += 1
+            print(f"Error al actualizar marcas de agua de {', '.join(tables)}: {e}")
+    
+    async def validators(self, tables: Sequence[str], path: str, params: Sequence[Tuple[str, str]]) -> Optional[Tuple[str, Optional[float]]]:
+        """
+        (ETag débil, epoch del último cambio) de una respuesta; None si no se pueden calcular
+        """
+        if self.backend is None:
+            return None
+        try:
+            marks = await self.backend.read(tables)
+        except Exception as e:
+            self.errorCount += 1
+            print(f"Error al leer marcas de agua: {e}")
+            return None
+        
+        digest = hashlib.blake2b(path.encode(), digest_size=12)
+        for name, value in sorted(params):
+            digest.update(f"\0{name}={value}".encode())
+        for table in tables:
+            digest.update(f"\0{table}@{marks[table][0]}".encode())
+        modifiedTimes = [modifiedAt for _, modifiedAt in marks.values()]
+        lastModified = None if None in modifiedTimes else max(modifiedTimes)
+        return f'W/"{digest.hexdigest()}"', lastModified
+    
+    def getStats(self) -> dict:
+        return {
+            **(self.backend.getStats() if self.backend is not None else {"backend": "off"}),
+            "bumpTotal": self.bumpTotal,
+            "notModifiedTotal": self.notModifiedTotal,
+            "errorCount": self.errorCount
+        }
+
+def standaloneWatermarks(backendName: str, redisUrl: Optional[str] = None) -> TableWatermarks:
+    """
+    Marcas de agua para procesos fuera de la API (worker, archivador, particiones)
+    Solo un backend compartido llega a los workers de la API; con memory la API no se entera
+    de lo que escribe este proceso y respondería 304 con datos viejos
+    """
+    if backendName == "memory":
+        print(
+            "Advertencia: CONDITIONAL_GET_BACKEND=memory con escrituras fuera de la API; "
+            "la API puede responder 304 con datos viejos. Use redis u off"
+        )
+    return TableWatermarks(createWatermarkBackend(backendName, redisUrl) if backendName == "redis" else None)
+
+def validatorHeaders(etag: str, lastModified: Optional[float]) -> Dict[str, str]:
+    """
+    Encabezados ETag y Last-Modified (fecha HTTP en GMT)
+    no-cache obliga a revalidar: sin él un navegador puede reusar la respuesta por heurística
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if lastModified is not None:
+        headers["Last-Modified"] = formatdate(lastModified, usegmt=True)
+    return headers
+
+def isNotModified(ifNoneMatch: Optional[str], ifModifiedSince: Optional[str], etag: str, lastModified: Optional[float]) -> bool:
+    """
+    Comparación débil de If-None-Match; If-Modified-Since solo cuenta si no hay If-None-Match
+    """
+    if ifNoneMatch is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in ifNoneMatch.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+    if ifModifiedSince is None or lastModified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(ifModifiedSince).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(lastModified) <= since
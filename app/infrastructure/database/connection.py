@@ -1,47 +1,128 @@
 """
 Configuración de conexión a base de datos MySQL con SQLAlchemy asíncrono
 """
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import DateTime, text
+from sqlalchemy.dialects.sqlite import DATETIME as SQLITE_DATETIME
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-import os
-from dotenv import load_dotenv
+from contextlib import AsyncExitStack
+from typing import Optional
+import asyncio
+from app.config import getSettings
+from app.infrastructure.metrics import instrumentEngine
 
-# Cargar variables de entorno
-load_dotenv()
+# Engines y session makers del proceso; se crean con el primer uso, no al importar
+_engine: Optional[AsyncEngine] = None
+_sessionFactory: Optional[async_sessionmaker] = None
+_replicaEngine: Optional[AsyncEngine] = None
+_replicaSessionFactory: Optional[async_sessionmaker] = None
 
-# Configuración de base de datos
-DATABASE_URL = os.getenv("DATABASE_URL")
+def createEngine(databaseUrl: str, poolName: str = "primary") -> AsyncEngine:
+    """Engine con el pool del proceso e instrumentado para /metrics"""
+    settings = getSettings()
+    
+    # Opciones del engine; SQLite (benchmarks) usa su propio pool sin tamaño fijo
+    engineOptions = {
+        "echo": settings.debug,
+        "pool_pre_ping": True,
+        "pool_recycle": 3600
+    }
+    if not databaseUrl.startswith("sqlite"):
+        engineOptions["pool_size"] = settings.poolSize
+        engineOptions["max_overflow"] = settings.maxOverflow
+    
+    engine = create_async_engine(databaseUrl, **engineOptions)
+    
+    # Medir cada consulta y checkout del pool (/metrics)
+    instrumentEngine(engine, poolName)
+    return engine
 
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL no está configurada en variables de entorno")
+def getEngine() -> AsyncEngine:
+    """
+    Engine asíncrono del primario, creado la primera vez que se pide
+    Importar modelos o repositorios no requiere DATABASE_URL
+    """
+    global _engine
+    if _engine is None:
+        databaseUrl = getSettings().databaseUrl
+        if not databaseUrl:
+            raise ValueError("DATABASE_URL no está configurada en variables de entorno")
+        _engine = createEngine(databaseUrl)
+    return _engine
 
-# Crear engine asíncrono
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=True if os.getenv("DEBUG", "false").lower() == "true" else False,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
-    pool_recycle=3600
-)
+def getReplicaEngine() -> Optional[AsyncEngine]:
+    """Engine de la réplica de lectura, None si DATABASE_REPLICA_URL no está configurada"""
+    global _replicaEngine
+    if _replicaEngine is None:
+        replicaUrl = getSettings().replicaDatabaseUrl
+        if not replicaUrl:
+            return None
+        _replicaEngine = createEngine(replicaUrl, "replica")
+    return _replicaEngine
 
-# Crear session maker asíncrono
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False
-)
+def getSessionFactory() -> async_sessionmaker:
+    """Session maker ligado al engine del proceso"""
+    global _sessionFactory
+    if _sessionFactory is None:
+        _sessionFactory = async_sessionmaker(
+            getEngine(),
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+    return _sessionFactory
+
+def getReplicaSessionFactory() -> Optional[async_sessionmaker]:
+    """Session maker de la réplica, None sin réplica configurada"""
+    global _replicaSessionFactory
+    if _replicaSessionFactory is None:
+        replicaEngine = getReplicaEngine()
+        if replicaEngine is None:
+            return None
+        _replicaSessionFactory = async_sessionmaker(
+            replicaEngine,
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+    return _replicaSessionFactory
+
+def openReplicaSession() -> AsyncSession:
+    """Nueva sesión sobre la réplica; solo para lecturas"""
+    return getReplicaSessionFactory()()
+
+def openSession() -> AsyncSession:
+    """
+    Nueva sesión; se pasa como sessionFactory a colas, jobs y exportaciones
+    sin crear el engine hasta que se abre la primera
+    """
+    return getSessionFactory()()
+
+async def disposeEngine():
+    """Cerrar las conexiones de los pools; el siguiente uso crea engines nuevos"""
+    global _engine, _sessionFactory, _replicaEngine, _replicaSessionFactory
+    for engine in (_engine, _replicaEngine):
+        if engine is not None:
+            await engine.dispose()
+    _engine = _replicaEngine = None
+    _sessionFactory = _replicaSessionFactory = None
 
 # Base class para todos los modelos
 class Base(DeclarativeBase):
     pass
 
+# Tipo para columnas createdAt con server_default: en SQLite CURRENT_TIMESTAMP se guarda
+# sin microsegundos, los parámetros se enlazan con el mismo formato para que las
+# comparaciones de cursores y ventanas sean consistentes
+CreatedAtType = DateTime(timezone=True).with_variant(
+    SQLITE_DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite"
+)
+
 # Dependency para obtener sesión de base de datos
 async def getDbSession():
     """
     Dependency para inyectar sesión de base de datos en endpoints FastAPI
     """
-    async with AsyncSessionLocal() as session:
+    async with openSession() as session:
         try:
             yield session
         except Exception:
@@ -56,8 +137,8 @@ async def checkDatabaseConnection():
     Verificar que la conexión a base de datos esté funcionando
     """
     try:
-        async with AsyncSessionLocal() as session:
-            await session.execute("SELECT 1")
+        async with getEngine().connect() as connection:
+            await connection.execute(text("SELECT 1"))
             return True
     except Exception as e:
         print(f"Error de conexión a base de datos: {e}")
@@ -69,5 +150,30 @@ async def createTables():
     Crear todas las tablas en la base de datos
     Solo para desarrollo, en producción usar Alembic
     """
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+    async with getEngine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+# Función para abrir de antemano las conexiones del pool
+async def warmUpPool(connections: Optional[int] = None) -> int:
+    """
+    Abrir a la vez las conexiones permanentes del pool y devolverlas, para que las primeras
+    peticiones no paguen la conexión a MySQL; retorna cuántas se abrieron
+    Por defecto DB_POOL_MIN_CONNECTIONS, sin pasar del tamaño del pool
+    SQLite no usa pool de tamaño fijo y no se precalienta
+    """
+    settings = getSettings()
+    engine = getEngine()
+    if connections is None:
+        connections = settings.poolMinConnections
+    connections = min(connections, settings.poolSize)
+    if connections <= 0 or engine.dialect.name == "sqlite":
+        return 0
+    
+    async def openConnection(stack: AsyncExitStack):
+        connection = await stack.enter_async_context(engine.connect())
+        await connection.execute(text("SELECT 1"))
+    
+    # Todas quedan abiertas hasta salir del stack, así el pool crea conexiones distintas
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(*(openConnection(stack) for _ in range(connections)))
+    return connections
@@ -0,0 +1,148 @@
+"""
+Monitor de salud de base de datos con sondeo en segundo plano
+
+/health responde con el último resultado en memoria; una sola tarea hace el
+SELECT 1 cada intervalo, así el sondeo agresivo del balanceador no consume
+conexiones del pool.
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+class DatabaseHealthMonitor:
+    """
+    Sondea la base de datos periódicamente y conserva el último estado y estadísticas del pool
+    """
+    
+    def __init__(self, engine: AsyncEngine, intervalSeconds: float = 5.0, timeoutSeconds: float = 2.0):
+        self.engine = engine
+        self.intervalSeconds = intervalSeconds
+        self.timeoutSeconds = timeoutSeconds
+        self._task: Optional[asyncio.Task] = None
+        
+        # Último resultado del sondeo
+        self.status = "unknown"
+        self.lastCheckedAt: Optional[datetime] = None
+        self.lastError: Optional[str] = None
+        self.lastQueryMs: Optional[float] = None
+        
+        # Espera del checkout del propio sondeo; la de todos los checkouts está en
+        # db_pool_checkout_seconds de /metrics
+        self.lastCheckoutWaitMs: Optional[float] = None
+        self.maxCheckoutWaitMs = 0.0
+        self.totalCheckoutWaitMs = 0.0
+        self.probeCount = 0
+        
+        # Contadores de eventos del pool (baratos, solo incrementos)
+        self.checkoutCount = 0
+        self.connectCount = 0
+        self.invalidatedCount = 0
+        self._registerPoolEvents()
+    
+    def _registerPoolEvents(self):
+        pool = self.engine.sync_engine.pool
+        
+        @event.listens_for(pool, "checkout")
+        def onCheckout(dbapiConnection, connectionRecord, connectionProxy):
+            self.checkoutCount += 1
+        
+        @event.listens_for(pool, "connect")
+        def onConnect(dbapiConnection, connectionRecord):
+            self.connectCount += 1
+        
+        @event.listens_for(pool, "invalidate")
+        def onInvalidate(dbapiConnection, connectionRecord, exception):
+            self.invalidatedCount += 1
+    
+    @property
+    def isConnected(self) -> bool:
+        return self.status == "connected"
+    
+    async def checkOnce(self) -> bool:
+        """
+        Ejecutar un sondeo: esperar conexión del pool, SELECT 1 y registrar tiempos
+        """
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeoutSeconds):
+                async with self.engine.connect() as connection:
+                    checkedOut = time.perf_counter()
+                    await connection.execute(text("SELECT 1"))
+                    finished = time.perf_counter()
+        except Exception as e:
+            self.status = "disconnected"
+            self.lastError = str(e) or type(e).__name__
+            self.lastCheckedAt = datetime.now()
+            return False
+        
+        checkoutWaitMs = (checkedOut - started) * 1000
+        self.status = "connected"
+        self.lastError = None
+        self.lastCheckedAt = datetime.now()
+        self.lastQueryMs = round((finished - checkedOut) * 1000, 3)
+        self.lastCheckoutWaitMs = round(checkoutWaitMs, 3)
+        self.maxCheckoutWaitMs = max(self.maxCheckoutWaitMs, checkoutWaitMs)
+        self.totalCheckoutWaitMs += checkoutWaitMs
+        self.probeCount += 1
+        return True
+    
+    async def _run(self):
+        while True:
+            await self.checkOnce()
+            await asyncio.sleep(self.intervalSeconds)
+    
+    def start(self):
+        """Iniciar el sondeo periódico en el event loop actual"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="database-health-monitor")
+    
+    async def stop(self):
+        """Detener el sondeo periódico"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def getPoolStats(self) -> dict:
+        """
+        Estado actual del pool; los pools sin tamaño fijo (NullPool) solo reportan contadores
+        """
+        pool = self.engine.sync_engine.pool
+        stats = {"poolClass": type(pool).__name__}
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, name, None)
+            if callable(method):
+                stats[name] = method()
+        maxOverflow = getattr(pool, "_max_overflow", None)
+        if maxOverflow is not None:
+            stats["maxOverflow"] = maxOverflow
+            stats["capacity"] = stats.get("size", 0) + maxOverflow
+        stats["checkoutCount"] = self.checkoutCount
+        stats["connectCount"] = self.connectCount
+        stats["invalidatedCount"] = self.invalidatedCount
+        return stats
+    
+    def getDetails(self) -> dict:
+        """
+        Estado completo para /health/details
+        """
+        return {
+            "status": self.status,
+            "lastCheckedAt": self.lastCheckedAt.isoformat() if self.lastCheckedAt else None,
+            "lastError": self.lastError,
+            "intervalSeconds": self.intervalSeconds,
+            "lastQueryMs": self.lastQueryMs,
+            "checkoutWait": {
+                "lastMs": self.lastCheckoutWaitMs,
+                "maxMs": round(self.maxCheckoutWaitMs, 3),
+                "avgMs": round(self.totalCheckoutWaitMs / self.probeCount, 3) if self.probeCount else None,
+                "probeCount": self.probeCount
+            },
+            "pool": self.getPoolStats()
+        }
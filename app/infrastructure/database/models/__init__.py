@@ -3,11 +3,25 @@ Exportar todos los modelos SQLAlchemy
 """
 from .user_model import UserModel
 from .detection_model import DetectionModel
-from .weather_model import WeatherModel
+from .weather_model import WeatherModel, WEATHER_READING_TIME
+from .ingest_key_model import IngestKeyModel
+from .incident_model import IncidentModel
+from .weather_rollup_model import (
+    WeatherRollupMinuteModel, WeatherRollupHourModel, WeatherRollupDayModel, ROLLUP_MODELS
+)
+from .fire_weather_model import FireWeatherDailyModel
 
 # Exportar modelos para que Alembic los detecte
 __all__ = [
     "UserModel",
     "DetectionModel", 
-    "WeatherModel"
+    "WeatherModel",
+    "WEATHER_READING_TIME",
+    "IngestKeyModel",
+    "IncidentModel",
+    "WeatherRollupMinuteModel",
+    "WeatherRollupHourModel",
+    "WeatherRollupDayModel",
+    "ROLLUP_MODELS",
+    "FireWeatherDailyModel"
 ]
\ No newline at end of file
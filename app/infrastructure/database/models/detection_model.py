@@ -1,9 +1,9 @@
 """
 Modelo SQLAlchemy para tabla detections
 """
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, Index
 from sqlalchemy.sql import func
-from app.infrastructure.database.connection import Base
+from app.infrastructure.database.connection import Base, CreatedAtType
 
 class DetectionModel(Base):
     __tablename__ = "detections"
@@ -22,10 +22,22 @@ class DetectionModel(Base):
     imagePath = Column(String(255), nullable=True)
     cameraId = Column(String(50), nullable=True, index=True)
     processed = Column(Boolean, default=False, nullable=False, index=True)
+    # Puntaje del motor de correlación, lo asigna el worker al procesar la detección
+    riskScore = Column(Float, nullable=True)
+    # Incidente asignado al ingerir (sin llave foránea: MySQL no las admite en tablas particionadas)
+    incidentId = Column(Integer, nullable=True, index=True)
     
     # Timestamps
     timestamp = Column(DateTime(timezone=True), nullable=True)
-    createdAt = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    # Columna de partición mensual en MySQL; allí la llave primaria es (id, createdAt) (migración 004)
+    createdAt = Column(CreatedAtType, server_default=func.now(), nullable=False, index=True)
+    
+    # Índices compuestos para filtros + paginación keyset sobre (createdAt, id)
+    __table_args__ = (
+        Index("ix_detections_cameraId_createdAt", "cameraId", "createdAt"),
+        Index("ix_detections_detectionType_createdAt", "detectionType", "createdAt"),
+        Index("ix_detections_processed_createdAt", "processed", "createdAt"),
+    )
     
     def __repr__(self):
         return f"<DetectionModel(id={self.id}, type='{self.detectionType}', confidence={self.confidence})>"
\ No newline at end of file
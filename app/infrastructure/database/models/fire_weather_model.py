@@ -0,0 +1,36 @@
+"""
+Modelo SQLAlchemy para tabla fire_weather_daily
+Caché de índices de peligro de incendio por sensor y día
+"""
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy.sql import func
+from app.infrastructure.database.connection import Base
+
+class FireWeatherDailyModel(Base):
+    __tablename__ = "fire_weather_daily"
+    
+    sensorId = Column(String(50), primary_key=True)
+    dayStart = Column(DateTime, primary_key=True, index=True)  # Mismo bucket que weather_rollup_1d
+    
+    # Entradas del día: mediodía y lluvia acumulada
+    temperature = Column(Float, nullable=True)
+    humidity = Column(Float, nullable=True)
+    windSpeed = Column(Float, nullable=True)
+    rainfall = Column(Float, nullable=True)
+    
+    # Códigos que se arrastran al día siguiente y los índices del día (nulos si faltan entradas)
+    ffmc = Column(Float, nullable=True)
+    dmc = Column(Float, nullable=True)
+    dc = Column(Float, nullable=True)
+    isi = Column(Float, nullable=True)
+    bui = Column(Float, nullable=True)
+    fwi = Column(Float, nullable=True)
+    ffwi = Column(Float, nullable=True)
+    ffwiMax = Column(Float, nullable=True)  # Máximo horario del día
+    
+    # recordCount del rollup diario usado: si cambia, el día (y los siguientes) se recalcula
+    sourceRecordCount = Column(Integer, nullable=False)
+    updatedAt = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<FireWeatherDailyModel(sensorId='{self.sensorId}', dayStart={self.dayStart}, fwi={self.fwi})>"
@@ -0,0 +1,46 @@
+"""
+Modelo SQLAlchemy para tabla incidents
+"""
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
+from sqlalchemy.sql import func
+from app.infrastructure.database.connection import Base, CreatedAtType
+
+class IncidentModel(Base):
+    __tablename__ = "incidents"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    cameraId = Column(String(50), nullable=False)
+    detectionType = Column(String(50), nullable=False)
+    
+    # Tiempo del evento (timestamp de las detecciones)
+    firstSeen = Column(DateTime(timezone=True), nullable=False)
+    lastSeen = Column(DateTime(timezone=True), nullable=False)
+    
+    # Agregados de las detecciones enlazadas
+    detectionCount = Column(Integer, nullable=False, default=1)
+    peakConfidence = Column(Float, nullable=False)
+    
+    # Envolvente de los bounding box
+    bboxMinX = Column(Integer, nullable=True)
+    bboxMinY = Column(Integer, nullable=True)
+    bboxMaxX = Column(Integer, nullable=True)
+    bboxMaxY = Column(Integer, nullable=True)
+    
+    # Último bbox (x1, y1, x2, y2) con el que se compara la siguiente detección
+    lastBboxMinX = Column(Integer, nullable=True)
+    lastBboxMinY = Column(Integer, nullable=True)
+    lastBboxMaxX = Column(Integer, nullable=True)
+    lastBboxMaxY = Column(Integer, nullable=True)
+    
+    createdAt = Column(CreatedAtType, server_default=func.now(), nullable=False, index=True)
+    updatedAt = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Índices para filtros por cámara/tipo sobre incidentes recientes
+    __table_args__ = (
+        Index("ix_incidents_cameraId_lastSeen", "cameraId", "lastSeen"),
+        Index("ix_incidents_detectionType_lastSeen", "detectionType", "lastSeen"),
+        Index("ix_incidents_lastSeen", "lastSeen"),
+    )
+    
+    def __repr__(self):
+        return f"<IncidentModel(id={self.id}, cameraId='{self.cameraId}', type='{self.detectionType}', count={self.detectionCount})>"
@@ -0,0 +1,24 @@
+"""
+Modelo SQLAlchemy para tabla ingest_keys
+"""
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.infrastructure.database.connection import Base, CreatedAtType
+
+class IngestKeyModel(Base):
+    __tablename__ = "ingest_keys"
+    
+    # La llave primaria (dataset, keyHash) es el índice único que impide duplicados
+    # entre workers; tabla aparte porque en las tablas particionadas toda llave única
+    # debe incluir createdAt
+    dataset = Column(String(20), primary_key=True)
+    keyHash = Column(String(32), primary_key=True)
+    
+    # ID del registro original en detections o weather_data
+    recordId = Column(Integer, nullable=False)
+    
+    # Las llaves expiran después de IDEMPOTENCY_WINDOW_SECONDS
+    createdAt = Column(CreatedAtType, server_default=func.now(), nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<IngestKeyModel(dataset='{self.dataset}', keyHash='{self.keyHash}', recordId={self.recordId})>"
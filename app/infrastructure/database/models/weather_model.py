@@ -1,9 +1,9 @@
 """
 Modelo SQLAlchemy para tabla weather_data
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
 from sqlalchemy.sql import func
-from app.infrastructure.database.connection import Base
+from app.infrastructure.database.connection import Base, CreatedAtType
 
 class WeatherModel(Base):
     __tablename__ = "weather_data"
@@ -23,7 +23,20 @@ class WeatherModel(Base):
     
     # Timestamps
     timestamp = Column(DateTime(timezone=True), nullable=True)
-    createdAt = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    # Columna de partición mensual en MySQL; allí la llave primaria es (id, createdAt) (migración 004)
+    createdAt = Column(CreatedAtType, server_default=func.now(), nullable=False, index=True)
+    
+    # Índices compuestos para filtros por sensor y rangos de tiempo
+    __table_args__ = (
+        Index("ix_weather_data_sensorId_createdAt", "sensorId", "createdAt"),
+        Index("ix_weather_data_sensorId_timestamp", "sensorId", "timestamp"),
+        Index("ix_weather_data_timestamp", "timestamp"),
+    )
     
     def __repr__(self):
-        return f"<WeatherModel(id={self.id}, temp={self.temperature}, humidity={self.humidity})>"
\ No newline at end of file
+        return f"<WeatherModel(id={self.id}, temp={self.temperature}, humidity={self.humidity})>"
+
+# Instante de cada lectura: timestamp del sensor o, si no lo trae, el de ingesta.
+# Las consultas por ventana filtran por esta misma expresión para que usen su índice
+WEATHER_READING_TIME = func.coalesce(WeatherModel.timestamp, WeatherModel.createdAt)
+Index("ix_weather_data_readingTime", WEATHER_READING_TIME)
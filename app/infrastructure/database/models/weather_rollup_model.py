@@ -0,0 +1,45 @@
+"""
+Modelos SQLAlchemy para tablas de rollups meteorológicos
+weather_rollup_1m, weather_rollup_1h y weather_rollup_1d comparten estructura
+"""
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy.sql import func
+from app.infrastructure.database.connection import Base
+
+class WeatherRollupMixin:
+    """Columnas comunes: suma, conteo, mínimo y máximo por sensor y bucket"""
+    sensorId = Column(String(50), primary_key=True)
+    bucketStart = Column(DateTime, primary_key=True, index=True)
+    
+    recordCount = Column(Integer, nullable=False, default=0)
+    temperatureSum = Column(Float, nullable=False, default=0.0)
+    temperatureCount = Column(Integer, nullable=False, default=0)
+    temperatureMin = Column(Float, nullable=True)
+    temperatureMax = Column(Float, nullable=True)
+    humiditySum = Column(Float, nullable=False, default=0.0)
+    humidityCount = Column(Integer, nullable=False, default=0)
+    windSpeedSum = Column(Float, nullable=False, default=0.0)
+    windSpeedCount = Column(Integer, nullable=False, default=0)
+    rainfallSum = Column(Float, nullable=False, default=0.0)
+    rainfallCount = Column(Integer, nullable=False, default=0)
+    
+    updatedAt = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<{type(self).__name__}(sensorId='{self.sensorId}', bucketStart={self.bucketStart}, count={self.recordCount})>"
+
+class WeatherRollupMinuteModel(WeatherRollupMixin, Base):
+    __tablename__ = "weather_rollup_1m"
+
+class WeatherRollupHourModel(WeatherRollupMixin, Base):
+    __tablename__ = "weather_rollup_1h"
+
+class WeatherRollupDayModel(WeatherRollupMixin, Base):
+    __tablename__ = "weather_rollup_1d"
+
+# Modelo por resolución
+ROLLUP_MODELS = {
+    "1m": WeatherRollupMinuteModel,
+    "1h": WeatherRollupHourModel,
+    "1d": WeatherRollupDayModel,
+}
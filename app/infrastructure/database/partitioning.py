@@ -0,0 +1,175 @@
+"""
+Particionado mensual por RANGE COLUMNS(createdAt) para detections y weather_data (MySQL)
+
+Solo genera DDL y planifica ventanas; no abre conexiones, así se puede revisar
+sin un MySQL disponible. La ejecución vive en app/jobs/partition_maintenance.py
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+PARTITIONED_TABLES = ("detections", "weather_data")
+PARTITION_COLUMN = "createdAt"
+# Partición abierta al final; las nuevas se crean dividiéndola
+FUTURE_PARTITION = "pfuture"
+ARCHIVE_TABLE_SUFFIX = "_archive_"
+
+# createdAt se asigna al insertar, después de medir: timestamp >= X implica
+# createdAt >= X - tolerancia (relojes de sensores adelantados)
+EVENT_TIME_SKEW = timedelta(hours=24)
+
+@dataclass(frozen=True)
+class PartitionWindow:
+    """Partición mensual [start, end)"""
+    name: str
+    start: datetime
+    end: datetime
+
+@dataclass
+class PartitionPlan:
+    """Cambios pendientes para una tabla"""
+    table: str
+    create: List[PartitionWindow] = field(default_factory=list)
+    expire: List[str] = field(default_factory=list)
+    
+    @property
+    def isEmpty(self) -> bool:
+        return not self.create and not self.expire
+
+def monthStart(value: datetime) -> datetime:
+    """Inicio del mes de una fecha"""
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+def addMonths(value: datetime, months: int) -> datetime:
+    """Sumar meses a un inicio de mes"""
+    monthIndex = value.year * 12 + (value.month - 1) + months
+    return value.replace(year=monthIndex // 12, month=monthIndex % 12 + 1)
+
+def partitionName(start: datetime) -> str:
+    return f"p{start:%Y%m}"
+
+def parsePartitionName(name: str) -> Optional[datetime]:
+    """Inicio del mes de una partición pYYYYMM, None para pfuture u otras"""
+    try:
+        return datetime.strptime(name, "p%Y%m")
+    except ValueError:
+        return None
+
+def monthlyWindows(start: datetime, end: datetime) -> List[PartitionWindow]:
+    """Particiones mensuales que cubren [start, end)"""
+    windows = []
+    current = monthStart(start)
+    while current < end:
+        following = addMonths(current, 1)
+        windows.append(PartitionWindow(partitionName(current), current, following))
+        current = following
+    return windows
+
+def createdAtLowerBound(startDate: datetime) -> datetime:
+    """
+    Límite inferior de createdAt para una consulta por timestamp >= startDate
+    Permite a MySQL descartar particiones anteriores sin perder lecturas
+    """
+    return startDate - EVENT_TIME_SKEW
+
+def planPartitionMaintenance(
+    table: str,
+    existingNames: Iterable[str],
+    now: datetime,
+    monthsAhead: int,
+    retentionMonths: int
+) -> PartitionPlan:
+    """
+    Planificar particiones a crear (mes actual + monthsAhead) y a expirar
+    retentionMonths=0 conserva todo; nunca expira el mes actual ni pfuture
+    """
+    plan = PartitionPlan(table)
+    existingMonths = sorted(filter(None, (parsePartitionName(name) for name in existingNames)))
+    current = monthStart(now)
+    
+    # Solo se puede agregar al final (dividiendo pfuture); si el job dejó de correr,
+    # los meses faltantes se crean uno por uno para que sus filas salgan de pfuture
+    firstMissing = addMonths(existingMonths[-1], 1) if existingMonths else current
+    plan.create = monthlyWindows(firstMissing, addMonths(current, monthsAhead + 1))
+    
+    if retentionMonths > 0:
+        cutoff = addMonths(current, -retentionMonths)
+        plan.expire = [partitionName(month) for month in existingMonths if addMonths(month, 1) <= cutoff]
+    return plan
+
+def formatBoundary(value: datetime) -> str:
+    return f"'{value:%Y-%m-%d %H:%M:%S}'"
+
+def partitionDefinitions(windows: Iterable[PartitionWindow]) -> List[str]:
+    definitions = [
+        f"PARTITION {window.name} VALUES LESS THAN ({formatBoundary(window.end)})" for window in windows
+    ]
+    definitions.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return definitions
+
+def primaryKeyDdl(table: str) -> str:
+    """
+    Toda llave única de una tabla particionada debe incluir la columna de partición
+    """
+    return f"ALTER TABLE `{table}` DROP PRIMARY KEY, ADD PRIMARY KEY (`id`, `{PARTITION_COLUMN}`)"
+
+def restorePrimaryKeyDdl(table: str) -> str:
+    return f"ALTER TABLE `{table}` DROP PRIMARY KEY, ADD PRIMARY KEY (`id`)"
+
+def partitionTableDdl(table: str, windows: List[PartitionWindow]) -> str:
+    """
+    Particionar una tabla existente; la primera ventana debe cubrir la fila más antigua
+    """
+    definitions = ",\n    ".join(partitionDefinitions(windows))
+    return f"ALTER TABLE `{table}` PARTITION BY RANGE COLUMNS(`{PARTITION_COLUMN}`) (\n    {definitions}\n)"
+
+def removePartitioningDdl(table: str) -> str:
+    return f"ALTER TABLE `{table}` REMOVE PARTITIONING"
+
+def addPartitionsDdl(table: str, windows: List[PartitionWindow]) -> str:
+    """
+    Crear meses nuevos dividiendo pfuture; normalmente está vacía y la operación es inmediata
+    """
+    definitions = ",\n    ".join(partitionDefinitions(windows))
+    return f"ALTER TABLE `{table}` REORGANIZE PARTITION {FUTURE_PARTITION} INTO (\n    {definitions}\n)"
+
+def dropPartitionsDdl(table: str, names: List[str]) -> str:
+    """Eliminar particiones completas sin DELETE fila por fila"""
+    return f"ALTER TABLE `{table}` DROP PARTITION {', '.join(names)}"
+
+def archiveTableName(table: str, name: str) -> str:
+    return f"{table}{ARCHIVE_TABLE_SUFFIX}{name[1:]}"
+
+def archivePartitionDdl(table: str, name: str) -> List[str]:
+    """
+    Mover una partición a una tabla propia (EXCHANGE PARTITION intercambia metadatos,
+    no copia filas) y luego eliminar la partición vacía
+    """
+    archiveTable = archiveTableName(table, name)
+    return [
+        f"CREATE TABLE `{archiveTable}` LIKE `{table}`",
+        removePartitioningDdl(archiveTable),
+        f"ALTER TABLE `{table}` EXCHANGE PARTITION {name} WITH TABLE `{archiveTable}`",
+        dropPartitionsDdl(table, [name])
+    ]
+
+def maintenanceStatements(plan: PartitionPlan, retentionMode: str = "drop") -> List[str]:
+    """
+    DDL para aplicar un plan; retentionMode "archive" conserva cada mes expirado en una tabla
+    """
+    statements = []
+    if plan.create:
+        statements.append(addPartitionsDdl(plan.table, plan.create))
+    if plan.expire:
+        if retentionMode == "archive":
+            for name in plan.expire:
+                statements.extend(archivePartitionDdl(plan.table, name))
+        else:
+            statements.append(dropPartitionsDdl(plan.table, plan.expire))
+    return statements
+
+EXISTING_PARTITIONS_SQL = """
+SELECT PARTITION_NAME FROM information_schema.PARTITIONS
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :tableName AND PARTITION_NAME IS NOT NULL
+ORDER BY PARTITION_ORDINAL_POSITION
+"""
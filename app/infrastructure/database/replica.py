@@ -0,0 +1,223 @@
+"""
+Enrutamiento de lecturas a una réplica con fallback al primario según su atraso
+
+El atraso se mide con marcas de agua de las tablas de ingesta: la fila más nueva que
+ya llegó a la réplica (MAX(createdAt), por índice) y la más antigua del primario que
+todavía no llegó. Así funciona igual con replicación de MySQL que con dos archivos
+SQLite en desarrollo, sin privilegios de REPLICATION CLIENT.
+
+Los GET y las consultas analíticas usan la réplica mientras su atraso esté bajo el
+umbral; las escrituras siempre van al primario. Tras una escritura el cliente recibe
+una cookie que fija sus lecturas al primario unos segundos (read-your-writes).
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Callable, Optional
+from fastapi import Request
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from app.infrastructure.database.models import DetectionModel, WeatherModel
+
+SessionFactory = Callable[[], AsyncSession]
+
+# Tablas cuya ingesta se usa como marca de agua de replicación
+WATERMARK_MODELS = (DetectionModel, WeatherModel)
+
+# Cookie con el instante (epoch) hasta el que las lecturas van al primario
+STICKY_COOKIE_NAME = "dbPrimaryUntil"
+
+# Métodos que nunca escriben
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+class ReplicaLagMonitor:
+    """
+    Mide periódicamente el atraso de la réplica respecto al primario
+    """
+    
+    def __init__(
+        self,
+        primaryEngine: AsyncEngine,
+        replicaEngine: AsyncEngine,
+        maxLagSeconds: float = 5.0,
+        intervalSeconds: float = 2.0,
+        timeoutSeconds: float = 2.0
+    ):
+        self.primaryEngine = primaryEngine
+        self.replicaEngine = replicaEngine
+        self.maxLagSeconds = maxLagSeconds
+        self.intervalSeconds = intervalSeconds
+        self.timeoutSeconds = timeoutSeconds
+        self._task: Optional[asyncio.Task] = None
+        
+        # Último resultado: unknown, ok, lagging o down
+        self.status = "unknown"
+        self.lagSeconds: Optional[float] = None
+        self.lastCheckedAt: Optional[datetime] = None
+        self.lastError: Optional[str] = None
+    
+    @property
+    def usable(self) -> bool:
+        return self.status == "ok"
+    
+    async def measureLag(self) -> float:
+        """
+        Segundos desde la escritura más antigua del primario que aún no está en la réplica;
+        0 si la réplica tiene todo
+        """
+        lag = 0.0
+        async with self.replicaEngine.connect() as replica, self.primaryEngine.connect() as primary:
+            for model in WATERMARK_MODELS:
+                replicated = (await replica.execute(select(func.max(model.createdAt)))).scalar()
+                query = select(func.min(model.createdAt), func.current_timestamp())
+                if replicated is not None:
+                    query = query.where(model.createdAt > replicated)
+                oldestMissing, primaryNow = (await primary.execute(query)).one()
+                if oldestMissing is not None:
+                    lag = max(lag, (primaryNow.replace(tzinfo=None) - oldestMissing.replace(tzinfo=None)).total_seconds())
+        return max(0.0, lag)
+    
+    async def checkOnce(self) -> bool:
+        """Medir y actualizar el estado; retorna si la réplica se puede usar"""
+        try:
+            async with asyncio.timeout(self.timeoutSeconds):
+                self.lagSeconds = await self.measureLag()
+        except Exception as e:
+            self.status = "down"
+            self.lagSeconds = None
+            self.lastError = str(e) or type(e).__name__
+        else:
+            self.status = "ok" if self.lagSeconds <= self.maxLagSeconds else "lagging"
+            self.lastError = None
+        self.lastCheckedAt = datetime.now()
+        return self.usable
+    
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.intervalSeconds)
+            await self.checkOnce()
+    
+    def start(self):
+        """Iniciar la medición periódica en el event loop actual"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="replica-lag-monitor")
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def getStats(self) -> dict:
+        return {
+            "status": self.status,
+            "lagSeconds": round(self.lagSeconds, 3) if self.lagSeconds is not None else None,
+            "maxLagSeconds": self.maxLagSeconds,
+            "lastCheckedAt": self.lastCheckedAt.isoformat() if self.lastCheckedAt else None,
+            "lastError": self.lastError
+        }
+
+class ReadRouter:
+    """
+    Decide qué base atiende cada lectura: réplica si está al día y el cliente no
+    escribió hace poco, si no el primario
+    """
+    
+    def __init__(self, primarySessionFactory: SessionFactory, stickySeconds: float = 5.0):
+        self.primarySessionFactory = primarySessionFactory
+        self.stickySeconds = stickySeconds
+        self.replicaSessionFactory: Optional[SessionFactory] = None
+        self.lagMonitor: Optional[ReplicaLagMonitor] = None
+        
+        # Contadores expuestos en estadísticas
+        self.replicaReads = 0
+        self.primaryReads = 0
+        self.stickyReads = 0
+        self.fallbackReads = 0
+    
+    def attachReplica(self, replicaSessionFactory: SessionFactory, lagMonitor: ReplicaLagMonitor):
+        self.replicaSessionFactory = replicaSessionFactory
+        self.lagMonitor = lagMonitor
+    
+    def detachReplica(self):
+        self.replicaSessionFactory = None
+        self.lagMonitor = None
+    
+    @property
+    def enabled(self) -> bool:
+        return self.replicaSessionFactory is not None
+    
+    @staticmethod
+    def isSticky(request: Optional[Request]) -> bool:
+        """El cliente escribió hace menos de stickySeconds"""
+        if request is None:
+            return False
+        try:
+            return float(request.cookies.get(STICKY_COOKIE_NAME, "0")) > time.time()
+        except ValueError:
+            return False
+    
+    def sessionFactoryFor(self, request: Optional[Request] = None) -> SessionFactory:
+        """Fábrica de sesiones para una lectura; sin request no hay stickiness (tareas de fondo)"""
+        if not self.enabled:
+            self.primaryReads += 1
+            return self.primarySessionFactory
+        if self.isSticky(request):
+            self.stickyReads += 1
+            return self.primarySessionFactory
+        if not self.lagMonitor.usable:
+            self.fallbackReads += 1
+            return self.primarySessionFactory
+        self.replicaReads += 1
+        return self.replicaSessionFactory
+    
+    async def readSession(self, request: Request):
+        """
+        Dependency para endpoints de solo lectura
+        """
+        async with self.sessionFactoryFor(request)() as session:
+            try:
+                yield session
+            except Exception:
+                await session.rollback()
+                raise
+            finally:
+                await session.close()
+    
+    def getStats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "stickySeconds": self.stickySeconds,
+            "replica": self.lagMonitor.getStats() if self.lagMonitor else None,
+            "replicaReads": self.replicaReads,
+            "primaryReads": self.primaryReads,
+            "stickyReads": self.stickyReads,
+            "fallbackReads": self.fallbackReads
+        }
+
+class ReadYourWritesMiddleware:
+    """
+    Middleware ASGI puro: en respuestas exitosas a métodos que escriben agrega la cookie
+    que fija las lecturas del cliente al primario durante stickySeconds
+    """
+    
+    def __init__(self, app, stickySeconds: float = 5.0):
+        self.app = app
+        self.stickySeconds = stickySeconds
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or self.stickySeconds <= 0:
+            await self.app(scope, receive, send)
+            return
+        
+        async def sendWithCookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.stickySeconds
+                cookie = f"{STICKY_COOKIE_NAME}={until:.3f}; Max-Age={int(self.stickySeconds) + 1}; Path=/; HttpOnly; SameSite=Lax"
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+        
+        await self.app(scope, receive, sendWithCookie)
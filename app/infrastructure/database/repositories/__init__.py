@@ -0,0 +1,37 @@
+"""
+Exportar repositorios de acceso a datos
+"""
+from .base import insertRows, upsertStatement, autoIncrementStep, INSERT_CHUNK_SIZE
+from .pagination import encodeCursor, decodeCursor, InvalidCursorError
+from .detection_repository import (
+    buildDetectionRow, insertDetectionRows, listDetections, loadDetectionColumns, loadLatestDetections,
+    detectionColumnsFromRows, claimUnprocessedDetections, markDetectionsProcessed, oldestUnprocessedCreatedAt,
+    loadDetectionImagePath, setDetectionImagePath, DEFAULT_CAMERA_ID
+)
+from .weather_repository import (
+    buildWeatherRow, insertWeatherRows, ingestWeatherRows, listWeatherData, loadWeatherColumns, loadLatestWeather,
+    loadWeatherSeriesColumns, WEATHER_SERIES_FIELDS, DEFAULT_SENSOR_ID
+)
+from .weather_rollup_repository import upsertWeatherRollups, summarizeWeatherRange
+from .archive_repository import loadArchivedIdsInDatabase
+from .fire_weather_repository import refreshFireWeather, listFireWeather, findPendingFireWeatherDays
+from .incident_repository import assignIncidents, listIncidents
+from .ingest_key_repository import (
+    findIngestKey, insertIngestKey, insertIngestKeysIgnoringDuplicates, claimIngestKeys, assignIngestKeyRecords,
+    loadRecentIngestKeys, purgeIngestKeys
+)
+
+__all__ = [
+    "insertRows", "upsertStatement", "autoIncrementStep", "INSERT_CHUNK_SIZE",
+    "encodeCursor", "decodeCursor", "InvalidCursorError",
+    "buildDetectionRow", "insertDetectionRows", "listDetections", "loadDetectionColumns", "loadLatestDetections", "DEFAULT_CAMERA_ID",
+    "detectionColumnsFromRows", "claimUnprocessedDetections", "markDetectionsProcessed", "oldestUnprocessedCreatedAt",
+    "loadDetectionImagePath", "setDetectionImagePath",
+    "buildWeatherRow", "insertWeatherRows", "ingestWeatherRows", "listWeatherData", "loadWeatherColumns", "loadLatestWeather", "DEFAULT_SENSOR_ID",
+    "loadWeatherSeriesColumns", "WEATHER_SERIES_FIELDS",
+    "upsertWeatherRollups", "summarizeWeatherRange", "loadArchivedIdsInDatabase",
+    "refreshFireWeather", "listFireWeather", "findPendingFireWeatherDays",
+    "assignIncidents", "listIncidents",
+    "findIngestKey", "insertIngestKey", "insertIngestKeysIgnoringDuplicates", "claimIngestKeys", "assignIngestKeyRecords",
+    "loadRecentIngestKeys", "purgeIngestKeys"
+]
@@ -0,0 +1,32 @@
+"""
+Repositorio del almacenamiento frío - Filas archivadas que todavía siguen en la base
+"""
+from datetime import datetime
+from typing import Optional
+import numpy as np
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.archive import ColdArchive
+
+async def loadArchivedIdsInDatabase(
+    session: AsyncSession,
+    archive: ColdArchive,
+    model,
+    startDate: Optional[datetime] = None,
+    endDate: Optional[datetime] = None,
+    timeColumn: str = "createdAt"
+) -> Optional[np.ndarray]:
+    """
+    IDs de la base que caen en el rango de IDs de archivos pendientes de borrado
+    Se pasan como excludeIds al leer el archivo; None si no hay archivos pendientes
+    """
+    idRanges = [
+        model.id.between(entry["minId"], entry["maxId"])
+        for entry in archive.pendingEntries(model.__tablename__, startDate=startDate, endDate=endDate, timeColumn=timeColumn)
+        if entry["minId"] is not None
+    ]
+    if not idRanges:
+        return None
+    
+    stmt = select(model.id).where(or_(*idRanges))
+    return np.array((await session.execute(stmt)).scalars().all(), dtype=np.int64)
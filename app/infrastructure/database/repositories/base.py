@@ -0,0 +1,103 @@
+"""
+Operaciones comunes de escritura masiva para los repositorios
+"""
+from typing import Callable, List, Optional, Sequence
+from sqlalchemy import func, insert, text
+from sqlalchemy.dialects.mysql import insert as mysqlInsert
+from sqlalchemy.dialects.postgresql import insert as postgresqlInsert
+from sqlalchemy.dialects.sqlite import insert as sqliteInsert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Filas por sentencia INSERT, mantiene cada paquete por debajo de max_allowed_packet
+INSERT_CHUNK_SIZE = 1000
+
+# @@auto_increment_increment de MySQL, consultado una vez por proceso (al arrancar o en el primer INSERT)
+_autoIncrementStep: Optional[int] = None
+
+async def autoIncrementStep(connection) -> int:
+    """
+    Paso de AUTO_INCREMENT del servidor MySQL; connection puede ser sesión o conexión
+    Con un paso distinto de 1 (replicación multi-primario, Galera) los IDs de un INSERT
+    multi-fila no son consecutivos y insertRows inserta fila por fila
+    """
+    global _autoIncrementStep
+    if _autoIncrementStep is None:
+        _autoIncrementStep = int((await connection.execute(text("SELECT @@auto_increment_increment"))).scalar())
+    return _autoIncrementStep
+
+async def insertRows(session: AsyncSession, model, rows: Sequence[dict], chunkSize: int = INSERT_CHUNK_SIZE) -> List[int]:
+    """
+    Insertar filas con un INSERT multi-fila por bloque y retornar los IDs asignados en orden
+    No hace commit, la transacción queda a cargo de quien llama
+    """
+    if not rows:
+        return []
+    
+    dialect = session.get_bind().dialect
+    insertedIds: List[int] = []
+    
+    for start in range(0, len(rows), chunkSize):
+        chunk = list(rows[start:start + chunkSize])
+        
+        if dialect.name == "sqlite":
+            # SQLite: el executemany ordenado del ORM termina en un INSERT por fila; el executemany
+            # de Core agrupa filas en INSERT multi-fila con la sentencia compilada en caché.
+            # Los rowids se asignan crecientes en el orden de VALUES aunque RETURNING no lo garantice
+            table = model.__table__
+            result = await session.execute(insert(table).returning(table.c.id), chunk)
+            insertedIds.extend(sorted(result.scalars().all()))
+        elif dialect.insert_executemany_returning_sort_by_parameter_order:
+            # PostgreSQL: INSERT ... VALUES (...), (...) RETURNING id en el orden de los parámetros
+            result = await session.execute(
+                insert(model).returning(model.id, sort_by_parameter_order=True),
+                chunk
+            )
+            insertedIds.extend(result.scalars().all())
+        elif await autoIncrementStep(session) == 1:
+            # MySQL: un solo INSERT multi-fila, LAST_INSERT_ID() es el ID de la primera fila
+            # e InnoDB reserva de una vez IDs consecutivos para un "simple insert" (cantidad de
+            # filas conocida) con cualquier innodb_autoinc_lock_mode; supone paso 1
+            result = await session.execute(insert(model).values(chunk))
+            firstId = result.lastrowid
+            insertedIds.extend(range(firstId, firstId + len(chunk)))
+        else:
+            # MySQL con auto_increment_increment > 1: el ID de cada fila sale de su propio INSERT
+            for row in chunk:
+                result = await session.execute(insert(model).values(row))
+                insertedIds.append(result.lastrowid)
+    
+    return insertedIds
+
+def upsertStatement(
+    session: AsyncSession,
+    model,
+    keyColumns: Sequence[str],
+    buildUpdate: Callable[[object], dict]
+):
+    """
+    Construir un INSERT que actualiza las filas existentes según el dialecto
+    buildUpdate recibe la referencia a los valores nuevos (VALUES()/excluded) y retorna el SET
+    Se ejecuta con una lista de filas (executemany): la sentencia se compila una vez y queda
+    en caché, el driver la agrupa en INSERT multi-fila
+    """
+    dialectName = session.get_bind().dialect.name
+    table = model.__table__
+    
+    if dialectName == "mysql":
+        stmt = mysqlInsert(table)
+        return stmt.on_duplicate_key_update(buildUpdate(stmt.inserted))
+    
+    if dialectName in ("sqlite", "postgresql"):
+        insertFactory = sqliteInsert if dialectName == "sqlite" else postgresqlInsert
+        stmt = insertFactory(table)
+        return stmt.on_conflict_do_update(index_elements=list(keyColumns), set_=buildUpdate(stmt.excluded))
+    
+    raise NotImplementedError(f"Upsert no soportado para el dialecto {dialectName}")
+
+def leastFunction(session: AsyncSession):
+    """LEAST escalar del dialecto (SQLite usa min con varios argumentos)"""
+    return func.min if session.get_bind().dialect.name == "sqlite" else func.least
+
+def greatestFunction(session: AsyncSession):
+    """GREATEST escalar del dialecto (SQLite usa max con varios argumentos)"""
+    return func.max if session.get_bind().dialect.name == "sqlite" else func.greatest
@@ -0,0 +1,222 @@
+"""
+Repositorio de detecciones - Acceso a tabla detections
+"""
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import Row, case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.entities import DetectionCreate, DetectionFilter, DetectionResponse
+from app.domain.services import DetectionColumns, datetimesToEpoch, toFloatArray, factorize
+from app.infrastructure.database.models import DetectionModel
+from app.infrastructure.database.partitioning import createdAtLowerBound
+from .base import insertRows
+from .pagination import keysetCondition, keysetOrder, splitPage
+
+DEFAULT_CAMERA_ID = "THERMAL_CAM_001"
+
+# Columnas del listado en el orden de DetectionResponse: las filas se serializan sin instanciar el ORM
+DETECTION_LIST_COLUMNS = [getattr(DetectionModel, name) for name in DetectionResponse.__fields__]
+
+def buildDetectionRow(detectionData: DetectionCreate) -> dict:
+    """
+    Convertir una detección validada en fila lista para insertar
+    """
+    return {
+        "detectionType": detectionData.detectionType,
+        "confidence": detectionData.confidence,
+        "bboxX": detectionData.bboxX,
+        "bboxY": detectionData.bboxY,
+        "bboxWidth": detectionData.bboxWidth,
+        "bboxHeight": detectionData.bboxHeight,
+        "imagePath": detectionData.imagePath,
+        "cameraId": detectionData.cameraId or DEFAULT_CAMERA_ID,
+        "timestamp": detectionData.timestamp or datetime.now(),
+        "processed": False
+    }
+
+async def insertDetectionRows(session: AsyncSession, rows: Sequence[dict]) -> List[int]:
+    """
+    Insertar detecciones con INSERT multi-fila, retorna IDs en el orden recibido
+    """
+    return await insertRows(session, DetectionModel, rows)
+
+def detectionFilterConditions(filters: DetectionFilter) -> list:
+    """
+    Traducir DetectionFilter a condiciones SQL; las fechas filtran por createdAt
+    """
+    conditions = []
+    if filters.detectionType is not None:
+        conditions.append(DetectionModel.detectionType == filters.detectionType.lower())
+    if filters.cameraId is not None:
+        conditions.append(DetectionModel.cameraId == filters.cameraId)
+    if filters.processed is not None:
+        conditions.append(DetectionModel.processed == filters.processed)
+    if filters.incidentId is not None:
+        conditions.append(DetectionModel.incidentId == filters.incidentId)
+    if filters.minConfidence is not None:
+        conditions.append(DetectionModel.confidence >= filters.minConfidence)
+    if filters.startDate is not None:
+        conditions.append(DetectionModel.createdAt >= filters.startDate)
+    if filters.endDate is not None:
+        conditions.append(DetectionModel.createdAt < filters.endDate)
+    return conditions
+
+async def listDetections(
+    session: AsyncSession,
+    filters: DetectionFilter,
+    pageSize: int,
+    cursor: Optional[str] = None,
+    includeTotal: bool = False
+) -> Tuple[List[Row], Optional[str], Optional[int]]:
+    """
+    Página de detecciones con paginación keyset
+    Retorna (filas con DETECTION_LIST_COLUMNS, cursor siguiente, total); el total solo se cuenta si se solicita
+    """
+    conditions = detectionFilterConditions(filters)
+    afterCursor = keysetCondition(DetectionModel, cursor)
+    
+    stmt = select(*DETECTION_LIST_COLUMNS).where(*conditions).order_by(*keysetOrder(DetectionModel)).limit(pageSize + 1)
+    if afterCursor is not None:
+        stmt = stmt.where(afterCursor)
+    
+    rows = list((await session.execute(stmt)).all())
+    page, nextCursor = splitPage(rows, pageSize)
+    
+    totalCount = None
+    if includeTotal:
+        totalCount = (await session.execute(
+            select(func.count()).select_from(DetectionModel).where(*conditions)
+        )).scalar_one()
+    
+    return page, nextCursor, totalCount
+
+async def loadLatestDetections(session: AsyncSession, sinceDate: datetime) -> List[DetectionModel]:
+    """
+    Última detección por (cameraId, detectionType) registrada desde sinceDate
+    El límite de fecha mantiene la consulta sobre el rango reciente del índice createdAt
+    """
+    latestIds = select(func.max(DetectionModel.id).label("id")).where(
+        DetectionModel.createdAt >= sinceDate
+    ).group_by(DetectionModel.cameraId, DetectionModel.detectionType).subquery()
+    
+    stmt = select(DetectionModel).join(latestIds, DetectionModel.id == latestIds.c.id)
+    return list((await session.execute(stmt)).scalars().all())
+
+async def loadDetectionColumns(
+    session: AsyncSession,
+    startDate: datetime,
+    endDate: datetime,
+    cameraId: Optional[str] = None
+) -> DetectionColumns:
+    """
+    Cargar una ventana de detecciones en formato columnar para el motor de correlación
+    La ventana se filtra por el tiempo del evento; el límite sobre createdAt
+    permite usar el índice y descartar particiones antiguas
+    """
+    eventTime = func.coalesce(DetectionModel.timestamp, DetectionModel.createdAt)
+    stmt = select(
+        DetectionModel.id,
+        eventTime,
+        func.coalesce(DetectionModel.cameraId, ""),
+        DetectionModel.detectionType,
+        DetectionModel.confidence
+    ).where(
+        eventTime >= startDate,
+        eventTime < endDate,
+        DetectionModel.createdAt >= createdAtLowerBound(startDate)
+    )
+    if cameraId is not None:
+        stmt = stmt.where(DetectionModel.cameraId == cameraId)
+    
+    return detectionColumnsFromRows((await session.execute(stmt)).all())
+
+def detectionColumnsFromRows(rows: Sequence[Sequence]) -> DetectionColumns:
+    """
+    Filas (id, tiempo del evento, cameraId, detectionType, confidence) en formato columnar
+    """
+    ids, times, cameraIds, detectionTypes, confidence = zip(*(row[:5] for row in rows)) if rows else ((),) * 5
+    cameraCodes, cameras = factorize(cameraIds)
+    typeCodes, types = factorize(detectionTypes)
+    
+    return DetectionColumns(
+        ids=np.array(ids, dtype=np.int64),
+        times=datetimesToEpoch(times),
+        cameraCodes=cameraCodes,
+        cameras=cameras,
+        typeCodes=typeCodes,
+        detectionTypes=types,
+        confidence=toFloatArray(confidence)
+    )
+
+def claimColumns() -> list:
+    """Columnas de una detección reclamada: las de detectionColumnsFromRows más createdAt"""
+    return [
+        DetectionModel.id,
+        func.coalesce(DetectionModel.timestamp, DetectionModel.createdAt),
+        func.coalesce(DetectionModel.cameraId, ""),
+        DetectionModel.detectionType,
+        DetectionModel.confidence,
+        DetectionModel.createdAt
+    ]
+
+async def claimUnprocessedDetections(session: AsyncSession, limit: int) -> List[Row]:
+    """
+    Reclamar hasta limit detecciones sin procesar, las más antiguas primero
+    MySQL/PostgreSQL: SELECT ... FOR UPDATE SKIP LOCKED; las filas quedan bloqueadas hasta
+    el commit de quien llama y los demás workers saltan a las siguientes
+    SQLite: no hay bloqueo por fila; un UPDATE ... RETURNING marca processed en una sola
+    sentencia que toma el bloqueo de escritura, así dos workers no reclaman la misma fila
+    """
+    oldestFirst = (DetectionModel.createdAt, DetectionModel.id)
+    if session.get_bind().dialect.name == "sqlite":
+        pendingIds = select(DetectionModel.id).where(
+            DetectionModel.processed == False
+        ).order_by(*oldestFirst).limit(limit).scalar_subquery()
+        stmt = update(DetectionModel).where(DetectionModel.id.in_(pendingIds)).values(
+            processed=True
+        ).returning(*claimColumns()).execution_options(synchronize_session=False)
+        rows = list((await session.execute(stmt)).all())
+        return sorted(rows, key=lambda row: (row[5], row[0]))
+    
+    stmt = select(*claimColumns()).where(
+        DetectionModel.processed == False
+    ).order_by(*oldestFirst).limit(limit).with_for_update(skip_locked=True)
+    return list((await session.execute(stmt)).all())
+
+async def markDetectionsProcessed(session: AsyncSession, ids: Sequence[int], riskScores: Sequence[float]) -> int:
+    """
+    Marcar detecciones como procesadas con su riskScore en un solo UPDATE (CASE por id)
+    No hace commit; retorna las filas actualizadas
+    """
+    if len(ids) == 0:
+        return 0
+    scoreById = {int(detectionId): round(float(score), 4) for detectionId, score in zip(ids, riskScores)}
+    result = await session.execute(
+        update(DetectionModel).where(DetectionModel.id.in_(list(scoreById))).values(
+            processed=True,
+            riskScore=case(scoreById, value=DetectionModel.id)
+        ).execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+async def loadDetectionImagePath(session: AsyncSession, detectionId: int) -> Optional[Tuple[str]]:
+    """(imagePath,) de la detección, None si no existe"""
+    return (await session.execute(
+        select(DetectionModel.imagePath).where(DetectionModel.id == detectionId)
+    )).first()
+
+async def setDetectionImagePath(session: AsyncSession, detectionId: int, imagePath: str) -> int:
+    """Asignar la imagen de una detección; no hace commit, retorna las filas actualizadas"""
+    result = await session.execute(
+        update(DetectionModel).where(DetectionModel.id == detectionId).values(
+            imagePath=imagePath
+        ).execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+async def oldestUnprocessedCreatedAt(session: AsyncSession) -> Optional[datetime]:
+    """createdAt de la detección pendiente más antigua (índice processed, createdAt)"""
+    return (await session.execute(
+        select(func.min(DetectionModel.createdAt)).where(DetectionModel.processed == False)
+    )).scalar()
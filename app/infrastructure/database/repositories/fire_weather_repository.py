@@ -0,0 +1,178 @@
+"""
+Repositorio de índices de peligro de incendio - Cálculo incremental desde los rollups
+
+fire_weather_daily guarda los índices de cada sensor y día junto con el recordCount del
+rollup diario del que salieron. Un día sin fila o con otro recordCount (llegaron lecturas
+nuevas o tardías) está pendiente: se recalcula desde el primer día pendiente de cada
+sensor hasta hoy, partiendo de los códigos del último día anterior que ya estaba guardado.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.services.fire_weather import FireWeatherState, computeFireWeather, dailyMaxByIndex, fosbergIndex
+from app.infrastructure.database.models import FireWeatherDailyModel, WeatherRollupDayModel, WeatherRollupHourModel
+from .base import INSERT_CHUNK_SIZE, upsertStatement
+
+# Columnas de fire_weather_daily que se reescriben al recalcular un día
+FIRE_WEATHER_VALUE_COLUMNS = [
+    "temperature", "humidity", "windSpeed", "rainfall",
+    "ffmc", "dmc", "dc", "isi", "bui", "fwi", "ffwi", "ffwiMax", "sourceRecordCount"
+]
+
+async def findPendingFireWeatherDays(session: AsyncSession, through: datetime, sensorId: Optional[str] = None) -> Dict[str, datetime]:
+    """
+    Primer día pendiente de cada sensor hasta through (inclusive)
+    Compara cada rollup diario con su fila en caché por llave primaria
+    """
+    rollup, cached = WeatherRollupDayModel, FireWeatherDailyModel
+    stmt = select(rollup.sensorId, func.min(rollup.bucketStart)).select_from(rollup).outerjoin(
+        cached, and_(cached.sensorId == rollup.sensorId, cached.dayStart == rollup.bucketStart)
+    ).where(
+        rollup.bucketStart <= through,
+        or_(cached.sensorId.is_(None), cached.sourceRecordCount != rollup.recordCount)
+    ).group_by(rollup.sensorId)
+    if sensorId is not None:
+        stmt = stmt.where(rollup.sensorId == sensorId)
+    return {sensor: firstDay for sensor, firstDay in (await session.execute(stmt)).all()}
+
+async def loadFireWeatherState(session: AsyncSession, pendingFrom: Dict[str, datetime], sensorIds: Sequence[str]) -> FireWeatherState:
+    """Códigos del último día calculado antes del primer día pendiente; valores iniciales si no hay"""
+    state = FireWeatherState.start(len(sensorIds))
+    for index, sensorId in enumerate(sensorIds):
+        row = (await session.execute(
+            select(FireWeatherDailyModel.ffmc, FireWeatherDailyModel.dmc, FireWeatherDailyModel.dc).where(
+                FireWeatherDailyModel.sensorId == sensorId,
+                FireWeatherDailyModel.dayStart < pendingFrom[sensorId],
+                FireWeatherDailyModel.ffmc.is_not(None)
+            ).order_by(FireWeatherDailyModel.dayStart.desc()).limit(1)
+        )).first()
+        if row is not None:
+            state.ffmc[index], state.dmc[index], state.dc[index] = row
+    return state
+
+def meanOf(sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    return np.divide(sums, counts, out=np.full(len(sums), np.nan), where=counts > 0)
+
+async def loadRollupMatrix(session: AsyncSession, model, sensorIds: Sequence[str], startDay: datetime, endDay: datetime):
+    """
+    Medias y conteos de un rollup como columnas NumPy con el índice de día y de sensor
+    de cada bucket
+    """
+    rows = (await session.execute(
+        select(
+            model.sensorId, model.bucketStart, model.recordCount,
+            model.temperatureSum, model.temperatureCount, model.humiditySum, model.humidityCount,
+            model.windSpeedSum, model.windSpeedCount, model.rainfallSum
+        ).where(model.sensorId.in_(sensorIds), model.bucketStart >= startDay, model.bucketStart < endDay)
+    )).all()
+    sensorIndex = {sensorId: index for index, sensorId in enumerate(sensorIds)}
+    buckets = [row[1] for row in rows]
+    values = np.array([row[2:] for row in rows], dtype=np.float64).reshape(len(rows), 8)
+    return {
+        "dayIndex": np.array([(bucket - startDay).days for bucket in buckets], dtype=np.int64),
+        "hour": np.array([bucket.hour for bucket in buckets], dtype=np.int64),
+        "sensorIndex": np.array([sensorIndex[row[0]] for row in rows], dtype=np.int64),
+        "recordCount": values[:, 0],
+        "temperature": meanOf(values[:, 1], values[:, 2]),
+        "humidity": meanOf(values[:, 3], values[:, 4]),
+        "windSpeed": meanOf(values[:, 5], values[:, 6]),
+        "rainfall": values[:, 7]
+    }
+
+def scatter(shape: Tuple[int, int], dayIndex: np.ndarray, sensorIndex: np.ndarray, values: np.ndarray) -> np.ndarray:
+    matrix = np.full(shape, np.nan)
+    matrix[dayIndex, sensorIndex] = values
+    return matrix
+
+async def refreshFireWeather(
+    session: AsyncSession,
+    through: datetime,
+    latitude: float,
+    noonHour: int = 12,
+    sensorId: Optional[str] = None
+) -> int:
+    """
+    Recalcular los días pendientes hasta through (inicio del día, inclusive) y guardarlos
+    Entradas por día: media de la hora noonHour (o del día si esa hora no tiene lecturas)
+    y lluvia total del día; FFWI máximo sobre las medias horarias
+    No hace commit. Retorna el número de días (sensor, día) escritos
+    """
+    pendingFrom = await findPendingFireWeatherDays(session, through, sensorId)
+    if not pendingFrom:
+        return 0
+    sensorIds = sorted(pendingFrom)
+    startDay = min(pendingFrom.values())
+    endDay = through + timedelta(days=1)
+    days = (endDay - startDay).days
+    shape = (days, len(sensorIds))
+    
+    state = await loadFireWeatherState(session, pendingFrom, sensorIds)
+    daily = await loadRollupMatrix(session, WeatherRollupDayModel, sensorIds, startDay, endDay)
+    hourly = await loadRollupMatrix(session, WeatherRollupHourModel, sensorIds, startDay, endDay)
+    
+    # Entradas del día: hora del mediodía si existe, si no la media diaria
+    hasRollup = np.zeros(shape, dtype=bool)
+    hasRollup[daily["dayIndex"], daily["sensorIndex"]] = True
+    recordCount = scatter(shape, daily["dayIndex"], daily["sensorIndex"], daily["recordCount"])
+    rainfall = scatter(shape, daily["dayIndex"], daily["sensorIndex"], daily["rainfall"])
+    noon = hourly["hour"] == noonHour
+    inputs = {}
+    for name in ("temperature", "humidity", "windSpeed"):
+        noonValues = scatter(shape, hourly["dayIndex"][noon], hourly["sensorIndex"][noon], hourly[name][noon])
+        dailyValues = scatter(shape, daily["dayIndex"], daily["sensorIndex"], daily[name])
+        inputs[name] = np.where(np.isnan(noonValues), dailyValues, noonValues)
+    ffwiMax = dailyMaxByIndex(
+        fosbergIndex(hourly["temperature"], hourly["humidity"], hourly["windSpeed"]),
+        hourly["dayIndex"], hourly["sensorIndex"], shape
+    )
+    
+    startIndex = np.array([(pendingFrom[sensor] - startDay).days for sensor in sensorIds], dtype=np.int64)
+    months = np.array([(startDay + timedelta(days=day)).month for day in range(days)], dtype=np.int64)
+    columns, _ = computeFireWeather(
+        months, inputs["temperature"], inputs["humidity"], inputs["windSpeed"], rainfall, startIndex, state, latitude
+    )
+    
+    # Una fila por rollup diario desde el día pendiente, aunque falten entradas para calcularlo
+    written = hasRollup & (np.arange(days)[:, None] >= startIndex[None, :])
+    dayIndexes, sensorIndexes = np.nonzero(written)
+    matrices = {
+        "temperature": inputs["temperature"], "humidity": inputs["humidity"], "windSpeed": inputs["windSpeed"],
+        "rainfall": rainfall, "ffmc": columns.ffmc, "dmc": columns.dmc, "dc": columns.dc, "isi": columns.isi,
+        "bui": columns.bui, "fwi": columns.fwi, "ffwi": columns.ffwi, "ffwiMax": ffwiMax
+    }
+    selected = {name: matrix[dayIndexes, sensorIndexes] for name, matrix in matrices.items()}
+    counts = recordCount[dayIndexes, sensorIndexes]
+    values = []
+    for position, (dayIndex, sensorIndex) in enumerate(zip(dayIndexes.tolist(), sensorIndexes.tolist())):
+        row = {"sensorId": sensorIds[sensorIndex], "dayStart": startDay + timedelta(days=dayIndex)}
+        for name, column in selected.items():
+            value = column[position]
+            row[name] = float(value) if np.isfinite(value) else None
+        row["sourceRecordCount"] = int(counts[position])
+        values.append(row)
+    
+    def buildUpdate(new):
+        update = {column: getattr(new, column) for column in FIRE_WEATHER_VALUE_COLUMNS}
+        update["updatedAt"] = func.now()
+        return update
+    
+    stmt = upsertStatement(session, FireWeatherDailyModel, ["sensorId", "dayStart"], buildUpdate)
+    for start in range(0, len(values), INSERT_CHUNK_SIZE):
+        await session.execute(stmt, values[start:start + INSERT_CHUNK_SIZE])
+    return len(values)
+
+async def listFireWeather(
+    session: AsyncSession,
+    startDay: datetime,
+    endDay: datetime,
+    sensorId: Optional[str] = None
+) -> List[FireWeatherDailyModel]:
+    """Índices guardados en [startDay, endDay) por sensor y día"""
+    stmt = select(FireWeatherDailyModel).where(
+        FireWeatherDailyModel.dayStart >= startDay, FireWeatherDailyModel.dayStart < endDay
+    ).order_by(FireWeatherDailyModel.sensorId, FireWeatherDailyModel.dayStart)
+    if sensorId is not None:
+        stmt = stmt.where(FireWeatherDailyModel.sensorId == sensorId)
+    return list((await session.execute(stmt)).scalars().all())
@@ -0,0 +1,213 @@
+"""
+Repositorio de incidentes - Acceso a tabla incidents
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import Row, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.entities import IncidentFilter, IncidentResponse
+from app.domain.services import IncidentTracker, bboxCorners
+from app.infrastructure.database.models import IncidentModel
+from .base import greatestFunction, leastFunction
+from .pagination import keysetCondition, keysetOrder, splitPage
+
+# Columnas del listado en el orden de IncidentResponse
+INCIDENT_LIST_COLUMNS = [getattr(IncidentModel, name) for name in IncidentResponse.__fields__]
+
+def envelopeOf(row: dict) -> Tuple[Optional[int], Optional[int], Optional[int], Optional[int]]:
+    """(minX, minY, maxX, maxY) del bbox de una detección"""
+    corners = bboxCorners(row.get("bboxX"), row.get("bboxY"), row.get("bboxWidth"), row.get("bboxHeight"))
+    if corners is None:
+        return (None, None, None, None)
+    return tuple(int(value) for value in corners)
+
+def mergeEnvelope(current: tuple, other: tuple) -> tuple:
+    if other[0] is None:
+        return current
+    if current[0] is None:
+        return other
+    return (min(current[0], other[0]), min(current[1], other[1]), max(current[2], other[2]), max(current[3], other[3]))
+
+def boxFromColumns(minX: Optional[int], minY: Optional[int], maxX: Optional[int], maxY: Optional[int]) -> Optional[Tuple[float, float, float, float]]:
+    """Bbox (x1, y1, x2, y2) guardado en cuatro columnas, None si está vacío"""
+    if minX is None:
+        return None
+    return (float(minX), float(minY), float(maxX), float(maxY))
+
+def lastBboxValues(box: Optional[Tuple[float, float, float, float]]) -> dict:
+    """Columnas lastBbox* de un bbox del tracker"""
+    values = (None, None, None, None) if box is None else tuple(int(value) for value in box)
+    return dict(zip(("lastBboxMinX", "lastBboxMinY", "lastBboxMaxX", "lastBboxMaxY"), values))
+
+async def insertIncident(
+    session: AsyncSession,
+    key: tuple,
+    aggregate: dict,
+    lastBox: Optional[Tuple[float, float, float, float]]
+) -> int:
+    """Crear un incidente con los agregados de sus primeras detecciones"""
+    envelope = aggregate["envelope"]
+    result = await session.execute(insert(IncidentModel).values(
+        cameraId=key[0],
+        detectionType=key[1],
+        firstSeen=aggregate["firstSeen"],
+        lastSeen=aggregate["lastSeen"],
+        detectionCount=aggregate["count"],
+        peakConfidence=aggregate["peakConfidence"],
+        bboxMinX=envelope[0], bboxMinY=envelope[1], bboxMaxX=envelope[2], bboxMaxY=envelope[3],
+        **lastBboxValues(lastBox)
+    ))
+    return result.inserted_primary_key[0]
+
+async def lockOpenIncidents(session: AsyncSession, cameraIds: Sequence[str], sinceDate: datetime) -> List[Row]:
+    """
+    Incidentes de las cámaras vistos desde sinceDate, bloqueados hasta el fin de la transacción
+    En InnoDB el FOR UPDATE sobre ix_incidents_cameraId_lastSeen bloquea también el rango, así
+    que otro worker que ingiera la misma cámara espera a este commit en vez de abrir un
+    incidente paralelo. PostgreSQL no bloquea rangos: toma un lock de asesoría por cámara
+    """
+    cameraIds = sorted(set(cameraIds))
+    if session.get_bind().dialect.name == "postgresql":
+        for cameraId in cameraIds:
+            await session.execute(select(func.pg_advisory_xact_lock(func.hashtext(cameraId))))
+    
+    stmt = select(
+        IncidentModel.id, IncidentModel.cameraId, IncidentModel.detectionType, IncidentModel.lastSeen,
+        IncidentModel.lastBboxMinX, IncidentModel.lastBboxMinY, IncidentModel.lastBboxMaxX, IncidentModel.lastBboxMaxY,
+        IncidentModel.bboxMinX, IncidentModel.bboxMinY, IncidentModel.bboxMaxX, IncidentModel.bboxMaxY
+    ).where(
+        IncidentModel.cameraId.in_(cameraIds),
+        IncidentModel.lastSeen >= sinceDate
+    ).order_by(IncidentModel.lastSeen).with_for_update()
+    return list((await session.execute(stmt)).all())
+
+async def loadIncidentTracker(session: AsyncSession, tracker: IncidentTracker, rows: Sequence[dict]):
+    """
+    Cargar en un tracker vacío los incidentes abiertos de las cámaras de rows, con lock
+    Los incidentes previos a la migración 009 no tienen último bbox: se usa su envolvente
+    """
+    earliest = min(row["timestamp"].timestamp() for row in rows)
+    sinceDate = datetime.fromtimestamp(earliest - tracker.maxGapSeconds)
+    for incident in await lockOpenIncidents(session, [row["cameraId"] for row in rows], sinceDate):
+        box = boxFromColumns(incident.lastBboxMinX, incident.lastBboxMinY, incident.lastBboxMaxX, incident.lastBboxMaxY)
+        if box is None:
+            box = boxFromColumns(incident.bboxMinX, incident.bboxMinY, incident.bboxMaxX, incident.bboxMaxY)
+        tracker.open((incident.cameraId, incident.detectionType), incident.id, incident.lastSeen.timestamp(), box)
+
+async def assignIncidents(session: AsyncSession, tracker: IncidentTracker, rows: Sequence[dict]):
+    """
+    Enlazar cada fila de detección con su incidente (row["incidentId"]), creando los nuevos
+    tracker llega vacío y se llena con los incidentes abiertos leídos en esta transacción;
+    nada queda en memoria si la transacción se revierte
+    Las extensiones de un mismo lote se agregan en un solo UPDATE por incidente
+    """
+    if not rows:
+        return
+    await loadIncidentTracker(session, tracker, rows)
+    
+    extended: Dict[int, dict] = {}
+    
+    for row in rows:
+        key = (row["cameraId"], row["detectionType"])
+        moment: datetime = row["timestamp"]
+        epoch = moment.timestamp()
+        box = bboxCorners(row.get("bboxX"), row.get("bboxY"), row.get("bboxWidth"), row.get("bboxHeight"))
+        envelope = envelopeOf(row)
+        
+        match = tracker.match(key, epoch, box)
+        if match.incidentId is None:
+            incidentId = await insertIncident(session, key, {
+                "count": 1, "firstSeen": moment, "lastSeen": moment,
+                "peakConfidence": row["confidence"], "envelope": envelope
+            }, box)
+            tracker.open(key, incidentId, epoch, box)
+        else:
+            incidentId = match.incidentId
+            tracker.extend(incidentId, epoch, box)
+            aggregate = extended.get(incidentId)
+            if aggregate is None:
+                extended[incidentId] = {
+                    "count": 1, "firstSeen": moment, "lastSeen": moment,
+                    "peakConfidence": row["confidence"], "envelope": envelope
+                }
+            else:
+                aggregate["count"] += 1
+                aggregate["firstSeen"] = min(aggregate["firstSeen"], moment)
+                aggregate["lastSeen"] = max(aggregate["lastSeen"], moment)
+                aggregate["peakConfidence"] = max(aggregate["peakConfidence"], row["confidence"])
+                aggregate["envelope"] = mergeEnvelope(aggregate["envelope"], envelope)
+        row["incidentId"] = incidentId
+    
+    least = leastFunction(session)
+    greatest = greatestFunction(session)
+    for incidentId, aggregate in extended.items():
+        values = {
+            "detectionCount": IncidentModel.detectionCount + aggregate["count"],
+            "firstSeen": least(IncidentModel.firstSeen, aggregate["firstSeen"]),
+            "lastSeen": greatest(IncidentModel.lastSeen, aggregate["lastSeen"]),
+            "peakConfidence": greatest(IncidentModel.peakConfidence, aggregate["peakConfidence"])
+        }
+        envelope = aggregate["envelope"]
+        if envelope[0] is not None:
+            # LEAST/GREATEST con NULL dan NULL: COALESCE toma el valor nuevo si aún no había bbox
+            for column, value, combine in (
+                (IncidentModel.bboxMinX, envelope[0], least),
+                (IncidentModel.bboxMinY, envelope[1], least),
+                (IncidentModel.bboxMaxX, envelope[2], greatest),
+                (IncidentModel.bboxMaxY, envelope[3], greatest),
+            ):
+                values[column.key] = func.coalesce(combine(column, value), value)
+        # Con el incidente bloqueado, el último bbox del tracker es el vigente
+        lastBox = tracker.lastBox(incidentId)
+        if lastBox is not None:
+            values.update(lastBboxValues(lastBox))
+        await session.execute(update(IncidentModel).where(IncidentModel.id == incidentId).values(**values))
+
+def incidentFilterConditions(filters: IncidentFilter, activeSince: Optional[datetime] = None) -> list:
+    """
+    Traducir IncidentFilter a condiciones SQL; las fechas filtran por solapamiento [firstSeen, lastSeen]
+    """
+    conditions = []
+    if filters.cameraId is not None:
+        conditions.append(IncidentModel.cameraId == filters.cameraId)
+    if filters.detectionType is not None:
+        conditions.append(IncidentModel.detectionType == filters.detectionType.lower())
+    if filters.minPeakConfidence is not None:
+        conditions.append(IncidentModel.peakConfidence >= filters.minPeakConfidence)
+    if filters.startDate is not None:
+        conditions.append(IncidentModel.lastSeen >= filters.startDate)
+    if filters.endDate is not None:
+        conditions.append(IncidentModel.firstSeen < filters.endDate)
+    if filters.activeOnly and activeSince is not None:
+        conditions.append(IncidentModel.lastSeen >= activeSince)
+    return conditions
+
+async def listIncidents(
+    session: AsyncSession,
+    filters: IncidentFilter,
+    pageSize: int,
+    cursor: Optional[str] = None,
+    includeTotal: bool = False,
+    activeSince: Optional[datetime] = None
+) -> Tuple[List[Row], Optional[str], Optional[int]]:
+    """
+    Página de incidentes con paginación keyset sobre (createdAt, id), más recientes primero
+    Retorna (filas con INCIDENT_LIST_COLUMNS, cursor siguiente, total); el total solo se cuenta si se solicita
+    """
+    conditions = incidentFilterConditions(filters, activeSince)
+    afterCursor = keysetCondition(IncidentModel, cursor)
+    
+    stmt = select(*INCIDENT_LIST_COLUMNS).where(*conditions).order_by(*keysetOrder(IncidentModel)).limit(pageSize + 1)
+    if afterCursor is not None:
+        stmt = stmt.where(afterCursor)
+    
+    rows = list((await session.execute(stmt)).all())
+    page, nextCursor = splitPage(rows, pageSize)
+    
+    totalCount = None
+    if includeTotal:
+        totalCount = (await session.execute(
+            select(func.count()).select_from(IncidentModel).where(*conditions)
+        )).scalar_one()
+    
+    return page, nextCursor, totalCount
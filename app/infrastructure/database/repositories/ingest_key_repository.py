@@ -0,0 +1,98 @@
+"""
+Repositorio de llaves de idempotencia - Acceso a tabla ingest_keys
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresqlInsert
+from sqlalchemy.dialects.sqlite import insert as sqliteInsert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.database.models import IngestKeyModel
+
+# recordId de una llave reclamada cuyo registro todavía no se inserta (los IDs empiezan en 1)
+PENDING_RECORD_ID = 0
+
+async def findIngestKey(session: AsyncSession, dataset: str, keyHash: str) -> Optional[int]:
+    """
+    ID del registro original de una llave, None si no existe
+    """
+    return (await session.execute(
+        select(IngestKeyModel.recordId).where(IngestKeyModel.dataset == dataset, IngestKeyModel.keyHash == keyHash)
+    )).scalar()
+
+async def insertIngestKey(session: AsyncSession, dataset: str, keyHash: str, recordId: int):
+    """
+    Registrar una llave en la transacción actual
+    Lanza IntegrityError si otro worker ya la registró; quien llama revierte y responde el original
+    """
+    await session.execute(insert(IngestKeyModel).values(dataset=dataset, keyHash=keyHash, recordId=recordId))
+
+async def insertIngestKeysIgnoringDuplicates(session: AsyncSession, dataset: str, keys: Sequence[Tuple[str, int]]):
+    """
+    Registrar llaves de un lote de la cola; una llave existente conserva su registro original
+    """
+    if not keys:
+        return
+    
+    dialectName = session.get_bind().dialect.name
+    stmt = insert(IngestKeyModel.__table__)
+    if dialectName == "mysql":
+        stmt = stmt.prefix_with("IGNORE")
+    elif dialectName in ("sqlite", "postgresql"):
+        insertFactory = sqliteInsert if dialectName == "sqlite" else postgresqlInsert
+        stmt = insertFactory(IngestKeyModel.__table__).on_conflict_do_nothing()
+    
+    await session.execute(stmt, [
+        {"dataset": dataset, "keyHash": keyHash, "recordId": recordId} for keyHash, recordId in keys
+    ])
+
+async def claimIngestKeys(session: AsyncSession, dataset: str, keyHashes: Sequence[str]) -> Dict[str, int]:
+    """
+    Reclamar llaves antes de insertar sus registros, en la transacción de quien llama
+    Retorna {keyHash: recordId} de las que ya estaban registradas; las reclamadas quedan con
+    PENDING_RECORD_ID hasta assignIngestKeyRecords. Si otro worker reclamó la misma llave el
+    índice único hace esperar al INSERT hasta su commit, y la lectura con bloqueo ve su recordId
+    """
+    keyHashes = list(dict.fromkeys(keyHashes))
+    if not keyHashes:
+        return {}
+    
+    await insertIngestKeysIgnoringDuplicates(session, dataset, [(keyHash, PENDING_RECORD_ID) for keyHash in keyHashes])
+    rows = (await session.execute(
+        select(IngestKeyModel.keyHash, IngestKeyModel.recordId)
+        .where(IngestKeyModel.dataset == dataset, IngestKeyModel.keyHash.in_(keyHashes))
+        .with_for_update()
+    )).all()
+    return {keyHash: recordId for keyHash, recordId in rows if recordId != PENDING_RECORD_ID}
+
+async def assignIngestKeyRecords(session: AsyncSession, dataset: str, keys: Sequence[Tuple[str, int]]):
+    """
+    Asignar a las llaves reclamadas el ID de su registro recién insertado
+    """
+    if not keys:
+        return
+    
+    table = IngestKeyModel.__table__
+    stmt = (
+        update(table)
+        .where(table.c.dataset == dataset, table.c.keyHash == bindparam("claimedKeyHash"))
+        .values(recordId=bindparam("claimedRecordId"))
+    )
+    await session.execute(stmt, [
+        {"claimedKeyHash": keyHash, "claimedRecordId": recordId} for keyHash, recordId in keys
+    ])
+
+async def loadRecentIngestKeys(session: AsyncSession, sinceDate: datetime) -> List[str]:
+    """
+    Hashes registrados desde sinceDate, para llenar el filtro de Bloom al arrancar
+    """
+    return list((await session.execute(
+        select(IngestKeyModel.keyHash).where(IngestKeyModel.createdAt >= sinceDate)
+    )).scalars().all())
+
+async def purgeIngestKeys(session: AsyncSession, olderThan: datetime) -> int:
+    """
+    Eliminar llaves fuera de la ventana de idempotencia, retorna las filas eliminadas
+    """
+    result = await session.execute(delete(IngestKeyModel).where(IngestKeyModel.createdAt < olderThan))
+    return result.rowcount
@@ -0,0 +1,61 @@
+"""
+Paginación keyset (cursor) sobre (createdAt, id)
+
+Cada página continúa donde terminó la anterior con una condición sobre el
+índice, por lo que el costo es O(tamaño de página) sin importar la profundidad.
+"""
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+from sqlalchemy import and_, or_
+
+class InvalidCursorError(ValueError):
+    """El cursor recibido no tiene el formato esperado"""
+    pass
+
+def encodeCursor(createdAt: datetime, recordId: int) -> str:
+    """
+    Codificar la última fila de una página como cursor opaco
+    """
+    raw = f"{createdAt.isoformat()}|{recordId}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decodeCursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decodificar un cursor opaco en (createdAt, id)
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        createdAt, recordId = base64.urlsafe_b64decode(padded.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(createdAt), int(recordId)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursorError(f"Cursor inválido: {cursor}") from e
+
+def keysetCondition(model, cursor: Optional[str]):
+    """
+    Condición para las filas posteriores al cursor en orden (createdAt DESC, id DESC)
+    Se expande en OR para que MySQL la resuelva como rango sobre el índice
+    """
+    if not cursor:
+        return None
+    createdAt, recordId = decodeCursor(cursor)
+    return or_(
+        model.createdAt < createdAt,
+        and_(model.createdAt == createdAt, model.id < recordId)
+    )
+
+def keysetOrder(model):
+    """
+    Orden estable de la paginación: más recientes primero
+    """
+    return (model.createdAt.desc(), model.id.desc())
+
+def splitPage(rows: list, pageSize: int) -> Tuple[list, Optional[str]]:
+    """
+    Separar la fila extra solicitada para saber si existe una página siguiente
+    """
+    if len(rows) <= pageSize:
+        return rows, None
+    page = rows[:pageSize]
+    last = page[-1]
+    return page, encodeCursor(last.createdAt, last.id)
@@ -0,0 +1,182 @@
+"""
+Repositorio de datos meteorológicos - Acceso a tabla weather_data
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import Row, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.entities import WeatherDataCreate, WeatherDataFilter, WeatherDataResponse
+from app.domain.services import WeatherColumns, datetimesToEpoch, toFloatArray, factorize
+from app.infrastructure.database.models import WeatherModel, WEATHER_READING_TIME
+from app.infrastructure.database.partitioning import createdAtLowerBound
+from .base import insertRows
+from .pagination import keysetCondition, keysetOrder, splitPage
+from .weather_rollup_repository import upsertWeatherRollups
+
+DEFAULT_SENSOR_ID = "DAVIS_V3_001"
+
+# Columnas del listado en el orden de WeatherDataResponse: las filas se serializan sin instanciar el ORM
+WEATHER_LIST_COLUMNS = [getattr(WeatherModel, name) for name in WeatherDataResponse.__fields__]
+
+def buildWeatherRow(weatherData: WeatherDataCreate) -> dict:
+    """
+    Convertir una lectura meteorológica validada en fila lista para insertar
+    """
+    return {
+        "temperature": weatherData.temperature,
+        "humidity": weatherData.humidity,
+        "windSpeed": weatherData.windSpeed,
+        "windDirection": weatherData.windDirection,
+        "pressure": weatherData.pressure,
+        "rainfall": weatherData.rainfall,
+        "sensorId": weatherData.sensorId or DEFAULT_SENSOR_ID,
+        "timestamp": weatherData.timestamp or datetime.now()
+    }
+
+async def insertWeatherRows(session: AsyncSession, rows: Sequence[dict]) -> List[int]:
+    """
+    Insertar lecturas meteorológicas con INSERT multi-fila, retorna IDs en el orden recibido
+    """
+    return await insertRows(session, WeatherModel, rows)
+
+async def ingestWeatherRows(session: AsyncSession, rows: Sequence[dict]) -> List[int]:
+    """
+    Insertar lecturas y actualizar sus rollups en la misma transacción
+    """
+    insertedIds = await insertWeatherRows(session, rows)
+    await upsertWeatherRollups(session, rows)
+    return insertedIds
+
+def weatherFilterConditions(filters: WeatherDataFilter) -> list:
+    """
+    Traducir WeatherDataFilter a condiciones SQL; las fechas filtran por createdAt
+    """
+    conditions = []
+    if filters.sensorId is not None:
+        conditions.append(WeatherModel.sensorId == filters.sensorId)
+    if filters.minTemperature is not None:
+        conditions.append(WeatherModel.temperature >= filters.minTemperature)
+    if filters.maxTemperature is not None:
+        conditions.append(WeatherModel.temperature <= filters.maxTemperature)
+    if filters.minHumidity is not None:
+        conditions.append(WeatherModel.humidity >= filters.minHumidity)
+    if filters.maxHumidity is not None:
+        conditions.append(WeatherModel.humidity <= filters.maxHumidity)
+    if filters.startDate is not None:
+        conditions.append(WeatherModel.createdAt >= filters.startDate)
+    if filters.endDate is not None:
+        conditions.append(WeatherModel.createdAt < filters.endDate)
+    return conditions
+
+async def listWeatherData(
+    session: AsyncSession,
+    filters: WeatherDataFilter,
+    pageSize: int,
+    cursor: Optional[str] = None,
+    includeTotal: bool = False
+) -> Tuple[List[Row], Optional[str], Optional[int]]:
+    """
+    Página de lecturas meteorológicas con paginación keyset
+    Retorna (filas con WEATHER_LIST_COLUMNS, cursor siguiente, total); el total solo se cuenta si se solicita
+    """
+    conditions = weatherFilterConditions(filters)
+    afterCursor = keysetCondition(WeatherModel, cursor)
+    
+    stmt = select(*WEATHER_LIST_COLUMNS).where(*conditions).order_by(*keysetOrder(WeatherModel)).limit(pageSize + 1)
+    if afterCursor is not None:
+        stmt = stmt.where(afterCursor)
+    
+    rows = list((await session.execute(stmt)).all())
+    page, nextCursor = splitPage(rows, pageSize)
+    
+    totalCount = None
+    if includeTotal:
+        totalCount = (await session.execute(
+            select(func.count()).select_from(WeatherModel).where(*conditions)
+        )).scalar_one()
+    
+    return page, nextCursor, totalCount
+
+async def loadLatestWeather(session: AsyncSession, sinceDate: datetime) -> List[WeatherModel]:
+    """
+    Última lectura por sensorId registrada desde sinceDate
+    El límite de fecha mantiene la consulta sobre el rango reciente del índice createdAt
+    """
+    latestIds = select(func.max(WeatherModel.id).label("id")).where(
+        WeatherModel.createdAt >= sinceDate
+    ).group_by(WeatherModel.sensorId).subquery()
+    
+    stmt = select(WeatherModel).join(latestIds, WeatherModel.id == latestIds.c.id)
+    return list((await session.execute(stmt)).scalars().all())
+
+async def loadWeatherColumns(
+    session: AsyncSession,
+    startDate: datetime,
+    endDate: datetime,
+    sensorId: Optional[str] = None
+) -> WeatherColumns:
+    """
+    Cargar una ventana de lecturas meteorológicas en formato columnar
+    Filtra por el instante de lectura (las lecturas sin timestamp usan createdAt); el
+    límite sobre createdAt permite descartar particiones antiguas
+    """
+    stmt = select(
+        WEATHER_READING_TIME,
+        func.coalesce(WeatherModel.sensorId, ""),
+        WeatherModel.temperature,
+        WeatherModel.humidity,
+        WeatherModel.windSpeed
+    ).where(
+        WEATHER_READING_TIME >= startDate,
+        WEATHER_READING_TIME < endDate,
+        WeatherModel.createdAt >= createdAtLowerBound(startDate)
+    )
+    if sensorId is not None:
+        stmt = stmt.where(WeatherModel.sensorId == sensorId)
+    
+    rows = (await session.execute(stmt)).all()
+    times, sensorIds, temperature, humidity, windSpeed = zip(*rows) if rows else ((),) * 5
+    
+    sensorCodes, sensors = factorize(sensorIds)
+    
+    return WeatherColumns(
+        times=datetimesToEpoch(times),
+        sensorCodes=sensorCodes,
+        sensors=sensors,
+        temperature=toFloatArray(temperature),
+        humidity=toFloatArray(humidity),
+        windSpeed=toFloatArray(windSpeed)
+    )
+
+# Columnas numéricas que se pueden remuestrear como serie
+WEATHER_SERIES_FIELDS = ("temperature", "humidity", "windSpeed", "pressure", "rainfall")
+
+async def loadWeatherSeriesColumns(
+    session: AsyncSession,
+    startDate: datetime,
+    endDate: datetime,
+    fields: Sequence[str],
+    sensorIds: Optional[Sequence[str]] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Lecturas de [startDate, endDate) por instante de lectura en una sola consulta, ordenadas por sensor y tiempo
+    Retorna (segundos epoch, códigos de sensor, sensores, columnas de fields)
+    """
+    stmt = select(
+        WEATHER_READING_TIME,
+        func.coalesce(WeatherModel.sensorId, ""),
+        *(getattr(WeatherModel, field) for field in fields)
+    ).where(
+        WEATHER_READING_TIME >= startDate,
+        WEATHER_READING_TIME < endDate,
+        WeatherModel.createdAt >= createdAtLowerBound(startDate)
+    ).order_by(WeatherModel.sensorId, WEATHER_READING_TIME, WeatherModel.id)
+    if sensorIds:
+        stmt = stmt.where(WeatherModel.sensorId.in_(sensorIds))
+    
+    rows = (await session.execute(stmt)).all()
+    columns = list(zip(*rows)) if rows else [()] * (2 + len(fields))
+    sensorCodes, sensors = factorize(columns[1])
+    values = {field: toFloatArray(column) for field, column in zip(fields, columns[2:])}
+    return datetimesToEpoch(columns[0]), sensorCodes, sensors, values
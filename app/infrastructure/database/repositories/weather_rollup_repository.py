@@ -0,0 +1,175 @@
+"""
+Repositorio de rollups meteorológicos - Mantenimiento incremental y resúmenes
+"""
+import asyncio
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.services.weather_rollups import (
+    RESOLUTIONS, RAW_RESOLUTION, WeatherAggregate, aggregateByBucket, aggregateColumns, planRollupSegments
+)
+from app.infrastructure.archive import ColdArchive
+from app.infrastructure.database.models import WeatherModel, ROLLUP_MODELS
+from app.infrastructure.database.partitioning import createdAtLowerBound
+from .archive_repository import loadArchivedIdsInDatabase
+from .base import INSERT_CHUNK_SIZE, upsertStatement, leastFunction, greatestFunction
+
+# Columnas que se suman al combinar un bucket existente con valores nuevos
+ADDITIVE_COLUMNS = [
+    "recordCount", "temperatureSum", "temperatureCount", "humiditySum", "humidityCount",
+    "windSpeedSum", "windSpeedCount", "rainfallSum", "rainfallCount"
+]
+
+async def upsertWeatherRollups(session: AsyncSession, rows: Sequence[dict]):
+    """
+    Actualizar los rollups 1m/1h/1d con las filas recién insertadas
+    Cada resolución se actualiza con un upsert por bloques en la transacción actual
+    """
+    if not rows:
+        return
+    
+    least = leastFunction(session)
+    greatest = greatestFunction(session)
+    
+    for resolution, _ in RESOLUTIONS:
+        model = ROLLUP_MODELS[resolution]
+        buckets = aggregateByBucket(rows, resolution)
+        
+        # Orden estable por llave primaria para reducir bloqueos cruzados entre transacciones
+        values = [
+            {"sensorId": sensorId, "bucketStart": bucketStart, **aggregate.toDict()}
+            for (sensorId, bucketStart), aggregate in sorted(buckets.items())
+        ]
+        
+        def buildUpdate(new):
+            update = {column: getattr(model, column) + getattr(new, column) for column in ADDITIVE_COLUMNS}
+            # LEAST/GREATEST retornan NULL si un lado es NULL, COALESCE conserva el valor existente
+            update["temperatureMin"] = least(
+                func.coalesce(model.temperatureMin, new.temperatureMin),
+                func.coalesce(new.temperatureMin, model.temperatureMin)
+            )
+            update["temperatureMax"] = greatest(
+                func.coalesce(model.temperatureMax, new.temperatureMax),
+                func.coalesce(new.temperatureMax, model.temperatureMax)
+            )
+            update["updatedAt"] = func.now()
+            return update
+        
+        stmt = upsertStatement(session, model, ["sensorId", "bucketStart"], buildUpdate)
+        for start in range(0, len(values), INSERT_CHUNK_SIZE):
+            await session.execute(stmt, values[start:start + INSERT_CHUNK_SIZE])
+
+async def aggregateRollupSegment(
+    session: AsyncSession,
+    resolution: str,
+    startDate: datetime,
+    endDate: datetime,
+    sensorId: Optional[str] = None
+) -> WeatherAggregate:
+    """
+    Agregar un tramo alineado leyendo solo los buckets de la resolución indicada
+    """
+    model = ROLLUP_MODELS[resolution]
+    stmt = select(
+        func.coalesce(func.sum(model.recordCount), 0),
+        func.coalesce(func.sum(model.temperatureSum), 0.0),
+        func.coalesce(func.sum(model.temperatureCount), 0),
+        func.min(model.temperatureMin),
+        func.max(model.temperatureMax),
+        func.coalesce(func.sum(model.humiditySum), 0.0),
+        func.coalesce(func.sum(model.humidityCount), 0),
+        func.coalesce(func.sum(model.windSpeedSum), 0.0),
+        func.coalesce(func.sum(model.windSpeedCount), 0),
+        func.coalesce(func.sum(model.rainfallSum), 0.0),
+        func.coalesce(func.sum(model.rainfallCount), 0)
+    ).where(model.bucketStart >= startDate, model.bucketStart < endDate)
+    if sensorId is not None:
+        stmt = stmt.where(model.sensorId == sensorId)
+    
+    return WeatherAggregate(*(await session.execute(stmt)).one())
+
+async def aggregateRawSegment(
+    session: AsyncSession,
+    startDate: datetime,
+    endDate: datetime,
+    sensorId: Optional[str] = None
+) -> WeatherAggregate:
+    """
+    Agregar un borde no alineado directamente sobre weather_data
+    """
+    stmt = select(
+        func.count(),
+        func.coalesce(func.sum(WeatherModel.temperature), 0.0),
+        func.count(WeatherModel.temperature),
+        func.min(WeatherModel.temperature),
+        func.max(WeatherModel.temperature),
+        func.coalesce(func.sum(WeatherModel.humidity), 0.0),
+        func.count(WeatherModel.humidity),
+        func.coalesce(func.sum(WeatherModel.windSpeed), 0.0),
+        func.count(WeatherModel.windSpeed),
+        func.coalesce(func.sum(WeatherModel.rainfall), 0.0),
+        func.count(WeatherModel.rainfall)
+    ).where(
+        WeatherModel.timestamp >= startDate,
+        WeatherModel.timestamp < endDate,
+        WeatherModel.createdAt >= createdAtLowerBound(startDate)
+    )
+    if sensorId is not None:
+        stmt = stmt.where(WeatherModel.sensorId == sensorId)
+    
+    return WeatherAggregate(*(await session.execute(stmt)).one())
+
+def aggregateArchivedSegment(
+    archive: ColdArchive,
+    startDate: datetime,
+    endDate: datetime,
+    sensorId: Optional[str] = None,
+    excludeIds: Optional[np.ndarray] = None
+) -> WeatherAggregate:
+    """
+    Agregar un borde crudo sobre las lecturas ya movidas al almacenamiento frío
+    Solo lee las cuatro columnas de medidas más las de filtro; lee y descomprime
+    archivos, así que se ejecuta fuera del event loop
+    """
+    total = WeatherAggregate()
+    for block in archive.readColumns(
+        "weather_data", ["temperature", "humidity", "windSpeed", "rainfall"],
+        startDate=startDate, endDate=endDate, timeColumn="timestamp", equals={"sensorId": sensorId},
+        excludeIds=excludeIds
+    ):
+        total.merge(aggregateColumns(*(block[name][0] for name in ("temperature", "humidity", "windSpeed", "rainfall"))))
+    return total
+
+async def summarizeWeatherRange(
+    session: AsyncSession,
+    startDate: datetime,
+    endDate: datetime,
+    sensorId: Optional[str] = None,
+    archive: Optional[ColdArchive] = None
+) -> Tuple[WeatherAggregate, List[Tuple[str, datetime, datetime]]]:
+    """
+    Resumir un rango combinando el rollup más grueso de cada tramo con los bordes crudos
+    Los bordes crudos incluyen las lecturas archivadas; los rollups no se archivan
+    Retorna el agregado total y los tramos usados
+    """
+    total = WeatherAggregate()
+    segments = planRollupSegments(startDate, endDate)
+    
+    for resolution, segmentStart, segmentEnd in segments:
+        if resolution == RAW_RESOLUTION:
+            aggregate = await aggregateRawSegment(session, segmentStart, segmentEnd, sensorId)
+            if archive is not None:
+                # Las filas de un día a medio borrar ya se contaron en la base
+                excludeIds = await loadArchivedIdsInDatabase(
+                    session, archive, WeatherModel, segmentStart, segmentEnd, "timestamp"
+                )
+                aggregate.merge(await asyncio.to_thread(
+                    aggregateArchivedSegment, archive, segmentStart, segmentEnd, sensorId, excludeIds
+                ))
+        else:
+            aggregate = await aggregateRollupSegment(session, resolution, segmentStart, segmentEnd, sensorId)
+        total.merge(aggregate)
+    
+    return total, segments
@@ -0,0 +1,8 @@
+"""
+Exportar componentes de exportación masiva
+"""
+from .streaming_export import streamExport, EXPORT_DATASETS, EXPORT_FORMATS, EXPORT_CHUNK_ROWS
+
+__all__ = [
+    "streamExport", "EXPORT_DATASETS", "EXPORT_FORMATS", "EXPORT_CHUNK_ROWS"
+]
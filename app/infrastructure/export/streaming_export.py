@@ -0,0 +1,168 @@
+"""
+Exportación en streaming de detections y weather_data (NDJSON o CSV)
+
+Las filas se leen con un cursor del lado del servidor en bloques de
+EXPORT_CHUNK_ROWS y se serializan directamente desde las tuplas de SQL, sin
+construir objetos Pydantic; la memoria usada no depende del total exportado.
+"""
+import asyncio
+import csv
+import io
+import json
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Callable, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.archive import ColdArchive
+from app.infrastructure.database.models import DetectionModel, WeatherModel
+from app.infrastructure.database.repositories import loadArchivedIdsInDatabase
+
+# Filas por bloque leído del cursor y serializado
+EXPORT_CHUNK_ROWS = 2000
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+@dataclass(frozen=True)
+class ExportDataset:
+    """Tabla exportable con sus columnas y la columna del filtro por dispositivo"""
+    model: type
+    columns: List[str]
+    deviceColumn: str
+
+EXPORT_DATASETS = {
+    "detections": ExportDataset(
+        model=DetectionModel,
+        columns=[
+            "id", "detectionType", "confidence", "bboxX", "bboxY", "bboxWidth", "bboxHeight",
+            "imagePath", "cameraId", "processed", "riskScore", "incidentId", "timestamp", "createdAt"
+        ],
+        deviceColumn="cameraId"
+    ),
+    "weather": ExportDataset(
+        model=WeatherModel,
+        columns=[
+            "id", "temperature", "humidity", "windSpeed", "windDirection", "pressure",
+            "rainfall", "sensorId", "timestamp", "createdAt"
+        ],
+        deviceColumn="sensorId"
+    )
+}
+
+def buildExportQuery(
+    dataset: ExportDataset,
+    startDate: Optional[datetime] = None,
+    endDate: Optional[datetime] = None,
+    deviceId: Optional[str] = None
+):
+    """
+    SELECT de columnas en orden de llave primaria con los filtros opcionales
+    """
+    model = dataset.model
+    stmt = select(*(getattr(model, column) for column in dataset.columns)).order_by(model.id)
+    if startDate is not None:
+        stmt = stmt.where(model.createdAt >= startDate)
+    if endDate is not None:
+        stmt = stmt.where(model.createdAt < endDate)
+    if deviceId is not None:
+        stmt = stmt.where(getattr(model, dataset.deviceColumn) == deviceId)
+    return stmt
+
+def formatValue(value):
+    """Convertir valores que JSON/CSV no representan directamente"""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def ndjsonSerializer(columns: List[str]) -> Callable[[list, bool], str]:
+    """
+    Serializador NDJSON: una línea JSON por fila, sin encabezado
+    """
+    encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=formatValue)
+    
+    def serialize(rows: list, isFirst: bool) -> str:
+        return "".join(encoder.encode(dict(zip(columns, row))) + "\n" for row in rows)
+    
+    return serialize
+
+def csvSerializer(columns: List[str]) -> Callable[[list, bool], str]:
+    """
+    Serializador CSV: encabezado en el primer bloque, valores nulos como campo vacío
+    """
+    def serialize(rows: list, isFirst: bool) -> str:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if isFirst:
+            writer.writerow(columns)
+        writer.writerows([formatValue(value) for value in row] for row in rows)
+        return buffer.getvalue()
+    
+    return serialize
+
+SERIALIZERS = {
+    "ndjson": ndjsonSerializer,
+    "csv": csvSerializer
+}
+
+async def streamExport(
+    sessionFactory: Callable[[], AsyncSession],
+    datasetName: str,
+    exportFormat: str,
+    startDate: Optional[datetime] = None,
+    endDate: Optional[datetime] = None,
+    deviceId: Optional[str] = None,
+    compress: bool = False,
+    archive: Optional[ColdArchive] = None
+) -> AsyncIterator[bytes]:
+    """
+    Generar el archivo exportado en bloques de bytes, opcionalmente comprimidos con gzip
+    Primero las filas del almacenamiento frío (IDs más antiguos) y luego las de la base
+    La sesión es propia del generador porque vive lo que dure la respuesta
+    """
+    dataset = EXPORT_DATASETS[datasetName]
+    serialize = SERIALIZERS[exportFormat](dataset.columns)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+    stmt = buildExportQuery(dataset, startDate, endDate, deviceId).execution_options(yield_per=EXPORT_CHUNK_ROWS)
+    
+    isFirst = True
+    if archive is not None:
+        # Las filas de un día a medio borrar salen de la base, no del archivo
+        async with sessionFactory() as session:
+            excludeIds = await loadArchivedIdsInDatabase(session, archive, dataset.model, startDate, endDate)
+        archivedBlocks = archive.readRows(
+            dataset.model.__tablename__, dataset.columns,
+            startDate=startDate, endDate=endDate, equals={dataset.deviceColumn: deviceId}, excludeIds=excludeIds
+        )
+        # Cada tramo se lee y descomprime en un hilo para no bloquear el event loop; si el
+        # cliente se desconecta, close() cierra el archivo abierto
+        try:
+            while (block := await asyncio.to_thread(next, archivedBlocks, None)) is not None:
+                for start in range(0, len(block), EXPORT_CHUNK_ROWS):
+                    chunk = serialize(block[start:start + EXPORT_CHUNK_ROWS], isFirst).encode()
+                    isFirst = False
+                    if compressor is not None:
+                        chunk = compressor.compress(chunk)
+                    if chunk:
+                        yield chunk
+        finally:
+            archivedBlocks.close()
+    
+    async with sessionFactory() as session:
+        result = await session.stream(stmt)
+        async for partition in result.partitions():
+            chunk = serialize(partition, isFirst).encode()
+            isFirst = False
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+    
+    # CSV sin filas igual lleva encabezado
+    if isFirst and exportFormat == "csv":
+        chunk = serialize([], True).encode()
+        yield compressor.compress(chunk) if compressor is not None else chunk
+    
+    if compressor is not None:
+        yield compressor.flush()
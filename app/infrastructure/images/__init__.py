@@ -0,0 +1,16 @@
+"""
+Exportar componentes del almacenamiento de imágenes
+"""
+from .content_store import (
+    ContentStore, StoredImage, UnsupportedImageError, ImageTooLargeError, parseStoredName,
+    IMAGE_VARIANTS, MEDIA_TYPES
+)
+from .thumbnails import ThumbnailPool, VARIANT_SIZES
+from .range_response import imageResponse
+
+__all__ = [
+    "ContentStore", "StoredImage", "UnsupportedImageError", "ImageTooLargeError", "parseStoredName",
+    "IMAGE_VARIANTS", "MEDIA_TYPES",
+    "ThumbnailPool", "VARIANT_SIZES",
+    "imageResponse"
+]
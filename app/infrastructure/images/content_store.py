@@ -0,0 +1,155 @@
+"""
+Almacén local de imágenes direccionado por contenido
+
+Cada imagen se guarda como <sha256>.<ext> en dos niveles de subdirectorios
+(ab/cd/abcd....jpg): la misma imagen subida dos veces ocupa un solo archivo y el
+nombre sirve como ETag fuerte. La subida se escribe por bloques a un archivo
+temporal mientras se calcula el hash y al final se renombra de forma atómica;
+nunca se tiene el archivo completo en memoria.
+"""
+import asyncio
+import hashlib
+import os
+import re
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator, Optional, Tuple
+
+# Firmas de los formatos aceptados: prefijo → (extensión, media type)
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", ("jpg", "image/jpeg")),
+    (b"\x89PNG\r\n\x1a\n", ("png", "image/png")),
+    (b"II*\x00", ("tiff", "image/tiff")),
+    (b"MM\x00*", ("tiff", "image/tiff")),
+)
+MEDIA_TYPES = {extension: mediaType for _, (extension, mediaType) in IMAGE_SIGNATURES}
+
+# Variantes generadas a partir del original
+IMAGE_VARIANTS = ("thumbnail", "preview")
+
+# Nombre relativo dentro del almacén: ab/cd/<sha256>.<ext> o ab/cd/<sha256>.<variante>.jpg
+STORED_NAME = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})\.(?:(thumbnail|preview)\.)?(jpg|png|tiff)$")
+
+class UnsupportedImageError(Exception):
+    """El contenido no es JPEG, PNG ni TIFF"""
+    pass
+
+class ImageTooLargeError(Exception):
+    """La subida supera el tamaño máximo"""
+    pass
+
+@dataclass(frozen=True)
+class StoredImage:
+    digest: str
+    extension: str
+    size: int
+    created: bool
+    
+    @property
+    def name(self) -> str:
+        """Ruta relativa guardada en detections.imagePath"""
+        return f"{self.digest[:2]}/{self.digest[2:4]}/{self.digest}.{self.extension}"
+    
+    @property
+    def mediaType(self) -> str:
+        return MEDIA_TYPES[self.extension]
+
+def sniffImageType(head: bytes) -> Tuple[str, str]:
+    for signature, imageType in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return imageType
+    raise UnsupportedImageError("La imagen debe ser JPEG, PNG o TIFF")
+
+def parseStoredName(name: str) -> Optional[Tuple[str, str]]:
+    """(digest, extensión) de un imagePath generado por el almacén, None si es una ruta externa"""
+    match = STORED_NAME.match(name or "")
+    if match is None or match.group(2) is not None:
+        return None
+    return match.group(1), match.group(3)
+
+class ContentStore:
+    """
+    Archivos de imagen nombrados por su SHA-256
+    """
+    
+    def __init__(self, rootDir: str, maxBytes: int = 20 * 1024 * 1024, chunkBytes: int = 64 * 1024):
+        self.rootDir = rootDir
+        self.maxBytes = maxBytes
+        self.chunkBytes = chunkBytes
+        self.temporaryDir = os.path.join(rootDir, "tmp")
+    
+    def pathFor(self, digest: str, extension: str, variant: Optional[str] = None) -> str:
+        fileName = f"{digest}.{extension}" if variant is None else f"{digest}.{variant}.jpg"
+        return os.path.join(self.rootDir, digest[:2], digest[2:4], fileName)
+    
+    async def save(self, chunks: AsyncIterator[bytes]) -> StoredImage:
+        """
+        Escribir la subida por bloques mientras se calcula el hash; si el contenido ya
+        existe se descarta la copia temporal
+        La escritura a disco corre en un hilo para no bloquear el event loop
+        """
+        await asyncio.to_thread(os.makedirs, self.temporaryDir, exist_ok=True)
+        temporaryPath = os.path.join(self.temporaryDir, uuid.uuid4().hex)
+        digest = hashlib.sha256()
+        size = 0
+        imageType = None
+        handle = await asyncio.to_thread(open, temporaryPath, "wb")
+        try:
+            try:
+                pending = bytearray()
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    size += len(chunk)
+                    if size > self.maxBytes:
+                        raise ImageTooLargeError(f"La imagen supera {self.maxBytes} bytes")
+                    digest.update(chunk)
+                    pending += chunk
+                    if imageType is None and len(pending) >= 16:
+                        imageType = sniffImageType(bytes(pending[:16]))
+                    # Escribir en bloques de chunkBytes sin importar cómo llegan los paquetes
+                    if len(pending) >= self.chunkBytes:
+                        await asyncio.to_thread(handle.write, pending)
+                        pending = bytearray()
+                if imageType is None:
+                    imageType = sniffImageType(bytes(pending))
+                if pending:
+                    await asyncio.to_thread(handle.write, pending)
+            finally:
+                await asyncio.to_thread(handle.close)
+            
+            hexDigest = digest.hexdigest()
+            created = await asyncio.to_thread(self._publish, temporaryPath, self.pathFor(hexDigest, imageType[0]))
+            return StoredImage(hexDigest, imageType[0], size, created)
+        except BaseException:
+            await asyncio.to_thread(self._discard, temporaryPath)
+            raise
+    
+    @staticmethod
+    def _publish(temporaryPath: str, finalPath: str) -> bool:
+        """Renombrar al nombre definitivo; False si la imagen ya estaba guardada"""
+        if os.path.exists(finalPath):
+            os.remove(temporaryPath)
+            return False
+        os.makedirs(os.path.dirname(finalPath), exist_ok=True)
+        os.replace(temporaryPath, finalPath)
+        return True
+    
+    @staticmethod
+    def _discard(temporaryPath: str):
+        try:
+            os.remove(temporaryPath)
+        except FileNotFoundError:
+            pass
+    
+    def readRange(self, path: str, start: int, end: int) -> Iterator[bytes]:
+        """Bytes [start, end] del archivo en bloques de chunkBytes (para correr en un hilo)"""
+        with open(path, "rb") as handle:
+            handle.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                block = handle.read(min(self.chunkBytes, remaining))
+                if not block:
+                    return
+                remaining -= len(block)
+                yield block
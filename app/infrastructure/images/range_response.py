@@ -0,0 +1,82 @@
+"""
+Respuestas de imágenes con ETag fuerte y peticiones Range (un solo rango)
+
+El ETag es el SHA-256 del contenido, así que un If-None-Match coincidente responde 304
+sin leer el archivo y If-Range solo respeta el rango si el cliente tiene la misma versión.
+Varios rangos en una petición se responden con el archivo completo, como permite RFC 9110.
+"""
+import asyncio
+import os
+from typing import Optional, Tuple
+from fastapi.responses import Response, StreamingResponse
+from .content_store import ContentStore
+
+# Las URL son por detección: revalidar con el ETag en vez de cachear a ciegas
+IMAGE_CACHE_CONTROL = "private, no-cache"
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+def parseRange(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    (inicio, fin) inclusivo de "bytes=a-b", "bytes=a-" o "bytes=-n"; None si no hay un rango
+    único que aplicar
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    startText, _, endText = header[len("bytes="):].strip().partition("-")
+    try:
+        if startText == "":
+            suffix = int(endText)
+            if suffix <= 0:
+                raise RangeNotSatisfiable()
+            return max(0, size - suffix), size - 1
+        start = int(startText)
+        end = int(endText) if endText else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+def etagMatches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match: lista de ETags o *; se compara sin el prefijo débil W/"""
+    if not header:
+        return False
+    candidates = [candidate.strip().removeprefix("W/") for candidate in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+async def imageResponse(store: ContentStore, path: str, mediaType: str, etag: str, headers) -> Response:
+    """
+    Servir un archivo del almacén respetando If-None-Match, Range e If-Range
+    Lanza FileNotFoundError si el archivo no existe
+    """
+    baseHeaders = {"ETag": etag, "Accept-Ranges": "bytes", "Cache-Control": IMAGE_CACHE_CONTROL}
+    if etagMatches(headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=baseHeaders)
+    
+    size = (await asyncio.to_thread(os.stat, path)).st_size
+    rangeHeader = headers.get("range")
+    ifRange = headers.get("if-range")
+    if ifRange is not None and ifRange.strip() != etag:
+        rangeHeader = None
+    
+    try:
+        byteRange = parseRange(rangeHeader, size)
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={**baseHeaders, "Content-Range": f"bytes */{size}"})
+    
+    if byteRange is None:
+        start, end, status = 0, size - 1, 200
+    else:
+        (start, end), status = byteRange, 206
+        baseHeaders["Content-Range"] = f"bytes {start}-{end}/{size}"
+    baseHeaders["Content-Length"] = str(end - start + 1 if size else 0)
+    
+    # Iterador síncrono: Starlette lo recorre en el threadpool, fuera del event loop
+    return StreamingResponse(
+        store.readRange(path, start, end) if size else iter(()),
+        status_code=status,
+        media_type=mediaType,
+        headers=baseHeaders
+    )
@@ -0,0 +1,118 @@
+"""
+Miniatura y vista previa de imágenes en un pool de procesos
+
+Decodificar y redimensionar una imagen térmica ocupa la CPU decenas de milisegundos;
+corre en procesos aparte (contexto spawn, sin heredar el event loop) y la API solo
+espera el resultado de forma asíncrona. Con IMAGE_THUMBNAIL_WORKERS=0 no se generan
+variantes y solo se sirve el original.
+"""
+import asyncio
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+# Lado mayor en píxeles de cada variante
+VARIANT_SIZES = {"thumbnail": 256, "preview": 1024}
+
+def renderVariants(sourcePath: str, targets: List[Tuple[str, int]]) -> List[str]:
+    """
+    Generar JPEG reducidos de la imagen (se ejecuta en el proceso del pool)
+    Las imágenes radiométricas de 16 bits o flotantes se normalizan a 8 bits
+    """
+    import numpy as np
+    from PIL import Image
+    
+    written = []
+    with Image.open(sourcePath) as source:
+        image = source
+        if image.mode in ("I;16", "I;16B", "I", "F"):
+            values = np.asarray(image, dtype=np.float32)
+            low, high = float(values.min()), float(values.max())
+            scaled = (values - low) * (255.0 / (high - low)) if high > low else np.zeros_like(values)
+            image = Image.fromarray(scaled.astype(np.uint8), mode="L")
+        elif image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        for targetPath, maxSide in targets:
+            variant = image.copy()
+            variant.thumbnail((maxSide, maxSide))
+            # Nombre único: dos workers pueden generar la misma variante a la vez
+            temporaryPath = f"{targetPath}.{uuid.uuid4().hex}.tmp"
+            try:
+                variant.save(temporaryPath, format="JPEG", quality=85)
+                os.replace(temporaryPath, targetPath)
+            except BaseException:
+                if os.path.exists(temporaryPath):
+                    os.remove(temporaryPath)
+                raise
+            written.append(targetPath)
+    return written
+
+class ThumbnailPool:
+    """
+    Pool de procesos creado con el primer uso; las tareas pendientes se rastrean
+    para esperarlas o cancelarlas al apagar
+    """
+    
+    def __init__(self, workers: int = 1):
+        self.workers = workers
+        self.available = workers > 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._inFlight: Dict[str, asyncio.Task] = {}
+        
+        # Contadores expuestos en estadísticas
+        self.renderedTotal = 0
+        self.errorCount = 0
+    
+    def _getExecutor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+    
+    async def render(self, sourcePath: str, targets: Dict[str, str]) -> List[str]:
+        """Generar las variantes {nombre: ruta destino} sin bloquear el event loop"""
+        loop = asyncio.get_running_loop()
+        jobs = [(path, VARIANT_SIZES[name]) for name, path in targets.items()]
+        return await loop.run_in_executor(self._getExecutor(), renderVariants, sourcePath, jobs)
+    
+    def schedule(self, key: str, sourcePath: str, targets: Dict[str, str]) -> Optional[asyncio.Task]:
+        """
+        Generar en segundo plano; una sola tarea por imagen aunque se suba varias veces
+        """
+        if not self.available or not targets:
+            return None
+        if key in self._inFlight:
+            return self._inFlight[key]
+        task = asyncio.create_task(self._renderLogged(key, sourcePath, targets))
+        self._tasks.add(task)
+        self._inFlight[key] = task
+        return task
+    
+    async def _renderLogged(self, key: str, sourcePath: str, targets: Dict[str, str]):
+        try:
+            self.renderedTotal += len(await self.render(sourcePath, targets))
+        except Exception as e:
+            self.errorCount += 1
+            print(f"Error al generar variantes de {sourcePath}: {e}")
+        finally:
+            self._tasks.discard(asyncio.current_task())
+            self._inFlight.pop(key, None)
+    
+    async def stop(self, timeoutSeconds: float = 10.0):
+        """Esperar las variantes en curso (hasta timeoutSeconds) y cerrar el pool"""
+        if self._tasks:
+            await asyncio.wait(list(self._tasks), timeout=timeoutSeconds)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def getStats(self) -> dict:
+        return {
+            "available": self.available,
+            "workers": self.workers,
+            "pending": len(self._tasks),
+            "renderedTotal": self.renderedTotal,
+            "errorCount": self.errorCount
+        }
@@ -0,0 +1,15 @@
+"""
+Exportar componentes de ingesta asíncrona
+"""
+from .write_behind_queue import WriteBehindQueue, QueueFullError
+from .bloom_filter import RotatingBloomFilter
+from .idempotency import (
+    IdempotencyKey, IdempotencyGuard, detectionIdempotencyKey, weatherIdempotencyKey,
+    withIngestKeys, insertUniqueRows, IDEMPOTENCY_KEY_FIELD
+)
+
+__all__ = [
+    "WriteBehindQueue", "QueueFullError", "RotatingBloomFilter",
+    "IdempotencyKey", "IdempotencyGuard", "detectionIdempotencyKey", "weatherIdempotencyKey",
+    "withIngestKeys", "insertUniqueRows", "IDEMPOTENCY_KEY_FIELD"
+]
@@ -0,0 +1,68 @@
+"""
+Filtro de Bloom con ventana de tiempo para descartar llaves de idempotencia nuevas
+sin consultar la base
+
+Dos generaciones de bits: las llaves se agregan a la actual y se buscan en ambas.
+Cada windowSeconds la actual pasa a ser la anterior y se descarta la más vieja, así
+una llave se recuerda entre una y dos ventanas. Un "no" es definitivo (dentro de la
+ventana y para las llaves vistas por este proceso); un "tal vez" se confirma en la base.
+"""
+import math
+import time
+from typing import Optional
+import numpy as np
+
+class RotatingBloomFilter:
+    """
+    Bits empaquetados en uint8; las k posiciones salen de un digest de 16 bytes
+    por doble hashing (h1 + i·h2)
+    """
+    
+    def __init__(self, expectedKeys: int = 1_000_000, falsePositiveRate: float = 0.01, windowSeconds: float = 86400.0):
+        self.windowSeconds = windowSeconds
+        self.bitCount = max(64, int(math.ceil(-expectedKeys * math.log(falsePositiveRate) / math.log(2) ** 2)))
+        self.hashCount = max(1, int(round(self.bitCount / expectedKeys * math.log(2))))
+        self._offsets = np.arange(self.hashCount, dtype=np.uint64)
+        self._current = np.zeros((self.bitCount + 7) // 8, dtype=np.uint8)
+        self._previous = np.zeros_like(self._current)
+        self._generationStart = time.monotonic()
+        self.rotations = 0
+    
+    @property
+    def memoryBytes(self) -> int:
+        return self._current.nbytes + self._previous.nbytes
+    
+    def _positions(self, digest: bytes) -> np.ndarray:
+        h1 = np.uint64(int.from_bytes(digest[:8], "little"))
+        h2 = np.uint64(int.from_bytes(digest[8:16], "little") | 1)
+        # La aritmética uint64 desborda módulo 2^64, que es lo esperado aquí
+        with np.errstate(over="ignore"):
+            return (h1 + self._offsets * h2) % np.uint64(self.bitCount)
+    
+    def rotateIfDue(self, now: Optional[float] = None):
+        """Pasar a la siguiente generación si la actual cumplió su ventana"""
+        now = time.monotonic() if now is None else now
+        if now - self._generationStart < self.windowSeconds:
+            return
+        # Si pasaron dos ventanas sin rotar, la anterior también expiró
+        if now - self._generationStart >= 2 * self.windowSeconds:
+            self._current[:] = 0
+        self._previous, self._current = self._current, self._previous
+        self._current[:] = 0
+        self._generationStart = now
+        self.rotations += 1
+    
+    def add(self, digest: bytes):
+        self.rotateIfDue()
+        positions = self._positions(digest)
+        np.bitwise_or.at(self._current, positions >> np.uint64(3), np.left_shift(1, positions & np.uint64(7)).astype(np.uint8))
+    
+    def mightContain(self, digest: bytes) -> bool:
+        self.rotateIfDue()
+        positions = self._positions(digest)
+        masks = np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+        byteIndexes = positions >> np.uint64(3)
+        for bits in (self._current, self._previous):
+            if np.all(bits[byteIndexes] & masks):
+                return True
+        return False
@@ -0,0 +1,211 @@
+"""
+Llaves de idempotencia para la ingesta
+
+Las cámaras y estaciones reintentan ante timeouts; la llave identifica la lectura
+original para responder con su registro en lugar de insertar un duplicado.
+Prioridad: encabezado Idempotency-Key del cliente; si no viene, hash de la llave
+natural, solo cuando el dispositivo envió su propio timestamp (sin él cada reintento
+recibe un timestamp distinto del servidor y no hay forma de reconocerlo).
+Los lotes y la cola write-behind usan la llave natural de cada elemento.
+"""
+import hashlib
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.entities import DetectionCreate, WeatherDataCreate
+from app.infrastructure.database.repositories import (
+    findIngestKey, claimIngestKeys, assignIngestKeyRecords, loadRecentIngestKeys, purgeIngestKeys
+)
+from .bloom_filter import RotatingBloomFilter
+
+# Campo auxiliar con la llave en las filas que pasan por la cola write-behind
+IDEMPOTENCY_KEY_FIELD = "_idempotencyKey"
+# Largo máximo aceptado para el encabezado del cliente
+MAX_CLIENT_KEY_LENGTH = 255
+
+class IdempotencyKey:
+    """Llave de un dataset: hash hexadecimal (columna) y digest binario (filtro de Bloom)"""
+    __slots__ = ("dataset", "digest", "hexDigest")
+    
+    def __init__(self, dataset: str, material: str):
+        self.dataset = dataset
+        self.digest = hashlib.blake2b(f"{dataset}\x1f{material}".encode(), digest_size=16).digest()
+        self.hexDigest = self.digest.hex()
+
+def formatTimestamp(value: datetime) -> str:
+    return value.isoformat()
+
+def clientKey(dataset: str, headerValue: Optional[str]) -> Optional[IdempotencyKey]:
+    if headerValue is None or not headerValue.strip():
+        return None
+    if len(headerValue) > MAX_CLIENT_KEY_LENGTH:
+        raise ValueError(f"Idempotency-Key excede {MAX_CLIENT_KEY_LENGTH} caracteres")
+    return IdempotencyKey(dataset, "client\x1f" + headerValue.strip())
+
+def detectionIdempotencyKey(
+    detectionData: DetectionCreate,
+    cameraId: str,
+    headerValue: Optional[str] = None
+) -> Optional[IdempotencyKey]:
+    """
+    Llave de una detección: encabezado o (cameraId, timestamp, detectionType, bbox)
+    """
+    key = clientKey("detections", headerValue)
+    if key is not None or detectionData.timestamp is None:
+        return key
+    material = "\x1f".join(str(part) for part in (
+        cameraId, formatTimestamp(detectionData.timestamp), detectionData.detectionType,
+        detectionData.bboxX, detectionData.bboxY, detectionData.bboxWidth, detectionData.bboxHeight
+    ))
+    return IdempotencyKey("detections", material)
+
+def weatherIdempotencyKey(
+    weatherData: WeatherDataCreate,
+    sensorId: str,
+    headerValue: Optional[str] = None
+) -> Optional[IdempotencyKey]:
+    """
+    Llave de una lectura meteorológica: encabezado o (sensorId, timestamp)
+    """
+    key = clientKey("weather", headerValue)
+    if key is not None or weatherData.timestamp is None:
+        return key
+    return IdempotencyKey("weather", f"{sensorId}\x1f{formatTimestamp(weatherData.timestamp)}")
+
+class IdempotencyGuard:
+    """
+    Filtro de Bloom del proceso delante de la tabla ingest_keys
+    Solo las llaves que el filtro no puede descartar se buscan en la base
+    En modo queue las llaves encoladas y aún sin confirmar se conocen en memoria:
+    su reintento se responde sin encolar otra vez la fila
+    """
+    
+    def __init__(self, windowSeconds: float = 86400.0, expectedKeys: int = 1_000_000, falsePositiveRate: float = 0.01):
+        self.windowSeconds = windowSeconds
+        self.bloom = RotatingBloomFilter(expectedKeys, falsePositiveRate, windowSeconds)
+        self._pendingKeys: Set[str] = set()  # hexDigest de filas en la cola write-behind
+        
+        # Contadores expuestos en estadísticas
+        self.skippedLookups = 0
+        self.lookups = 0
+        self.duplicates = 0
+        self.pendingReplays = 0
+    
+    async def findDuplicate(self, session: AsyncSession, key: IdempotencyKey) -> Optional[int]:
+        """
+        ID del registro original si la llave ya se registró, None si es nueva
+        """
+        if not self.bloom.mightContain(key.digest):
+            self.skippedLookups += 1
+            return None
+        self.lookups += 1
+        recordId = await findIngestKey(session, key.dataset, key.hexDigest)
+        if recordId is not None:
+            self.duplicates += 1
+        return recordId
+    
+    def remember(self, key: IdempotencyKey):
+        self.bloom.add(key.digest)
+    
+    def isPending(self, key: IdempotencyKey) -> bool:
+        """La llave pertenece a una fila encolada que todavía no se confirma"""
+        if key.hexDigest in self._pendingKeys:
+            self.pendingReplays += 1
+            return True
+        return False
+    
+    def markPending(self, key: IdempotencyKey):
+        self._pendingKeys.add(key.hexDigest)
+        self.remember(key)
+    
+    def releasePending(self, rows: Sequence[dict]):
+        """
+        Filas de la cola confirmadas (la llave ya está en ingest_keys) o descartadas
+        """
+        for row in rows:
+            self._pendingKeys.discard(row.get(IDEMPOTENCY_KEY_FIELD))
+    
+    def rememberDuplicate(self, count: int = 1):
+        """Duplicados detectados por el índice único (registrados por otro worker o en un lote)"""
+        self.duplicates += count
+    
+    async def prime(self, session: AsyncSession) -> int:
+        """Cargar en el filtro las llaves de la ventana vigente, retorna cuántas"""
+        keyHashes = await loadRecentIngestKeys(session, datetime.now() - timedelta(seconds=self.windowSeconds))
+        for keyHash in keyHashes:
+            self.bloom.add(bytes.fromhex(keyHash))
+        return len(keyHashes)
+    
+    async def purgeExpired(self, session: AsyncSession) -> int:
+        """Eliminar de la base las llaves fuera de la ventana"""
+        return await purgeIngestKeys(session, datetime.now() - timedelta(seconds=self.windowSeconds))
+    
+    def getStats(self) -> dict:
+        return {
+            "windowSeconds": self.windowSeconds,
+            "bloomBytes": self.bloom.memoryBytes,
+            "bloomHashes": self.bloom.hashCount,
+            "bloomRotations": self.bloom.rotations,
+            "skippedLookups": self.skippedLookups,
+            "lookups": self.lookups,
+            "duplicates": self.duplicates,
+            "pendingKeys": len(self._pendingKeys),
+            "pendingReplays": self.pendingReplays
+        }
+
+InsertFunction = Callable[[AsyncSession, Sequence[dict]], Awaitable[List[int]]]
+
+async def insertUniqueRows(
+    session: AsyncSession,
+    dataset: str,
+    insertFunction: InsertFunction,
+    rows: Sequence[dict],
+    keyHashes: Sequence[Optional[str]]
+) -> Tuple[List[int], List[bool]]:
+    """
+    Insertar en la transacción de quien llama solo las filas cuya llave no está registrada
+    Las llaves se reclaman antes de insertar: un duplicado de otro worker, de un lote anterior
+    o del mismo lote no se inserta y recibe el ID original. Las filas sin llave se insertan siempre
+    Retorna los IDs alineados con rows y si cada fila era un duplicado
+    """
+    idsByKey: Dict[str, int] = await claimIngestKeys(session, dataset, [keyHash for keyHash in keyHashes if keyHash])
+    newPositions: List[int] = []
+    claimedPositions: Dict[str, int] = {}  # primera fila de cada llave nueva
+    for position, keyHash in enumerate(keyHashes):
+        if keyHash is None:
+            newPositions.append(position)
+        elif keyHash not in idsByKey and keyHash not in claimedPositions:
+            claimedPositions[keyHash] = position
+            newPositions.append(position)
+    
+    insertedIds = await insertFunction(session, [rows[position] for position in newPositions])
+    recordIds: List[Optional[int]] = [None] * len(rows)
+    for position, recordId in zip(newPositions, insertedIds):
+        recordIds[position] = recordId
+    for keyHash, position in claimedPositions.items():
+        idsByKey[keyHash] = recordIds[position]
+    await assignIngestKeyRecords(session, dataset, [
+        (keyHash, recordIds[position]) for keyHash, position in claimedPositions.items()
+    ])
+    
+    replayed = [recordId is None for recordId in recordIds]
+    return [
+        idsByKey[keyHash] if recordId is None else recordId for recordId, keyHash in zip(recordIds, keyHashes)
+    ], replayed
+
+def withIngestKeys(dataset: str, insertFunction: InsertFunction) -> Callable[[AsyncSession, Sequence[dict]], Awaitable[List[Optional[int]]]]:
+    """
+    Envolver la inserción de la cola write-behind: quita IDEMPOTENCY_KEY_FIELD de las filas,
+    descarta las que ya están registradas (reintentos recibidos por otro worker o después de
+    rotar el filtro) y registra las llaves con los IDs asignados en la misma transacción
+    Las filas descartadas reciben None en lugar de ID
+    """
+    async def insertWithKeys(session: AsyncSession, rows: Sequence[dict]) -> List[Optional[int]]:
+        keyHashes = [row.get(IDEMPOTENCY_KEY_FIELD) for row in rows]
+        cleanRows = [
+            {name: value for name, value in row.items() if name != IDEMPOTENCY_KEY_FIELD} if keyHash else row
+            for row, keyHash in zip(rows, keyHashes)
+        ]
+        recordIds, replayed = await insertUniqueRows(session, dataset, insertFunction, cleanRows, keyHashes)
+        return [None if isReplay else recordId for recordId, isReplay in zip(recordIds, replayed)]
+    return insertWithKeys
@@ -0,0 +1,246 @@
+"""
+Cola de ingesta write-behind con group-commit
+
+Los handlers encolan filas ya validadas y responden 202; una tarea de fondo
+agrupa las filas y las confirma en un solo INSERT multi-fila cada N ms o cada
+M filas, lo que ocurra primero.
+
+Si la base falla (conexión, bloqueo) el lote se reintenta con backoff. Si rechaza los
+datos (IntegrityError, DataError) reintentar no sirve: el lote se parte en mitades hasta
+aislar las filas rechazadas, que se apartan como dead letters y no bloquean al resto.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, List, Optional, Sequence
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# La inserción puede descartar filas (duplicados ya registrados): su ID es None
+InsertFunction = Callable[[AsyncSession, Sequence[dict]], Awaitable[List[Optional[int]]]]
+FlushedCallback = Callable[[List[dict], List[Optional[int]]], Awaitable[None]]
+DeadLetterCallback = Callable[[dict], None]
+
+# Espera máxima entre reintentos cuando la base de datos falla
+MAX_RETRY_BACKOFF_SECONDS = 5.0
+
+# Errores de la fila, no de la base: no se reintentan
+REJECTED_ROW_ERRORS = (IntegrityError, DataError)
+
+# Dead letters recientes que se conservan para diagnóstico
+DEAD_LETTER_HISTORY = 100
+
+class QueueFullError(Exception):
+    """La cola alcanzó su capacidad máxima o se está deteniendo"""
+    pass
+
+class WriteBehindQueue:
+    """
+    Cola acotada en memoria con una tarea que hace group-commit de las filas
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        insertFunction: InsertFunction,
+        sessionFactory: Callable[[], AsyncSession],
+        maxSize: int = 10000,
+        flushIntervalMs: int = 50,
+        flushMaxRows: int = 500,
+        onFlushed: Optional[FlushedCallback] = None,
+        onDeadLetter: Optional[DeadLetterCallback] = None
+    ):
+        self.name = name
+        self.maxSize = maxSize
+        self.flushInterval = flushIntervalMs / 1000.0
+        self.flushMaxRows = flushMaxRows
+        self._insertFunction = insertFunction
+        self._sessionFactory = sessionFactory
+        self._onFlushed = onFlushed  # Se invoca con (filas, ids) después de cada commit; None en las descartadas
+        self._onDeadLetter = onDeadLetter  # Se invoca con cada fila que la base rechaza
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxSize)
+        self._pending: List[dict] = []  # Lote que falló y se reintenta en el siguiente ciclo
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._consecutiveErrors = 0
+        self.deadLetters: deque = deque(maxlen=DEAD_LETTER_HISTORY)  # (fila, error) rechazadas por la base
+        
+        # Contadores expuestos en estadísticas
+        self.enqueuedTotal = 0
+        self.rejectedTotal = 0
+        self.flushedRowsTotal = 0
+        self.flushCount = 0
+        self.flushErrorCount = 0
+        self.deadLetterTotal = 0
+        self.lastFlushSeconds = 0.0
+        self.maxFlushSeconds = 0.0
+        self.totalFlushSeconds = 0.0
+    
+    @property
+    def depth(self) -> int:
+        """Filas aceptadas que aún no se confirman en base de datos"""
+        return self._queue.qsize() + len(self._pending)
+    
+    def enqueue(self, row: dict):
+        """
+        Encolar una fila sin bloquear; lanza QueueFullError si no hay capacidad
+        """
+        if self._stopping:
+            raise QueueFullError(f"La cola {self.name} se está deteniendo")
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.rejectedTotal += 1
+            raise QueueFullError(f"La cola {self.name} está llena ({self.maxSize} filas)")
+        self.enqueuedTotal += 1
+    
+    def start(self):
+        """
+        Iniciar la tarea de group-commit en el event loop actual
+        """
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run(), name=f"write-behind-{self.name}")
+    
+    async def stop(self):
+        """
+        Dejar de aceptar filas, esperar el lote en curso y drenar todo lo pendiente
+        """
+        self._stopping = True
+        if self._task is not None:
+            await self._task
+            self._task = None
+        
+        # Drenar lo que quedó en la cola, con reintentos acotados
+        attempts = 0
+        while self.depth > 0 and attempts < 3:
+            batch = self._takePending()
+            while len(batch) < self.flushMaxRows and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if not await self._flushSafely(batch):
+                attempts += 1
+        
+        if self.depth > 0:
+            print(f"Cola {self.name}: {self.depth} filas sin confirmar al detenerse")
+    
+    def getStats(self) -> dict:
+        """
+        Contadores de profundidad y latencia de confirmación
+        """
+        return {
+            "depth": self.depth,
+            "maxSize": self.maxSize,
+            "enqueuedTotal": self.enqueuedTotal,
+            "rejectedTotal": self.rejectedTotal,
+            "flushedRowsTotal": self.flushedRowsTotal,
+            "flushCount": self.flushCount,
+            "flushErrorCount": self.flushErrorCount,
+            "deadLetterTotal": self.deadLetterTotal,
+            "lastDeadLetterError": self.deadLetters[-1][1] if self.deadLetters else None,
+            "lastFlushMs": round(self.lastFlushSeconds * 1000, 3),
+            "maxFlushMs": round(self.maxFlushSeconds * 1000, 3),
+            "avgFlushMs": round(self.totalFlushSeconds / self.flushCount * 1000, 3) if self.flushCount else 0.0
+        }
+    
+    def _takePending(self) -> List[dict]:
+        batch = self._pending
+        self._pending = []
+        return batch
+    
+    async def _run(self):
+        """
+        Ciclo principal: juntar un lote, confirmarlo y repetir hasta que se detenga
+        """
+        while not self._stopping:
+            batch = await self._collectBatch()
+            if batch and not await self._flushSafely(batch):
+                backoff = min(self.flushInterval * 2 ** self._consecutiveErrors, MAX_RETRY_BACKOFF_SECONDS)
+                await asyncio.sleep(backoff)
+    
+    async def _collectBatch(self) -> List[dict]:
+        """
+        Juntar filas hasta flushMaxRows o hasta que venza el intervalo desde la primera
+        """
+        loop = asyncio.get_running_loop()
+        batch = self._takePending()
+        
+        if not batch:
+            # Esperar la primera fila; el timeout permite revisar si nos están deteniendo
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=self.flushInterval))
+            except asyncio.TimeoutError:
+                return batch
+        
+        deadline = loop.time() + self.flushInterval
+        while len(batch) < self.flushMaxRows:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            
+            remaining = deadline - loop.time()
+            if remaining <= 0 or self._stopping:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        return batch
+    
+    async def _flushSafely(self, batch: List[dict]) -> bool:
+        """
+        Confirmar un lote; si la base rechaza datos se bisecta hasta aislar las filas culpables
+        Ante un error de conexión lo que falta se conserva para reintentar y retorna False
+        """
+        # Pila de partes por confirmar; la primera mitad queda arriba para conservar el orden
+        remaining = [batch]
+        while remaining:
+            part = remaining.pop()
+            try:
+                await self._commitPart(part)
+            except REJECTED_ROW_ERRORS as e:
+                if len(part) == 1:
+                    self._deadLetter(part[0], e)
+                else:
+                    middle = len(part) // 2
+                    remaining.append(part[middle:])
+                    remaining.append(part[:middle])
+            except Exception as e:
+                self.flushErrorCount += 1
+                self._consecutiveErrors += 1
+                self._pending = part + [row for pending in reversed(remaining) for row in pending] + self._pending
+                print(f"Error al confirmar lote de {len(part)} filas en cola {self.name}: {e}")
+                return False
+        return True
+    
+    async def _commitPart(self, batch: List[dict]):
+        """Confirmar filas en una transacción y avisar a onFlushed"""
+        started = time.perf_counter()
+        async with self._sessionFactory() as session:
+            insertedIds = await self._insertFunction(session, batch)
+            await session.commit()
+        
+        elapsed = time.perf_counter() - started
+        self._consecutiveErrors = 0
+        self.flushCount += 1
+        self.flushedRowsTotal += len(batch)
+        self.lastFlushSeconds = elapsed
+        self.maxFlushSeconds = max(self.maxFlushSeconds, elapsed)
+        self.totalFlushSeconds += elapsed
+        
+        if self._onFlushed is not None:
+            try:
+                await self._onFlushed(batch, insertedIds)
+            except Exception as e:
+                print(f"Error en callback posterior al commit de cola {self.name}: {e}")
+    
+    def _deadLetter(self, row: dict, error: Exception):
+        """Apartar una fila que la base rechaza; ya se respondió 202 y no se reintenta"""
+        message = str(getattr(error, "orig", None) or error)
+        self.deadLetterTotal += 1
+        self.deadLetters.append((row, message))
+        print(f"Fila rechazada en cola {self.name} (dead letter): {message} - {row}")
+        if self._onDeadLetter is not None:
+            self._onDeadLetter(row)
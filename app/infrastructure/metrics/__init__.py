@@ -0,0 +1,10 @@
+"""
+Exportar componentes de métricas
+"""
+from .registry import MetricsRegistry, Histogram, metricsRegistry
+from .middleware import MetricsMiddleware, instrumentEngine, currentRequestMetrics
+
+__all__ = [
+    "MetricsRegistry", "Histogram", "metricsRegistry",
+    "MetricsMiddleware", "instrumentEngine", "currentRequestMetrics"
+]
@@ -0,0 +1,118 @@
+"""
+Middleware ASGI de métricas HTTP y hooks SQL por petición
+
+Cada petición guarda un RequestMetrics en una context var; los hooks de
+SQLAlchemy suman ahí las consultas y el tiempo en base de datos, y el
+middleware lo registra por plantilla de ruta al terminar.
+"""
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from .registry import MetricsRegistry, metricsRegistry
+
+UNMATCHED_ROUTE = "unmatched"
+
+class RequestMetrics:
+    """Acumulador por petición, única asignación que hace el middleware"""
+    __slots__ = ("send", "status", "responseBytes", "dbQueries", "dbSeconds")
+    
+    def __init__(self, send):
+        self.send = send
+        self.status = 500
+        self.responseBytes = 0
+        self.dbQueries = 0
+        self.dbSeconds = 0.0
+    
+    async def sendWrapper(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+        elif message["type"] == "http.response.body":
+            self.responseBytes += len(message.get("body", b""))
+        await self.send(message)
+
+currentRequestMetrics: ContextVar[Optional[RequestMetrics]] = ContextVar("currentRequestMetrics", default=None)
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI puro: cuenta peticiones, latencia y tamaños por plantilla de ruta
+    """
+    
+    def __init__(self, app, registry: MetricsRegistry = metricsRegistry):
+        self.app = app
+        self.registry = registry
+        self._routeTemplates = None
+    
+    def routeTemplate(self, scope) -> str:
+        """
+        Plantilla de la ruta resuelta (/api/v1/export/{dataset}), nunca el path real,
+        para que la cardinalidad de etiquetas sea fija
+        """
+        if self._routeTemplates is None:
+            application = scope.get("app")
+            routes = getattr(application, "routes", [])
+            self._routeTemplates = {
+                route.endpoint: route.path for route in routes if hasattr(route, "endpoint")
+            }
+        return self._routeTemplates.get(scope.get("endpoint"), UNMATCHED_ROUTE)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        metrics = RequestMetrics(send)
+        token = currentRequestMetrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, metrics.sendWrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            currentRequestMetrics.reset(token)
+            requestBytes = 0
+            for name, value in scope.get("headers", ()):
+                if name == b"content-length":
+                    requestBytes = int(value or 0)
+                    break
+            self.registry.observeRequest(
+                scope["method"], self.routeTemplate(scope), metrics.status, elapsed,
+                requestBytes, metrics.responseBytes, metrics.dbQueries, metrics.dbSeconds
+            )
+
+def instrumentEngine(engine: AsyncEngine, poolName: str = "primary", registry: MetricsRegistry = metricsRegistry):
+    """
+    Registrar hooks before/after_cursor_execute que miden cada consulta y la
+    atribuyen a la petición en curso, y medir la espera de cada checkout del pool
+    """
+    syncEngine = engine.sync_engine
+    
+    # El pool no tiene evento previo al checkout: se envuelve pool.connect, por donde
+    # pasan todas las conexiones (sesiones de endpoints, colas, jobs, sondeo de salud)
+    pool = syncEngine.pool
+    connectPool = pool.connect
+    
+    def timedConnect():
+        started = time.perf_counter()
+        try:
+            return connectPool()
+        finally:
+            registry.observeCheckout(poolName, time.perf_counter() - started)
+    
+    pool.connect = timedConnect
+    
+    @event.listens_for(syncEngine, "before_cursor_execute")
+    def beforeCursorExecute(connection, cursor, statement, parameters, context, executemany):
+        connection.info["metricsQueryStart"] = time.perf_counter()
+    
+    @event.listens_for(syncEngine, "after_cursor_execute")
+    def afterCursorExecute(connection, cursor, statement, parameters, context, executemany):
+        started = connection.info.pop("metricsQueryStart", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        registry.observeQuery(elapsed)
+        metrics = currentRequestMetrics.get()
+        if metrics is not None:
+            metrics.dbQueries += 1
+            metrics.dbSeconds += elapsed
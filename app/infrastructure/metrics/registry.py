@@ -0,0 +1,174 @@
+"""
+Registro de métricas en memoria con salida en formato de texto de Prometheus
+
+Los histogramas tienen buckets fijos: observar un valor es un bisect y dos
+incrementos, sin asignar memoria, por lo que se puede dejar activo en producción.
+"""
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Buckets de latencia en segundos
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Buckets de tamaño de payload en bytes
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+# Buckets de consultas SQL por petición
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Cuantiles estimados que se publican junto a cada histograma de latencia
+PUBLISHED_QUANTILES = (0.5, 0.95, 0.99)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class Histogram:
+    """Histograma con buckets fijos (límite superior inclusivo)"""
+    __slots__ = ("bounds", "counts", "total", "count")
+    
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # el último es +Inf
+        self.total = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimar un cuantil interpolando linealmente dentro del bucket (como histogram_quantile)
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, bucketCount in enumerate(self.counts):
+            if cumulative + bucketCount >= rank and bucketCount > 0:
+                if index == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index]
+                return lower + (upper - lower) * (rank - cumulative) / bucketCount
+            cumulative += bucketCount
+        return self.bounds[-1]
+
+def escapeLabelValue(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def formatLabels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escapeLabelValue(value)}"' for name, value in pairs) + "}"
+
+def formatNumber(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class MetricFamily:
+    """Familia de métricas del mismo nombre y tipo con varias combinaciones de etiquetas"""
+    
+    def __init__(self, name: str, help: str, metricType: str, bounds: Optional[Sequence[float]] = None):
+        self.name = name
+        self.help = help
+        self.metricType = metricType
+        self.bounds = bounds
+        self.series: Dict[Labels, object] = {}
+    
+    def histogram(self, labels: Labels) -> Histogram:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = Histogram(self.bounds)
+        return series
+    
+    def increment(self, labels: Labels, amount: float = 1):
+        self.series[labels] = self.series.get(labels, 0) + amount
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.metricType}"]
+        for labels, series in self.series.items():
+            if self.metricType == "histogram":
+                cumulative = 0
+                for bound, bucketCount in zip(list(self.bounds) + ["+Inf"], series.counts):
+                    cumulative += bucketCount
+                    le = bound if bound == "+Inf" else formatNumber(bound)
+                    lines.append(f"{self.name}_bucket{formatLabels(labels, ('le', le))} {cumulative}")
+                lines.append(f"{self.name}_sum{formatLabels(labels)} {formatNumber(series.total)}")
+                lines.append(f"{self.name}_count{formatLabels(labels)} {series.count}")
+            else:
+                lines.append(f"{self.name}{formatLabels(labels)} {formatNumber(series)}")
+        return lines
+
+GaugeCollector = Callable[[], Iterable[Tuple[Labels, float]]]
+
+class MetricsRegistry:
+    """
+    Métricas HTTP por plantilla de ruta, métricas SQL y gauges calculados al exportar
+    """
+    
+    def __init__(self):
+        self.requestsTotal = MetricFamily("http_requests_total", "Peticiones HTTP por ruta y estado", "counter")
+        self.requestDuration = MetricFamily("http_request_duration_seconds", "Latencia de peticiones HTTP", "histogram", LATENCY_BUCKETS)
+        self.requestSize = MetricFamily("http_request_size_bytes", "Tamaño del cuerpo de la petición", "histogram", SIZE_BUCKETS)
+        self.responseSize = MetricFamily("http_response_size_bytes", "Tamaño del cuerpo de la respuesta", "histogram", SIZE_BUCKETS)
+        self.requestDbQueries = MetricFamily("http_request_db_queries", "Consultas SQL ejecutadas por petición", "histogram", QUERY_COUNT_BUCKETS)
+        self.requestDbDuration = MetricFamily("http_request_db_seconds", "Tiempo en base de datos por petición", "histogram", LATENCY_BUCKETS)
+        self.dbQueriesTotal = MetricFamily("db_queries_total", "Consultas SQL ejecutadas", "counter")
+        self.dbQueryDuration = MetricFamily("db_query_duration_seconds", "Duración de cada consulta SQL", "histogram", LATENCY_BUCKETS)
+        self.dbCheckoutDuration = MetricFamily("db_pool_checkout_seconds", "Espera para obtener una conexión del pool", "histogram", LATENCY_BUCKETS)
+        self._gauges: List[Tuple[str, str, GaugeCollector]] = []
+    
+    def observeRequest(self, method: str, route: str, status: int, seconds: float,
+                       requestBytes: int, responseBytes: int, dbQueries: int, dbSeconds: float):
+        """Registrar una petición terminada"""
+        labels = (("method", method), ("route", route))
+        self.requestsTotal.increment(labels + (("status", str(status)),))
+        self.requestDuration.histogram(labels).observe(seconds)
+        self.requestSize.histogram(labels).observe(requestBytes)
+        self.responseSize.histogram(labels).observe(responseBytes)
+        self.requestDbQueries.histogram(labels).observe(dbQueries)
+        self.requestDbDuration.histogram(labels).observe(dbSeconds)
+    
+    def observeQuery(self, seconds: float):
+        """Registrar una consulta SQL"""
+        self.dbQueriesTotal.increment(())
+        self.dbQueryDuration.histogram(()).observe(seconds)
+    
+    def observeCheckout(self, pool: str, seconds: float):
+        """Registrar la espera de un checkout del pool (incluye el pre-ping)"""
+        self.dbCheckoutDuration.histogram((("pool", pool),)).observe(seconds)
+    
+    def addGauge(self, name: str, help: str, collector: GaugeCollector):
+        """Registrar un gauge cuyo valor se calcula al exportar"""
+        self._gauges.append((name, help, collector))
+    
+    def latencyQuantiles(self) -> List[str]:
+        """Cuantiles p50/p95/p99 estimados de la latencia por ruta"""
+        name = "http_request_duration_quantile_seconds"
+        lines = [f"# HELP {name} Cuantiles estimados de latencia por ruta", f"# TYPE {name} gauge"]
+        for labels, histogram in self.requestDuration.series.items():
+            for q in PUBLISHED_QUANTILES:
+                value = histogram.quantile(q)
+                if value is not None:
+                    lines.append(f"{name}{formatLabels(labels, ('quantile', str(q)))} {formatNumber(value)}")
+        return lines
+    
+    def render(self) -> str:
+        """Exportar todas las métricas en formato de texto de Prometheus"""
+        lines: List[str] = []
+        for family in (self.requestsTotal, self.requestDuration, self.requestSize, self.responseSize,
+                       self.requestDbQueries, self.requestDbDuration, self.dbQueriesTotal, self.dbQueryDuration,
+                       self.dbCheckoutDuration):
+            lines.extend(family.render())
+        lines.extend(self.latencyQuantiles())
+        for name, help, collector in self._gauges:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} gauge")
+            try:
+                for labels, value in collector():
+                    lines.append(f"{name}{formatLabels(labels)} {formatNumber(value)}")
+            except Exception as e:
+                lines.append(f"# error al calcular {name}: {e}")
+        return "\n".join(lines) + "\n"
+
+# Registro compartido por el proceso
+metricsRegistry = MetricsRegistry()
@@ -0,0 +1,10 @@
+"""
+Exportar hub de eventos en vivo y sus backends
+"""
+from .event_hub import Event, EventHub, Subscription, SubscriberLimitError
+from .backends import InMemoryEventBackend, RedisEventBackend, createEventBackend
+
+__all__ = [
+    "Event", "EventHub", "Subscription", "SubscriberLimitError",
+    "InMemoryEventBackend", "RedisEventBackend", "createEventBackend"
+]
@@ -0,0 +1,148 @@
+"""
+Backends del hub de eventos: en memoria (un worker) o canal pub/sub de Redis (varios workers)
+
+Ambos exponen start(deliver), send(event), stop() y getStats(); send nunca bloquea
+la ingesta. Con Redis los eventos salen por una cola acotada hacia PUBLISH y una
+tarea escucha el canal y entrega cada mensaje al hub local. Cualquier servidor que
+hable el protocolo de Redis (Valkey, KeyDB) sirve, y para desarrollo se puede pasar
+un cliente compatible con redis.asyncio ya construido (p. ej. uno falso en memoria).
+"""
+import asyncio
+from typing import Optional
+from .event_hub import Event, EventDelivery
+
+try:
+    import redis.asyncio as redisAsyncio
+except ImportError:
+    redisAsyncio = None
+
+# Espera antes de reintentar cuando se pierde la conexión con Redis
+RECONNECT_DELAY_SECONDS = 1.0
+
+class InMemoryEventBackend:
+    """Entrega directa a las suscripciones del mismo proceso"""
+    shared = False
+    
+    def __init__(self):
+        self._deliver: Optional[EventDelivery] = None
+    
+    async def start(self, deliver: EventDelivery):
+        self._deliver = deliver
+    
+    def send(self, event: Event):
+        if self._deliver is not None:
+            self._deliver(event)
+    
+    async def stop(self):
+        self._deliver = None
+    
+    def getStats(self) -> dict:
+        return {"backend": "memory"}
+
+class RedisEventBackend:
+    """
+    Publicación y escucha sobre un canal de Redis compartido por los workers
+    """
+    shared = True
+    
+    def __init__(self, url: Optional[str] = None, channel: str = "thermal-monitoring-events", client=None, outboxSize: int = 10000):
+        self.url = url
+        self.channel = channel
+        self._client = client
+        self._ownsClient = client is None
+        self._outbox: asyncio.Queue = asyncio.Queue(maxsize=outboxSize)
+        self._pubsub = None
+        self._deliver: Optional[EventDelivery] = None
+        self._listenTask: Optional[asyncio.Task] = None
+        self._publishTask: Optional[asyncio.Task] = None
+        
+        # Contadores expuestos en estadísticas
+        self.sentTotal = 0
+        self.receivedTotal = 0
+        self.droppedTotal = 0
+        self.errorCount = 0
+    
+    async def start(self, deliver: EventDelivery):
+        if self._client is None:
+            if redisAsyncio is None:
+                raise RuntimeError("EVENTS_BACKEND=redis requiere el paquete redis (pip install redis)")
+            self._client = redisAsyncio.from_url(self.url)
+        self._deliver = deliver
+        self._pubsub = self._client.pubsub()
+        await self._pubsub.subscribe(self.channel)
+        self._listenTask = asyncio.create_task(self._listen(), name="events-redis-listen")
+        self._publishTask = asyncio.create_task(self._publishLoop(), name="events-redis-publish")
+    
+    def send(self, event: Event):
+        """Encolar para PUBLISH; si Redis no da abasto el evento se descarta"""
+        try:
+            self._outbox.put_nowait(event)
+        except asyncio.QueueFull:
+            self.droppedTotal += 1
+    
+    async def stop(self):
+        for task in (self._publishTask, self._listenTask):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._publishTask = self._listenTask = None
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(self.channel)
+                await self._pubsub.reset()
+            except Exception as e:
+                print(f"Error al cerrar la suscripción de eventos en Redis: {e}")
+            self._pubsub = None
+        if self._ownsClient and self._client is not None:
+            await self._client.close()
+            self._client = None
+    
+    async def _publishLoop(self):
+        while True:
+            event = await self._outbox.get()
+            try:
+                await self._client.publish(self.channel, event.payload)
+                self.sentTotal += 1
+            except Exception as e:
+                self.errorCount += 1
+                self.droppedTotal += 1
+                print(f"Error al publicar evento en Redis: {e}")
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+    
+    async def _listen(self):
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    self.receivedTotal += 1
+                    self._deliver(Event.fromPayload(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # El cliente reconecta y vuelve a suscribirse en la siguiente lectura
+                self.errorCount += 1
+                print(f"Error al escuchar eventos en Redis: {e}")
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+    
+    def getStats(self) -> dict:
+        return {
+            "backend": "redis",
+            "channel": self.channel,
+            "outboxDepth": self._outbox.qsize(),
+            "sentTotal": self.sentTotal,
+            "receivedTotal": self.receivedTotal,
+            "droppedTotal": self.droppedTotal,
+            "errorCount": self.errorCount
+        }
+
+def createEventBackend(name: str, redisUrl: Optional[str] = None, channel: str = "thermal-monitoring-events"):
+    """Backend según EVENTS_BACKEND: memory o redis"""
+    if name == "memory":
+        return InMemoryEventBackend()
+    if name == "redis":
+        return RedisEventBackend(redisUrl, channel)
+    raise ValueError(f"EVENTS_BACKEND no soportado: {name} (memory o redis)")
@@ -0,0 +1,204 @@
+"""
+Hub pub/sub en proceso para empujar eventos de ingesta a clientes WebSocket/SSE
+
+Cada evento se serializa una sola vez y se reparte a los suscriptores cuyo filtro
+lo acepta. Cada suscriptor tiene una cola acotada: si se llena (cliente lento) se
+cierra la suscripción en lugar de bloquear la ingesta o crecer sin límite; el
+cliente recibe un evento "closed" y debe reconectarse.
+
+El backend decide de dónde llegan los eventos: en memoria solo se reparten los del
+propio worker; con un backend compartido (Redis) todos los workers publican en un
+canal y cada uno reparte lo que recibe de él, incluido lo propio.
+"""
+import asyncio
+from typing import Callable, Optional, Set
+import orjson
+from app.domain.entities import EventFilter
+
+EventDelivery = Callable[["Event"], None]
+
+class SubscriberLimitError(Exception):
+    """Se alcanzó el máximo de suscriptores del worker"""
+    pass
+
+class Event:
+    """
+    Evento publicado: tipo, datos y su JSON {"type", "data"} ya serializado
+    """
+    __slots__ = ("type", "data", "payload", "_sseFrame")
+    
+    def __init__(self, eventType: str, data: dict, payload: Optional[bytes] = None):
+        self.type = eventType
+        self.data = data
+        self.payload = payload if payload is not None else orjson.dumps({"type": eventType, "data": data})
+        self._sseFrame: Optional[bytes] = None
+    
+    @classmethod
+    def fromPayload(cls, payload: bytes) -> "Event":
+        """Reconstruir un evento recibido del backend compartido"""
+        decoded = orjson.loads(payload)
+        return cls(decoded["type"], decoded["data"], payload)
+    
+    @property
+    def text(self) -> str:
+        return self.payload.decode()
+    
+    @property
+    def sseFrame(self) -> bytes:
+        """Evento en formato Server-Sent Events, calculado una vez para todos los suscriptores"""
+        if self._sseFrame is None:
+            self._sseFrame = b"event: " + self.type.encode() + b"\ndata: " + self.payload + b"\n\n"
+        return self._sseFrame
+
+def splitValues(value: Optional[str], lower: bool = False) -> Optional[frozenset]:
+    """Valores separados por coma de un filtro, None si no se filtra"""
+    if value is None:
+        return None
+    values = [part.strip().lower() if lower else part.strip() for part in value.split(",")]
+    return frozenset(part for part in values if part) or None
+
+# Marca en la cola de una suscripción cerrada
+CLOSED = object()
+
+class Subscription:
+    """
+    Filtro compilado y cola acotada de un cliente conectado
+    """
+    
+    def __init__(self, filters: EventFilter, maxQueueSize: int = 256):
+        self.eventTypes = splitValues(filters.types, lower=True)
+        self.cameraIds = splitValues(filters.cameraId)
+        self.detectionTypes = splitValues(filters.detectionType, lower=True)
+        self.sensorIds = splitValues(filters.sensorId)
+        self.minConfidence = filters.minConfidence
+        self.closeReason: Optional[str] = None
+        self.delivered = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxQueueSize)
+    
+    @property
+    def closed(self) -> bool:
+        return self.closeReason is not None
+    
+    def accepts(self, event: Event) -> bool:
+        """
+        Los filtros de cámara, tipo y confianza aplican a detecciones y alertas;
+        el de sensor a lecturas meteorológicas
+        """
+        if self.eventTypes is not None and event.type not in self.eventTypes:
+            return False
+        data = event.data
+        if event.type == "weather":
+            return self.sensorIds is None or data.get("sensorId") in self.sensorIds
+        if self.cameraIds is not None and data.get("cameraId") not in self.cameraIds:
+            return False
+        if self.detectionTypes is not None and data.get("detectionType") not in self.detectionTypes:
+            return False
+        if self.minConfidence is not None and (data.get("confidence") or 0.0) < self.minConfidence:
+            return False
+        return True
+    
+    def offer(self, event: Event) -> bool:
+        """Encolar sin bloquear; retorna False y cierra la suscripción si la cola está llena"""
+        if self.closed:
+            return False
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.close("slow_consumer")
+            return False
+        self.delivered += 1
+        return True
+    
+    def close(self, reason: str):
+        """Descartar lo pendiente y dejar solo la marca de cierre"""
+        if self.closed:
+            return
+        self.closeReason = reason
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(CLOSED)
+    
+    async def next(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """
+        Siguiente evento; None si la suscripción se cerró
+        Lanza asyncio.TimeoutError si no llega nada en timeout (para heartbeats)
+        """
+        item = await asyncio.wait_for(self._queue.get(), timeout)
+        if item is CLOSED:
+            self._queue.put_nowait(CLOSED)
+            return None
+        return item
+
+class EventHub:
+    """
+    Reparto de eventos a las suscripciones del worker a través de un backend
+    """
+    
+    def __init__(self, backend, clientQueueSize: int = 256, maxSubscribers: int = 1000):
+        self.backend = backend
+        self.clientQueueSize = clientQueueSize
+        self.maxSubscribers = maxSubscribers
+        self._subscriptions: Set[Subscription] = set()
+        
+        # Contadores expuestos en estadísticas
+        self.publishedTotal = 0
+        self.deliveredTotal = 0
+        self.slowConsumersTotal = 0
+    
+    @property
+    def subscriberCount(self) -> int:
+        return len(self._subscriptions)
+    
+    @property
+    def wantsEvents(self) -> bool:
+        """Si vale la pena armar eventos: hay suscriptores locales o el backend es compartido"""
+        return bool(self._subscriptions) or self.backend.shared
+    
+    async def start(self):
+        await self.backend.start(self._deliver)
+    
+    async def stop(self):
+        """Detener el backend y cerrar las suscripciones abiertas"""
+        await self.backend.stop()
+        for subscription in list(self._subscriptions):
+            subscription.close("shutdown")
+        self._subscriptions.clear()
+    
+    def publish(self, eventType: str, data: dict):
+        """Publicar sin bloquear; se descarta si nadie puede recibirlo"""
+        if not self.wantsEvents:
+            return
+        self.publishedTotal += 1
+        self.backend.send(Event(eventType, data))
+    
+    def subscribe(self, filters: EventFilter) -> Subscription:
+        if len(self._subscriptions) >= self.maxSubscribers:
+            raise SubscriberLimitError(f"Se alcanzó el máximo de {self.maxSubscribers} suscriptores")
+        subscription = Subscription(filters, self.clientQueueSize)
+        self._subscriptions.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription):
+        self._subscriptions.discard(subscription)
+    
+    def _deliver(self, event: Event):
+        """Repartir un evento del backend a las suscripciones que lo aceptan"""
+        for subscription in list(self._subscriptions):
+            if not subscription.accepts(event):
+                continue
+            if subscription.offer(event):
+                self.deliveredTotal += 1
+            elif subscription.closeReason == "slow_consumer":
+                self.slowConsumersTotal += 1
+                self._subscriptions.discard(subscription)
+    
+    def getStats(self) -> dict:
+        return {
+            **self.backend.getStats(),
+            "subscribers": len(self._subscriptions),
+            "maxSubscribers": self.maxSubscribers,
+            "clientQueueSize": self.clientQueueSize,
+            "publishedTotal": self.publishedTotal,
+            "deliveredTotal": self.deliveredTotal,
+            "slowConsumersTotal": self.slowConsumersTotal
+        }
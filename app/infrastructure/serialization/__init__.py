@@ -0,0 +1,10 @@
+"""
+Exportar serialización rápida de respuestas
+"""
+from .json_response import (
+    EntitySerializer, ContractError, checkContract, jsonResponse, dumps, RESPONSE_CONTRACT_CHECKS
+)
+
+__all__ = [
+    "EntitySerializer", "ContractError", "checkContract", "jsonResponse", "dumps", "RESPONSE_CONTRACT_CHECKS"
+]
@@ -0,0 +1,71 @@
+"""
+Respuestas JSON sin pasar por Pydantic: filas ORM o tuplas SQL → dict → bytes con orjson
+
+Las entidades de respuesta siguen declarándose en response_model para OpenAPI, pero
+FastAPI no vuelve a validar cuando el endpoint retorna un Response ya serializado.
+El contrato (que el JSON coincide con lo que produciría la entidad) se verifica en
+los benchmarks y, si RESPONSE_CONTRACT_CHECKS está activo, en cada respuesta.
+"""
+import json
+import os
+from typing import Any, Dict, Mapping, Optional, Sequence, Type
+import orjson
+from pydantic import BaseModel
+from starlette.responses import Response
+
+# Validar cada respuesta contra su entidad (costoso, para desarrollo); por defecto sigue a DEBUG
+RESPONSE_CONTRACT_CHECKS = os.getenv(
+    "RESPONSE_CONTRACT_CHECKS", os.getenv("DEBUG", "false")
+).lower() == "true"
+
+class ContractError(AssertionError):
+    """El JSON generado no coincide con la entidad declarada"""
+
+class EntitySerializer:
+    """
+    Campos de una entidad de respuesta, en orden, para armar dicts desde filas
+    """
+    
+    def __init__(self, entityClass: Type[BaseModel]):
+        self.entityClass = entityClass
+        self.fields = tuple(entityClass.__fields__)
+    
+    def fromRow(self, row: Sequence) -> dict:
+        """Tupla SQL con las columnas en el orden de la entidad"""
+        return dict(zip(self.fields, row))
+    
+    def fromObject(self, instance: Any) -> dict:
+        """Instancia ORM (o cualquier objeto con los atributos)"""
+        return {name: getattr(instance, name) for name in self.fields}
+    
+    def fromMapping(self, mapping: Mapping) -> dict:
+        """Dict con llaves extra o faltantes (cachés); descarta las que no son de la entidad"""
+        return {name: mapping.get(name) for name in self.fields}
+
+def dumps(payload: Any) -> bytes:
+    return orjson.dumps(payload)
+
+def checkContract(entityClass: Type[BaseModel], payload: Any):
+    """
+    Validar el payload con la entidad y comparar su JSON con el que genera Pydantic
+    Lanza ContractError con la primera diferencia
+    """
+    expected = json.loads(entityClass.parse_obj(payload).json())
+    actual = orjson.loads(dumps(payload))
+    if expected != actual:
+        raise ContractError(
+            f"La respuesta no cumple {entityClass.__name__}: esperado {str(expected)[:300]}, obtenido {str(actual)[:300]}"
+        )
+
+def jsonResponse(
+    payload: Any,
+    entityClass: Optional[Type[BaseModel]] = None,
+    statusCode: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Serializar una sola vez con orjson; entityClass solo se usa si los chequeos de contrato están activos
+    """
+    if RESPONSE_CONTRACT_CHECKS and entityClass is not None:
+        checkContract(entityClass, payload)
+    return Response(content=dumps(payload), status_code=statusCode, headers=headers, media_type="application/json")
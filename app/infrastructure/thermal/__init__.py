@@ -0,0 +1,6 @@
+"""
+Exportar componentes de procesamiento de cuadros radiométricos
+"""
+from .frame_pool import HotspotPool, FrameSizeError, detectSharedFrame, releaseSegment
+
+__all__ = ["HotspotPool", "FrameSizeError", "detectSharedFrame", "releaseSegment"]
@@ -0,0 +1,113 @@
+"""
+Detección de puntos calientes en un pool de procesos con el cuadro en memoria compartida
+
+El cuerpo de la petición se escribe directo a un segmento de memoria compartida y el
+proceso del pool lo lee con np.frombuffer sobre ese segmento: el cuadro no se serializa
+ni se copia entre procesos, solo viajan su nombre y sus dimensiones. El pool se crea
+con el primer cuadro (contexto spawn, sin heredar el event loop).
+"""
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import AsyncIterator, List, Optional
+from app.domain.services.hotspot_detector import FRAME_DTYPES, detectFrameHotspots
+
+class FrameSizeError(Exception):
+    """El cuerpo no tiene exactamente width * height muestras"""
+    pass
+
+def detectSharedFrame(segmentName: str, width: int, height: int, dtype: str, options: dict) -> List[dict]:
+    """Adjuntar el segmento y detectar sobre él (se ejecuta en el proceso del pool)"""
+    segment = SharedMemory(name=segmentName)
+    try:
+        return detectFrameHotspots(segment.buf, width, height, dtype, **options)
+    finally:
+        segment.close()
+
+class HotspotPool:
+    """
+    Procesos de detección; uno por núcleo asignado a este worker de la API
+    """
+    
+    def __init__(self, workers: int = 1):
+        self.workers = max(1, workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        
+        # Contadores expuestos en estadísticas
+        self.framesTotal = 0
+        self.hotspotsTotal = 0
+        self.errorCount = 0
+        self.computeSeconds = 0.0
+        self.inFlight = 0
+    
+    def _getExecutor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+    
+    @staticmethod
+    async def receiveFrame(chunks: AsyncIterator[bytes], width: int, height: int, dtype: str) -> SharedMemory:
+        """
+        Copiar el cuerpo al segmento compartido conforme llega; quien llama lo libera
+        Lanza FrameSizeError si sobran o faltan bytes
+        """
+        expected = width * height * FRAME_DTYPES[dtype].itemsize
+        segment = SharedMemory(create=True, size=expected)
+        try:
+            received = 0
+            async for chunk in chunks:
+                if received + len(chunk) > expected:
+                    raise FrameSizeError(f"El cuadro excede {expected} bytes ({width}x{height} {dtype})")
+                segment.buf[received:received + len(chunk)] = chunk
+                received += len(chunk)
+            if received != expected:
+                raise FrameSizeError(f"El cuadro tiene {received} bytes, se esperaban {expected} ({width}x{height} {dtype})")
+            return segment
+        except BaseException:
+            releaseSegment(segment)
+            raise
+    
+    async def detect(self, segment: SharedMemory, width: int, height: int, dtype: str, **options) -> List[dict]:
+        """Puntos calientes del cuadro en el segmento sin bloquear el event loop"""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        self.inFlight += 1
+        try:
+            hotspots = await loop.run_in_executor(
+                self._getExecutor(), detectSharedFrame, segment.name, width, height, dtype, options
+            )
+        except Exception:
+            self.errorCount += 1
+            raise
+        finally:
+            self.inFlight -= 1
+        self.computeSeconds += time.perf_counter() - started
+        self.framesTotal += 1
+        self.hotspotsTotal += len(hotspots)
+        return hotspots
+    
+    async def stop(self):
+        """Cerrar el pool; los cuadros en curso se cancelan"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def getStats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "inFlight": self.inFlight,
+            "framesTotal": self.framesTotal,
+            "hotspotsTotal": self.hotspotsTotal,
+            "errorCount": self.errorCount,
+            "avgFrameMs": round(self.computeSeconds * 1000 / self.framesTotal, 3) if self.framesTotal else None
+        }
+
+def releaseSegment(segment: SharedMemory):
+    """Cerrar y borrar el segmento de un cuadro"""
+    segment.close()
+    try:
+        segment.unlink()
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,3 @@
+"""
+Tareas de mantenimiento que se ejecutan fuera del ciclo de peticiones
+"""
@@ -0,0 +1,193 @@
+"""
+Archivador: mueve días completos de weather_data y detections más antiguos que
+settings.archiveAfterDays (ARCHIVE_AFTER_DAYS) al almacenamiento frío y los elimina
+de la base por bloques
+
+    python -m app.jobs.archiver [--after-days 90] [--dry-run]
+
+Orden por día: leer filas, escribir el .npz y el manifiesto (pendingDelete), borrar
+por ID en transacciones cortas y marcar el día como borrado. Si se interrumpe, los
+lectores descartan del archivo las filas que siguen en la base y la siguiente corrida
+combina el archivo existente con ellas.
+"""
+import argparse
+import asyncio
+import fcntl
+import os
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, Optional
+from sqlalchemy import Boolean, DateTime, Float, Integer, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import Settings
+from app.infrastructure.archive import ColdArchive, columnToPython
+from app.infrastructure.database.models import DetectionModel, WeatherModel
+
+LOCK_NAME = ".archiver.lock"
+
+def columnKinds(model) -> Dict[str, str]:
+    """Tipo de almacenamiento de cada columna del modelo, en orden de tabla (id primero)"""
+    kinds = {}
+    for column in model.__table__.columns:
+        if isinstance(column.type, Boolean):
+            kinds[column.name] = "bool"
+        elif isinstance(column.type, Integer):
+            kinds[column.name] = "int"
+        elif isinstance(column.type, Float):
+            kinds[column.name] = "float"
+        elif isinstance(column.type, DateTime):
+            kinds[column.name] = "datetime"
+        else:
+            kinds[column.name] = "str"
+    return kinds
+
+def archiveConditions(model, settings: Settings) -> list:
+    """Filtro adicional por tabla: con archiveDetectionMaxConfidence solo detecciones de menor confianza"""
+    if model is DetectionModel and settings.archiveDetectionMaxConfidence is not None:
+        return [DetectionModel.confidence < settings.archiveDetectionMaxConfidence]
+    return []
+
+ARCHIVED_MODELS = [WeatherModel, DetectionModel]
+
+async def archiveDay(
+    sessionFactory: Callable[[], AsyncSession],
+    archive: ColdArchive,
+    model,
+    day: date,
+    cutoff: datetime,
+    settings: Settings
+) -> int:
+    """
+    Archivar las filas de un día de createdAt y eliminarlas de la base
+    en DELETE de settings.archiveDeleteChunk filas; retorna las filas movidas
+    """
+    table = model.__tablename__
+    kinds = columnKinds(model)
+    dayStart = datetime.combine(day, time.min)
+    dayEnd = min(dayStart + timedelta(days=1), cutoff)
+    
+    async with sessionFactory() as session:
+        stmt = select(*(getattr(model, name) for name in kinds)).where(
+            model.createdAt >= dayStart, model.createdAt < dayEnd, *archiveConditions(model, settings)
+        ).order_by(model.id)
+        rows = [tuple(row) for row in (await session.execute(stmt)).all()]
+    if not rows:
+        return 0
+    
+    # Corrida anterior interrumpida: conservar lo ya archivado de ese día
+    existing = archive.findEntry(table, day)
+    if existing is not None:
+        data = await asyncio.to_thread(archive.readEntry, existing, list(kinds))
+        archivedRows = list(zip(*(columnToPython(*data[name]) for name in kinds)))
+        merged = {row[0]: row for row in archivedRows}
+        merged.update((row[0], row) for row in rows)
+        fileRows = [merged[rowId] for rowId in sorted(merged)]
+    else:
+        fileRows = rows
+    
+    # Compresión fuera del event loop
+    await asyncio.to_thread(archive.writeDay, table, day, kinds, fileRows)
+    
+    ids = [row[0] for row in rows]
+    chunk = settings.archiveDeleteChunk
+    for start in range(0, len(ids), chunk):
+        async with sessionFactory() as session:
+            await session.execute(delete(model).where(model.id.in_(ids[start:start + chunk])))
+            await session.commit()
+    await asyncio.to_thread(archive.markDeleted, table, day)
+    return len(rows)
+
+async def runArchiver(
+    sessionFactory: Callable[[], AsyncSession],
+    archive: ColdArchive,
+    settings: Settings,
+    afterDays: Optional[int] = None,
+    now: Optional[datetime] = None,
+    dryRun: bool = False,
+    watermarks=None
+) -> Dict[str, int]:
+    """
+    Archivar todos los días completos anteriores a now - afterDays (por defecto settings.archiveAfterDays)
+    Retorna las filas movidas por tabla; un lock de archivo evita corridas simultáneas
+    watermarks (TableWatermarks) invalida los ETag de cada tabla tras borrar un día
+    """
+    if afterDays is None:
+        afterDays = settings.archiveAfterDays
+    if afterDays <= 0:
+        return {}
+    
+    cutoff = datetime.combine((now or datetime.now()).date() - timedelta(days=afterDays), time.min)
+    os.makedirs(archive.rootDir, exist_ok=True)
+    report: Dict[str, int] = {}
+    
+    with open(os.path.join(archive.rootDir, LOCK_NAME), "w") as lockFile:
+        try:
+            fcntl.flock(lockFile, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            print("Archivador en curso en otro proceso, se omite")
+            return {}
+        
+        for model in ARCHIVED_MODELS:
+            conditions = [model.createdAt < cutoff, *archiveConditions(model, settings)]
+            if dryRun:
+                async with sessionFactory() as session:
+                    report[model.__tablename__] = (await session.execute(
+                        select(func.count()).select_from(model).where(*conditions)
+                    )).scalar()
+                continue
+            
+            moved = 0
+            while True:
+                async with sessionFactory() as session:
+                    oldest = (await session.execute(select(func.min(model.createdAt)).where(*conditions))).scalar()
+                if oldest is None:
+                    break
+                moved += await archiveDay(sessionFactory, archive, model, oldest.date(), cutoff, settings)
+                if watermarks is not None:
+                    await watermarks.bump(model.__tablename__)
+            report[model.__tablename__] = moved
+    
+    return report
+
+async def runArchiverLoop(sessionFactory: Callable[[], AsyncSession], archive: ColdArchive, settings: Settings, watermarks=None):
+    """Ejecutar el archivador al iniciar y luego cada settings.archiveIntervalHours"""
+    while True:
+        try:
+            report = await runArchiver(sessionFactory, archive, settings, watermarks=watermarks)
+            for table, moved in report.items():
+                if moved:
+                    print(f"Archivadas {moved} filas de {table}")
+        except Exception as e:
+            print(f"Error en archivador: {e}")
+        await asyncio.sleep(settings.archiveIntervalHours * 3600)
+
+def main():
+    from app.config import getSettings
+    from app.infrastructure.cache import standaloneWatermarks
+    from app.infrastructure.database.connection import openSession, disposeEngine
+    
+    settings = getSettings()
+    parser = argparse.ArgumentParser(description="Mover filas antiguas al almacenamiento frío")
+    parser.add_argument("--after-days", type=int, default=settings.archiveAfterDays)
+    parser.add_argument("--dry-run", action="store_true", help="Contar filas sin mover nada")
+    args = parser.parse_args()
+    
+    watermarks = standaloneWatermarks(settings.conditionalGetBackend, settings.conditionalGetRedisUrl)
+    
+    async def run():
+        await watermarks.start()
+        try:
+            report = await runArchiver(
+                openSession, ColdArchive(settings.archiveDir), settings, args.after_days, dryRun=args.dry_run, watermarks=watermarks
+            )
+        finally:
+            await watermarks.stop()
+            await disposeEngine()
+        if not report:
+            print("Archivado desactivado (ARCHIVE_AFTER_DAYS=0)")
+        for table, moved in report.items():
+            print(f"{table}: {moved} filas {'por archivar' if args.dry_run else 'archivadas'}")
+    
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
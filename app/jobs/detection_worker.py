@@ -0,0 +1,241 @@
+"""
+Worker de detecciones: reclama lotes con processed = false, les calcula el riesgo con
+el motor de correlación y los marca procesados con su riskScore
+
+Corre dentro de la API (DETECTION_WORKER_ENABLED=true) o como proceso aparte; la
+configuración (DETECTION_WORKER_*, CAMERA_SENSOR_MAP) sale de app.config en ambos casos:
+
+    python -m app.jobs.detection_worker [--once] [--batch-size 500]
+
+Cada lote es una transacción: reclamar (FOR UPDATE SKIP LOCKED, o UPDATE ... RETURNING
+en SQLite), cargar las lecturas meteorológicas del rango, correlacionar y un solo
+UPDATE. Varios workers pueden correr en paralelo sin procesar dos veces una fila.
+El tamaño del lote se ajusta para que cada transacción dure cerca de
+DETECTION_WORKER_TARGET_SECONDS: lotes cortos si la base está lenta, largos si hay atraso.
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import Settings
+from app.domain.services import correlate
+from app.infrastructure.database.repositories import (
+    claimUnprocessedDetections, detectionColumnsFromRows, loadWeatherColumns,
+    markDetectionsProcessed, oldestUnprocessedCreatedAt
+)
+
+# Cada cuánto se mide el atraso mientras hay lotes llenos
+LAG_CHECK_INTERVAL_SECONDS = 10.0
+# Espera máxima entre reintentos cuando la base de datos falla
+MAX_RETRY_BACKOFF_SECONDS = 30.0
+
+class AdaptiveBatchSize:
+    """
+    Tamaño de lote que se ajusta para que cada lote tarde cerca de targetSeconds
+    Solo crece con lotes llenos: un lote incompleto no dice si cabría más
+    """
+    
+    def __init__(self, initial: int, minimum: int, maximum: int, targetSeconds: float):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.targetSeconds = targetSeconds
+        self.size = min(max(initial, minimum), maximum)
+    
+    def record(self, claimed: int, elapsedSeconds: float):
+        if elapsedSeconds > self.targetSeconds:
+            scaled = int(self.size * self.targetSeconds / elapsedSeconds)
+            self.size = max(self.minimum, min(scaled, self.size))
+        elif claimed >= self.size and elapsedSeconds < self.targetSeconds / 2:
+            self.size = min(self.maximum, self.size * 2)
+
+class DetectionWorker:
+    """
+    Ciclo de reclamar, correlacionar y marcar lotes de detecciones pendientes
+    """
+    
+    def __init__(
+        self,
+        sessionFactory: Callable[[], AsyncSession],
+        cameraSensorMap: Optional[Dict[str, str]] = None,
+        batchSize: Optional[AdaptiveBatchSize] = None,
+        maxGapMinutes: int = 30,
+        idleSeconds: float = 1.0,
+        watermarks=None
+    ):
+        self._sessionFactory = sessionFactory
+        self.watermarks = watermarks  # TableWatermarks opcional: los ETag de detecciones cambian con cada lote
+        self.cameraSensorMap = cameraSensorMap or {}
+        self.batchSize = batchSize or AdaptiveBatchSize(500, 50, 5000, 0.5)
+        self.maxGap = timedelta(minutes=maxGapMinutes)
+        self.idleSeconds = idleSeconds
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._consecutiveErrors = 0
+        self._lastLagCheck = 0.0
+        
+        # Contadores expuestos en estadísticas
+        self.processedTotal = 0
+        self.batchCount = 0
+        self.errorCount = 0
+        self.lastBatchSeconds = 0.0
+        self.lastBatchRows = 0
+        self.oldestUnprocessedAgeSeconds: Optional[float] = None
+    
+    async def processBatch(self) -> int:
+        """
+        Procesar un lote en una transacción; retorna las detecciones procesadas
+        """
+        started = time.perf_counter()
+        async with self._sessionFactory() as session:
+            rows = await claimUnprocessedDetections(session, self.batchSize.size)
+            if not rows:
+                return 0
+            
+            detections = detectionColumnsFromRows(rows)
+            eventTimes = [row[1] for row in rows]
+            weather = await loadWeatherColumns(session, min(eventTimes) - self.maxGap, max(eventTimes) + self.maxGap)
+            output = correlate(
+                detections,
+                weather,
+                cameraSensorMap=self.cameraSensorMap,
+                maxGapSeconds=self.maxGap.total_seconds()
+            )
+            await markDetectionsProcessed(session, detections.ids, output.riskScores)
+            await session.commit()
+        if self.watermarks is not None:
+            await self.watermarks.bump("detections")
+        
+        elapsed = time.perf_counter() - started
+        self.batchSize.record(len(rows), elapsed)
+        self.processedTotal += len(rows)
+        self.batchCount += 1
+        self.lastBatchRows = len(rows)
+        self.lastBatchSeconds = elapsed
+        return len(rows)
+    
+    async def measureLag(self) -> Optional[float]:
+        """Antigüedad en segundos de la detección pendiente más antigua, 0 sin pendientes"""
+        async with self._sessionFactory() as session:
+            oldest = await oldestUnprocessedCreatedAt(session)
+        self._lastLagCheck = time.monotonic()
+        self.oldestUnprocessedAgeSeconds = 0.0 if oldest is None else max(
+            0.0, (datetime.now(oldest.tzinfo) - oldest).total_seconds()
+        )
+        return self.oldestUnprocessedAgeSeconds
+    
+    async def drain(self) -> int:
+        """Procesar lotes hasta que no queden pendientes (modo --once)"""
+        total = 0
+        while True:
+            processed = await self.processBatch()
+            total += processed
+            if processed == 0:
+                return total
+    
+    def start(self):
+        """Iniciar el ciclo en el event loop actual"""
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run(), name="detection-worker")
+    
+    async def stop(self):
+        """Terminar el lote en curso y detener el ciclo"""
+        self._stopping = True
+        if self._task is not None:
+            await self._task
+            self._task = None
+    
+    async def _run(self):
+        while not self._stopping:
+            try:
+                processed = await self.processBatch()
+                self._consecutiveErrors = 0
+                if processed < self.batchSize.size or time.monotonic() - self._lastLagCheck >= LAG_CHECK_INTERVAL_SECONDS:
+                    await self.measureLag()
+            except Exception as e:
+                self.errorCount += 1
+                self._consecutiveErrors += 1
+                print(f"Error en worker de detecciones: {e}")
+                await self._sleep(min(self.idleSeconds * 2 ** self._consecutiveErrors, MAX_RETRY_BACKOFF_SECONDS))
+                continue
+            if processed == 0:
+                await self._sleep(self.idleSeconds)
+    
+    async def _sleep(self, seconds: float):
+        """Esperar sin demorar el apagado más de 100 ms"""
+        deadline = time.monotonic() + seconds
+        while not self._stopping and time.monotonic() < deadline:
+            await asyncio.sleep(min(0.1, deadline - time.monotonic()))
+    
+    def getStats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "batchSize": self.batchSize.size,
+            "processedTotal": self.processedTotal,
+            "batchCount": self.batchCount,
+            "errorCount": self.errorCount,
+            "lastBatchRows": self.lastBatchRows,
+            "lastBatchMs": round(self.lastBatchSeconds * 1000, 3),
+            "oldestUnprocessedAgeSeconds": self.oldestUnprocessedAgeSeconds
+        }
+
+def createDetectionWorker(
+    sessionFactory: Callable[[], AsyncSession],
+    settings: Settings,
+    initialBatch: Optional[int] = None,
+    watermarks=None
+) -> DetectionWorker:
+    """Worker configurado con settings; initialBatch reemplaza detectionWorkerInitialBatch"""
+    return DetectionWorker(
+        sessionFactory,
+        settings.cameraSensorMap,
+        AdaptiveBatchSize(
+            initialBatch or settings.detectionWorkerInitialBatch, settings.detectionWorkerMinBatch,
+            settings.detectionWorkerMaxBatch, settings.detectionWorkerTargetSeconds
+        ),
+        maxGapMinutes=settings.detectionWorkerMaxGapMinutes,
+        idleSeconds=settings.detectionWorkerIdleSeconds,
+        watermarks=watermarks
+    )
+
+def main():
+    from app.config import getSettings
+    from app.infrastructure.cache import standaloneWatermarks
+    from app.infrastructure.database.connection import openSession, disposeEngine
+    
+    settings = getSettings()
+    parser = argparse.ArgumentParser(description="Procesar detecciones pendientes con el motor de correlación")
+    parser.add_argument("--once", action="store_true", help="Procesar lo pendiente y terminar")
+    parser.add_argument("--batch-size", type=int, default=settings.detectionWorkerInitialBatch, help="Tamaño inicial del lote")
+    args = parser.parse_args()
+    
+    watermarks = standaloneWatermarks(settings.conditionalGetBackend, settings.conditionalGetRedisUrl)
+    worker = createDetectionWorker(openSession, settings, args.batch_size, watermarks=watermarks)
+    
+    async def run():
+        await watermarks.start()
+        try:
+            if args.once:
+                print(f"Detecciones procesadas: {await worker.drain()}")
+                return
+            worker.start()
+            try:
+                while True:
+                    await asyncio.sleep(60)
+                    stats = worker.getStats()
+                    print(f"Procesadas {stats['processedTotal']}, lote {stats['batchSize']}, atraso {stats['oldestUnprocessedAgeSeconds']} s")
+            finally:
+                await worker.stop()
+        finally:
+            await watermarks.stop()
+            await disposeEngine()
+    
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
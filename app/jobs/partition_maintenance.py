@@ -0,0 +1,132 @@
+"""
+Mantenimiento de particiones mensuales: crear los meses siguientes y aplicar retención
+
+Se ejecuta periódicamente desde la API (PARTITION_MAINTENANCE_INTERVAL_HOURS) o por cron:
+
+    python -m app.jobs.partition_maintenance [--dry-run]
+    python -m app.jobs.partition_maintenance --offline --table detections --existing p202609,p202610
+
+Solo aplica a MySQL; en otros motores no hace nada.
+"""
+import argparse
+import asyncio
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.infrastructure.database.partitioning import (
+    PARTITIONED_TABLES, EXISTING_PARTITIONS_SQL, planPartitionMaintenance, maintenanceStatements
+)
+
+# Meses futuros que deben existir siempre
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+# Meses completos a conservar; 0 conserva todo
+PARTITION_RETENTION_MONTHS = int(os.getenv("PARTITION_RETENTION_MONTHS", "0"))
+# "drop" elimina los meses expirados, "archive" los mueve a tablas <tabla>_archive_YYYYMM
+PARTITION_RETENTION_MODE = os.getenv("PARTITION_RETENTION_MODE", "drop").lower()
+
+# Evita que varios workers reorganicen la misma tabla a la vez
+MAINTENANCE_LOCK_NAME = "thermal_partition_maintenance"
+
+async def runPartitionMaintenance(
+    engine: AsyncEngine,
+    now: Optional[datetime] = None,
+    monthsAhead: int = PARTITION_MONTHS_AHEAD,
+    retentionMonths: int = PARTITION_RETENTION_MONTHS,
+    retentionMode: str = PARTITION_RETENTION_MODE,
+    dryRun: bool = False,
+    watermarks=None
+) -> Dict[str, List[str]]:
+    """
+    Planificar y aplicar el mantenimiento de cada tabla particionada
+    Retorna las sentencias ejecutadas (o planificadas en dryRun) por tabla
+    watermarks (TableWatermarks) invalida los ETag de las tablas reorganizadas
+    """
+    if engine.dialect.name != "mysql":
+        return {}
+    
+    now = now or datetime.now()
+    report: Dict[str, List[str]] = {}
+    
+    async with engine.connect() as connection:
+        acquired = (await connection.execute(text("SELECT GET_LOCK(:name, 0)"), {"name": MAINTENANCE_LOCK_NAME})).scalar()
+        if not acquired:
+            print("Mantenimiento de particiones en curso en otro proceso, se omite")
+            return {}
+        try:
+            for table in PARTITIONED_TABLES:
+                existing = (await connection.execute(text(EXISTING_PARTITIONS_SQL), {"tableName": table})).scalars().all()
+                if not existing:
+                    # Tabla sin particionar (migración 004 pendiente)
+                    continue
+                plan = planPartitionMaintenance(table, existing, now, monthsAhead, retentionMonths)
+                statements = maintenanceStatements(plan, retentionMode)
+                report[table] = statements
+                if dryRun:
+                    continue
+                # Cada DDL hace commit implícito en MySQL
+                for statement in statements:
+                    await connection.execute(text(statement))
+                if statements and watermarks is not None:
+                    await watermarks.bump(table)
+        finally:
+            await connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": MAINTENANCE_LOCK_NAME})
+    
+    return report
+
+async def runPartitionMaintenanceLoop(engine: AsyncEngine, intervalSeconds: float, watermarks=None):
+    """Ejecutar el mantenimiento al iniciar y luego cada intervalo"""
+    while True:
+        try:
+            report = await runPartitionMaintenance(engine, watermarks=watermarks)
+            for table, statements in report.items():
+                if statements:
+                    print(f"Particiones de {table} actualizadas: {len(statements)} sentencias")
+        except Exception as e:
+            print(f"Error en mantenimiento de particiones: {e}")
+        await asyncio.sleep(intervalSeconds)
+
+def main():
+    parser = argparse.ArgumentParser(description="Mantenimiento de particiones mensuales")
+    parser.add_argument("--dry-run", action="store_true", help="Mostrar el DDL sin ejecutarlo")
+    parser.add_argument("--offline", action="store_true", help="Planificar sin base de datos a partir de --existing")
+    parser.add_argument("--table", default=PARTITIONED_TABLES[0])
+    parser.add_argument("--existing", default="", help="Particiones actuales separadas por coma (modo --offline)")
+    parser.add_argument("--now", type=datetime.fromisoformat, default=None)
+    args = parser.parse_args()
+    
+    if args.offline:
+        existing = [name.strip() for name in args.existing.split(",") if name.strip()]
+        plan = planPartitionMaintenance(
+            args.table, existing, args.now or datetime.now(), PARTITION_MONTHS_AHEAD, PARTITION_RETENTION_MONTHS
+        )
+        for statement in maintenanceStatements(plan, PARTITION_RETENTION_MODE):
+            print(statement + ";")
+        return
+    
+    from app.config import getSettings
+    from app.infrastructure.cache import standaloneWatermarks
+    from app.infrastructure.database.connection import getEngine, disposeEngine
+    
+    settings = getSettings()
+    watermarks = standaloneWatermarks(settings.conditionalGetBackend, settings.conditionalGetRedisUrl)
+    
+    async def run():
+        await watermarks.start()
+        try:
+            report = await runPartitionMaintenance(getEngine(), now=args.now, dryRun=args.dry_run, watermarks=watermarks)
+        finally:
+            await watermarks.stop()
+            await disposeEngine()
+        if not report:
+            print("Sin tablas particionadas (requiere MySQL y la migración 004)")
+        for table, statements in report.items():
+            print(f"-- {table}: {len(statements)} sentencias")
+            for statement in statements:
+                print(statement + ";")
+    
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Arranque de producción: varios workers de uvicorn con el pool de conexiones repartido
+
+    python -m app.launcher [--workers N] [--print-plan]
+
+Cada worker es un proceso con su propio engine y pool. El número de workers sale de
+los núcleos disponibles (afinidad y cuota de CPU del contenedor) o de WEB_CONCURRENCY,
+y DB_CONNECTION_BUDGET (conexiones a MySQL para toda la API) se reparte entre ellos:
+cada worker recibe DB_POOL_SIZE y DB_MAX_OVERFLOW por variable de entorno, con la
+misma proporción 1:2 de los valores por defecto. Sin recarga automática.
+
+Con SIGTERM uvicorn deja de aceptar conexiones, espera las peticiones en curso hasta
+LAUNCHER_GRACEFUL_TIMEOUT y luego cada worker ejecuta su shutdown (drenar colas
+write-behind, terminar el lote del worker de detecciones).
+"""
+import argparse
+import os
+from dataclasses import dataclass
+from typing import Optional
+import uvicorn
+from app.config import getSettings
+from app.cpu import availableCores
+
+# Conexiones mínimas por worker: una permanente y dos de overflow
+MIN_CONNECTIONS_PER_WORKER = 3
+# Con pocos workers no se pasa del pool de siempre (10 + 20)
+MAX_CONNECTIONS_PER_WORKER = 30
+
+@dataclass(frozen=True)
+class LaunchPlan:
+    """Workers y pool de cada uno"""
+    cores: int
+    workers: int
+    poolSize: int
+    maxOverflow: int
+    
+    @property
+    def totalConnections(self) -> int:
+        return self.workers * (self.poolSize + self.maxOverflow)
+
+def planLaunch(cores: int, requestedWorkers: Optional[int], connectionBudget: int) -> LaunchPlan:
+    """
+    Un worker por núcleo (la API es asíncrona), limitado para que cada uno tenga al menos
+    MIN_CONNECTIONS_PER_WORKER; el presupuesto se reparte 1:2 entre pool y overflow
+    """
+    workers = requestedWorkers if requestedWorkers else cores
+    workers = max(1, min(workers, connectionBudget // MIN_CONNECTIONS_PER_WORKER or 1))
+    perWorker = max(MIN_CONNECTIONS_PER_WORKER, min(MAX_CONNECTIONS_PER_WORKER, connectionBudget // workers))
+    poolSize = max(1, perWorker // 3)
+    return LaunchPlan(cores=cores, workers=workers, poolSize=poolSize, maxOverflow=perWorker - poolSize)
+
+def main():
+    settings = getSettings()
+    parser = argparse.ArgumentParser(description="Arrancar la API con varios workers")
+    parser.add_argument("--workers", type=int, default=settings.webConcurrency, help="Por defecto uno por núcleo")
+    parser.add_argument("--connection-budget", type=int, default=settings.dbConnectionBudget)
+    parser.add_argument("--print-plan", action="store_true", help="Mostrar el reparto y salir")
+    args = parser.parse_args()
+    
+    plan = planLaunch(availableCores(), args.workers, args.connection_budget)
+    print(f"Núcleos disponibles: {plan.cores}")
+    print(f"Workers: {plan.workers}, pool por worker: {plan.poolSize} + {plan.maxOverflow} overflow")
+    print(f"Conexiones máximas a la base: {plan.totalConnections} de {args.connection_budget}")
+    if args.print_plan:
+        return
+    
+    # Los workers heredan el entorno: app.config toma estos tamaños y el engine se crea con ellos
+    os.environ["DB_POOL_SIZE"] = str(plan.poolSize)
+    os.environ["DB_MAX_OVERFLOW"] = str(plan.maxOverflow)
+    # Los procesos de detección de puntos calientes se reparten los núcleos entre workers
+    os.environ.setdefault("HOTSPOT_WORKERS", str(max(1, plan.cores // plan.workers)))
+    # Un worker no ve las escrituras de otro: con varios, las marcas de agua en memoria darían 304 viejos
+    if plan.workers > 1 and settings.conditionalGetBackend == "memory":
+        os.environ["CONDITIONAL_GET_BACKEND"] = "off"
+        print("GET condicionales desactivados: con varios workers requieren CONDITIONAL_GET_BACKEND=redis")
+    
+    uvicorn.run(
+        "app.main:app",
+        host=settings.apiHost,
+        port=settings.apiPort,
+        workers=plan.workers,
+        log_level=settings.logLevel,
+        reload=False,
+        timeout_graceful_shutdown=settings.launcherGracefulTimeout
+    )
+
+if __name__ == "__main__":
+    main()
@@ -2,58 +2,553 @@
 Sistema de monitoreo térmico - FastAPI Server
 Iteración 2: Conexión a base de datos MySQL
 """
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import APIRouter, FastAPI, Request, Depends, HTTPException, Body, Query, Header, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse, PlainTextResponse
 from pydantic import BaseModel
-from typing import Optional, List
-from datetime import datetime
+from typing import Dict, Optional, List, Any
+from datetime import datetime, timedelta
+from contextlib import asynccontextmanager
 import uvicorn
 import os
-from dotenv import load_dotenv
+import time
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from app.config import getSettings
 
-# Cargar variables de entorno
-load_dotenv()
-
-# Configuración desde variables de entorno
-ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
-DEBUG = os.getenv("DEBUG", "false").lower() == "true"
-PROJECT_NAME = os.getenv("PROJECT_NAME", "Thermal Monitoring API")
-VERSION = os.getenv("VERSION", "1.0.0")
-API_HOST = os.getenv("API_HOST", "0.0.0.0")
-API_PORT = int(os.getenv("API_PORT", "8000"))
-LOG_LEVEL = os.getenv("LOG_LEVEL", "info")
-CORS_ORIGINS = ["*"]  # En iteraciones futuras lo leeremos de .env
-DATABASE_URL = os.getenv("DATABASE_URL")
-
-print(f"Configuración cargada:")
-print(f"  - Ambiente: {ENVIRONMENT}")
-print(f"  - Debug: {DEBUG}")
-print(f"  - Base de datos: {DATABASE_URL}")
-
-# Configurar aplicación FastAPI
-app = FastAPI(
-    title=PROJECT_NAME,
-    description="Sistema de monitoreo inteligente con cámaras térmicas y sensores meteorológicos",
-    version=VERSION,
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
+# Configuración leída una sola vez; el engine se crea al arrancar, no al importar
+settings = getSettings()
 
-# Configurar CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Rutas de la API; createApp las monta sobre la aplicación
+router = APIRouter()
 
-# TODO: Importar conexión DB cuando esté creada
-from app.infrastructure.database.connection import getDbSession, checkDatabaseConnection
-from app.domain.entities import DetectionCreate, DetectionResponse, WeatherDataCreate, WeatherDataResponse
+from app.infrastructure.database.connection import (
+    getDbSession, openSession, openReplicaSession, getEngine, getReplicaEngine, disposeEngine, warmUpPool
+)
+from app.infrastructure.database.health import DatabaseHealthMonitor
+from app.infrastructure.database.replica import ReadRouter, ReplicaLagMonitor, ReadYourWritesMiddleware
+from app.domain.entities import (
+    DetectionCreate, DetectionResponse, DetectionList, DetectionFilter, DetectionLatestList,
+    WeatherDataCreate, WeatherDataResponse, WeatherDataList, WeatherDataFilter, WeatherSummary,
+    WeatherCurrentList, WeatherCurrentReading, DetectionLatest, BatchResult, BatchItemError, validateBatch,
+    IncidentResponse, IncidentList, IncidentFilter, EventFilter, FrameDetectionResult,
+    FireWeatherList, WeatherSeriesList
+)
 from app.infrastructure.database.models import DetectionModel, WeatherModel
+from app.infrastructure.database.repositories import (
+    buildDetectionRow, insertDetectionRows, buildWeatherRow, ingestWeatherRows,
+    loadDetectionColumns, loadWeatherColumns, listDetections, listWeatherData, InvalidCursorError,
+    upsertWeatherRollups, summarizeWeatherRange, loadLatestDetections, loadLatestWeather,
+    autoIncrementStep, findIngestKey, insertIngestKey, assignIncidents, listIncidents,
+    loadDetectionImagePath, setDetectionImagePath, refreshFireWeather, listFireWeather, findPendingFireWeatherDays,
+    loadWeatherSeriesColumns, WEATHER_SERIES_FIELDS
+)
+from app.domain.services import (
+    correlate, IncidentTracker, scoreDetections, riskLevelFor, RISK_LEVEL_THRESHOLDS, RECOMMENDATIONS, FRAME_DTYPES,
+    dangerClassFor, datetimesToEpoch, alignGrid, resampleColumns, rowsToLists,
+    SERIES_INTERVALS, SERIES_AGGREGATIONS, SERIES_FILLS
+)
+from app.infrastructure.ingest import (
+    WriteBehindQueue, QueueFullError, IdempotencyGuard, IdempotencyKey, detectionIdempotencyKey,
+    weatherIdempotencyKey, withIngestKeys, insertUniqueRows, IDEMPOTENCY_KEY_FIELD
+)
+from app.infrastructure.export import streamExport, EXPORT_DATASETS, EXPORT_FORMATS
+from app.infrastructure.cache import LatestReadingCache, TableWatermarks, createWatermarkBackend, validatorHeaders, isNotModified
+from app.infrastructure.metrics import MetricsMiddleware, metricsRegistry
+from app.jobs.partition_maintenance import runPartitionMaintenanceLoop
+from app.jobs.archiver import runArchiverLoop
+from app.jobs.detection_worker import DetectionWorker, createDetectionWorker
+from app.infrastructure.archive import ColdArchive
+from app.infrastructure.images import (
+    ContentStore, ThumbnailPool, UnsupportedImageError, ImageTooLargeError, parseStoredName, imageResponse,
+    IMAGE_VARIANTS, MEDIA_TYPES
+)
+from app.infrastructure.thermal import HotspotPool, FrameSizeError, releaseSegment
+from app.cpu import availableCores
+from app.infrastructure.serialization import EntitySerializer, jsonResponse, dumps
+from app.infrastructure.realtime import (
+    EventHub, Subscription, SubscriberLimitError, InMemoryEventBackend, createEventBackend
+)
+import asyncio
+
+# Sondeo de base de datos en segundo plano para /health; se crea junto con el engine
+databaseHealthMonitor: Optional[DatabaseHealthMonitor] = None
+
+async def warmUpDatabasePool():
+    """
+    Uvicorn no abre el socket hasta terminar el startup: cada worker recibe tráfico
+    con su pool ya conectado (DB_POOL_MIN_CONNECTIONS, 0 lo desactiva)
+    """
+    try:
+        opened = await warmUpPool()
+        if opened:
+            print(f"Pool de conexiones precalentado: {opened} conexiones")
+    except Exception as e:
+        # El sondeo de salud reporta la base caída; no impedir el arranque
+        print(f"Error al precalentar el pool de conexiones: {e}")
+
+async def checkAutoIncrementStep():
+    """
+    Consultar al arrancar el paso de AUTO_INCREMENT de MySQL: con un paso distinto de 1
+    los lotes se insertan fila por fila y conviene verlo en el log antes del primer lote
+    """
+    if getEngine().dialect.name != "mysql":
+        return
+    try:
+        async with getEngine().connect() as connection:
+            step = await autoIncrementStep(connection)
+    except Exception as e:
+        print(f"No se pudo consultar auto_increment_increment: {e}")
+        return
+    if step != 1:
+        print(f"auto_increment_increment={step}: los lotes se insertan fila por fila")
+
+async def startDatabaseHealthMonitor():
+    """Primer sondeo antes de atender peticiones y luego periódico"""
+    global databaseHealthMonitor
+    databaseHealthMonitor = DatabaseHealthMonitor(getEngine(), intervalSeconds=settings.healthCheckIntervalSeconds)
+    await databaseHealthMonitor.checkOnce()
+    databaseHealthMonitor.start()
+
+async def stopDatabaseHealthMonitor():
+    """Detener el sondeo periódico"""
+    if databaseHealthMonitor is not None:
+        await databaseHealthMonitor.stop()
+
+# Lecturas hacia la réplica (DATABASE_REPLICA_URL) mientras esté al día; sin réplica todo va al primario
+readRouter: Optional[ReadRouter] = None
+
+async def readSession(request: Request):
+    """Dependency de los endpoints de solo lectura: sesión en la base que elija readRouter"""
+    async for session in readRouter.readSession(request):
+        yield session
+
+async def startReadReplica():
+    """Medir el atraso de la réplica antes de enviarle lecturas y luego periódicamente"""
+    if not settings.replicaDatabaseUrl:
+        return
+    try:
+        lagMonitor = ReplicaLagMonitor(
+            getEngine(), getReplicaEngine(),
+            maxLagSeconds=settings.replicaMaxLagSeconds,
+            intervalSeconds=settings.replicaCheckIntervalSeconds
+        )
+    except Exception as e:
+        print(f"No se pudo configurar la réplica de lectura, se lee del primario: {e}")
+        return
+    await lagMonitor.checkOnce()
+    lagMonitor.start()
+    readRouter.attachReplica(openReplicaSession, lagMonitor)
+
+async def stopReadReplica():
+    """Detener la medición de atraso"""
+    if readRouter.lagMonitor is not None:
+        await readRouter.lagMonitor.stop()
+        readRouter.detachReplica()
+
+# Respuestas de detecciones y lecturas: filas → dict → orjson, sin instanciar entidades Pydantic
+detectionSerializer = EntitySerializer(DetectionResponse)
+weatherSerializer = EntitySerializer(WeatherDataResponse)
+latestDetectionSerializer = EntitySerializer(DetectionLatest)
+currentWeatherSerializer = EntitySerializer(WeatherCurrentReading)
+incidentSerializer = EntitySerializer(IncidentResponse)
+
+# Últimas lecturas por sensorId y por (cameraId, detectionType)
+latestWeatherCache: Optional[LatestReadingCache] = None
+latestDetectionCache: Optional[LatestReadingCache] = None
+latestCacheRefreshTask: Optional[asyncio.Task] = None
+
+# Eventos en vivo: detecciones, lecturas y alertas hacia clientes WebSocket/SSE
+eventHub: Optional[EventHub] = None
+ALERT_MIN_RISK_SCORE = {level: threshold for threshold, level in RISK_LEVEL_THRESHOLDS}[settings.alertMinRiskLevel]
+
+async def startEventHub():
+    """Conectar el backend de eventos; si Redis no responde se reparte solo en este worker"""
+    try:
+        await eventHub.start()
+    except Exception as e:
+        print(f"No se pudo iniciar el backend de eventos {settings.eventsBackend}, se usa memoria: {e}")
+        eventHub.backend = InMemoryEventBackend()
+        await eventHub.start()
+
+async def stopEventHub():
+    """Cerrar suscripciones y desconectar el backend"""
+    await eventHub.stop()
+
+# Marcas de agua por tabla para GET condicionales; en memoria solo sirven con un worker
+tableWatermarks: Optional[TableWatermarks] = None
+
+async def startTableWatermarks():
+    """Conectar el backend; si Redis no responde se desactivan (memoria daría 304 viejos entre workers)"""
+    try:
+        await tableWatermarks.start()
+    except Exception as e:
+        print(f"No se pudo iniciar el backend de marcas de agua {settings.conditionalGetBackend}, GET condicionales desactivados: {e}")
+        tableWatermarks.backend = None
+
+async def stopTableWatermarks():
+    await tableWatermarks.stop()
+
+class ConditionalGet:
+    """
+    Dependency de GET condicional sobre las tablas que lee un endpoint
+    Con If-None-Match (o If-Modified-Since) vigente responde 304 antes de cualquier consulta;
+    si no, retorna los encabezados ETag/Last-Modified que el endpoint agrega a su respuesta
+    requiredParams: sin ellos la respuesta depende de la hora (endDate = ahora) y no se valida
+    timeDependentParams: con ellos la respuesta depende de la hora (activeOnly) y no se valida
+    """
+    
+    def __init__(self, *tables: str, requiredParams: tuple = (), timeDependentParams: tuple = ()):
+        self.tables = tables
+        self.requiredParams = requiredParams
+        self.timeDependentParams = timeDependentParams
+    
+    async def __call__(self, request: Request, response: Response) -> dict:
+        if not tableWatermarks.enabled or any(name not in request.query_params for name in self.requiredParams):
+            return {}
+        if any(name in request.query_params for name in self.timeDependentParams):
+            return {}
+        validators = await tableWatermarks.validators(self.tables, request.url.path, request.query_params.multi_items())
+        if validators is None:
+            return {}
+        etag, lastModified = validators
+        headers = validatorHeaders(etag, lastModified)
+        if isNotModified(request.headers.get("if-none-match"), request.headers.get("if-modified-since"), etag, lastModified):
+            tableWatermarks.notModifiedTotal += 1
+            raise HTTPException(status_code=304, headers=headers)
+        
+        # Una escritura reciente puede no haber llegado a la réplica: sin validador para esos datos
+        if readRouter.enabled and (lastModified is None or time.time() - lastModified < settings.replicaMaxLagSeconds):
+            return {}
+        # Endpoints que retornan una entidad los reciben por response; los que arman su Response los pasan
+        response.headers.update(headers)
+        return headers
+
+def alertWeatherFor(cameraId: str) -> Optional[dict]:
+    """Última lectura vigente del sensor asignado a la cámara, desde la caché"""
+    sensorId = settings.cameraSensorMap.get(cameraId)
+    if sensorId is None:
+        return None
+    reading = latestWeatherCache.get(sensorId)
+    return None if reading is None or reading["stale"] else reading
+
+def publishDetections(detections: List[dict]):
+    """
+    Publicar detecciones confirmadas y una alerta por cada una que alcance settings.alertMinRiskLevel
+    El riesgo se calcula con la última lectura del sensor de la cámara en caché, sin consultar la base
+    """
+    for detection in detections:
+        eventHub.publish("detection", detection)
+    
+    readings = [alertWeatherFor(detection["cameraId"]) for detection in detections]
+    riskScores = scoreDetections(
+        [detection["confidence"] for detection in detections],
+        [detection["detectionType"] for detection in detections],
+        [reading["temperature"] if reading else None for reading in readings],
+        [reading["humidity"] if reading else None for reading in readings],
+        [reading["windSpeed"] if reading else None for reading in readings]
+    )
+    for detection, reading, riskScore in zip(detections, readings, riskScores):
+        if riskScore < ALERT_MIN_RISK_SCORE:
+            continue
+        riskLevel = riskLevelFor(float(riskScore))
+        eventHub.publish("alert", {
+            "detectionId": detection["id"],
+            "incidentId": detection.get("incidentId"),
+            "cameraId": detection["cameraId"],
+            "detectionType": detection["detectionType"],
+            "confidence": detection["confidence"],
+            "timestamp": detection["timestamp"],
+            "riskScore": round(float(riskScore), 4),
+            "riskLevel": riskLevel,
+            "recommendation": RECOMMENDATIONS[riskLevel],
+            "sensorId": reading["sensorId"] if reading else None,
+            "temperature": reading["temperature"] if reading else None,
+            "humidity": reading["humidity"] if reading else None,
+            "windSpeed": reading["windSpeed"] if reading else None
+        })
+
+def cacheWeatherReadings(rows: List[dict], insertedIds: List[int]):
+    """Write-through de lecturas confirmadas hacia la caché"""
+    for row, weatherId in zip(rows, insertedIds):
+        latestWeatherCache.update(row["sensorId"], {**row, "id": weatherId})
+
+def cacheDetections(rows: List[dict], insertedIds: List[int]):
+    """Write-through de detecciones confirmadas hacia la caché"""
+    for row, detectionId in zip(rows, insertedIds):
+        latestDetectionCache.update((row["cameraId"], row["detectionType"]), {**row, "id": detectionId})
+
+def committedRows(rows: List[dict], insertedIds: List[Optional[int]]):
+    """Filas insertadas y sus IDs; las descartadas por duplicadas (ID None) se cuentan y se omiten"""
+    committed = [(row, recordId) for row, recordId in zip(rows, insertedIds) if recordId is not None]
+    if len(committed) < len(rows):
+        idempotencyGuard.rememberDuplicate(len(rows) - len(committed))
+    return [row for row, _ in committed], [recordId for _, recordId in committed]
+
+async def weatherReadingsCommitted(rows: List[dict], insertedIds: List[Optional[int]]):
+    """Después del commit de un lote de lecturas: marca de agua, caché y eventos en vivo"""
+    idempotencyGuard.releasePending(rows)
+    rows, insertedIds = committedRows(rows, insertedIds)
+    if not rows:
+        return
+    await tableWatermarks.bump("weather_data")
+    cacheWeatherReadings(rows, insertedIds)
+    if eventHub.wantsEvents:
+        for row, weatherId in zip(rows, insertedIds):
+            eventHub.publish("weather", weatherSerializer.fromMapping({**row, "id": weatherId}))
+
+async def detectionsCommitted(rows: List[dict], insertedIds: List[Optional[int]]):
+    """
+    Después del commit de un lote de detecciones: marca de agua, caché y eventos en vivo
+    createdAt lo asigna la base y no se conoce sin releer las filas, va nulo en el evento
+    """
+    idempotencyGuard.releasePending(rows)
+    rows, insertedIds = committedRows(rows, insertedIds)
+    if not rows:
+        return
+    await tableWatermarks.bump("detections", "incidents")
+    cacheDetections(rows, insertedIds)
+    if eventHub.wantsEvents:
+        publishDetections([
+            detectionSerializer.fromMapping({**row, "id": detectionId}) for row, detectionId in zip(rows, insertedIds)
+        ])
+
+async def refreshLatestCaches(sinceDate: datetime):
+    """
+    Cargar desde la base las últimas lecturas registradas desde sinceDate
+    Mantiene la caché consistente con lo que ingieren otros workers
+    """
+    async with openSession() as session:
+        for weather in await loadLatestWeather(session, sinceDate):
+            latestWeatherCache.update(weather.sensorId, weatherSerializer.fromObject(weather))
+        for detection in await loadLatestDetections(session, sinceDate):
+            latestDetectionCache.update(
+                (detection.cameraId, detection.detectionType),
+                detectionSerializer.fromObject(detection)
+            )
+
+async def runLatestCacheRefresh():
+    """Refrescar periódicamente solo el rango reciente de la caché"""
+    while True:
+        await asyncio.sleep(settings.latestCacheRefreshSeconds)
+        try:
+            await refreshLatestCaches(datetime.now() - timedelta(seconds=settings.latestCacheRefreshSeconds * 2))
+        except Exception as e:
+            print(f"Error al refrescar caché de últimas lecturas: {e}")
+
+async def primeLatestCaches():
+    """Llenar la caché de últimas lecturas antes de atender peticiones"""
+    global latestCacheRefreshTask
+    try:
+        await refreshLatestCaches(datetime.now() - timedelta(hours=settings.latestCachePrimeHours))
+    except Exception as e:
+        print(f"No se pudo precargar la caché de últimas lecturas: {e}")
+    if settings.latestCacheRefreshSeconds > 0:
+        latestCacheRefreshTask = asyncio.create_task(runLatestCacheRefresh())
+
+async def stopLatestCacheRefresh():
+    """Detener el refresco periódico de la caché"""
+    if latestCacheRefreshTask is not None:
+        latestCacheRefreshTask.cancel()
+
+def newIncidentTracker() -> IncidentTracker:
+    """Tracker vacío para una ingesta; assignIncidents lo llena desde la base con lock"""
+    return IncidentTracker(settings.incidentIouThreshold, settings.incidentMaxGapSeconds, settings.incidentMaxOpenPerCamera)
+
+async def insertTrackedDetections(session: AsyncSession, rows: List[dict]) -> List[int]:
+    """
+    Enlazar las filas con sus incidentes e insertarlas en la transacción de quien llama
+    """
+    await assignIncidents(session, newIncidentTracker(), rows)
+    return await insertDetectionRows(session, rows)
+
+def queuedRowRejected(row: dict):
+    """Una fila encolada que la base rechazó no se confirmó: su reintento vuelve a encolarse"""
+    idempotencyGuard.releasePending([row])
+
+# Colas write-behind, solo existen en modo de ingesta "queue"
+ingestQueues: Dict[str, WriteBehindQueue] = {}
+
+def buildIngestQueues() -> Dict[str, WriteBehindQueue]:
+    """Colas de group-commit por tabla; vacío en modo de ingesta "sync"""
+    if settings.ingestMode != "queue":
+        return {}
+    return {
+        "detections": WriteBehindQueue(
+            "detections", withIngestKeys("detections", insertTrackedDetections), openSession,
+            maxSize=settings.ingestQueueMaxSize,
+            flushIntervalMs=settings.ingestFlushIntervalMs,
+            flushMaxRows=settings.ingestFlushMaxRows,
+            onFlushed=detectionsCommitted,
+            onDeadLetter=queuedRowRejected
+        ),
+        "weather": WriteBehindQueue(
+            "weather", withIngestKeys("weather", ingestWeatherRows), openSession,
+            maxSize=settings.ingestQueueMaxSize,
+            flushIntervalMs=settings.ingestFlushIntervalMs,
+            flushMaxRows=settings.ingestFlushMaxRows,
+            onFlushed=weatherReadingsCommitted,
+            onDeadLetter=queuedRowRejected
+        )
+    }
+
+async def startIngestQueues():
+    """Iniciar tareas de group-commit"""
+    for queue in ingestQueues.values():
+        queue.start()
+
+async def stopIngestQueues():
+    """Drenar colas antes de terminar para no perder filas aceptadas"""
+    for queue in ingestQueues.values():
+        await queue.stop()
+
+# Crear meses siguientes y aplicar retención sobre tablas particionadas
+partitionMaintenanceTask: Optional[asyncio.Task] = None
+
+async def startPartitionMaintenance():
+    """Programar el mantenimiento de particiones si la base es MySQL"""
+    global partitionMaintenanceTask
+    if getEngine().dialect.name == "mysql" and settings.partitionMaintenanceIntervalHours > 0:
+        partitionMaintenanceTask = asyncio.create_task(
+            runPartitionMaintenanceLoop(getEngine(), settings.partitionMaintenanceIntervalHours * 3600, tableWatermarks)
+        )
+
+async def stopPartitionMaintenance():
+    """Detener el mantenimiento periódico"""
+    if partitionMaintenanceTask is not None:
+        partitionMaintenanceTask.cancel()
+
+# Almacenamiento frío: lo leen el resumen y la exportación, lo escribe el archivador
+coldArchive: Optional[ColdArchive] = None
+archiverTask: Optional[asyncio.Task] = None
+
+async def startArchiver():
+    """Programar el archivador si hay horizonte de retención configurado"""
+    global archiverTask
+    if settings.archiveAfterDays > 0 and settings.archiveIntervalHours > 0:
+        archiverTask = asyncio.create_task(runArchiverLoop(openSession, coldArchive, settings, tableWatermarks))
+
+async def stopArchiver():
+    """Detener el archivador periódico"""
+    if archiverTask is not None:
+        archiverTask.cancel()
+
+# Worker de detecciones pendientes (processed = false); también corre como proceso aparte
+detectionWorker: Optional[DetectionWorker] = None
+
+async def startDetectionWorker():
+    """Iniciar el worker dentro de la API si está habilitado"""
+    if settings.detectionWorkerEnabled:
+        detectionWorker.start()
+
+async def stopDetectionWorker():
+    """Terminar el lote en curso antes de cerrar"""
+    await detectionWorker.stop()
+
+# Llaves de idempotencia: filtro de Bloom por proceso delante de ingest_keys
+idempotencyGuard: Optional[IdempotencyGuard] = None
+ingestKeyPurgeTask: Optional[asyncio.Task] = None
+
+async def runIngestKeyPurge():
+    """Eliminar periódicamente las llaves fuera de la ventana"""
+    while True:
+        try:
+            async with openSession() as session:
+                purged = await idempotencyGuard.purgeExpired(session)
+                await session.commit()
+            if purged:
+                print(f"Eliminadas {purged} llaves de idempotencia expiradas")
+        except Exception as e:
+            print(f"Error al purgar llaves de idempotencia: {e}")
+        await asyncio.sleep(min(3600.0, settings.idempotencyWindowSeconds))
+
+async def startIdempotencyGuard():
+    """Cargar las llaves de la ventana vigente y programar la purga"""
+    global ingestKeyPurgeTask
+    try:
+        async with openSession() as session:
+            await idempotencyGuard.prime(session)
+    except Exception as e:
+        print(f"No se pudo precargar el filtro de idempotencia: {e}")
+    ingestKeyPurgeTask = asyncio.create_task(runIngestKeyPurge())
+
+async def stopIdempotencyGuard():
+    """Detener la purga periódica"""
+    if ingestKeyPurgeTask is not None:
+        ingestKeyPurgeTask.cancel()
+
+def resolveIdempotencyKey(buildKey, data, deviceId: str, headerValue: Optional[str]) -> Optional[IdempotencyKey]:
+    """Llave de la petición; un encabezado inválido es error del cliente"""
+    try:
+        return buildKey(data, deviceId, headerValue)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def replayRecord(session: AsyncSession, model, serializer: EntitySerializer, recordId: int):
+    """
+    Responder 200 con el registro original de un reintento
+    Si ya salió de la tabla (archivo o retención) solo se conoce su ID
+    """
+    headers = {"Idempotent-Replayed": "true"}
+    record = await session.get(model, recordId)
+    if record is None:
+        return jsonResponse({"id": recordId}, headers=headers)
+    return jsonResponse(serializer.fromObject(record), serializer.entityClass, headers=headers)
+
+async def commitWithIngestKey(session: AsyncSession, record, key: Optional[IdempotencyKey]) -> Optional[int]:
+    """
+    Confirmar un registro nuevo junto con su llave en la misma transacción
+    Retorna el ID original si otro worker registró la llave primero (la transacción se revierte)
+    """
+    if key is None:
+        await session.commit()
+        return None
+    
+    await session.flush()
+    try:
+        await insertIngestKey(session, key.dataset, key.hexDigest, record.id)
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        originalId = await findIngestKey(session, key.dataset, key.hexDigest)
+        if originalId is None:
+            raise
+        idempotencyGuard.rememberDuplicate()
+        idempotencyGuard.remember(key)
+        return originalId
+    
+    idempotencyGuard.remember(key)
+    return None
+
+def acceptedResponse(queueName: str, replayed: bool = False) -> JSONResponse:
+    """202 de una fila encolada; un reintento de una fila aún en cola lleva Idempotent-Replayed"""
+    return JSONResponse(
+        status_code=202,
+        content={"status": "accepted", "queueDepth": ingestQueues[queueName].depth},
+        headers={"Idempotent-Replayed": "true"} if replayed else None
+    )
+
+def enqueueRow(queueName: str, row: dict, key: Optional[IdempotencyKey] = None) -> JSONResponse:
+    """
+    Encolar una fila validada y responder 202, o 503 con Retry-After si no hay capacidad
+    Un reintento cuya fila sigue en la cola se responde sin encolarla de nuevo
+    """
+    queue = ingestQueues[queueName]
+    if key is not None:
+        if idempotencyGuard.isPending(key):
+            return acceptedResponse(queueName, replayed=True)
+        # La llave se registra al confirmar el lote (withIngestKeys)
+        row = {**row, IDEMPOTENCY_KEY_FIELD: key.hexDigest}
+    try:
+        queue.enqueue(row)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    if key is not None:
+        idempotencyGuard.markPending(key)
+    
+    return acceptedResponse(queueName)
 
 # Modelos Pydantic para validación de datos
 class DetectionData(BaseModel):
@@ -82,204 +577,1025 @@ class CorrelationResult(BaseModel):
     recommendation: str
 
 # Endpoint raíz - Health check
-@app.get("/")
+@router.get("/")
 async def readRoot():
     """Verificar que la API esté funcionando correctamente"""
     return {
         "message": "Thermal Monitoring API funcionando correctamente",
-        "version": VERSION,
-        "environment": ENVIRONMENT,
+        "version": settings.version,
+        "environment": settings.environment,
         "status": "online",
-        "docs": f"http://localhost:{API_PORT}/docs"
+        "docs": f"http://localhost:{settings.apiPort}/docs"
     }
 
-@app.get("/health")
+@router.get("/health")
 async def healthCheck():
-    """Endpoint de salud del sistema"""
-    dbStatus = "connecting"
-    try:
-        isConnected = await checkDatabaseConnection()
-        dbStatus = "connected" if isConnected else "disconnected"
-    except Exception as e:
-        dbStatus = f"error: {str(e)}"
-    
+    """
+    Endpoint de salud del sistema
+    Responde al instante con el último sondeo de base de datos en memoria
+    """
     return {
         "status": "healthy",
         "service": "thermal-monitoring-api",
         "timestamp": datetime.now().isoformat(),
-        "database": dbStatus,
+        "database": databaseHealthMonitor.status,
+        "databaseCheckedAt": databaseHealthMonitor.lastCheckedAt.isoformat() if databaseHealthMonitor.lastCheckedAt else None,
         "iteration": "2"
     }
 
+@router.get("/health/details")
+async def healthDetails():
+    """
+    Detalle del sondeo de base de datos y estadísticas del pool de conexiones
+    Permite ver si pool_size/max_overflow es el cuello de botella
+    """
+    return {
+        "service": "thermal-monitoring-api",
+        "timestamp": datetime.now().isoformat(),
+        "database": databaseHealthMonitor.getDetails(),
+        "ingestQueues": {name: queue.getStats() for name, queue in ingestQueues.items()},
+        "events": eventHub.getStats(),
+        "conditionalGet": tableWatermarks.getStats(),
+        "detectionWorker": detectionWorker.getStats(),
+        "readRouting": readRouter.getStats(),
+        "thumbnails": thumbnailPool.getStats(),
+        "hotspots": hotspotPool.getStats()
+    }
+
+def poolGauges():
+    """Conexiones del pool en uso y disponibles"""
+    if databaseHealthMonitor is None:
+        return
+    poolStats = databaseHealthMonitor.getPoolStats()
+    for name in ("checkedout", "checkedin", "overflow"):
+        if name in poolStats:
+            yield (("state", name),), poolStats[name]
+
+def ingestQueueGauges():
+    """Profundidad actual de cada cola write-behind"""
+    for name, queue in ingestQueues.items():
+        yield (("queue", name),), queue.depth
+
+def detectionWorkerGauges():
+    """Atraso y tamaño de lote del worker de detecciones de este proceso"""
+    if detectionWorker.oldestUnprocessedAgeSeconds is not None:
+        yield (("measure", "oldest_unprocessed_age_seconds"),), detectionWorker.oldestUnprocessedAgeSeconds
+    yield (("measure", "batch_size"),), detectionWorker.batchSize.size
+    yield (("measure", "processed_total"),), detectionWorker.processedTotal
+
+def eventSubscriberGauges():
+    """Clientes suscritos a eventos en vivo en este worker"""
+    yield (), eventHub.subscriberCount
+
+metricsRegistry.addGauge("db_pool_connections", "Conexiones del pool por estado", poolGauges)
+metricsRegistry.addGauge("ingest_queue_depth", "Filas pendientes en colas write-behind", ingestQueueGauges)
+metricsRegistry.addGauge("detection_worker", "Atraso, lote y total del worker de detecciones", detectionWorkerGauges)
+metricsRegistry.addGauge("event_subscribers", "Clientes WebSocket/SSE conectados", eventSubscriberGauges)
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Métricas en formato de texto de Prometheus
+    Cada worker mantiene sus propios contadores
+    """
+    return PlainTextResponse(metricsRegistry.render(), media_type="text/plain; version=0.0.4")
+
 # Endpoint de prueba para estructura API
-@app.get("/api/v1/test")
+@router.get("/api/v1/test")
 async def testEndpoint():
     """Verificar estructura de API v1"""
     return {
         "message": "API v1 funcionando correctamente",
         "availableEndpoints": [
             "/api/v1/detections",
+            "/api/v1/detections/batch",
             "/api/v1/weather",
-            "/api/v1/analysis/correlation"
+            "/api/v1/weather/batch",
+            "/api/v1/analysis/correlation",
+            "/api/v1/incidents",
+            "/api/v1/stream/events",
+            "/api/v1/stream/ws"
         ],
         "iteration": "1"
     }
 
 # Recibir detecciones del módulo de visión
-@app.post("/api/v1/detections", response_model=DetectionResponse)
+@router.post("/api/v1/detections", response_model=DetectionResponse)
 async def receiveDetection(
     detectionData: DetectionCreate,
+    idempotencyKey: Optional[str] = Header(None, alias="Idempotency-Key", description="Llave del cliente para reintentos"),
     session: AsyncSession = Depends(getDbSession)
 ):
     """
     Recibir detecciones del módulo de visión por computadora
     Guardar en base de datos MySQL
+    Un reintento (mismo Idempotency-Key o misma cámara, timestamp, tipo y bbox) responde el registro original
     """
-    # Crear nuevo registro en base de datos
-    newDetection = DetectionModel(
-        detectionType=detectionData.detectionType,
-        confidence=detectionData.confidence,
-        bboxX=detectionData.bboxX,
-        bboxY=detectionData.bboxY,
-        bboxWidth=detectionData.bboxWidth,
-        bboxHeight=detectionData.bboxHeight,
-        imagePath=detectionData.imagePath,
-        cameraId=detectionData.cameraId or "THERMAL_CAM_001",
-        timestamp=detectionData.timestamp or datetime.now(),
-        processed=False
-    )
+    row = buildDetectionRow(detectionData)
+    key = resolveIdempotencyKey(detectionIdempotencyKey, detectionData, row["cameraId"], idempotencyKey)
+    if key is not None:
+        # Antes de la búsqueda: si la fila se confirma durante ella, la llave ya estará en la base
+        if idempotencyGuard.isPending(key):
+            return acceptedResponse("detections", replayed=True)
+        originalId = await idempotencyGuard.findDuplicate(session, key)
+        if originalId is not None:
+            return await replayRecord(session, DetectionModel, detectionSerializer, originalId)
+    
+    if "detections" in ingestQueues:
+        return enqueueRow("detections", row, key)
+    
+    # Crear nuevo registro en base de datos enlazado a su incidente
+    await assignIncidents(session, newIncidentTracker(), [row])
+    newDetection = DetectionModel(**row)
     
     session.add(newDetection)
-    await session.commit()
+    originalId = await commitWithIngestKey(session, newDetection, key)
+    if originalId is not None:
+        return await replayRecord(session, DetectionModel, detectionSerializer, originalId)
     await session.refresh(newDetection)
+    await tableWatermarks.bump("detections", "incidents")
     
-    return DetectionResponse.from_orm(newDetection)
+    response = detectionSerializer.fromObject(newDetection)
+    latestDetectionCache.update((response["cameraId"], response["detectionType"]), response)
+    if eventHub.wantsEvents:
+        publishDetections([response])
+    return jsonResponse(response, DetectionResponse)
 
 # Recibir datos meteorológicos
-@app.post("/api/v1/weather", response_model=WeatherDataResponse)
+@router.post("/api/v1/weather", response_model=WeatherDataResponse)
 async def receiveWeather(
     weatherData: WeatherDataCreate,
+    idempotencyKey: Optional[str] = Header(None, alias="Idempotency-Key", description="Llave del cliente para reintentos"),
     session: AsyncSession = Depends(getDbSession)
 ):
     """
     Recibir datos meteorológicos cada 5 minutos
     Guardar en base de datos MySQL
+    Un reintento (mismo Idempotency-Key o mismo sensor y timestamp) responde el registro original
     """
-    # Crear nuevo registro meteorológico
-    newWeatherData = WeatherModel(
-        temperature=weatherData.temperature,
-        humidity=weatherData.humidity,
-        windSpeed=weatherData.windSpeed,
-        windDirection=weatherData.windDirection,
-        pressure=weatherData.pressure,
-        rainfall=weatherData.rainfall,
-        sensorId=weatherData.sensorId or "DAVIS_V3_001",
-        timestamp=weatherData.timestamp or datetime.now()
-    )
+    row = buildWeatherRow(weatherData)
+    key = resolveIdempotencyKey(weatherIdempotencyKey, weatherData, row["sensorId"], idempotencyKey)
+    if key is not None:
+        if idempotencyGuard.isPending(key):
+            return acceptedResponse("weather", replayed=True)
+        originalId = await idempotencyGuard.findDuplicate(session, key)
+        if originalId is not None:
+            return await replayRecord(session, WeatherModel, weatherSerializer, originalId)
+    
+    if "weather" in ingestQueues:
+        return enqueueRow("weather", row, key)
+    
+    # Crear nuevo registro meteorológico y actualizar sus rollups en la misma transacción
+    newWeatherData = WeatherModel(**row)
     
     session.add(newWeatherData)
-    await session.commit()
+    await upsertWeatherRollups(session, [row])
+    originalId = await commitWithIngestKey(session, newWeatherData, key)
+    if originalId is not None:
+        return await replayRecord(session, WeatherModel, weatherSerializer, originalId)
     await session.refresh(newWeatherData)
+    await tableWatermarks.bump("weather_data")
+    
+    response = weatherSerializer.fromObject(newWeatherData)
+    latestWeatherCache.update(response["sensorId"], response)
+    if eventHub.wantsEvents:
+        eventHub.publish("weather", response)
+    return jsonResponse(response, WeatherDataResponse)
+
+def checkBatchSize(items: List[Any]):
+    """
+    Rechazar lotes que exceden el tamaño máximo configurado
+    """
+    if len(items) > settings.batchMaxItems:
+        raise HTTPException(
+            status_code=413,
+            detail=f"El lote excede el máximo de {settings.batchMaxItems} elementos"
+        )
+
+async def insertBatch(session: AsyncSession, dataset: str, insertFunction, rows: List[dict], keys: List[Optional[IdempotencyKey]]):
+    """
+    Insertar y confirmar las filas de un lote que no repiten una lectura registrada
+    Retorna el ID de cada fila (el original en los duplicados) y si era un duplicado
+    """
+    recordIds, replayed = await insertUniqueRows(
+        session, dataset, insertFunction, rows, [key.hexDigest if key else None for key in keys]
+    )
+    await session.commit()
+    for key in keys:
+        if key is not None:
+            idempotencyGuard.remember(key)
+    return recordIds, replayed
+
+def batchResponse(validItems: list, recordIds: List[int], replayed: List[bool], errors: List[BatchItemError]):
+    """
+    Resultado de un lote; los errores de validación pueden traer valores no JSON en ctx
+    """
+    insertedIds = [recordId for recordId, isReplay in zip(recordIds, replayed) if not isReplay]
+    duplicates = [
+        {"index": index, "id": recordId}
+        for (index, _), recordId, isReplay in zip(validItems, recordIds, replayed) if isReplay
+    ]
+    return jsonResponse({
+        "insertedIds": insertedIds,
+        "insertedCount": len(insertedIds),
+        "rejectedCount": len(errors),
+        "errors": jsonable_encoder(errors),
+        "duplicateCount": len(duplicates),
+        "duplicates": duplicates
+    }, BatchResult)
+
+# Recibir lote de detecciones
+@router.post("/api/v1/detections/batch", response_model=BatchResult)
+async def receiveDetectionBatch(
+    items: List[Any] = Body(...),
+    session: AsyncSession = Depends(getDbSession)
+):
+    """
+    Recibir ráfagas de detecciones en una sola petición
+    Los elementos válidos se guardan con un INSERT multi-fila en una transacción,
+    los inválidos se reportan por posición sin rechazar el lote completo
+    Un elemento con timestamp que repite (cámara, timestamp, tipo, bbox) de una detección
+    registrada no se inserta y se reporta en duplicates con el ID original
+    """
+    checkBatchSize(items)
+    validItems, errors = validateBatch(items, DetectionCreate)
+    
+    rows = [buildDetectionRow(detectionData) for _, detectionData in validItems]
+    keys = [detectionIdempotencyKey(detectionData, row["cameraId"]) for (_, detectionData), row in zip(validItems, rows)]
+    recordIds, replayed = await insertBatch(session, "detections", insertTrackedDetections, rows, keys)
+    await detectionsCommitted(rows, [None if isReplay else recordId for recordId, isReplay in zip(recordIds, replayed)])
+    
+    return batchResponse(validItems, recordIds, replayed, errors)
+
+# Recibir lote de datos meteorológicos
+@router.post("/api/v1/weather/batch", response_model=BatchResult)
+async def receiveWeatherBatch(
+    items: List[Any] = Body(...),
+    session: AsyncSession = Depends(getDbSession)
+):
+    """
+    Recibir lecturas meteorológicas acumuladas en una sola petición
+    Mismo contrato que el lote de detecciones; la llave natural es (sensorId, timestamp)
+    """
+    checkBatchSize(items)
+    validItems, errors = validateBatch(items, WeatherDataCreate)
     
-    return WeatherDataResponse.from_orm(newWeatherData)
+    rows = [buildWeatherRow(weatherData) for _, weatherData in validItems]
+    keys = [weatherIdempotencyKey(weatherData, row["sensorId"]) for (_, weatherData), row in zip(validItems, rows)]
+    recordIds, replayed = await insertBatch(session, "weather", ingestWeatherRows, rows, keys)
+    await weatherReadingsCommitted(rows, [None if isReplay else recordId for recordId, isReplay in zip(recordIds, replayed)])
+    
+    return batchResponse(validItems, recordIds, replayed, errors)
+
+# Detección de puntos calientes: un proceso por núcleo asignado a este worker
+hotspotPool: Optional[HotspotPool] = None
+
+async def stopHotspotPool():
+    """Cerrar el pool de procesos de detección"""
+    await hotspotPool.stop()
+
+# Recibir cuadro radiométrico crudo
+@router.post("/api/v1/detections/frame", response_model=FrameDetectionResult)
+async def receiveRadiometricFrame(
+    request: Request,
+    cameraId: str = Query(..., description="Identificador de la cámara"),
+    width: int = Query(..., ge=1, description="Columnas del cuadro"),
+    height: int = Query(..., ge=1, description="Filas del cuadro"),
+    dtype: str = Query("uint16", description="Codificación little-endian de cada muestra: uint16 o float32"),
+    scale: float = Query(0.01, gt=0, description="°C = valor * scale + offset"),
+    offset: float = Query(-273.15, description="°C = valor * scale + offset"),
+    threshold: Optional[float] = Query(None, description="Umbral en °C (por defecto HOTSPOT_THRESHOLD_CELSIUS)"),
+    timestamp: Optional[datetime] = Query(None, description="Momento de captura del cuadro"),
+    session: AsyncSession = Depends(getDbSession)
+):
+    """
+    Detectar puntos calientes en un cuadro radiométrico para cámaras sin detección propia
+    El cuerpo son width * height muestras crudas (application/octet-stream); cada punto
+    caliente (umbral, componentes conectadas, bbox y temperatura máxima) se guarda como
+    detección fire por el mismo camino que un lote
+    """
+    if dtype not in FRAME_DTYPES:
+        raise HTTPException(status_code=400, detail=f"dtype debe ser uno de: {list(FRAME_DTYPES)}")
+    if width * height > settings.hotspotMaxFramePixels:
+        raise HTTPException(status_code=413, detail=f"El cuadro excede {settings.hotspotMaxFramePixels} píxeles")
+    expectedBytes = width * height * FRAME_DTYPES[dtype].itemsize
+    declaredLength = request.headers.get("content-length")
+    if declaredLength and declaredLength.isdigit() and int(declaredLength) != expectedBytes:
+        raise HTTPException(status_code=400, detail=f"El cuadro debe tener {expectedBytes} bytes ({width}x{height} {dtype})")
+    thresholdCelsius = settings.hotspotThresholdCelsius if threshold is None else threshold
+    capturedAt = timestamp or datetime.now()
+    
+    try:
+        segment = await HotspotPool.receiveFrame(request.stream(), width, height, dtype)
+    except FrameSizeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    startedCompute = datetime.now()
+    try:
+        hotspots = await hotspotPool.detect(
+            segment, width, height, dtype,
+            scale=scale,
+            offset=offset,
+            thresholdCelsius=thresholdCelsius,
+            minPixels=settings.hotspotMinPixels,
+            maxHotspots=settings.hotspotMaxPerFrame
+        )
+    finally:
+        releaseSegment(segment)
+    computeMs = (datetime.now() - startedCompute).total_seconds() * 1000
+    
+    # Misma ruta que un lote: validación, incidentes, caché de últimas y eventos en vivo
+    rows = [
+        buildDetectionRow(DetectionCreate(
+            detectionType="fire",
+            confidence=hotspot["confidence"],
+            cameraId=cameraId,
+            bboxX=hotspot["bboxX"],
+            bboxY=hotspot["bboxY"],
+            bboxWidth=hotspot["bboxWidth"],
+            bboxHeight=hotspot["bboxHeight"],
+            timestamp=capturedAt
+        ))
+        for hotspot in hotspots
+    ]
+    insertedIds = []
+    if rows:
+        insertedIds = await insertTrackedDetections(session, rows)
+        await session.commit()
+        await detectionsCommitted(rows, insertedIds)
+    
+    return jsonResponse({
+        "cameraId": cameraId,
+        "width": width,
+        "height": height,
+        "thresholdCelsius": thresholdCelsius,
+        "hotspots": [{"id": detectionId, **hotspot} for hotspot, detectionId in zip(hotspots, insertedIds)],
+        "insertedCount": len(insertedIds),
+        "computeMs": round(computeMs, 3)
+    }, FrameDetectionResult)
+
+# Estadísticas de la ingesta asíncrona
+@router.get("/api/v1/ingest/stats")
+async def getIngestStats():
+    """
+    Profundidad de cola y latencia de group-commit por tabla, y efectividad del filtro de idempotencia
+    """
+    return {
+        "mode": settings.ingestMode,
+        "queues": {name: queue.getStats() for name, queue in ingestQueues.items()},
+        "idempotency": idempotencyGuard.getStats()
+    }
 
 # Motor principal - Correlación de datos
-@app.get("/api/v1/analysis/correlation", response_model=CorrelationResult)
-async def getCorrelation():
+@router.get("/api/v1/analysis/correlation", response_model=CorrelationResult)
+async def getCorrelation(
+    windowMinutes: int = Query(60, ge=1, le=60 * 24 * 31, description="Tamaño de la ventana en minutos"),
+    endDate: Optional[datetime] = Query(None, description="Fin de la ventana, por defecto ahora"),
+    cameraId: Optional[str] = Query(None, description="Analizar solo una cámara"),
+    sensorId: Optional[str] = Query(None, description="Usar solo este sensor meteorológico"),
+    maxGapMinutes: int = Query(30, ge=1, le=24 * 60, description="Distancia máxima a la lectura meteorológica"),
+    validators: dict = Depends(ConditionalGet("detections", "weather_data", requiredParams=("endDate",))),
+    session: AsyncSession = Depends(readSession)
+):
     """
     Motor principal de correlación de datos
-    En esta iteración retorna análisis simulado
+    Une cada detección de la ventana con la lectura meteorológica más cercana
+    de su sensor y calcula el riesgo de forma vectorizada
     """
+    windowEnd = endDate or datetime.now()
+    windowStart = windowEnd - timedelta(minutes=windowMinutes)
+    maxGap = timedelta(minutes=maxGapMinutes)
+    
+    detections = await loadDetectionColumns(session, windowStart, windowEnd, cameraId)
+    weather = await loadWeatherColumns(session, windowStart - maxGap, windowEnd + maxGap, sensorId)
+    
+    output = correlate(
+        detections,
+        weather,
+        cameraSensorMap=settings.cameraSensorMap,
+        sensorId=sensorId,
+        maxGapSeconds=maxGap.total_seconds()
+    )
+    
     return CorrelationResult(
-        riskLevel="medium",
-        confidence=0.85,
+        riskLevel=output.riskLevel,
+        confidence=output.confidence,
         factors={
-            "thermalDetection": True,
-            "weatherConditions": "favorable_for_fire",
-            "windSpeed": "15_kmh",
-            "humidity": "25_percent",
-            "temperature": "28_celsius"
+            **output.factors,
+            "windowStart": windowStart.isoformat(),
+            "windowEnd": windowEnd.isoformat()
         },
-        recommendation="Aumentar vigilancia en sector detectado"
+        recommendation=output.recommendation
     )
 
 # Obtener lista de detecciones
-@app.get("/api/v1/detections")
-async def getDetections():
+@router.get("/api/v1/detections", response_model=DetectionList)
+async def getDetections(
+    filters: DetectionFilter = Depends(),
+    pageSize: int = Query(50, ge=1, le=500, description="Elementos por página"),
+    cursor: Optional[str] = Query(None, description="Cursor nextCursor de la página anterior"),
+    includeTotal: bool = Query(False, description="Contar el total con los filtros (costoso en tablas grandes)"),
+    validators: dict = Depends(ConditionalGet("detections")),
+    session: AsyncSession = Depends(readSession)
+):
     """
-    Obtener lista de detecciones registradas
-    En esta iteración retorna datos simulados
+    Obtener lista de detecciones registradas, más recientes primero
+    Paginación keyset sobre (createdAt, id): usar nextCursor para la página siguiente
     """
-    simulatedDetections = [
-        {
-            "id": "det_001",
-            "detectionType": "fire",
-            "confidence": 0.92,
-            "cameraId": "THERMAL_CAM_001",
-            "timestamp": "2024-01-15T10:30:00Z",
-            "processed": True
-        },
-        {
-            "id": "det_002", 
-            "detectionType": "smoke",
-            "confidence": 0.78,
-            "cameraId": "THERMAL_CAM_001",
-            "timestamp": "2024-01-15T10:25:00Z",
-            "processed": True
-        }
-    ]
+    try:
+        rows, nextCursor, totalCount = await listDetections(session, filters, pageSize, cursor, includeTotal)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return {
-        "detections": simulatedDetections,
-        "totalCount": len(simulatedDetections),
-        "iteration": "1"
-    }
+    return jsonResponse({
+        "detections": [detectionSerializer.fromRow(row) for row in rows],
+        "totalCount": totalCount,
+        "pageSize": pageSize,
+        "nextCursor": nextCursor
+    }, DetectionList, headers=validators)
+
+# Obtener lista de incidentes
+@router.get("/api/v1/incidents", response_model=IncidentList)
+async def getIncidents(
+    filters: IncidentFilter = Depends(),
+    pageSize: int = Query(50, ge=1, le=500, description="Elementos por página"),
+    cursor: Optional[str] = Query(None, description="Cursor nextCursor de la página anterior"),
+    includeTotal: bool = Query(False, description="Contar el total con los filtros"),
+    validators: dict = Depends(ConditionalGet("incidents", timeDependentParams=("activeOnly",))),
+    session: AsyncSession = Depends(readSession)
+):
+    """
+    Obtener incidentes (detecciones consecutivas agrupadas), más recientes primero
+    activeOnly filtra los vistos dentro de settings.incidentMaxGapSeconds
+    """
+    activeSince = datetime.now() - timedelta(seconds=settings.incidentMaxGapSeconds)
+    try:
+        rows, nextCursor, totalCount = await listIncidents(session, filters, pageSize, cursor, includeTotal, activeSince)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return jsonResponse({
+        "incidents": [incidentSerializer.fromRow(row) for row in rows],
+        "totalCount": totalCount,
+        "pageSize": pageSize,
+        "nextCursor": nextCursor
+    }, IncidentList, headers=validators)
+
+def closedEventMessage(subscription: Subscription) -> bytes:
+    """Último mensaje de una suscripción cerrada por el servidor"""
+    return dumps({"type": "closed", "data": {"reason": subscription.closeReason}})
+
+async def closeOnDisconnect(websocket: WebSocket, subscription: Subscription):
+    """Leer del cliente hasta que se desconecte; los mensajes entrantes se ignoran"""
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    finally:
+        subscription.close("disconnected")
+
+# Eventos en vivo por WebSocket
+@router.websocket("/api/v1/stream/ws")
+async def streamWebSocket(websocket: WebSocket, filters: EventFilter = Depends()):
+    """
+    Empujar detecciones, lecturas meteorológicas y alertas a medida que se confirman
+    Cada mensaje es JSON {"type": "detection" | "weather" | "alert", "data": {...}}
+    Un cliente que no lee a tiempo recibe {"type": "closed"} y se cierra con código 1013
+    """
+    try:
+        subscription = eventHub.subscribe(filters)
+    except SubscriberLimitError:
+        await websocket.close(code=1013)
+        return
+    
+    await websocket.accept()
+    watcher = asyncio.create_task(closeOnDisconnect(websocket, subscription))
+    try:
+        while True:
+            event = await subscription.next()
+            if event is None:
+                break
+            await websocket.send_text(event.text)
+        if subscription.closeReason != "disconnected":
+            await websocket.send_text(closedEventMessage(subscription).decode())
+            await websocket.close(code=1013 if subscription.closeReason == "slow_consumer" else 1001)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        watcher.cancel()
+        eventHub.unsubscribe(subscription)
+
+async def serverSentEvents(subscription: Subscription):
+    """Eventos en formato SSE con un comentario keepalive cuando no hay actividad"""
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            try:
+                event = await subscription.next(settings.eventsHeartbeatSeconds)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if event is None:
+                yield b"event: closed\ndata: " + closedEventMessage(subscription) + b"\n\n"
+                break
+            yield event.sseFrame
+    finally:
+        eventHub.unsubscribe(subscription)
+
+# Eventos en vivo por Server-Sent Events
+@router.get("/api/v1/stream/events")
+async def streamEvents(filters: EventFilter = Depends()):
+    """
+    Mismos eventos que /api/v1/stream/ws como text/event-stream, para clientes sin WebSocket
+    El nombre del evento SSE es el tipo y data es el JSON {"type", "data"}
+    """
+    try:
+        subscription = eventHub.subscribe(filters)
+    except SubscriberLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    
+    return StreamingResponse(
+        serverSentEvents(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 # Obtener datos meteorológicos
-@app.get("/api/v1/weather")
-async def getWeatherData():
+@router.get("/api/v1/weather", response_model=WeatherDataList)
+async def getWeatherData(
+    filters: WeatherDataFilter = Depends(),
+    pageSize: int = Query(50, ge=1, le=500, description="Elementos por página"),
+    cursor: Optional[str] = Query(None, description="Cursor nextCursor de la página anterior"),
+    includeTotal: bool = Query(False, description="Contar el total con los filtros (costoso en tablas grandes)"),
+    validators: dict = Depends(ConditionalGet("weather_data")),
+    session: AsyncSession = Depends(readSession)
+):
     """
-    Obtener datos meteorológicos actuales
-    En esta iteración retorna datos simulados
+    Obtener datos meteorológicos registrados, más recientes primero
+    Paginación keyset sobre (createdAt, id): usar nextCursor para la página siguiente
     """
-    simulatedWeatherData = [
+    try:
+        rows, nextCursor, totalCount = await listWeatherData(session, filters, pageSize, cursor, includeTotal)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return jsonResponse({
+        "weatherData": [weatherSerializer.fromRow(row) for row in rows],
+        "totalCount": totalCount,
+        "pageSize": pageSize,
+        "nextCursor": nextCursor
+    }, WeatherDataList, headers=validators)
+
+# Condiciones actuales desde caché
+@router.get("/api/v1/weather/current", response_model=WeatherCurrentList)
+async def getCurrentWeather(
+    sensorId: Optional[str] = Query(None, description="Solo este sensor")
+):
+    """
+    Última lectura de cada sensor servida desde memoria, sin consultar la base
+    Cada lectura indica su antigüedad y si se considera stale
+    """
+    if sensorId is not None:
+        reading = latestWeatherCache.get(sensorId)
+        readings = [reading] if reading is not None else []
+    else:
+        readings = latestWeatherCache.snapshot()
+    
+    return jsonResponse({
+        "readings": [currentWeatherSerializer.fromMapping(reading) for reading in readings],
+        "staleAfterSeconds": latestWeatherCache.staleAfterSeconds
+    }, WeatherCurrentList)
+
+# Últimas detecciones desde caché
+@router.get("/api/v1/detections/latest", response_model=DetectionLatestList)
+async def getLatestDetections(
+    cameraId: Optional[str] = Query(None, description="Solo esta cámara"),
+    detectionType: Optional[str] = Query(None, description="Solo este tipo de detección")
+):
+    """
+    Última detección por cámara y tipo servida desde memoria, sin consultar la base
+    """
+    detections = [
+        latestDetectionSerializer.fromMapping(detection) for detection in latestDetectionCache.snapshot()
+        if (cameraId is None or detection["cameraId"] == cameraId)
+        and (detectionType is None or detection["detectionType"] == detectionType.lower())
+    ]
+    return jsonResponse({
+        "detections": detections,
+        "staleAfterSeconds": latestDetectionCache.staleAfterSeconds
+    }, DetectionLatestList)
+
+# Resumen meteorológico desde rollups
+@router.get("/api/v1/weather/summary", response_model=WeatherSummary)
+async def getWeatherSummary(
+    startDate: datetime = Query(..., description="Inicio del período"),
+    endDate: datetime = Query(..., description="Fin del período (exclusivo)"),
+    sensorId: Optional[str] = Query(None, description="Resumir solo un sensor"),
+    validators: dict = Depends(ConditionalGet("weather_data")),
+    session: AsyncSession = Depends(readSession)
+):
+    """
+    Resumen estadístico de un período
+    Usa el rollup más grueso que cabe en cada tramo (1d, 1h, 1m) y lee weather_data
+    solo en los bordes que no alinean con un minuto (incluidas las lecturas archivadas)
+    """
+    if endDate <= startDate:
+        raise HTTPException(status_code=400, detail="endDate debe ser posterior a startDate")
+    
+    total, _ = await summarizeWeatherRange(session, startDate, endDate, sensorId, archive=coldArchive)
+    
+    def average(valueSum: float, count: int) -> Optional[float]:
+        return round(valueSum / count, 2) if count else None
+    
+    return jsonResponse({
+        "sensorId": sensorId,
+        "avgTemperature": average(total.temperatureSum, total.temperatureCount),
+        "maxTemperature": total.temperatureMax,
+        "minTemperature": total.temperatureMin,
+        "avgHumidity": average(total.humiditySum, total.humidityCount),
+        "avgWindSpeed": average(total.windSpeedSum, total.windSpeedCount),
+        "totalRainfall": round(total.rainfallSum, 2) if total.rainfallCount else None,
+        "recordCount": total.recordCount,
+        "periodStart": startDate,
+        "periodEnd": endDate
+    }, WeatherSummary, headers=validators)
+
+# Series meteorológicas remuestreadas a intervalo fijo
+@router.get("/api/v1/weather/series", response_model=WeatherSeriesList)
+async def getWeatherSeries(
+    startDate: Optional[datetime] = Query(None, description="Inicio (por defecto 24 horas antes de endDate); se alinea al intervalo"),
+    endDate: Optional[datetime] = Query(None, description="Fin, exclusivo (por defecto ahora)"),
+    sensorId: Optional[List[str]] = Query(None, description="Sensores a incluir (repetible); por defecto todos"),
+    interval: str = Query("5m", description="Ancho del bucket: 1m, 5m o 1h"),
+    aggregation: str = Query("mean", description="Agregación por bucket: mean, min, max o last"),
+    fill: str = Query("none", description="Buckets sin lecturas: none, ffill o linear"),
+    fillLimit: Optional[int] = Query(None, ge=1, description="Máximo de buckets consecutivos a rellenar"),
+    fields: List[str] = Query(["temperature", "humidity", "windSpeed"], description="Campos a incluir (repetible)"),
+    validators: dict = Depends(ConditionalGet("weather_data", requiredParams=("endDate",))),
+    session: AsyncSession = Depends(readSession)
+):
+    """
+    Una grilla de intervalo fijo por sensor, calculada con NumPy sobre las lecturas de una
+    sola consulta. La respuesta es columnar: timestamps es compartido y cada serie trae un
+    arreglo por campo alineado con él. Las lecturas archivadas en frío no se incluyen
+    """
+    if interval not in SERIES_INTERVALS:
+        raise HTTPException(status_code=400, detail=f"interval debe ser uno de {', '.join(SERIES_INTERVALS)}")
+    if aggregation not in SERIES_AGGREGATIONS:
+        raise HTTPException(status_code=400, detail=f"aggregation debe ser una de {', '.join(SERIES_AGGREGATIONS)}")
+    if fill not in SERIES_FILLS:
+        raise HTTPException(status_code=400, detail=f"fill debe ser uno de {', '.join(SERIES_FILLS)}")
+    unknownFields = [field for field in fields if field not in WEATHER_SERIES_FIELDS]
+    if unknownFields:
+        raise HTTPException(status_code=400, detail=f"Campos no válidos: {', '.join(unknownFields)}")
+    fields = list(dict.fromkeys(fields))
+    
+    endDate = endDate or datetime.now()
+    startDate = startDate or endDate - timedelta(hours=24)
+    if endDate <= startDate:
+        raise HTTPException(status_code=400, detail="endDate debe ser posterior a startDate")
+    intervalSeconds = SERIES_INTERVALS[interval]
+    startEpoch, endEpoch = datetimesToEpoch([startDate, endDate]).tolist()
+    gridStart, buckets = alignGrid(startEpoch, endEpoch, intervalSeconds)
+    
+    # Rechazar antes de consultar si ni un solo sensor cabe en el límite
+    if buckets * len(fields) * len(sensorId or [None]) > settings.weatherSeriesMaxPoints:
+        raise HTTPException(status_code=400, detail="Demasiados puntos: reducir el rango, los campos o usar un intervalo mayor")
+    gridStartDate = datetime(1970, 1, 1) + timedelta(seconds=gridStart)
+    
+    times, sensorCodes, sensors, columns = await loadWeatherSeriesColumns(session, gridStartDate, endDate, fields, sensorId)
+    if buckets * len(fields) * len(sensors) > settings.weatherSeriesMaxPoints:
+        raise HTTPException(status_code=400, detail="Demasiados puntos: reducir el rango, los sensores, los campos o usar un intervalo mayor")
+    
+    counts, grids = resampleColumns(
+        times, sensorCodes, len(sensors), columns, gridStart, intervalSeconds, buckets, aggregation, fill, fillLimit
+    )
+    values = {field: rowsToLists(grid) for field, grid in grids.items()}
+    countRows = counts.tolist()
+    series = [
         {
-            "id": "weather_001",
-            "temperature": 25.5,
-            "humidity": 45.2,
-            "windSpeed": 12.3,
-            "windDirection": 180,
-            "sensorId": "DAVIS_V3_001",
-            "timestamp": "2024-01-15T10:30:00Z"
-        },
+            "sensorId": sensor,
+            "count": countRows[index],
+            "values": {field: values[field][index] for field in fields}
+        }
+        for index, sensor in enumerate(sensors.tolist())
+    ]
+    return jsonResponse({
+        "interval": interval,
+        "intervalSeconds": intervalSeconds,
+        "aggregation": aggregation,
+        "fill": fill,
+        "start": gridStartDate,
+        "fields": fields,
+        "timestamps": list(range(gridStart, gridStart + buckets * intervalSeconds, intervalSeconds)),
+        "series": series
+    }, WeatherSeriesList, headers=validators)
+
+# Un recálculo de índices de incendio a la vez por worker; entre workers el upsert es idempotente
+fireWeatherLock: Optional[asyncio.Lock] = None
+
+# Índices de peligro de incendio por sensor y día
+@router.get("/api/v1/weather/fire-index", response_model=FireWeatherList)
+async def getFireWeatherIndex(
+    startDate: Optional[datetime] = Query(None, description="Primer día (por defecto 29 días antes de endDate)"),
+    endDate: Optional[datetime] = Query(None, description="Último día, inclusive (por defecto hoy)"),
+    sensorId: Optional[str] = Query(None, description="Solo un sensor"),
+    session: AsyncSession = Depends(getDbSession)
+):
+    """
+    Fosberg FFWI y sistema canadiense FWI (FFMC, DMC, DC, ISI, BUI, FWI) por sensor y día
+    Los días ya calculados se leen de fire_weather_daily; solo se recalculan los que
+    recibieron lecturas desde entonces y los siguientes, partiendo de los códigos guardados
+    """
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    lastDay = (endDate or today).replace(hour=0, minute=0, second=0, microsecond=0)
+    firstDay = (startDate or lastDay - timedelta(days=29)).replace(hour=0, minute=0, second=0, microsecond=0)
+    if lastDay < firstDay:
+        raise HTTPException(status_code=400, detail="endDate debe ser igual o posterior a startDate")
+    
+    # Un día pendiente cambia los códigos de todos los siguientes: se recalcula siempre hasta hoy,
+    # aunque se pidan días anteriores, para no dejar filas guardadas que ya no corresponden
+    # El lock solo se toma si hay algo pendiente; las lecturas sin cambios no se serializan
+    recomputedDays = 0
+    if await findPendingFireWeatherDays(session, today, sensorId):
+        async with fireWeatherLock:
+            recomputedDays = await refreshFireWeather(
+                session, today, settings.fireWeatherLatitude, settings.fireWeatherNoonHour, sensorId
+            )
+            await session.commit()
+    
+    def rounded(value: Optional[float]) -> Optional[float]:
+        return round(value, 2) if value is not None else None
+    
+    days = [
         {
-            "id": "weather_002",
-            "temperature": 26.8,
-            "humidity": 42.1,
-            "windSpeed": 15.7,
-            "windDirection": 165,
-            "sensorId": "DAVIS_V3_001",
-            "timestamp": "2024-01-15T10:25:00Z"
+            "sensorId": row.sensorId,
+            "day": row.dayStart,
+            **{name: rounded(getattr(row, name)) for name in (
+                "temperature", "humidity", "windSpeed", "rainfall", "ffmc", "dmc", "dc", "isi", "bui", "fwi", "ffwi", "ffwiMax"
+            )},
+            "dangerClass": dangerClassFor(row.fwi)
         }
+        for row in await listFireWeather(session, firstDay, lastDay + timedelta(days=1), sensorId)
     ]
+    return jsonResponse({"days": days, "count": len(days), "recomputedDays": recomputedDays}, FireWeatherList)
+
+# Imágenes de detecciones: almacén por contenido y variantes generadas fuera del event loop
+imageStore: Optional[ContentStore] = None
+thumbnailPool: Optional[ThumbnailPool] = None
+
+async def stopThumbnailPool():
+    """Terminar las variantes en curso y cerrar el pool de procesos"""
+    await thumbnailPool.stop()
+
+async def uploadChunks(request: Request):
+    """
+    Bloques del cuerpo: multipart/form-data (campo file, que Starlette vuelca a disco
+    pasado 1 MB) o la imagen cruda como cuerpo (image/jpeg, image/png, image/tiff)
+    """
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="Falta el campo file con la imagen")
+        try:
+            while chunk := await upload.read(imageStore.chunkBytes):
+                yield chunk
+        finally:
+            await form.close()
+        return
+    async for chunk in request.stream():
+        yield chunk
+
+async def scheduleImageVariants(digest: str, extension: str):
+    """Generar en segundo plano las variantes que aún no existen"""
+    if not thumbnailPool.available:
+        return
+    targets = {variant: imageStore.pathFor(digest, extension, variant) for variant in IMAGE_VARIANTS}
+    missing = {
+        variant: path for variant, path in targets.items() if not await asyncio.to_thread(os.path.exists, path)
+    }
+    thumbnailPool.schedule(digest, imageStore.pathFor(digest, extension), missing)
+
+# Subir la imagen de una detección
+@router.post("/api/v1/detections/{detectionId}/image")
+async def uploadDetectionImage(
+    detectionId: int,
+    request: Request,
+    session: AsyncSession = Depends(getDbSession)
+):
+    """
+    Guardar la imagen de una detección en el almacén por contenido y asignar imagePath
+    El cuerpo se escribe a disco por bloques mientras se calcula su SHA-256; una imagen
+    repetida se guarda una sola vez. Miniatura y vista previa se generan después
+    """
+    if await loadDetectionImagePath(session, detectionId) is None:
+        raise HTTPException(status_code=404, detail="Detección no encontrada")
+    # Cerrar la transacción de lectura: la subida puede tardar y no debe retener la conexión
+    await session.rollback()
+    declaredLength = request.headers.get("content-length")
+    if declaredLength and declaredLength.isdigit() and int(declaredLength) > imageStore.maxBytes + 64 * 1024:
+        raise HTTPException(status_code=413, detail=f"La imagen supera {imageStore.maxBytes} bytes")
+    
+    try:
+        stored = await imageStore.save(uploadChunks(request))
+    except ImageTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedImageError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    
+    await setDetectionImagePath(session, detectionId, stored.name)
+    await session.commit()
+    await tableWatermarks.bump("detections")
+    await scheduleImageVariants(stored.digest, stored.extension)
     
     return {
-        "weatherData": simulatedWeatherData,
-        "totalCount": len(simulatedWeatherData),
-        "iteration": "1"
+        "id": detectionId,
+        "imagePath": stored.name,
+        "sha256": stored.digest,
+        "size": stored.size,
+        "mediaType": stored.mediaType,
+        "deduplicated": not stored.created
     }
 
+# Descargar la imagen de una detección
+@router.get("/api/v1/detections/{detectionId}/image")
+async def getDetectionImage(
+    detectionId: int,
+    request: Request,
+    variant: str = Query("original", description="original, thumbnail o preview"),
+    session: AsyncSession = Depends(readSession)
+):
+    """
+    Servir la imagen original o una variante con ETag fuerte (su SHA-256) y soporte de Range
+    """
+    if variant != "original" and variant not in IMAGE_VARIANTS:
+        raise HTTPException(status_code=400, detail=f"variant debe ser original o uno de: {list(IMAGE_VARIANTS)}")
+    row = await loadDetectionImagePath(session, detectionId)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Detección no encontrada")
+    storedName = parseStoredName(row[0])
+    if storedName is None:
+        raise HTTPException(status_code=404, detail="La detección no tiene imagen en el almacén")
+    
+    digest, extension = storedName
+    if variant == "original":
+        path, mediaType, etag = imageStore.pathFor(digest, extension), MEDIA_TYPES[extension], f'"{digest}"'
+    else:
+        path, mediaType, etag = imageStore.pathFor(digest, extension, variant), "image/jpeg", f'"{digest}-{variant}"'
+    try:
+        return await imageResponse(imageStore, path, mediaType, etag, request.headers)
+    except FileNotFoundError:
+        detail = "Imagen no encontrada en el almacén" if variant == "original" else f"La variante {variant} aún no está disponible"
+        raise HTTPException(status_code=404, detail=detail)
+
+# Exportación masiva en streaming
+@router.get("/api/v1/export/{dataset}")
+async def exportDataset(
+    request: Request,
+    dataset: str,
+    exportFormat: str = Query("ndjson", alias="format", description="Formato de salida: ndjson o csv"),
+    startDate: Optional[datetime] = Query(None, description="Fecha de registro inicial"),
+    endDate: Optional[datetime] = Query(None, description="Fecha de registro final (exclusiva)"),
+    deviceId: Optional[str] = Query(None, description="cameraId o sensorId según el dataset"),
+    gzip: bool = Query(False, description="Comprimir la respuesta con gzip al vuelo")
+):
+    """
+    Exportar detections o weather completos para entrenamiento y auditorías
+    La memoria usada es constante: se lee con cursor del servidor y se envía por bloques
+    """
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(status_code=404, detail=f"Dataset desconocido: {dataset}")
+    if exportFormat not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format debe ser uno de: {list(EXPORT_FORMATS)}")
+    
+    headers = {"Content-Disposition": f'attachment; filename="{dataset}.{exportFormat}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    
+    return StreamingResponse(
+        streamExport(
+            readRouter.sessionFactoryFor(request), dataset, exportFormat, startDate, endDate, deviceId,
+            compress=gzip, archive=coldArchive
+        ),
+        media_type=EXPORT_FORMATS[exportFormat],
+        headers=headers
+    )
+
+def buildServices():
+    """
+    Crear los servicios del proceso (cachés, eventos, colas, pools, archivo, worker)
+    Los llama createApp(): importar el módulo no crea pools de procesos, colas ni directorios,
+    y cada aplicación construida parte de servicios nuevos
+    """
+    global readRouter, latestWeatherCache, latestDetectionCache, eventHub, tableWatermarks, ingestQueues
+    global coldArchive, detectionWorker, idempotencyGuard, hotspotPool, fireWeatherLock, imageStore, thumbnailPool
+    readRouter = ReadRouter(openSession, stickySeconds=settings.replicaStickySeconds)
+    latestWeatherCache = LatestReadingCache(settings.latestCacheMaxEntries, settings.latestWeatherStaleSeconds)
+    latestDetectionCache = LatestReadingCache(settings.latestCacheMaxEntries, settings.latestDetectionStaleSeconds)
+    eventHub = EventHub(
+        createEventBackend(settings.eventsBackend, settings.eventsRedisUrl, settings.eventsRedisChannel),
+        clientQueueSize=settings.eventsClientQueueSize,
+        maxSubscribers=settings.eventsMaxSubscribers
+    )
+    tableWatermarks = TableWatermarks(createWatermarkBackend(settings.conditionalGetBackend, settings.conditionalGetRedisUrl))
+    idempotencyGuard = IdempotencyGuard(settings.idempotencyWindowSeconds, settings.idempotencyExpectedKeys, settings.idempotencyFalsePositiveRate)
+    ingestQueues = buildIngestQueues()
+    coldArchive = ColdArchive(settings.archiveDir)
+    detectionWorker = createDetectionWorker(openSession, settings, watermarks=tableWatermarks)
+    hotspotPool = HotspotPool(settings.hotspotWorkers or availableCores())
+    fireWeatherLock = asyncio.Lock()
+    imageStore = ContentStore(settings.imageStoreDir, settings.imageMaxBytes, settings.imageChunkBytes)
+    thumbnailPool = ThumbnailPool(settings.imageThumbnailWorkers)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Arranque en orden antes de aceptar tráfico y apagado inverso: primero se drenan
+    colas y worker (aún pueden publicar eventos) y al final se cierra el pool
+    """
+    print(f"Configuración cargada:")
+    print(f"  - Ambiente: {settings.environment}")
+    print(f"  - Debug: {settings.debug}")
+    print(f"  - Base de datos: {settings.databaseUrl}")
+    print(f"  - Modo de ingesta: {settings.ingestMode}")
+    
+    await warmUpDatabasePool()
+    await checkAutoIncrementStep()
+    await startDatabaseHealthMonitor()
+    await startReadReplica()
+    await startEventHub()
+    await startTableWatermarks()
+    await primeLatestCaches()
+    await startIngestQueues()
+    await startPartitionMaintenance()
+    await startArchiver()
+    await startDetectionWorker()
+    await startIdempotencyGuard()
+    try:
+        yield
+    finally:
+        await stopDetectionWorker()
+        await stopIngestQueues()
+        await stopThumbnailPool()
+        await stopHotspotPool()
+        await stopIdempotencyGuard()
+        await stopArchiver()
+        await stopPartitionMaintenance()
+        await stopLatestCacheRefresh()
+        await stopEventHub()
+        await stopTableWatermarks()
+        await stopReadReplica()
+        await stopDatabaseHealthMonitor()
+        await disposeEngine()
+
+def createApp() -> FastAPI:
+    """
+    Aplicación FastAPI con middleware, rutas y ciclo de vida
+    Construirla no abre conexiones: el engine se crea en el arranque del lifespan
+    """
+    buildServices()
+    application = FastAPI(
+        title=settings.projectName,
+        description="Sistema de monitoreo inteligente con cámaras térmicas y sensores meteorológicos",
+        version=settings.version,
+        docs_url="/docs",
+        redoc_url="/redoc",
+        lifespan=lifespan
+    )
+    
+    # Configurar CORS
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.corsOrigins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    
+    # Read-your-writes: tras escribir, el cliente lee del primario unos segundos
+    if settings.replicaDatabaseUrl:
+        application.add_middleware(ReadYourWritesMiddleware, stickySeconds=settings.replicaStickySeconds)
+    
+    # Métricas por ruta (latencia, tamaños, consultas SQL) expuestas en /metrics
+    application.add_middleware(MetricsMiddleware, registry=metricsRegistry)
+    
+    application.include_router(router)
+    return application
+
+app = createApp()
+
 # Ejecutar servidor si se ejecuta directamente
 if __name__ == "__main__":
-    print(f"Iniciando {PROJECT_NAME} - Iteración 1")
-    print(f"Ambiente: {ENVIRONMENT}")
-    print(f"Debug: {DEBUG}")
-    print(f"Documentación disponible en: http://{API_HOST}:{API_PORT}/docs")
+    print(f"Iniciando {settings.projectName} - Iteración 1")
+    print(f"Ambiente: {settings.environment}")
+    print(f"Debug: {settings.debug}")
+    print(f"Documentación disponible en: http://{settings.apiHost}:{settings.apiPort}/docs")
     
     uvicorn.run(
         "main:app",
-        host=API_HOST,
-        port=API_PORT,
-        reload=DEBUG,
-        log_level=LOG_LEVEL.lower()
+        host=settings.apiHost,
+        port=settings.apiPort,
+        reload=settings.debug,
+        log_level=settings.logLevel.lower()
     )
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""
+Benchmarks de rendimiento de la API (en proceso, sobre SQLite)
+"""
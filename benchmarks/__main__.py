@@ -0,0 +1,168 @@
+"""
+CLI de benchmarks
+
+    python -m benchmarks run --sizes 10000 1000000 --output results.json
+    python -m benchmarks run --sizes 10000 --baseline benchmarks/baseline.json --threshold 0.2
+    python -m benchmarks compare results.json benchmarks/baseline.json --threshold 0.2
+    python -m benchmarks serialization --rows 500
+    python -m benchmarks startup --runs 5 --max-import-ms 1500 --max-first-request-ms 5000
+    python -m benchmarks hotspots --width 640 --height 480 --frames 200
+
+`compare` (o `run --baseline`) termina con código 1 si alguna métrica empeora más que el umbral;
+`startup` termina con código 1 si la mediana de arranque supera su presupuesto.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from .compare import compareResults, findRegressions, formatReport
+
+DEFAULT_SIZES = [10_000, 1_000_000]
+
+def runAllSizes(sizes, iterations: int, seed: int) -> dict:
+    """
+    Cada tamaño corre en un subproceso para partir de una aplicación y cachés limpias
+    """
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="thermal-bench-") as workDir:
+        for rows in sizes:
+            outputPath = os.path.join(workDir, f"{rows}.json")
+            databasePath = os.path.join(workDir, f"{rows}.sqlite")
+            print(f"Benchmark con {rows} filas por tabla...", file=sys.stderr)
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks", "size", str(rows),
+                 "--database", databasePath, "--output", outputPath,
+                 "--iterations", str(iterations), "--seed", str(seed)],
+                check=True
+            )
+            with open(outputPath) as handle:
+                results[str(rows)] = json.load(handle)
+    return {
+        "metadata": {
+            "createdAt": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": "sqlite+aiosqlite",
+            "iterations": iterations,
+            "seed": seed
+        },
+        "results": results
+    }
+
+def reportComparison(current: dict, baselinePath: str, threshold: float) -> int:
+    with open(baselinePath) as handle:
+        baseline = json.load(handle)
+    changes = compareResults(current, baseline)
+    print(formatReport(changes, threshold))
+    regressions = findRegressions(changes, threshold)
+    if regressions:
+        print(f"\n{len(regressions)} métricas empeoraron más de {threshold:.0%}: "
+              + ", ".join(change.label for change in regressions))
+        return 1
+    print(f"\nSin regresiones mayores a {threshold:.0%}")
+    return 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks de la API sobre SQLite")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    runParser = commands.add_parser("run", help="Ejecutar benchmarks para varios tamaños de tabla")
+    runParser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    runParser.add_argument("--iterations", type=int, default=30)
+    runParser.add_argument("--seed", type=int, default=42)
+    runParser.add_argument("--output", default="benchmark-results.json")
+    runParser.add_argument("--baseline", help="Comparar contra esta línea base al terminar")
+    runParser.add_argument("--threshold", type=float, default=0.2)
+    
+    compareParser = commands.add_parser("compare", help="Comparar resultados contra una línea base")
+    compareParser.add_argument("current")
+    compareParser.add_argument("baseline")
+    compareParser.add_argument("--threshold", type=float, default=0.2)
+    
+    serializationParser = commands.add_parser("serialization", help="CPU por respuesta de listado: Pydantic contra orjson")
+    serializationParser.add_argument("--rows", type=int, default=500)
+    serializationParser.add_argument("--iterations", type=int, default=200)
+    serializationParser.add_argument("--seed", type=int, default=42)
+    
+    startupParser = commands.add_parser("startup", help="Tiempo de importación y hasta la primera respuesta")
+    startupParser.add_argument("--runs", type=int, default=5)
+    startupParser.add_argument("--max-import-ms", type=float, default=1500)
+    startupParser.add_argument("--max-first-request-ms", type=float, default=5000)
+    startupParser.add_argument("--output", help="Guardar también los resultados en JSON")
+    
+    hotspotsParser = commands.add_parser("hotspots", help="Cuadros radiométricos por segundo por núcleo")
+    hotspotsParser.add_argument("--width", type=int, default=640)
+    hotspotsParser.add_argument("--height", type=int, default=480)
+    hotspotsParser.add_argument("--frames", type=int, default=200)
+    hotspotsParser.add_argument("--workers", type=int, default=0, help="Procesos del pool, por defecto uno por núcleo")
+    hotspotsParser.add_argument("--hotspots-per-frame", type=int, default=3)
+    hotspotsParser.add_argument("--seed", type=int, default=42)
+    hotspotsParser.add_argument("--output", help="Guardar también los resultados en JSON")
+    
+    sizeParser = commands.add_parser("size", help="Ejecutar un solo tamaño (uso interno)")
+    sizeParser.add_argument("rows", type=int)
+    sizeParser.add_argument("--database", required=True)
+    sizeParser.add_argument("--output", required=True)
+    sizeParser.add_argument("--iterations", type=int, default=30)
+    sizeParser.add_argument("--seed", type=int, default=42)
+    
+    args = parser.parse_args()
+    
+    if args.command == "size":
+        from .scenarios import runSize
+        metrics = runSize(args.rows, args.database, args.iterations, args.seed)
+        with open(args.output, "w") as handle:
+            json.dump(metrics, handle, indent=2)
+        return 0
+    
+    if args.command == "serialization":
+        os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+        from .serialization import runSerialization
+        print(json.dumps(runSerialization(args.rows, args.iterations, args.seed), indent=2))
+        return 0
+    
+    if args.command == "startup":
+        from .startup import runStartup, checkBudget
+        results = runStartup(args.runs)
+        print(json.dumps(results, indent=2))
+        if args.output:
+            with open(args.output, "w") as handle:
+                json.dump(results, handle, indent=2)
+        exceeded = checkBudget(results, args.max_import_ms, args.max_first_request_ms)
+        if exceeded:
+            print("Presupuesto de arranque excedido: " + ", ".join(exceeded))
+            return 1
+        print("Arranque dentro del presupuesto")
+        return 0
+    
+    if args.command == "hotspots":
+        from app.cpu import availableCores
+        from .hotspots import runHotspots
+        results = runHotspots(
+            args.width, args.height, args.frames, args.workers or availableCores(), args.hotspots_per_frame, args.seed
+        )
+        print(json.dumps(results, indent=2))
+        if args.output:
+            with open(args.output, "w") as handle:
+                json.dump(results, handle, indent=2)
+        return 0
+    
+    if args.command == "compare":
+        with open(args.current) as handle:
+            current = json.load(handle)
+        return reportComparison(current, args.baseline, args.threshold)
+    
+    current = runAllSizes(args.sizes, args.iterations, args.seed)
+    with open(args.output, "w") as handle:
+        json.dump(current, handle, indent=2)
+    print(f"Resultados guardados en {args.output}", file=sys.stderr)
+    if args.baseline:
+        return reportComparison(current, args.baseline, args.threshold)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
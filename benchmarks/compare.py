@@ -0,0 +1,55 @@
+"""
+Comparación de resultados contra una línea base guardada
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+@dataclass
+class MetricChange:
+    """Cambio de una métrica respecto a la línea base"""
+    size: str
+    metric: str
+    baseline: float
+    current: float
+    change: float  # fracción; positiva = peor
+    
+    @property
+    def label(self) -> str:
+        return f"{self.size}/{self.metric}"
+
+def lowerIsBetter(metric: str) -> Optional[bool]:
+    """
+    Dirección de la métrica según su sufijo: latencias (_ms) y throughput (_per_sec)
+    """
+    if metric.endswith("_ms"):
+        return True
+    if metric.endswith("_per_sec"):
+        return False
+    return None
+
+def compareResults(current: dict, baseline: dict) -> List[MetricChange]:
+    """
+    Cambios de todas las métricas presentes en ambos resultados
+    """
+    changes = []
+    for size, baselineMetrics in baseline.get("results", {}).items():
+        currentMetrics: Dict[str, float] = current.get("results", {}).get(size, {})
+        for metric, baselineValue in baselineMetrics.items():
+            direction = lowerIsBetter(metric)
+            if direction is None or metric not in currentMetrics or not baselineValue:
+                continue
+            currentValue = currentMetrics[metric]
+            relative = (currentValue - baselineValue) / baselineValue
+            changes.append(MetricChange(size, metric, baselineValue, currentValue, relative if direction else -relative))
+    return changes
+
+def findRegressions(changes: List[MetricChange], threshold: float) -> List[MetricChange]:
+    """Métricas que empeoraron más que el umbral (0.2 = 20%)"""
+    return [change for change in changes if change.change > threshold]
+
+def formatReport(changes: List[MetricChange], threshold: float) -> str:
+    lines = [f"{'métrica':<60} {'base':>12} {'actual':>12} {'cambio':>8}"]
+    for change in changes:
+        marker = "  REGRESIÓN" if change.change > threshold else ""
+        lines.append(f"{change.label:<60} {change.baseline:>12.3f} {change.current:>12.3f} {change.change:>+8.1%}{marker}")
+    return "\n".join(lines)
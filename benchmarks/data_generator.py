@@ -0,0 +1,136 @@
+"""
+Generador sintético y reproducible de detecciones y lecturas meteorológicas
+
+Los datos se generan por bloques ordenados en el tiempo, así los IDs crecen
+con createdAt como en producción y 1M de filas no se materializan de una vez.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterator, List
+import numpy as np
+
+DETECTION_TYPES = np.array(["person", "vehicle", "animal", "smoke", "fire"], dtype=object)
+DETECTION_TYPE_PROBABILITIES = np.array([0.35, 0.25, 0.2, 0.12, 0.08])
+FRAME_WIDTH = 640
+FRAME_HEIGHT = 480
+
+@dataclass
+class SyntheticDataset:
+    """
+    Parámetros de un conjunto sintético: cámaras y sensores repartidos en un periodo
+    """
+    endTime: datetime
+    spanDays: float = 30.0
+    cameraCount: int = 12
+    sensorCount: int = 8
+    seed: int = 42
+    chunkSize: int = 20000
+    
+    @property
+    def startTime(self) -> datetime:
+        return self.endTime - timedelta(days=self.spanDays)
+    
+    @property
+    def cameraIds(self) -> List[str]:
+        return [f"THERMAL_CAM_{index + 1:03d}" for index in range(self.cameraCount)]
+    
+    @property
+    def sensorIds(self) -> List[str]:
+        return [f"DAVIS_V3_{index + 1:03d}" for index in range(self.sensorCount)]
+    
+    def cameraSensorMap(self) -> str:
+        """Valor de CAMERA_SENSOR_MAP: cada cámara toma el sensor de su zona"""
+        sensors = self.sensorIds
+        return ",".join(f"{camera}:{sensors[index % len(sensors)]}" for index, camera in enumerate(self.cameraIds))
+    
+    def _sliceTimes(self, rng: np.random.Generator, chunkIndex: int, chunkCount: int, size: int) -> np.ndarray:
+        """Epoch ordenados dentro del tramo de tiempo que corresponde al bloque"""
+        spanSeconds = self.spanDays * 86400.0
+        sliceStart = self.startTime.timestamp() + spanSeconds * chunkIndex / chunkCount
+        times = sliceStart + np.sort(rng.uniform(0.0, spanSeconds / chunkCount, size))
+        return np.floor(times)
+    
+    def detectionChunks(self, count: int) -> Iterator[List[dict]]:
+        """
+        Detecciones por cámara: mezcla de tipos, confianza beta y bbox dentro del cuadro
+        Las filas incluyen createdAt para repartirlas en el periodo
+        """
+        rng = np.random.default_rng(self.seed)
+        cameras = np.array(self.cameraIds, dtype=object)
+        chunkCount = max(1, -(-count // self.chunkSize))
+        
+        for chunkIndex in range(chunkCount):
+            size = min(self.chunkSize, count - chunkIndex * self.chunkSize)
+            times = self._sliceTimes(rng, chunkIndex, chunkCount, size)
+            types = rng.choice(DETECTION_TYPES, size=size, p=DETECTION_TYPE_PROBABILITIES)
+            confidence = np.round(rng.beta(8, 2, size), 4)
+            width = rng.integers(16, 200, size)
+            height = rng.integers(16, 200, size)
+            x = (rng.random(size) * (FRAME_WIDTH - width)).astype(int)
+            y = (rng.random(size) * (FRAME_HEIGHT - height)).astype(int)
+            cameraIds = cameras[rng.integers(0, len(cameras), size)]
+            
+            chunk = []
+            for index in range(size):
+                moment = datetime.fromtimestamp(times[index])
+                chunk.append({
+                    "detectionType": types[index],
+                    "confidence": float(confidence[index]),
+                    "bboxX": int(x[index]),
+                    "bboxY": int(y[index]),
+                    "bboxWidth": int(width[index]),
+                    "bboxHeight": int(height[index]),
+                    "imagePath": None,
+                    "cameraId": cameraIds[index],
+                    "timestamp": moment,
+                    "createdAt": moment,
+                    "processed": False
+                })
+            yield chunk
+    
+    def weatherChunks(self, count: int) -> Iterator[List[dict]]:
+        """
+        Lecturas por sensor con ciclo diario de temperatura, humedad inversa,
+        viento gamma y lluvia ocasional
+        """
+        rng = np.random.default_rng(self.seed + 1)
+        sensors = np.array(self.sensorIds, dtype=object)
+        sensorOffsets = rng.normal(0.0, 2.0, len(sensors))
+        chunkCount = max(1, -(-count // self.chunkSize))
+        
+        for chunkIndex in range(chunkCount):
+            size = min(self.chunkSize, count - chunkIndex * self.chunkSize)
+            times = self._sliceTimes(rng, chunkIndex, chunkCount, size)
+            sensorIndex = rng.integers(0, len(sensors), size)
+            hours = (times % 86400.0) / 3600.0
+            temperature = 22.0 + 8.0 * np.sin(2 * np.pi * (hours - 9.0) / 24.0) + sensorOffsets[sensorIndex] + rng.normal(0.0, 1.0, size)
+            humidity = np.clip(60.0 - 2.0 * (temperature - 22.0) + rng.normal(0.0, 5.0, size), 5.0, 100.0)
+            windSpeed = rng.gamma(2.0, 4.0, size)
+            windDirection = rng.integers(0, 361, size)
+            pressure = 1013.0 + rng.normal(0.0, 4.0, size)
+            raining = rng.random(size) < 0.03
+            rainfall = np.where(raining, rng.exponential(2.0, size), 0.0)
+            
+            chunk = []
+            for index in range(size):
+                moment = datetime.fromtimestamp(times[index])
+                chunk.append({
+                    "temperature": round(float(temperature[index]), 2),
+                    "humidity": round(float(humidity[index]), 2),
+                    "windSpeed": round(float(windSpeed[index]), 2),
+                    "windDirection": int(windDirection[index]),
+                    "pressure": round(float(pressure[index]), 2),
+                    "rainfall": round(float(rainfall[index]), 2),
+                    "sensorId": sensors[sensorIndex[index]],
+                    "timestamp": moment,
+                    "createdAt": moment
+                })
+            yield chunk
+
+def toPayload(row: dict) -> dict:
+    """
+    Fila generada a cuerpo JSON para los endpoints de ingesta (sin createdAt)
+    """
+    payload = {key: value for key, value in row.items() if key not in ("createdAt", "processed")}
+    payload["timestamp"] = row["timestamp"].isoformat()
+    return payload
@@ -0,0 +1,79 @@
+"""
+Rendimiento de la detección de puntos calientes en cuadros radiométricos, en cuadros por segundo por núcleo
+
+    python -m benchmarks hotspots --width 640 --height 480 --frames 200 --workers 4
+
+Se mide en dos niveles sobre cuadros sintéticos uint16 (centésimas de Kelvin):
+- singleCore: la función de detección en este proceso, sin pool (techo por núcleo)
+- pool: el camino del endpoint (memoria compartida + HotspotPool) con todos los cuadros
+  en vuelo a la vez; fpsPerCore es el total dividido entre los procesos del pool
+"""
+import asyncio
+import time
+from typing import Dict, List
+import numpy as np
+
+def syntheticFrames(count: int, width: int, height: int, hotspotsPerFrame: int, seed: int) -> List[bytes]:
+    """Fondo de 20 a 35 °C con ruido y manchas gaussianas que llegan a 80-400 °C"""
+    rng = np.random.default_rng(seed)
+    rows, columns = np.mgrid[0:height, 0:width]
+    frames = []
+    for _ in range(count):
+        celsius = rng.uniform(20, 35) + rng.normal(0, 0.5, (height, width))
+        for _ in range(hotspotsPerFrame):
+            centerY, centerX = rng.uniform(0, height), rng.uniform(0, width)
+            radius = rng.uniform(2, max(3, min(width, height) / 20))
+            celsius += rng.uniform(80, 400) * np.exp(-((rows - centerY) ** 2 + (columns - centerX) ** 2) / (2 * radius ** 2))
+        frames.append(np.round((celsius + 273.15) * 100).astype("<u2").tobytes())
+    return frames
+
+def measureSingleCore(frames: List[bytes], width: int, height: int, thresholdCelsius: float) -> Dict[str, float]:
+    from app.domain.services.hotspot_detector import detectFrameHotspots
+    
+    for frame in frames[:5]:
+        detectFrameHotspots(frame, width, height, thresholdCelsius=thresholdCelsius)
+    started = time.perf_counter()
+    hotspots = sum(len(detectFrameHotspots(frame, width, height, thresholdCelsius=thresholdCelsius)) for frame in frames)
+    elapsed = time.perf_counter() - started
+    return {
+        "msPerFrame": round(elapsed * 1000 / len(frames), 3),
+        "fpsPerCore": round(len(frames) / elapsed, 1),
+        "hotspotsPerFrame": round(hotspots / len(frames), 2)
+    }
+
+async def measurePool(frames: List[bytes], width: int, height: int, workers: int, thresholdCelsius: float) -> Dict[str, float]:
+    from app.infrastructure.thermal import HotspotPool, releaseSegment
+    
+    pool = HotspotPool(workers)
+    
+    async def detectOne(frame: bytes):
+        async def body():
+            yield frame
+        segment = await pool.receiveFrame(body(), width, height, "uint16")
+        try:
+            return await pool.detect(segment, width, height, "uint16", thresholdCelsius=thresholdCelsius)
+        finally:
+            releaseSegment(segment)
+    
+    try:
+        # Arrancar los procesos antes de medir
+        await asyncio.gather(*(detectOne(frame) for frame in frames[:workers * 2]))
+        started = time.perf_counter()
+        await asyncio.gather(*(detectOne(frame) for frame in frames))
+        elapsed = time.perf_counter() - started
+    finally:
+        await pool.stop()
+    return {
+        "workers": workers,
+        "fps": round(len(frames) / elapsed, 1),
+        "fpsPerCore": round(len(frames) / elapsed / workers, 1)
+    }
+
+def runHotspots(width: int, height: int, frameCount: int, workers: int, hotspotsPerFrame: int, seed: int, thresholdCelsius: float = 60.0) -> dict:
+    frames = syntheticFrames(frameCount, width, height, hotspotsPerFrame, seed)
+    return {
+        "frame": f"{width}x{height} uint16",
+        "frames": frameCount,
+        "singleCore": measureSingleCore(frames, width, height, thresholdCelsius),
+        "pool": asyncio.run(measurePool(frames, width, height, workers, thresholdCelsius))
+    }
@@ -0,0 +1,169 @@
+"""
+Escenarios de benchmark para un tamaño de tabla
+
+Se ejecuta en un proceso propio: la configuración se lee una vez por proceso (app.config),
+así que DATABASE_URL y CAMERA_SENSOR_MAP se fijan antes de usar la base o la aplicación.
+"""
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List
+from .data_generator import SyntheticDataset, toPayload
+
+# Peticiones de ingesta individuales y tamaño de lote medidos por tamaño de tabla
+INGEST_REQUESTS = 500
+INGEST_BATCH_SIZE = 500
+INGEST_BATCHES = 10
+
+def summarizeLatencies(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/media en milisegundos"""
+    ordered = sorted(samples)
+    percentile = lambda q: ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+    return {
+        "p50_ms": round(percentile(0.5) * 1000, 3),
+        "p95_ms": round(percentile(0.95) * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3)
+    }
+
+async def measureLatency(request: Callable[[], Awaitable], iterations: int, warmup: int = 3) -> Dict[str, float]:
+    """
+    Ejecutar una petición varias veces y resumir su latencia
+    cpu_ms es el tiempo de CPU del proceso por petición (cliente y aplicación comparten proceso)
+    """
+    for _ in range(warmup):
+        await request()
+    samples = []
+    cpuStarted = time.process_time()
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await request()
+        samples.append(time.perf_counter() - started)
+    summary = summarizeLatencies(samples)
+    summary["cpu_ms"] = round((time.process_time() - cpuStarted) / iterations * 1000, 3)
+    return summary
+
+async def seedTables(dataset: SyntheticDataset, rows: int):
+    """
+    Cargar detecciones y lecturas directamente con los repositorios (incluye rollups)
+    """
+    from app.infrastructure.database.connection import openSession, createTables
+    from app.infrastructure.database.repositories import insertDetectionRows, ingestWeatherRows
+    
+    await createTables()
+    for chunk in dataset.detectionChunks(rows):
+        async with openSession() as session:
+            await insertDetectionRows(session, chunk)
+            await session.commit()
+    for chunk in dataset.weatherChunks(rows):
+        async with openSession() as session:
+            await ingestWeatherRows(session, chunk)
+            await session.commit()
+
+async def checkResponseContracts(client, camera: str, sensor: str):
+    """
+    Validar que los listados y las cachés serializados con orjson cumplen su entidad declarada
+    """
+    from app.domain.entities import DetectionList, WeatherDataList, WeatherCurrentList, DetectionLatestList
+    from app.infrastructure.serialization import checkContract
+    
+    for url, params, entityClass in (
+        ("/api/v1/detections", {"pageSize": 500}, DetectionList),
+        ("/api/v1/detections", {"pageSize": 50, "cameraId": camera, "includeTotal": "true"}, DetectionList),
+        ("/api/v1/weather", {"pageSize": 500}, WeatherDataList),
+        ("/api/v1/weather", {"pageSize": 50, "sensorId": sensor, "includeTotal": "true"}, WeatherDataList),
+        ("/api/v1/weather/current", {}, WeatherCurrentList),
+        ("/api/v1/detections/latest", {}, DetectionLatestList),
+    ):
+        checkContract(entityClass, checked(await client.get(url, params=params)).json())
+
+def checked(response):
+    """Fallar el benchmark si el endpoint responde con error"""
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.method} {response.request.url} -> {response.status_code}: {response.text[:200]}")
+    return response
+
+async def runScenarios(rows: int, databasePath: str, iterations: int, seed: int) -> Dict[str, float]:
+    """
+    Sembrar la base con `rows` filas por tabla y medir consultas, correlación e ingesta
+    """
+    import httpx
+    
+    endTime = datetime.now().replace(second=0, microsecond=0)
+    dataset = SyntheticDataset(endTime=endTime, seed=seed)
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{databasePath}"
+    os.environ["CAMERA_SENSOR_MAP"] = dataset.cameraSensorMap()
+    os.environ.setdefault("INGEST_MODE", "sync")
+    
+    metrics: Dict[str, float] = {}
+    
+    started = time.perf_counter()
+    await seedTables(dataset, rows)
+    metrics["seed_rows_per_sec"] = round(2 * rows / (time.perf_counter() - started), 1)
+    
+    from app.main import app
+    
+    camera = dataset.cameraIds[0]
+    sensor = dataset.sensorIds[0]
+    weekStart = (endTime - timedelta(days=7)).isoformat()
+    weekEnd = endTime.isoformat()
+    
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            get = lambda url, **params: lambda: client.get(url, params=params)
+            
+            await checkResponseContracts(client, camera, sensor)
+            
+            # Listados paginados
+            firstPage = checked(await client.get("/api/v1/detections", params={"pageSize": 100})).json()
+            queries = {
+                "list_detections": get("/api/v1/detections", pageSize=100),
+                "list_detections_camera": get("/api/v1/detections", pageSize=100, cameraId=camera),
+                "list_detections_next_page": get("/api/v1/detections", pageSize=100, cursor=firstPage["nextCursor"]),
+                "list_detections_total": get("/api/v1/detections", pageSize=100, includeTotal="true"),
+                "list_detections_500": get("/api/v1/detections", pageSize=500),
+                "list_weather": get("/api/v1/weather", pageSize=100),
+                "list_weather_sensor": get("/api/v1/weather", pageSize=100, sensorId=sensor),
+                "list_weather_500": get("/api/v1/weather", pageSize=500),
+                "weather_summary_week": get("/api/v1/weather/summary", startDate=weekStart, endDate=weekEnd),
+                "weather_summary_week_sensor": get("/api/v1/weather/summary", startDate=weekStart, endDate=weekEnd, sensorId=sensor),
+                "correlation_1h": get("/api/v1/analysis/correlation", windowMinutes=60),
+                "correlation_24h": get("/api/v1/analysis/correlation", windowMinutes=1440),
+            }
+            for name, request in queries.items():
+                checked(await request())
+                for key, value in (await measureLatency(request, iterations)).items():
+                    metrics[f"{name}.{key}"] = value
+            
+            # Ingesta individual
+            for name, url, chunks in (
+                ("ingest_detections", "/api/v1/detections", dataset.detectionChunks(INGEST_REQUESTS)),
+                ("ingest_weather", "/api/v1/weather", dataset.weatherChunks(INGEST_REQUESTS)),
+            ):
+                payloads = [toPayload(row) for row in next(chunks)]
+                started = time.perf_counter()
+                for payload in payloads:
+                    checked(await client.post(url, json=payload))
+                metrics[f"{name}.rows_per_sec"] = round(len(payloads) / (time.perf_counter() - started), 1)
+            
+            # Ingesta por lotes
+            for name, url, chunks in (
+                ("ingest_detections_batch", "/api/v1/detections/batch", dataset.detectionChunks(INGEST_BATCH_SIZE * INGEST_BATCHES)),
+                ("ingest_weather_batch", "/api/v1/weather/batch", dataset.weatherChunks(INGEST_BATCH_SIZE * INGEST_BATCHES)),
+            ):
+                payloads = [toPayload(row) for row in next(chunks)]
+                started = time.perf_counter()
+                for start in range(0, len(payloads), INGEST_BATCH_SIZE):
+                    checked(await client.post(url, json=payloads[start:start + INGEST_BATCH_SIZE]))
+                metrics[f"{name}.rows_per_sec"] = round(len(payloads) / (time.perf_counter() - started), 1)
+    
+    from app.infrastructure.database.connection import disposeEngine
+    await disposeEngine()
+    return metrics
+
+def runSize(rows: int, databasePath: str, iterations: int, seed: int) -> Dict[str, float]:
+    if os.path.exists(databasePath):
+        os.remove(databasePath)
+    return asyncio.run(runScenarios(rows, databasePath, iterations, seed))
@@ -0,0 +1,79 @@
+"""
+Costo de CPU por respuesta de listado: ruta Pydantic (from_orm + response_model + json)
+contra la ruta actual (tuplas → dict → orjson), sin base de datos ni red
+
+    python -m benchmarks serialization --rows 500 --iterations 200
+"""
+import json
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+from .data_generator import SyntheticDataset
+
+def buildRows(dataset: SyntheticDataset, fields, generate, rows: int) -> List[tuple]:
+    """Tuplas en el orden de la entidad, como las retorna select(*columnas)"""
+    chunk = next(generate(rows))
+    return [
+        tuple({"id": index + 1, "processed": False, **row}.get(name) for name in fields)
+        for index, row in enumerate(chunk)
+    ]
+
+def cpuPerCall(function: Callable[[], object], iterations: int, warmup: int = 5) -> float:
+    """Milisegundos de CPU por llamada"""
+    for _ in range(warmup):
+        function()
+    started = time.process_time()
+    for _ in range(iterations):
+        function()
+    return (time.process_time() - started) / iterations * 1000
+
+def runSerialization(rows: int, iterations: int, seed: int) -> Dict[str, float]:
+    from datetime import datetime
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.utils import create_response_field
+    from app.domain.entities import DetectionList, DetectionResponse, WeatherDataList, WeatherDataResponse
+    from app.infrastructure.serialization import EntitySerializer, checkContract, dumps
+    
+    dataset = SyntheticDataset(endTime=datetime.now().replace(second=0, microsecond=0), seed=seed, chunkSize=rows)
+    metrics: Dict[str, float] = {}
+    
+    for name, listClass, entityClass, key, generate in (
+        ("detections", DetectionList, DetectionResponse, "detections", dataset.detectionChunks),
+        ("weather", WeatherDataList, WeatherDataResponse, "weatherData", dataset.weatherChunks),
+    ):
+        serializer = EntitySerializer(entityClass)
+        tuples = buildRows(dataset, serializer.fields, generate, rows)
+        instances = [SimpleNamespace(**dict(zip(serializer.fields, row))) for row in tuples]
+        responseField = create_response_field(name=f"Response_{name}", type_=listClass)
+        
+        def pydanticPath():
+            # Lo que hacía el endpoint antes: from_orm, validación de response_model
+            # (fastapi.routing.serialize_response), jsonable_encoder y json de Starlette
+            content = listClass(**{key: [entityClass.from_orm(row) for row in instances], "pageSize": rows})
+            value, errors = responseField.validate(content, {}, loc=("response",))
+            if errors:
+                raise RuntimeError(errors)
+            encoded = jsonable_encoder(value)
+            return json.dumps(encoded, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+        
+        def orjsonPath():
+            return dumps({
+                key: [serializer.fromRow(row) for row in tuples],
+                "totalCount": None,
+                "pageSize": rows,
+                "nextCursor": None
+            })
+        
+        # Ambas rutas deben producir el mismo documento
+        checkContract(listClass, json.loads(orjsonPath()))
+        if json.loads(pydanticPath()) != json.loads(orjsonPath()):
+            raise RuntimeError(f"Las rutas de serialización de {name} no coinciden")
+        
+        before = cpuPerCall(pydanticPath, iterations)
+        after = cpuPerCall(orjsonPath, iterations)
+        metrics[f"{name}_{rows}.pydantic_cpu_ms"] = round(before, 3)
+        metrics[f"{name}_{rows}.orjson_cpu_ms"] = round(after, 3)
+        metrics[f"{name}_{rows}.saved_cpu_ms"] = round(before - after, 3)
+        metrics[f"{name}_{rows}.speedup"] = round(before / after, 1) if after > 0 else None
+    
+    return metrics
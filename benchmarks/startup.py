@@ -0,0 +1,100 @@
+"""
+Presupuesto de arranque en frío: tiempo de importar app.main y tiempo hasta la primera respuesta
+
+    python -m benchmarks startup --runs 5 --max-import-ms 1500 --max-first-request-ms 5000
+
+Cada medición corre en un proceso nuevo. La importación se mide sin DATABASE_URL (no
+debe requerir base de datos); la primera respuesta arranca uvicorn contra un SQLite
+temporal y cuenta desde lanzar el proceso hasta el primer 200 de /health, con el
+lifespan completo de por medio.
+"""
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Dict, List
+
+IMPORT_SNIPPET = (
+    "import time, json; started = time.perf_counter(); import app.main; "
+    "print(json.dumps({'import_ms': (time.perf_counter() - started) * 1000}))"
+)
+CREATE_TABLES_SNIPPET = (
+    "import asyncio; from app.infrastructure.database.connection import createTables, disposeEngine; "
+    "asyncio.run(createTables()); asyncio.run(disposeEngine())"
+)
+
+def projectEnv(**overrides) -> Dict[str, str]:
+    """Entorno del subproceso con la raíz del proyecto en PYTHONPATH y sin DATABASE_URL heredada"""
+    env = {key: value for key, value in os.environ.items() if key != "DATABASE_URL"}
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    env.update(overrides)
+    return env
+
+def freePort() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+def measureImport() -> float:
+    """Milisegundos de import app.main en un intérprete nuevo"""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], env=projectEnv(), check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])["import_ms"]
+
+def measureFirstRequest(databasePath: str, timeoutSeconds: float = 60.0) -> float:
+    """Milisegundos desde lanzar uvicorn hasta el primer 200 de /health"""
+    env = projectEnv(DATABASE_URL=f"sqlite+aiosqlite:///{databasePath}")
+    port = freePort()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeoutSeconds:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn terminó con código {server.returncode} antes de responder")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f"Sin respuesta de /health en {timeoutSeconds} s")
+    finally:
+        server.terminate()
+        server.wait()
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "median_ms": round(statistics.median(samples), 1),
+        "max_ms": round(max(samples), 1)
+    }
+
+def runStartup(runs: int) -> Dict[str, Dict[str, float]]:
+    importSamples = [measureImport() for _ in range(runs)]
+    firstRequestSamples = []
+    with tempfile.TemporaryDirectory(prefix="thermal-startup-") as workDir:
+        databasePath = os.path.join(workDir, "startup.sqlite")
+        subprocess.run(
+            [sys.executable, "-c", CREATE_TABLES_SNIPPET],
+            env=projectEnv(DATABASE_URL=f"sqlite+aiosqlite:///{databasePath}"), check=True
+        )
+        for _ in range(runs):
+            firstRequestSamples.append(measureFirstRequest(databasePath))
+    return {"import": summarize(importSamples), "first_request": summarize(firstRequestSamples)}
+
+def checkBudget(results: Dict[str, Dict[str, float]], maxImportMs: float, maxFirstRequestMs: float) -> List[str]:
+    """Mediciones cuya mediana supera el presupuesto"""
+    exceeded = []
+    for name, budget in (("import", maxImportMs), ("first_request", maxFirstRequestMs)):
+        if results[name]["median_ms"] > budget:
+            exceeded.append(f"{name}: {results[name]['median_ms']} ms > {budget} ms")
+    return exceeded
@@ -0,0 +1,51 @@
+"""
+Lectura por tramos del almacenamiento frío
+
+    python -m pytest tests
+"""
+import tempfile
+from datetime import date, datetime, timedelta
+import numpy as np
+from app.infrastructure.archive import ColdArchive
+
+KINDS = {"id": "int", "temperature": "float", "windDirection": "int", "sensorId": "str", "timestamp": "datetime"}
+DAY = date(2026, 6, 1)
+
+def archiveWithRows(count: int):
+    archive = ColdArchive(tempfile.mkdtemp(prefix="thermal-archive-"))
+    start = datetime(2026, 6, 1)
+    rows = [
+        (index + 1, 20.0 + index, None if index % 3 else index, f"S{index % 2}", start + timedelta(minutes=index))
+        for index in range(count)
+    ]
+    return archive, archive.writeDay("weather_data", DAY, KINDS, rows), rows
+
+def testSlicesMatchWholeFile():
+    archive, entry, _ = archiveWithRows(100)
+    whole = archive.readEntry(entry, list(KINDS))
+    slices = list(archive.readEntrySlices(entry, list(KINDS), sliceRows=37))
+    
+    assert [len(block["id"][0]) for block in slices] == [37, 37, 26]
+    for name in KINDS:
+        values, nulls = whole[name]
+        assert np.array_equal(np.concatenate([block[name][0] for block in slices]), values)
+        if nulls is None:
+            assert all(block[name][1] is None for block in slices)
+        else:
+            assert np.array_equal(np.concatenate([block[name][1] for block in slices]), nulls)
+
+def testMissingColumnReadsAsNull():
+    archive, entry, _ = archiveWithRows(10)
+    block = next(archive.readEntrySlices(entry, ["rainfall"], sliceRows=4))
+    assert block["rainfall"][1].all() and len(block["rainfall"][1]) == 4
+
+def testReadRowsFiltersEachSlice():
+    archive, _, rows = archiveWithRows(100)
+    blocks = list(archive.readRows(
+        "weather_data", ["id", "sensorId"],
+        startDate=datetime(2026, 6, 1, 0, 10), endDate=datetime(2026, 6, 1, 1, 0), timeColumn="timestamp", equals={"sensorId": "S1"},
+        sliceRows=16
+    ))
+    expected = [(row[0], row[3]) for row in rows if 10 <= row[0] - 1 < 60 and row[3] == "S1"]
+    assert [row for block in blocks for row in block] == expected
+    assert all(len(block) <= 16 for block in blocks)
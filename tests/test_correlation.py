@@ -0,0 +1,104 @@
+"""
+Motor de correlación detección-clima y carga de su ventana meteorológica
+
+    python -m pytest tests
+"""
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.domain.services import correlate, factorize
+from app.domain.services.correlation_engine import DetectionColumns, WeatherColumns, asofJoinBySensor, asofJoinNearest
+from app.infrastructure.database.connection import Base
+from app.infrastructure.database.models import WeatherModel
+from app.infrastructure.database.repositories.weather_repository import loadWeatherColumns
+
+def detectionColumns(times, cameras, types, confidence) -> DetectionColumns:
+    cameraCodes, cameraValues = factorize(cameras)
+    typeCodes, typeValues = factorize(types)
+    return DetectionColumns(
+        ids=np.arange(1, len(times) + 1),
+        times=np.array(times, dtype=np.float64),
+        cameraCodes=cameraCodes, cameras=cameraValues,
+        typeCodes=typeCodes, detectionTypes=typeValues,
+        confidence=np.array(confidence, dtype=np.float64)
+    )
+
+def weatherColumns(times, sensors, temperature, humidity, windSpeed) -> WeatherColumns:
+    sensorCodes, sensorValues = factorize(sensors)
+    return WeatherColumns(
+        times=np.array(times, dtype=np.float64),
+        sensorCodes=sensorCodes, sensors=sensorValues,
+        temperature=np.array(temperature, dtype=np.float64),
+        humidity=np.array(humidity, dtype=np.float64),
+        windSpeed=np.array(windSpeed, dtype=np.float64)
+    )
+
+def testNearestPicksClosestAndRespectsGap():
+    right = np.array([0.0, 100.0, 200.0])
+    nearest = asofJoinNearest(np.array([-10.0, 40.0, 60.0, 150.0, 260.0, 500.0]), right, maxGapSeconds=60.0)
+    # En un empate (150) gana la lectura anterior
+    assert nearest.tolist() == [0, 0, 1, 1, 2, -1]
+    assert asofJoinNearest(np.array([1.0]), np.empty(0), 60.0).tolist() == [-1]
+
+def testJoinUsesSensorAssignedToCamera():
+    detections = detectionColumns([100.0, 100.0, 100.0], ["CAM1", "CAM2", "CAM3"], ["fire"] * 3, [0.9] * 3)
+    # Las lecturas no están ordenadas: el join devuelve posiciones sobre el arreglo original
+    weather = weatherColumns([110.0, 90.0, 300.0, 100.0], ["S2", "S1", "S1", "S9"], [30.0] * 4, [20.0] * 4, [10.0] * 4)
+    joined = asofJoinBySensor(detections, weather, cameraSensorMap={"CAM1": "S1", "CAM2": "S2", "CAM3": "S4"}, maxGapSeconds=60.0)
+    # CAM3 apunta a un sensor sin lecturas
+    assert joined.tolist() == [1, 0, -1]
+    anySensor = asofJoinBySensor(detections, weather, maxGapSeconds=60.0)
+    assert anySensor.tolist() == [3, 3, 3]
+
+def testCorrelateScoresDryWindyFireAsCritical():
+    detections = detectionColumns([0.0, 50.0], ["CAM1", "CAM1"], ["fire", "person"], [0.95, 0.6])
+    weather = weatherColumns([10.0], ["S1"], [38.0], [12.0], [35.0])
+    output = correlate(detections, weather, cameraSensorMap={"CAM1": "S1"}, maxGapSeconds=60.0)
+    
+    assert output.weatherIndex.tolist() == [0, 0]
+    assert output.riskLevel == "critical"
+    assert output.factors["topDetectionType"] == "fire"
+    assert output.factors["thermalDetection"] is True
+    assert output.factors["weatherConditions"] == "favorable_for_fire"
+    assert output.confidence == 0.95
+    assert output.riskScores[0] > output.riskScores[1]
+
+def testCorrelateWithoutWeatherHalvesConfidence():
+    detections = detectionColumns([0.0], ["CAM1"], ["fire"], [0.8])
+    output = correlate(detections, weatherColumns([], [], [], [], []))
+    assert output.weatherIndex.tolist() == [-1]
+    assert output.confidence == 0.4
+    # Factor neutro: 0.8 * 1.0 * (0.5 + 0.5 * 0.5)
+    assert np.isclose(output.riskScores[0], 0.6)
+
+def testCorrelateEmptyWindowIsLow():
+    output = correlate(detectionColumns([], [], [], []), weatherColumns([5.0], ["S1"], [20.0], [50.0], [5.0]))
+    assert output.riskLevel == "low" and output.factors["weatherReadingCount"] == 1
+
+def testWeatherWindowIncludesReadingsWithoutTimestamp():
+    path = os.path.join(tempfile.mkdtemp(prefix="thermal-correlation-"), "weather.sqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    start = datetime(2026, 7, 1, 12, 0)
+    
+    async def scenario():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all, tables=[WeatherModel.__table__])
+            await connection.execute(insert(WeatherModel.__table__), [
+                {"sensorId": "S1", "temperature": 21.0, "timestamp": start + timedelta(minutes=5), "createdAt": start + timedelta(minutes=6)},
+                # Sin timestamp: cuenta el instante de ingesta
+                {"sensorId": "S1", "temperature": 22.0, "timestamp": None, "createdAt": start + timedelta(minutes=10)},
+                {"sensorId": "S1", "temperature": 23.0, "timestamp": None, "createdAt": start + timedelta(hours=2)},
+            ])
+        async with async_sessionmaker(engine)() as session:
+            columns = await loadWeatherColumns(session, start, start + timedelta(hours=1))
+        await engine.dispose()
+        return columns
+    
+    columns = asyncio.run(scenario())
+    startEpoch = (start - datetime(1970, 1, 1)).total_seconds()
+    assert sorted(columns.temperature.tolist()) == [21.0, 22.0]
+    assert sorted(columns.times.tolist()) == [startEpoch + 300, startEpoch + 600]
@@ -0,0 +1,62 @@
+"""
+Sistema canadiense FWI contra los valores publicados de Van Wagner y Pickett (1985)
+
+    python -m pytest tests
+
+Primeros días de la tabla de prueba del programa original: abril a 46° N partiendo de
+los códigos estándar (FFMC 85, DMC 6, DC 15); los valores publicados tienen un decimal.
+"""
+import numpy as np
+import pytest
+from app.domain.services.fire_weather import FireWeatherState, computeFireWeather, dangerClassFor
+
+# (temperatura, humedad, viento, lluvia) -> (FFMC, DMC, DC, ISI, BUI, FWI)
+REFERENCE_DAYS = [
+    ((17.0, 42.0, 25.0, 0.0), (87.7, 8.5, 19.0, 10.9, 8.5, 10.1)),
+    ((20.0, 21.0, 25.0, 2.4), (86.2, 10.4, 23.6, 8.8, 10.4, 9.3)),
+    ((8.5, 40.0, 17.0, 0.0), (87.0, 11.8, 26.1, 6.5, 11.7, 7.6)),
+    ((6.5, 25.0, 6.0, 0.0), (88.8, 13.2, 28.2, 4.9, 13.1, 6.2)),
+    ((13.0, 34.0, 24.0, 0.0), (89.1, 15.4, 31.5, 12.6, 15.3, 14.8)),
+]
+APRIL = 4
+LATITUDE = 46.0
+
+def referenceInputs(days):
+    inputs = np.array([weather for weather, _ in days], dtype=np.float64)
+    return [inputs[:, [column]] for column in range(4)]
+
+def compute(days, state):
+    temperature, humidity, windSpeed, rainfall = referenceInputs(days)
+    return computeFireWeather(
+        np.full(len(days), APRIL), temperature, humidity, windSpeed, rainfall,
+        np.zeros(1, dtype=np.int64), state, LATITUDE
+    )
+
+def testMatchesPublishedReferenceValues():
+    columns, _ = compute(REFERENCE_DAYS, FireWeatherState.start(1))
+    expected = np.array([values for _, values in REFERENCE_DAYS])
+    computed = np.column_stack([getattr(columns, name)[:, 0] for name in ("ffmc", "dmc", "dc", "isi", "bui", "fwi")])
+    assert np.allclose(computed, expected, atol=0.051)
+
+def testContinuingFromStateMatchesSingleRun():
+    whole, finalState = compute(REFERENCE_DAYS, FireWeatherState.start(1))
+    _, state = compute(REFERENCE_DAYS[:2], FireWeatherState.start(1))
+    rest, restState = compute(REFERENCE_DAYS[2:], state)
+    assert np.allclose(rest.fwi[:, 0], whole.fwi[2:, 0])
+    assert np.allclose(restState.dc, finalState.dc)
+
+def testMissingDayKeepsState():
+    temperature, humidity, windSpeed, rainfall = referenceInputs(REFERENCE_DAYS[:2])
+    humidity[0, 0] = np.nan
+    columns, state = computeFireWeather(
+        np.full(2, APRIL), temperature, humidity, windSpeed, rainfall,
+        np.zeros(1, dtype=np.int64), FireWeatherState.start(1), LATITUDE
+    )
+    assert not columns.active[0, 0] and np.isnan(columns.fwi[0, 0])
+    # El segundo día parte de los códigos iniciales, como si el primero no existiera
+    alone, _ = compute(REFERENCE_DAYS[1:2], FireWeatherState.start(1))
+    assert np.isclose(columns.fwi[1, 0], alone.fwi[0, 0])
+
+@pytest.mark.parametrize("fwi, danger", [(None, None), (0.0, "low"), (5.0, "moderate"), (19.9, "high"), (30.0, "extreme")])
+def testDangerClasses(fwi, danger):
+    assert dangerClassFor(fwi) == danger
@@ -0,0 +1,82 @@
+"""
+Componentes conectadas de puntos calientes sobre cuadros sintéticos
+
+    python -m pytest tests
+"""
+from collections import deque
+import numpy as np
+import pytest
+from app.domain.services import detectFrameHotspots
+from app.domain.services.hotspot_detector import detectHotspots, rawThreshold
+
+def floodComponents(mask: np.ndarray) -> list:
+    """Referencia píxel a píxel (8-vecindad): (x, y, ancho, alto, píxeles) de cada componente"""
+    height, width = mask.shape
+    seen = np.zeros_like(mask)
+    components = []
+    for startY, startX in zip(*np.nonzero(mask)):
+        if seen[startY, startX]:
+            continue
+        seen[startY, startX] = True
+        queue, cells = deque([(startY, startX)]), []
+        while queue:
+            y, x = queue.popleft()
+            cells.append((y, x))
+            for nextY in range(max(0, y - 1), min(height, y + 2)):
+                for nextX in range(max(0, x - 1), min(width, x + 2)):
+                    if mask[nextY, nextX] and not seen[nextY, nextX]:
+                        seen[nextY, nextX] = True
+                        queue.append((nextY, nextX))
+        ys, xs = zip(*cells)
+        components.append((min(xs), min(ys), max(xs) - min(xs) + 1, max(ys) - min(ys) + 1, len(cells)))
+    return sorted(components)
+
+def detectedComponents(frame: np.ndarray, threshold, minPixels: int = 1) -> list:
+    hotspots = detectHotspots(frame, threshold, minPixels=minPixels, maxHotspots=10 ** 6)
+    return sorted(zip(
+        hotspots.x.tolist(), hotspots.y.tolist(), hotspots.width.tolist(), hotspots.height.tolist(), hotspots.pixels.tolist()
+    ))
+
+def testShapesJoinedFromBelowAndDiagonally():
+    frame = np.zeros((10, 12), dtype=np.uint16)
+    # U: dos columnas que solo se unen en la fila de abajo
+    frame[1:6, 1] = frame[1:6, 4] = 100
+    frame[5, 1:5] = 100
+    # Escalera unida solo por las esquinas
+    for step in range(4):
+        frame[1 + step, 7 + step] = 100
+    # Punto aislado
+    frame[8, 10] = 100
+    
+    assert detectedComponents(frame, 50) == [(1, 1, 4, 5, 12), (7, 1, 4, 4, 4), (10, 8, 1, 1, 1)]
+    # minPixels descarta el punto aislado
+    assert len(detectHotspots(frame, 50, minPixels=2)) == 2
+
+@pytest.mark.parametrize("seed", range(5))
+def testMatchesFloodFillOnRandomFrames(seed):
+    frame = np.random.default_rng(seed).integers(0, 100, size=(40, 60), dtype=np.uint16)
+    assert detectedComponents(frame, 70) == floodComponents(frame >= 70)
+
+def testHottestFirstWithPeakAndMean():
+    frame = np.zeros((6, 6), dtype=np.float32)
+    frame[0:2, 0:2] = [[70.0, 80.0], [90.0, 100.0]]
+    frame[4:6, 4:6] = 150.0
+    hotspots = detectHotspots(frame, 60.0, minPixels=4)
+    assert hotspots.x.tolist() == [4, 0]
+    assert hotspots.peak.tolist() == [150.0, 100.0]
+    assert hotspots.mean.tolist() == [150.0, 85.0]
+
+def testFrameInCentikelvinUsesCelsiusThreshold():
+    # 60 °C = 33315 centésimas de Kelvin
+    assert rawThreshold(np.dtype("<u2"), 60.0, 0.01, -273.15) == 33315
+    frame = np.full((4, 4), 29315, dtype="<u2")  # 20 °C
+    frame[1:3, 1:3] = 37315  # 100 °C
+    hotspots = detectFrameHotspots(frame.tobytes(), 4, 4, thresholdCelsius=60.0)
+    assert hotspots == [{
+        "bboxX": 1, "bboxY": 1, "bboxWidth": 2, "bboxHeight": 2, "pixels": 4,
+        "peakTemperature": 100.0, "meanTemperature": 100.0, "confidence": 0.7
+    }]
+
+def testShortBufferIsRejected():
+    with pytest.raises(ValueError):
+        detectFrameHotspots(b"\x00" * 10, 4, 4)
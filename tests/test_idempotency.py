@@ -0,0 +1,111 @@
+"""
+Reclamación de llaves de idempotencia al insertar lotes y filas de la cola write-behind
+
+    python -m pytest tests
+
+Corre sobre un archivo SQLite temporal por prueba, sin levantar la API.
+"""
+import asyncio
+import os
+import tempfile
+from datetime import datetime
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.infrastructure.database.connection import Base
+from app.infrastructure.database.models import IngestKeyModel, WeatherModel
+from app.infrastructure.database.repositories import insertWeatherRows
+from app.infrastructure.ingest import IDEMPOTENCY_KEY_FIELD, insertUniqueRows, withIngestKeys
+
+def weatherRow(minute: int) -> dict:
+    return {
+        "temperature": 20.0 + minute,
+        "humidity": 40.0,
+        "windSpeed": 3.0,
+        "sensorId": "S1",
+        "timestamp": datetime(2026, 1, 1, 12, minute)
+    }
+
+@pytest.fixture
+def sessionFactory():
+    path = os.path.join(tempfile.mkdtemp(prefix="thermal-idempotency-"), "keys.sqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    
+    async def createSchema():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all, tables=[WeatherModel.__table__, IngestKeyModel.__table__])
+    
+    asyncio.run(createSchema())
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+async def insertAndCommit(sessionFactory, rows, keyHashes):
+    async with sessionFactory() as session:
+        result = await insertUniqueRows(session, "weather", insertWeatherRows, rows, keyHashes)
+        await session.commit()
+    return result
+
+async def countRows(sessionFactory, model) -> int:
+    async with sessionFactory() as session:
+        return (await session.execute(select(func.count()).select_from(model))).scalar()
+
+def testRepeatedBatchReturnsOriginalIds(sessionFactory):
+    async def scenario():
+        rows = [weatherRow(0), weatherRow(5)]
+        firstIds, firstReplayed = await insertAndCommit(sessionFactory, rows, ["a", "b"])
+        secondIds, secondReplayed = await insertAndCommit(sessionFactory, rows, ["a", "b"])
+        return firstIds, firstReplayed, secondIds, secondReplayed, await countRows(sessionFactory, WeatherModel)
+    
+    firstIds, firstReplayed, secondIds, secondReplayed, storedRows = asyncio.run(scenario())
+    assert firstReplayed == [False, False]
+    assert secondReplayed == [True, True]
+    assert secondIds == firstIds
+    assert storedRows == 2
+
+def testDuplicateInsideBatchIsInsertedOnce(sessionFactory):
+    async def scenario():
+        result = await insertAndCommit(sessionFactory, [weatherRow(0), weatherRow(0), weatherRow(5)], ["a", "a", None])
+        return result, await countRows(sessionFactory, WeatherModel)
+    
+    (recordIds, replayed), storedRows = asyncio.run(scenario())
+    assert replayed == [False, True, False]
+    assert recordIds[0] == recordIds[1]
+    assert storedRows == 2
+
+def testRowsWithoutKeyAreAlwaysInserted(sessionFactory):
+    async def scenario():
+        await insertAndCommit(sessionFactory, [weatherRow(0)], [None])
+        await insertAndCommit(sessionFactory, [weatherRow(0)], [None])
+        return await countRows(sessionFactory, WeatherModel), await countRows(sessionFactory, IngestKeyModel)
+    
+    assert asyncio.run(scenario()) == (2, 0)
+
+def testClaimedKeysPointToInsertedRecords(sessionFactory):
+    async def scenario():
+        recordIds, _ = await insertAndCommit(sessionFactory, [weatherRow(0), weatherRow(5)], ["a", "b"])
+        async with sessionFactory() as session:
+            keys = dict((await session.execute(select(IngestKeyModel.keyHash, IngestKeyModel.recordId))).all())
+        return recordIds, keys
+    
+    recordIds, keys = asyncio.run(scenario())
+    assert keys == {"a": recordIds[0], "b": recordIds[1]}
+
+def testQueueFlushDropsRowsAlreadyRegistered(sessionFactory):
+    # Un reintento que otro worker encoló llega al flush con una llave ya registrada
+    insertWithKeys = withIngestKeys("weather", insertWeatherRows)
+    
+    async def flush(rows):
+        async with sessionFactory() as session:
+            recordIds = await insertWithKeys(session, rows)
+            await session.commit()
+        return recordIds
+    
+    async def scenario():
+        first = await flush([{**weatherRow(0), IDEMPOTENCY_KEY_FIELD: "a"}])
+        second = await flush([{**weatherRow(0), IDEMPOTENCY_KEY_FIELD: "a"}, {**weatherRow(5), IDEMPOTENCY_KEY_FIELD: "b"}])
+        return first, second, await countRows(sessionFactory, WeatherModel)
+    
+    first, second, storedRows = asyncio.run(scenario())
+    assert first[0] is not None
+    assert second[0] is None and second[1] is not None
+    assert storedRows == 2
@@ -0,0 +1,93 @@
+"""
+Enlace de detecciones con incidentes reconstruidos desde la base en cada ingesta
+
+    python -m pytest tests
+
+Cada ingesta usa un tracker nuevo, como lo haría otro worker, sobre un archivo SQLite temporal.
+"""
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.domain.services import IncidentTracker
+from app.infrastructure.database.connection import Base
+from app.infrastructure.database.models import IncidentModel
+from app.infrastructure.database.repositories import assignIncidents
+
+START = datetime(2026, 7, 1, 12, 0)
+
+def detectionRow(seconds: int, bboxX: int = 100, cameraId: str = "CAM1") -> dict:
+    return {
+        "cameraId": cameraId, "detectionType": "fire", "confidence": 0.8,
+        "bboxX": bboxX, "bboxY": 100, "bboxWidth": 50, "bboxHeight": 50,
+        "timestamp": START + timedelta(seconds=seconds)
+    }
+
+@pytest.fixture
+def sessionFactory():
+    path = os.path.join(tempfile.mkdtemp(prefix="thermal-incidents-"), "incidents.sqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    
+    async def createSchema():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all, tables=[IncidentModel.__table__])
+    
+    asyncio.run(createSchema())
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+async def ingest(sessionFactory, rows, commit: bool = True):
+    async with sessionFactory() as session:
+        await assignIncidents(session, IncidentTracker(maxGapSeconds=120), rows)
+        if commit:
+            await session.commit()
+        else:
+            await session.rollback()
+    return [row["incidentId"] for row in rows]
+
+async def storedIncidents(sessionFactory):
+    async with sessionFactory() as session:
+        return list((await session.execute(
+            select(IncidentModel.id, IncidentModel.detectionCount, IncidentModel.lastBboxMinX).order_by(IncidentModel.id)
+        )).all())
+
+def testSeparateIngestsJoinTheSameIncident(sessionFactory):
+    async def scenario():
+        first = await ingest(sessionFactory, [detectionRow(0)])
+        second = await ingest(sessionFactory, [detectionRow(10, bboxX=110), detectionRow(20, bboxX=120)])
+        return first, second, await storedIncidents(sessionFactory)
+    
+    first, second, incidents = asyncio.run(scenario())
+    assert second == first * 2
+    assert [(row.detectionCount, row.lastBboxMinX) for row in incidents] == [(3, 120)]
+
+def testMatchUsesLastBboxNotEnvelope(sessionFactory):
+    # La envolvente crece con el incendio; la siguiente detección se compara con el último bbox
+    async def scenario():
+        ids = await ingest(sessionFactory, [detectionRow(seconds * 5, bboxX=100 + seconds * 20) for seconds in range(10)])
+        return ids, await ingest(sessionFactory, [detectionRow(60, bboxX=290)])
+    
+    ids, later = asyncio.run(scenario())
+    assert len(set(ids)) == 1
+    assert later == ids[:1]
+
+def testGapOpensNewIncident(sessionFactory):
+    async def scenario():
+        first = await ingest(sessionFactory, [detectionRow(0)])
+        return first, await ingest(sessionFactory, [detectionRow(600)])
+    
+    first, later = asyncio.run(scenario())
+    assert later != first
+
+def testRolledBackIngestLeavesNoState(sessionFactory):
+    async def scenario():
+        await ingest(sessionFactory, [detectionRow(0)], commit=False)
+        await ingest(sessionFactory, [detectionRow(10, cameraId="CAM2")])
+        return await ingest(sessionFactory, [detectionRow(20)]), await storedIncidents(sessionFactory)
+    
+    ids, incidents = asyncio.run(scenario())
+    assert len(incidents) == 2
+    assert [row.detectionCount for row in incidents] == [1, 1]
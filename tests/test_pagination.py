@@ -0,0 +1,59 @@
+"""
+Paginación keyset: cursores opacos y desempate por id con createdAt repetido
+
+    python -m pytest tests
+"""
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.domain.entities import WeatherDataFilter
+from app.infrastructure.database.connection import Base
+from app.infrastructure.database.models import WeatherModel
+from app.infrastructure.database.repositories import listWeatherData
+from app.infrastructure.database.repositories.pagination import InvalidCursorError, decodeCursor, encodeCursor
+
+def testCursorRoundTrip():
+    createdAt = datetime(2026, 10, 18, 12, 30, 5, 123456)
+    cursor = encodeCursor(createdAt, 42)
+    assert "=" not in cursor and "|" not in cursor
+    assert decodeCursor(cursor) == (createdAt, 42)
+
+@pytest.mark.parametrize("cursor", ["", "no-es-base64!", encodeCursor(datetime(2026, 1, 1), 1)[:-3], "MjAyNi0wMS0wMQ"])
+def testMalformedCursorIsRejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decodeCursor(cursor)
+
+def testPagesBreakTiesOnEqualCreatedAt():
+    path = os.path.join(tempfile.mkdtemp(prefix="thermal-pagination-"), "pages.sqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    createdAt = datetime(2026, 10, 18, 12, 0)
+    
+    async def scenario():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all, tables=[WeatherModel.__table__])
+            # Siete filas con el mismo createdAt entre dos más nuevas y una más antigua
+            await connection.execute(insert(WeatherModel.__table__), [
+                {"sensorId": "S1", "temperature": float(index), "createdAt": moment}
+                for index, moment in enumerate(
+                    [createdAt - timedelta(minutes=1)] + [createdAt] * 7 + [createdAt + timedelta(minutes=1)] * 2
+                )
+            ])
+        pages, cursor = [], None
+        async with async_sessionmaker(engine)() as session:
+            while True:
+                page, cursor, _ = await listWeatherData(session, WeatherDataFilter(), pageSize=3, cursor=cursor)
+                pages.append([row.id for row in page])
+                if cursor is None:
+                    break
+        await engine.dispose()
+        return pages
+    
+    pages = asyncio.run(scenario())
+    seen = [recordId for page in pages for recordId in page]
+    assert [len(page) for page in pages] == [3, 3, 3, 1]
+    # Cada fila una sola vez, en (createdAt DESC, id DESC)
+    assert seen == [10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
@@ -0,0 +1,78 @@
+"""
+Planificación de particiones mensuales y DDL generado
+
+    python -m pytest tests
+
+Solo ejercita funciones puras: no necesita un MySQL disponible.
+"""
+from datetime import datetime, timedelta
+from app.infrastructure.database.partitioning import (
+    EVENT_TIME_SKEW, FUTURE_PARTITION, PartitionPlan, PartitionWindow,
+    addMonths, createdAtLowerBound, maintenanceStatements, monthlyWindows, planPartitionMaintenance
+)
+
+def testMonthlyWindowsCoverRangeAcrossYear():
+    windows = monthlyWindows(datetime(2026, 11, 15, 8, 30), datetime(2027, 2, 1))
+    assert [window.name for window in windows] == ["p202611", "p202612", "p202701"]
+    assert windows[0].start == datetime(2026, 11, 1)
+    assert all(window.end == following.start for window, following in zip(windows, windows[1:]))
+    assert windows[-1].end == datetime(2027, 2, 1)
+
+def testAddMonthsCrossesYearBoundaries():
+    assert addMonths(datetime(2026, 12, 1), 1) == datetime(2027, 1, 1)
+    assert addMonths(datetime(2026, 1, 1), -1) == datetime(2025, 12, 1)
+    assert addMonths(datetime(2026, 3, 1), -14) == datetime(2025, 1, 1)
+
+def testPlanCreatesCurrentAndAheadOnEmptyTable():
+    plan = planPartitionMaintenance("detections", [FUTURE_PARTITION], datetime(2026, 10, 18), monthsAhead=2, retentionMonths=0)
+    assert [window.name for window in plan.create] == ["p202610", "p202611", "p202612"]
+    assert plan.expire == []
+
+def testPlanFillsMissedMonthsAfterLastPartition():
+    existing = ["p202607", "p202608", FUTURE_PARTITION]
+    plan = planPartitionMaintenance("detections", existing, datetime(2026, 10, 3), monthsAhead=1, retentionMonths=0)
+    assert [window.name for window in plan.create] == ["p202609", "p202610", "p202611"]
+
+def testPlanIsEmptyWhenAheadAlreadyExists():
+    existing = ["p202610", "p202611", FUTURE_PARTITION]
+    plan = planPartitionMaintenance("detections", existing, datetime(2026, 10, 31, 23, 59), monthsAhead=1, retentionMonths=0)
+    assert plan.isEmpty
+
+def testRetentionExpiresOnlyWholeMonthsBeforeCutoff():
+    existing = ["p202606", "p202607", "p202608", "p202609", "p202610", FUTURE_PARTITION]
+    plan = planPartitionMaintenance("weather_data", existing, datetime(2026, 10, 18), monthsAhead=0, retentionMonths=2)
+    # Corte en 2026-08-01: agosto aún tiene filas dentro de la retención
+    assert plan.expire == ["p202606", "p202607"]
+    assert plan.create == []
+
+def testLowerBoundSubtractsEventSkew():
+    startDate = datetime(2026, 10, 1, 0, 30)
+    assert createdAtLowerBound(startDate) == startDate - EVENT_TIME_SKEW
+    assert EVENT_TIME_SKEW == timedelta(hours=24)
+    # Una lectura con timestamp a inicio de mes puede tener createdAt del mes anterior
+    assert createdAtLowerBound(datetime(2026, 10, 1)) < datetime(2026, 10, 1)
+
+def testReorganizeSplitsFuturePartition():
+    plan = PartitionPlan("detections", create=[
+        PartitionWindow("p202611", datetime(2026, 11, 1), datetime(2026, 12, 1)),
+        PartitionWindow("p202612", datetime(2026, 12, 1), datetime(2027, 1, 1)),
+    ])
+    assert maintenanceStatements(plan) == [
+        "ALTER TABLE `detections` REORGANIZE PARTITION pfuture INTO (\n"
+        "    PARTITION p202611 VALUES LESS THAN ('2026-12-01 00:00:00'),\n"
+        "    PARTITION p202612 VALUES LESS THAN ('2027-01-01 00:00:00'),\n"
+        "    PARTITION pfuture VALUES LESS THAN (MAXVALUE)\n"
+        ")"
+    ]
+
+def testExpiredMonthsDropOrArchive():
+    plan = PartitionPlan("weather_data", expire=["p202606", "p202607"])
+    assert maintenanceStatements(plan) == ["ALTER TABLE `weather_data` DROP PARTITION p202606, p202607"]
+    archived = maintenanceStatements(plan, retentionMode="archive")
+    assert archived[:4] == [
+        "CREATE TABLE `weather_data_archive_202606` LIKE `weather_data`",
+        "ALTER TABLE `weather_data_archive_202606` REMOVE PARTITIONING",
+        "ALTER TABLE `weather_data` EXCHANGE PARTITION p202606 WITH TABLE `weather_data_archive_202606`",
+        "ALTER TABLE `weather_data` DROP PARTITION p202606",
+    ]
+    assert len(archived) == 8
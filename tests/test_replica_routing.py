@@ -0,0 +1,131 @@
+"""
+Enrutamiento de lecturas a la réplica con dos archivos SQLite
+
+    python -m pytest tests
+
+Una aplicación mínima con el mismo cableado que app/main.py: las escrituras usan la sesión
+del primario, los GET pasan por ReadRouter.readSession y ReadYourWritesMiddleware fija al
+primario las lecturas del cliente que acaba de escribir.
+"""
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.infrastructure.database.connection import Base
+from app.infrastructure.database.models import DetectionModel, WeatherModel
+from app.infrastructure.database.replica import STICKY_COOKIE_NAME, ReadRouter, ReadYourWritesMiddleware, ReplicaLagMonitor
+
+TABLES = [WeatherModel.__table__, DetectionModel.__table__]
+
+class Databases:
+    """Primario y réplica en archivos separados, con el router y el monitor de atraso"""
+    
+    def __init__(self):
+        directory = tempfile.mkdtemp(prefix="thermal-replica-")
+        self.replicaPath = os.path.join(directory, "replica.sqlite")
+        self.primaryEngine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'primary.sqlite')}")
+        self.replicaEngine = create_async_engine(f"sqlite+aiosqlite:///{self.replicaPath}")
+        self.primarySessions = async_sessionmaker(self.primaryEngine, expire_on_commit=False)
+        self.replicaSessions = async_sessionmaker(self.replicaEngine, expire_on_commit=False)
+        self.lagMonitor = ReplicaLagMonitor(self.primaryEngine, self.replicaEngine, maxLagSeconds=5.0)
+        self.router = ReadRouter(self.primarySessions, stickySeconds=5.0)
+        self.router.attachReplica(self.replicaSessions, self.lagMonitor)
+    
+    async def createSchemas(self):
+        for engine in (self.primaryEngine, self.replicaEngine):
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all, tables=TABLES)
+    
+    async def dispose(self):
+        await self.primaryEngine.dispose()
+        await self.replicaEngine.dispose()
+
+def buildApp(databases: Databases) -> FastAPI:
+    application = FastAPI()
+    
+    async def primarySession():
+        async with databases.primarySessions() as session:
+            yield session
+    
+    @application.post("/weather")
+    async def writeWeather(sensorId: str, session: AsyncSession = Depends(primarySession)):
+        session.add(WeatherModel(sensorId=sensorId, temperature=20.0, timestamp=datetime.now()))
+        await session.commit()
+        return {"sensorId": sensorId}
+    
+    @application.get("/weather")
+    async def readWeather(session: AsyncSession = Depends(databases.router.readSession)):
+        return sorted((await session.execute(select(WeatherModel.sensorId))).scalars().all())
+    
+    application.add_middleware(ReadYourWritesMiddleware, stickySeconds=5.0)
+    return application
+
+async def sensorsIn(sessionFactory) -> list:
+    async with sessionFactory() as session:
+        return sorted((await session.execute(select(WeatherModel.sensorId))).scalars().all())
+
+@pytest.fixture
+def databases():
+    databases = Databases()
+    asyncio.run(databases.createSchemas())
+    yield databases
+    asyncio.run(databases.dispose())
+
+def testReadsGoToReplicaAndWritesToPrimary(databases):
+    async def scenario():
+        # Solo la réplica tiene esta fila: si la lectura la ve, vino de la réplica
+        async with databases.replicaSessions() as session:
+            session.add(WeatherModel(sensorId="REPLICA", temperature=20.0, timestamp=datetime.now()))
+            await session.commit()
+        assert await databases.lagMonitor.checkOnce()
+        
+        transport = httpx.ASGITransport(app=buildApp(databases))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            fromReplica = (await client.get("/weather")).json()
+            write = await client.post("/weather", params={"sensorId": "WRITTEN"})
+            # El cliente que escribió lee del primario mientras dure la cookie
+            sticky = (await client.get("/weather")).json()
+            client.cookies.clear()
+            afterSticky = (await client.get("/weather")).json()
+        return fromReplica, write, sticky, afterSticky, await sensorsIn(databases.primarySessions), await sensorsIn(databases.replicaSessions)
+    
+    fromReplica, write, sticky, afterSticky, primaryRows, replicaRows = asyncio.run(scenario())
+    assert fromReplica == ["REPLICA"]
+    assert STICKY_COOKIE_NAME in write.cookies
+    assert primaryRows == ["WRITTEN"] and replicaRows == ["REPLICA"]
+    assert sticky == ["WRITTEN"]
+    assert afterSticky == ["REPLICA"]
+    assert databases.router.replicaReads == 2 and databases.router.stickyReads == 1
+
+def testLaggingReplicaFallsBackToPrimary(databases):
+    async def scenario():
+        async with databases.primarySessions() as session:
+            # Escrita hace un minuto y todavía ausente en la réplica
+            createdAt = datetime.utcnow().replace(microsecond=0) - timedelta(minutes=1)
+            session.add(WeatherModel(sensorId="PRIMARY", temperature=20.0, timestamp=createdAt, createdAt=createdAt))
+            await session.commit()
+        await databases.lagMonitor.checkOnce()
+        return await sensorsIn(databases.router.sessionFactoryFor())
+    
+    assert asyncio.run(scenario()) == ["PRIMARY"]
+    assert databases.lagMonitor.status == "lagging"
+    assert databases.router.fallbackReads == 1
+
+def testMissingReplicaFallsBackToPrimary(databases):
+    async def scenario():
+        async with databases.primarySessions() as session:
+            session.add(WeatherModel(sensorId="PRIMARY", temperature=20.0, timestamp=datetime.now()))
+            await session.commit()
+        await databases.replicaEngine.dispose()
+        os.remove(databases.replicaPath)
+        await databases.lagMonitor.checkOnce()
+        return await sensorsIn(databases.router.sessionFactoryFor())
+    
+    assert asyncio.run(scenario()) == ["PRIMARY"]
+    assert databases.lagMonitor.status == "down"
+    assert databases.router.fallbackReads == 1
@@ -0,0 +1,125 @@
+"""
+Contrato de las respuestas serializadas con orjson: el JSON de cada listado, última
+lectura y resumen debe coincidir con el que generaría su entidad Pydantic
+
+    python -m pytest tests
+
+La API corre en proceso sobre SQLite con RESPONSE_CONTRACT_CHECKS activo, así que una
+diferencia falla dentro del endpoint (ContractError) y también al revisar el cuerpo.
+"""
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# La configuración se lee al importar la aplicación
+TEST_DIR = tempfile.mkdtemp(prefix="thermal-contracts-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(TEST_DIR, 'contracts.sqlite')}"
+os.environ["RESPONSE_CONTRACT_CHECKS"] = "true"
+os.environ["INGEST_MODE"] = "sync"
+os.environ["CAMERA_SENSOR_MAP"] = "CAM1:S1,CAM2:S2"
+os.environ["IMAGE_STORE_DIR"] = os.path.join(TEST_DIR, "images")
+os.environ["ARCHIVE_DIR"] = os.path.join(TEST_DIR, "archive")
+
+import httpx
+import pytest
+from app.domain.entities import (
+    DetectionList, DetectionLatestList, DetectionResponse, FireWeatherList, IncidentList, WeatherCurrentList,
+    WeatherDataList, WeatherDataResponse, WeatherSeriesList, WeatherSummary
+)
+from app.infrastructure.database.connection import createTables
+from app.infrastructure.serialization import checkContract
+from app.main import CorrelationResult, app
+
+NOW = datetime.now().replace(microsecond=0)
+WINDOW_START = (NOW - timedelta(hours=6)).isoformat()
+WINDOW_END = (NOW + timedelta(minutes=1)).isoformat()
+
+# (nombre, método, ruta, parámetros, entidad, campo con la lista que no debe venir vacía)
+ENDPOINTS = [
+    ("detections", "GET", "/api/v1/detections", {"includeTotal": "true"}, DetectionList, "detections"),
+    ("detectionsLatest", "GET", "/api/v1/detections/latest", {}, DetectionLatestList, "detections"),
+    ("incidents", "GET", "/api/v1/incidents", {"includeTotal": "true"}, IncidentList, "incidents"),
+    ("weather", "GET", "/api/v1/weather", {"includeTotal": "true"}, WeatherDataList, "weatherData"),
+    ("weatherCurrent", "GET", "/api/v1/weather/current", {}, WeatherCurrentList, "readings"),
+    ("weatherSummary", "GET", "/api/v1/weather/summary", {"startDate": WINDOW_START, "endDate": WINDOW_END}, WeatherSummary, None),
+    ("weatherSummarySensor", "GET", "/api/v1/weather/summary", {"startDate": WINDOW_START, "endDate": WINDOW_END, "sensorId": "S1"}, WeatherSummary, None),
+    ("weatherSeries", "GET", "/api/v1/weather/series", {"startDate": WINDOW_START, "endDate": WINDOW_END}, WeatherSeriesList, "series"),
+    ("fireIndex", "GET", "/api/v1/weather/fire-index", {}, FireWeatherList, "days"),
+    ("correlation", "GET", "/api/v1/analysis/correlation", {"windowMinutes": 360}, CorrelationResult, None),
+]
+
+def weatherReadings() -> list:
+    readings = []
+    for sensorIndex, sensorId in enumerate(("S1", "S2")):
+        for minute in range(0, 360, 10):
+            readings.append({
+                "sensorId": sensorId,
+                "temperature": 20.0 + sensorIndex + minute / 60,
+                "humidity": 40.0 - minute / 30,
+                "windSpeed": 5.0 + sensorIndex,
+                "windDirection": 90 if minute % 20 else None,
+                "rainfall": 0.0 if minute % 30 else 0.2,
+                "timestamp": (NOW - timedelta(minutes=minute)).isoformat()
+            })
+    return readings
+
+def detections() -> list:
+    return [
+        {
+            "detectionType": detectionType,
+            "confidence": 0.5 + index / 20,
+            "cameraId": cameraId,
+            "bboxX": 10 + index, "bboxY": 10, "bboxWidth": 40, "bboxHeight": 30,
+            "timestamp": (NOW - timedelta(minutes=index)).isoformat()
+        }
+        for index, (cameraId, detectionType) in enumerate(
+            [("CAM1", "fire"), ("CAM1", "fire"), ("CAM2", "smoke"), ("CAM2", "hotspot")]
+        )
+    ]
+
+async def collectResponses() -> dict:
+    """Sembrar datos por la API y pedir cada endpoint una vez"""
+    await createTables()
+    responses = {}
+    async with app.router.lifespan_context(app):
+        # Un ContractError llega como 500 del endpoint que lo produjo
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            batch = await client.post("/api/v1/weather/batch", json=weatherReadings())
+            assert batch.status_code == 200, batch.text
+            responses["weatherCreate"] = await client.post("/api/v1/weather", json={
+                "sensorId": "S3", "temperature": 25.0, "humidity": 30.0, "windSpeed": 2.0
+            })
+            responses["detectionCreate"] = await client.post("/api/v1/detections", json=detections()[0])
+            batch = await client.post("/api/v1/detections/batch", json=detections()[1:])
+            assert batch.status_code == 200, batch.text
+            
+            for name, method, path, params, _, _ in ENDPOINTS:
+                responses[name] = await client.request(method, path, params=params)
+    return responses
+
+@pytest.fixture(scope="module")
+def responses() -> dict:
+    return asyncio.run(collectResponses())
+
+@pytest.mark.parametrize("name,entityClass", [
+    ("detectionCreate", DetectionResponse),
+    ("weatherCreate", WeatherDataResponse)
+])
+def testIngestResponsesMatchEntity(responses, name, entityClass):
+    response = responses[name]
+    assert response.status_code == 200, response.text
+    checkContract(entityClass, response.json())
+
+@pytest.mark.parametrize("name,entityClass,listField", [
+    (name, entityClass, listField) for name, _, _, _, entityClass, listField in ENDPOINTS
+], ids=[endpoint[0] for endpoint in ENDPOINTS])
+def testReadResponsesMatchEntity(responses, name, entityClass, listField):
+    response = responses[name]
+    assert response.status_code == 200, response.text
+    body = response.json()
+    checkContract(entityClass, body)
+    # Una lista vacía no ejercita el contrato de sus elementos
+    if listField is not None:
+        assert body[listField], f"{name} respondió {listField} vacío"
@@ -0,0 +1,60 @@
+"""
+Remuestreo de series: bordes de los buckets, agregaciones y relleno de huecos
+
+    python -m pytest tests
+"""
+import numpy as np
+import pytest
+from app.domain.services.time_series import alignGrid, fillGaps, resampleColumns
+
+START = 1_789_999_200  # múltiplo de 60 y de 3600
+
+def resample(times, values, sensorCodes=None, sensorCount=1, buckets=3, interval=60, **options):
+    times = np.array(times, dtype=np.float64)
+    sensorCodes = np.zeros(len(times), dtype=np.int32) if sensorCodes is None else np.array(sensorCodes, dtype=np.int32)
+    counts, grids = resampleColumns(
+        times, sensorCodes, sensorCount, {"value": np.array(values, dtype=np.float64)},
+        START, interval, buckets, **options
+    )
+    return counts, grids["value"]
+
+def testAlignGridCoversHalfOpenRange():
+    assert alignGrid(START + 30, START + 180, 60) == (START, 3)
+    # El fin es exclusivo: una ventana que termina en un borde no agrega otro bucket
+    assert alignGrid(START, START + 120, 60) == (START, 2)
+    assert alignGrid(START, START + 120.5, 60) == (START, 3)
+    assert alignGrid(START, START, 60) == (START, 0)
+
+def testReadingOnBoundaryStartsNextBucket():
+    counts, grid = resample(
+        [START, START + 59.999, START + 60, START + 119, START + 180, START - 0.001],
+        [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    )
+    # Las lecturas en START + 180 (fin de la grilla) y antes de START quedan fuera
+    assert counts.tolist() == [[2, 2, 0]]
+    assert grid[0, :2].tolist() == [1.5, 3.5]
+    assert np.isnan(grid[0, 2])
+
+@pytest.mark.parametrize("aggregation, expected", [("mean", 2.0), ("min", 1.0), ("max", 3.0), ("last", 1.0)])
+def testAggregationsKeepArrivalOrderForLast(aggregation, expected):
+    _, grid = resample([START + 10, START + 50, START + 20], [2.0, 3.0, 1.0], buckets=1, aggregation=aggregation)
+    assert grid[0, 0] == expected
+
+def testNullsDoNotCountAsValues():
+    counts, grid = resample([START, START + 1, START + 61], [4.0, np.nan, np.nan], buckets=2)
+    # La lectura se cuenta aunque su valor sea nulo; el bucket sin valores queda vacío
+    assert counts.tolist() == [[2, 1]]
+    assert grid[0, 0] == 4.0 and np.isnan(grid[0, 1])
+
+def testSensorsHaveSeparateRows():
+    counts, grid = resample([START + 5, START + 5, START + 65], [1.0, 10.0, 20.0], sensorCodes=[0, 1, 1], sensorCount=2, buckets=2)
+    assert counts.tolist() == [[1, 0], [1, 1]]
+    assert grid[1].tolist() == [10.0, 20.0]
+
+def testFillModesAndLimit():
+    row = np.array([[np.nan, 1.0, np.nan, np.nan, 4.0, np.nan]])
+    assert np.array_equal(fillGaps(row, "ffill"), [[np.nan, 1.0, 1.0, 1.0, 4.0, 4.0]], equal_nan=True)
+    assert np.array_equal(fillGaps(row, "linear"), [[np.nan, 1.0, 2.0, 3.0, 4.0, np.nan]], equal_nan=True)
+    assert np.array_equal(fillGaps(row, "ffill", limit=1), [[np.nan, 1.0, 1.0, np.nan, 4.0, 4.0]], equal_nan=True)
+    # Un hueco de dos buckets supera el límite de uno: linear no lo rellena a medias
+    assert np.array_equal(fillGaps(row, "linear", limit=1), row, equal_nan=True)